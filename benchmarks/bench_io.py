@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+import spyns
+from spyns.data import SnapshotParameters
+from spyns.data_cython import SimulationHeisenbergData_t
+
+from .structures import SCALINGS, STRUCTURES, make_lattice, make_simulation_data
+
+
+class TimePostSimulation(object):
+    params = [STRUCTURES, [1000, 10000]]
+    param_names = ["structure", "sweeps"]
+
+    def setup(self, structure: str, sweeps: int) -> None:
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=4, r=1.2), sweeps=sweeps
+        )
+        spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=self.data, equilibration_run=False
+        )
+
+    def time_post_simulation(self, structure: str, sweeps: int) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            spyns.run.post_simulation(data=self.data)
+
+
+class TimeTraceIO(object):
+    params = [STRUCTURES, [1000, 10000]]
+    param_names = ["structure", "sweeps"]
+
+    def setup(self, structure: str, sweeps: int) -> None:
+        self.directory: str = tempfile.mkdtemp()
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=4, r=1.2),
+            sweeps=sweeps,
+            trace_filepath=str(Path(self.directory) / "trace.csv"),
+        )
+        spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=self.data, equilibration_run=False
+        )
+        spyns.data.make_trace_data_frame(data=self.data.container)
+
+    def teardown(self, structure: str, sweeps: int) -> None:
+        shutil.rmtree(self.directory)
+
+    def time_write_trace_history_to_disk(self, structure: str, sweeps: int) -> None:
+        spyns.data.write_trace_history_to_disk(data=self.data.container)
+
+
+class TimeSnapshotIO(object):
+    params = [STRUCTURES, SCALINGS]
+    param_names = ["structure", "scaling"]
+
+    def setup(self, structure: str, scaling: int) -> None:
+        self.directory: str = tempfile.mkdtemp()
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=scaling, r=1.2),
+            sweeps=1,
+            snapshot_filepath=str(Path(self.directory) / "snapshots.csv"),
+        )
+        spyns.data.dump_state_snapshot_to_disk(data=self.data.container, sweep_index=1)
+
+    def teardown(self, structure: str, scaling: int) -> None:
+        shutil.rmtree(self.directory)
+
+    def time_dump_state_snapshot_to_disk(self, structure: str, scaling: int) -> None:
+        spyns.data.dump_state_snapshot_to_disk(data=self.data.container, sweep_index=2)
+
+
+class TimeEncodedSnapshotIO(object):
+    params = [STRUCTURES, ["float64", "angles16", "octahedral16"], [None, 1]]
+    param_names = ["structure", "encoding", "compression_level"]
+
+    def setup(self, structure: str, encoding: str, compression_level: int) -> None:
+        self.directory: str = tempfile.mkdtemp()
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=12, r=1.2),
+            sweeps=1,
+            snapshot_filepath=str(Path(self.directory) / "snapshots.bin"),
+            snapshot_parameters=SnapshotParameters(
+                encoding=encoding, compression_level=compression_level, chunk_size=1
+            ),
+        )
+
+    def teardown(self, structure: str, encoding: str, compression_level: int) -> None:
+        shutil.rmtree(self.directory)
+
+    def time_dump_state_snapshot_to_disk(
+        self, structure: str, encoding: str, compression_level: int
+    ) -> None:
+        spyns.data.dump_state_snapshot_to_disk(data=self.data.container, sweep_index=1)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+from typing import Tuple
+
+import pymatgen as pmg
+
+from spyns.lattice import Lattice
+import spyns
+
+from .structures import SCALINGS, STRUCTURES, get_scaling_factors, make_unit_cell
+
+
+class TimeLattice(object):
+    params = [STRUCTURES, SCALINGS, [1.2, 1.9]]
+    param_names = ["structure", "scaling", "r"]
+    timeout = 600
+
+    def setup(self, structure: str, scaling: int, r: float) -> None:
+        self.unit_cell: pmg.Structure = make_unit_cell(structure=structure)
+        self.scaling_factors: Tuple[int, int, int] = get_scaling_factors(
+            structure=structure, scaling=scaling
+        )
+        self.supercell: pmg.Structure = spyns.lattice.generate.make_supercell(
+            cell_structure=self.unit_cell, scaling_factors=self.scaling_factors
+        )
+
+    def time_lattice(self, structure: str, scaling: int, r: float) -> None:
+        Lattice(structure=self.supercell, r=r)
+
+    def time_lattice_from_unit_cell(
+        self, structure: str, scaling: int, r: float
+    ) -> None:
+        Lattice.from_unit_cell(
+            structure=self.unit_cell, r=r, scaling_factors=self.scaling_factors
+        )
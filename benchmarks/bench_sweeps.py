@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import scipy.sparse
+
+import spyns
+from spyns.data_cython import SimulationHeisenbergData_t
+
+from .structures import SCALINGS, STRUCTURES, make_lattice, make_simulation_data
+
+
+class TimeSweeps(object):
+    params = [STRUCTURES, SCALINGS]
+    param_names = ["structure", "scaling"]
+    sweeps = 10
+
+    def setup(self, structure: str, scaling: int) -> None:
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=scaling, r=1.2),
+            sweeps=self.sweeps,
+        )
+
+    def time_run_sweeps(self, structure: str, scaling: int) -> None:
+        spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=self.data, equilibration_run=True
+        )
+
+    def track_flips_per_second(self, structure: str, scaling: int) -> float:
+        start: float = time.perf_counter()
+        spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=self.data, equilibration_run=True
+        )
+        elapsed: float = time.perf_counter() - start
+
+        return self.sweeps * self.data.container.lookup_tables.number_sites / elapsed
+
+    track_flips_per_second.unit = "flips/s"
+
+
+class TimeTotalEnergy(object):
+    params = [STRUCTURES, SCALINGS]
+    param_names = ["structure", "scaling"]
+
+    def setup(self, structure: str, scaling: int) -> None:
+        self.data: SimulationHeisenbergData_t = make_simulation_data(
+            lattice=make_lattice(structure=structure, scaling=scaling, r=1.2), sweeps=1
+        )
+        self.coupling_matrix: scipy.sparse.csr_matrix = spyns.model.heisenberg.build_coupling_matrix(
+            lookup_tables=self.data.container.lookup_tables
+        )
+
+    def time_compute_total_energy_python(self, structure: str, scaling: int) -> None:
+        spyns.model.heisenberg.compute_total_energy(
+            data=self.data.container, coupling_matrix=self.coupling_matrix
+        )
+
+    def time_compute_total_energy_python_building_matrix(
+        self, structure: str, scaling: int
+    ) -> None:
+        spyns.model.heisenberg.compute_total_energy(data=self.data.container)
+
+    def time_compute_total_energy_cython(self, structure: str, scaling: int) -> None:
+        spyns.model.heisenberg_cython.compute_total_energy(self.data)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pymatgen as pmg
+
+from spyns.data import (
+    HeisenbergState,
+    SimulationData,
+    SimulationParameters,
+    SnapshotParameters,
+    StructureParameters,
+)
+from spyns.lattice import Lattice
+import spyns
+from spyns.data_cython import SimulationHeisenbergData_t
+from spyns.random_numbers.distribution import RandomNumberGenerator
+
+UNIT_CELLS: Dict[str, Tuple[StructureParameters, Dict[int, str]]] = {
+    "square": (
+        StructureParameters(
+            abc=(2.0, 2.0, 20.0),
+            ang=3 * (90,),
+            spacegroup=1,
+            species=4 * ["Fe"],
+            coordinates=[
+                [0.00, 0.00, 0.00],
+                [0.50, 0.00, 0.00],
+                [0.00, 0.50, 0.00],
+                [0.50, 0.50, 0.00],
+            ],
+        ),
+        {0: "1", 1: "2", 2: "2", 3: "1"},
+    ),
+    "cubic": (
+        StructureParameters(
+            abc=(2.0, 2.0, 2.0),
+            ang=3 * (90,),
+            spacegroup=1,
+            species=8 * ["Fe"],
+            coordinates=[
+                [0.00, 0.00, 0.00],
+                [0.50, 0.00, 0.00],
+                [0.00, 0.50, 0.00],
+                [0.50, 0.50, 0.00],
+                [0.00, 0.00, 0.50],
+                [0.50, 0.00, 0.50],
+                [0.00, 0.50, 0.50],
+                [0.50, 0.50, 0.50],
+            ],
+        ),
+        {0: "1", 1: "2", 2: "2", 3: "1", 4: "2", 5: "1", 6: "1", 7: "2"},
+    ),
+    "bcc": (
+        StructureParameters(
+            abc=(2.0, 2.0, 1.0),
+            ang=3 * (90,),
+            spacegroup=1,
+            species=8 * ["Fe"],
+            coordinates=[
+                [0.00, 0.00, 0.00],
+                [0.50, 0.00, 0.00],
+                [0.00, 0.50, 0.00],
+                [0.50, 0.50, 0.00],
+                [0.25, 0.25, 0.50],
+                [0.75, 0.25, 0.50],
+                [0.25, 0.75, 0.50],
+                [0.75, 0.75, 0.50],
+            ],
+        ),
+        {0: "1", 1: "2", 2: "2", 3: "1", 4: "3", 5: "4", 6: "4", 7: "3"},
+    ),
+}
+STRUCTURES = list(UNIT_CELLS)
+SCALINGS = [4, 8, 12]
+
+
+def make_unit_cell(structure: str) -> pmg.Structure:
+    """Build one of the unit cells used by the test fixtures.
+
+    :param structure: Name of the unit cell, ``"square"``, ``"cubic"``, or ``"bcc"``.
+    :return: A pymatgen ``Structure`` object with subspecie labels.
+    """
+    structure_parameters, subspecies_labels = UNIT_CELLS[structure]
+
+    return spyns.lattice.generate.label_subspecies(
+        structure=spyns.lattice.generate.from_parameters(
+            structure_parameters=structure_parameters
+        ),
+        subspecies_labels=subspecies_labels,
+    )
+
+
+def get_scaling_factors(structure: str, scaling: int) -> Tuple[int, int, int]:
+    """Choose supercell scaling factors that keep the supercell roughly isotropic.
+
+    :param structure: Name of the unit cell.
+    :param scaling: Number of unit cells along the longest supercell edges.
+    :return: Number of unit cells along each lattice vector.
+    """
+    if structure == "square":
+        return scaling, scaling, 1
+
+    if structure == "bcc":
+        return scaling, scaling, 2 * scaling
+
+    return scaling, scaling, scaling
+
+
+def make_lattice(structure: str, scaling: int, r: float) -> Lattice:
+    """Build a supercell lattice with uniform ferromagnetic interactions.
+
+    :param structure: Name of the unit cell.
+    :param scaling: Number of unit cells along the longest supercell edges.
+    :param r: Cutoff radius for finding neighbors in sphere.
+    :return: Lattice with its interaction parameters set.
+    """
+    lattice: Lattice = Lattice.from_unit_cell(
+        structure=make_unit_cell(structure=structure),
+        r=r,
+        scaling_factors=get_scaling_factors(structure=structure, scaling=scaling),
+    )
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=-1.0)
+    )
+
+    return lattice
+
+
+def make_simulation_data(
+    lattice: Lattice,
+    sweeps: int,
+    trace_filepath: Optional[str] = None,
+    snapshot_filepath: Optional[str] = None,
+    snapshot_parameters: Optional[SnapshotParameters] = None,
+    seed: int = 1234,
+) -> SimulationHeisenbergData_t:
+    """Set up the data containers of a Heisenberg simulation without running it.
+
+    :param lattice: Lattice with its interaction parameters set.
+    :param sweeps: Number of equilibration and production sweeps.
+    :param trace_filepath: Optional path for the trace history.
+    :param snapshot_filepath: Optional path for the state snapshots.
+    :param snapshot_parameters: Optional encoding for the state snapshots.
+    :param seed: Random number generator seed.
+    :return: Data container for the compiled kernels.
+    """
+    np.random.seed(seed)
+
+    state: HeisenbergState = spyns.model.heisenberg.sample_random_state(
+        lattice.number_sites
+    )
+    data_object: SimulationData = spyns.data.setup_containers(
+        parameters=SimulationParameters(
+            seed=seed,
+            mode="heisenberg_cython",
+            trace_filepath=trace_filepath,
+            snapshot_filepath=snapshot_filepath,
+            sweeps=sweeps,
+            equilibration_sweeps=sweeps,
+            sample_interval=1,
+            temperature=1.0,
+        ),
+        state=state,
+        lattice=lattice,
+        snapshot_parameters=snapshot_parameters,
+    )
+    data: SimulationHeisenbergData_t = SimulationHeisenbergData_t(
+        data=data_object,
+        random_number_generator=RandomNumberGenerator(
+            seed=seed, number_sites=lattice.number_sites
+        ),
+    )
+    spyns.model.heisenberg_cython.save_full_state(data)
+
+    return data
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import os
+import re
 import sys
 from collections import OrderedDict
 
@@ -12,19 +13,28 @@ USE_CYTHON = os.environ.get("USE_CYTHON", None)
 with open("README.rst", "rt", encoding="utf8") as f:
     readme = f.read()
 
+with open(os.path.join("spyns", "__init__.py"), "rt", encoding="utf8") as f:
+    release = re.search(r'^__version__: str = "(.+)"$', f.read(), re.M).group(1)
+
 name = "spyns"
-version = "0.1"
-release = "0.1.0"
+version = ".".join(release.split(".")[:2])
 
-dependencies = ["numpy>=1.16.2", "pandas>=0.24.2", "pymatgen>=2019.5.8"]
+dependencies = [
+    "numpy>=1.16.2",
+    "pandas>=0.24.2",
+    "pymatgen>=2019.5.8",
+    "scipy>=1.2.1",
+]
 cmdclass = {}
 extras_dependencies = {
+    "arrow": ["pyarrow>=0.17.0"],
     "docs": [
         "sphinx>=1.8.5",
         "sphinx-rtd-theme==0.4.3",
         "sphinx-autodoc-typehints==1.6.0",
     ],
     "dev": [
+        "asv==0.4.1",
         "autopep8==1.4.4",
         "black==19.3b0",
         "Cython>=0.29.6",
@@ -61,6 +71,12 @@ extensions = [
         language="c++",
         extra_compile_args=["-std=c++11"],
     ),
+    setuptools.extension.Extension(
+        "spyns.algorithms.wang_landau.heisenberg_cython",
+        sources=["spyns/algorithms/wang_landau/heisenberg_cython" + ext],
+        language="c++",
+        extra_compile_args=["-std=c++11"],
+    ),
     setuptools.extension.Extension(
         "spyns.random_numbers.distribution",
         sources=["spyns/random_numbers/distribution" + ext],
@@ -114,6 +130,12 @@ setuptools.setup(
     include_package_data=True,
     setup_requires=setup_requires,
     ext_modules=extensions,
+    entry_points={
+        "console_scripts": [
+            "spyns-batch = spyns.batch:main",
+            "spyns-queue = spyns.work_queue:main",
+        ]
+    },
     zip_safe=False,
     install_requires=dependencies,
     extras_require=extras_dependencies,
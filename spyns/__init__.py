@@ -1,8 +1,50 @@
 # -*- coding: utf-8 -*-
 
-import spyns.algorithms
-import spyns.data
-import spyns.lattice
-import spyns.model
-import spyns.run
-import spyns.statistics
+import importlib
+from types import ModuleType
+from typing import List
+
+__version__: str = "0.1.0"
+SUBMODULES: List[str] = [
+    "algorithms",
+    "annealing",
+    "batch",
+    "data",
+    "domains",
+    "lattice",
+    "metrics",
+    "model",
+    "progress",
+    "result_store",
+    "reweighting",
+    "run",
+    "runtime",
+    "shared",
+    "snapshots",
+    "statistics",
+    "structure_factor",
+    "trace",
+    "wang_landau",
+    "work_queue",
+]
+
+
+def __getattr__(name: str) -> ModuleType:
+    """Import submodules on first access.
+
+    Building lattices pulls in pymatgen and pandas, which take far longer to import
+    than the simulation kernels. Loading submodules lazily keeps ``import spyns``
+    cheap for code that only needs ``spyns.runtime``.
+
+    :param name: Name of the submodule.
+    :return: The imported submodule.
+    :raises AttributeError: An error will be raised if ``name`` is not a submodule.
+    """
+    if name in SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + SUBMODULES)
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
 import spyns.algorithms.metropolis
+import spyns.algorithms.wang_landau
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+import spyns.algorithms.metropolis.base_cython
+import spyns.algorithms.metropolis.heisenberg_cython
@@ -960,6 +960,12 @@ struct __pyx_obj_5spyns_11data_cython_LookupTables_t;
 struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t;
 struct __pyx_obj_5spyns_11data_cython_Estimators_t;
 struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t;
+struct __pyx_obj_5spyns_11data_cython_Histograms_t;
+struct __pyx_obj_5spyns_11data_cython_Metrics_t;
+struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t;
+struct __pyx_obj_5spyns_11data_cython_OrderParameters_t;
+struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t;
+struct __pyx_obj_5spyns_11data_cython_Progress_t;
 struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t;
 struct __pyx_array_obj;
 struct __pyx_MemviewEnum_obj;
@@ -1006,8 +1012,8 @@ struct __pyx_obj_5spyns_11data_cython_SimulationParameters_t {
  * 
  * 
  * cdef class LookupTables_t:             # <<<<<<<<<<<<<<
- *     cdef long[:] sublattice_table
- *     cdef long[:] neighbors_table
+ *     cdef const short[:] sublattice_table
+ *     cdef const int[:] neighbors_table
  */
 struct __pyx_obj_5spyns_11data_cython_LookupTables_t {
   PyObject_HEAD
@@ -1015,13 +1021,14 @@ struct __pyx_obj_5spyns_11data_cython_LookupTables_t {
   __Pyx_memviewslice neighbors_table;
   __Pyx_memviewslice neighbors_count;
   __Pyx_memviewslice neighbors_lookup_index;
-  __Pyx_memviewslice interaction_parameters_table;
+  __Pyx_memviewslice interaction_class_table;
+  __Pyx_memviewslice interaction_class_parameters;
   long number_sites;
   long number_sublattices;
 };
 
 
-/* "spyns/data_cython.pxd":20
+/* "spyns/data_cython.pxd":21
  * 
  * 
  * cdef class HeisenbergState_t:             # <<<<<<<<<<<<<<
@@ -1036,7 +1043,7 @@ struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t {
 };
 
 
-/* "spyns/data_cython.pxd":26
+/* "spyns/data_cython.pxd":27
  * 
  * 
  * cdef class Estimators_t:             # <<<<<<<<<<<<<<
@@ -1052,7 +1059,7 @@ struct __pyx_obj_5spyns_11data_cython_Estimators_t {
 };
 
 
-/* "spyns/data_cython.pxd":33
+/* "spyns/data_cython.pxd":34
  * 
  * 
  * cdef class SimulationTrace_t:             # <<<<<<<<<<<<<<
@@ -1068,7 +1075,111 @@ struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t {
 };
 
 
-/* "spyns/data_cython.pxd":40
+/* "spyns/data_cython.pxd":41
+ * 
+ * 
+ * cdef class Histograms_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef double energy_min
+ */
+struct __pyx_obj_5spyns_11data_cython_Histograms_t {
+  PyObject_HEAD
+  int enabled;
+  double energy_min;
+  double energy_width;
+  long energy_bins;
+  double magnetization_width;
+  long magnetization_bins;
+  __Pyx_memviewslice energy_counts;
+  __Pyx_memviewslice energy_magnetization_counts;
+  __Pyx_memviewslice out_of_range;
+};
+
+
+/* "spyns/data_cython.pxd":53
+ * 
+ * 
+ * cdef class Metrics_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef long[:] attempted_flips
+ */
+struct __pyx_obj_5spyns_11data_cython_Metrics_t {
+  PyObject_HEAD
+  int enabled;
+  __Pyx_memviewslice attempted_flips;
+  __Pyx_memviewslice accepted_flips;
+};
+
+
+/* "spyns/data_cython.pxd":59
+ * 
+ * 
+ * cdef class ShellCorrelations_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef long sample_interval
+ */
+struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t {
+  PyObject_HEAD
+  int enabled;
+  long sample_interval;
+  __Pyx_memviewslice correlation_sums;
+  __Pyx_memviewslice number_samples;
+};
+
+
+/* "spyns/data_cython.pxd":66
+ * 
+ * 
+ * cdef class OrderParameters_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef const double[:, :] weights
+ */
+struct __pyx_obj_5spyns_11data_cython_OrderParameters_t {
+  PyObject_HEAD
+  int enabled;
+  __Pyx_memviewslice weights;
+  __Pyx_memviewslice values;
+};
+
+
+/* "spyns/data_cython.pxd":72
+ * 
+ * 
+ * cdef class Hamiltonian_t:             # <<<<<<<<<<<<<<
+ *     cdef bint field_enabled
+ *     cdef bint anisotropy_enabled
+ */
+struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t {
+  PyObject_HEAD
+  int field_enabled;
+  int anisotropy_enabled;
+  int exchange_enabled;
+  __Pyx_memviewslice magnetic_field;
+  __Pyx_memviewslice anisotropy;
+  __Pyx_memviewslice exchange_tensors;
+};
+
+
+/* "spyns/data_cython.pxd":81
+ * 
+ * 
+ * cdef class Progress_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef object callback
+ */
+struct __pyx_obj_5spyns_11data_cython_Progress_t {
+  PyObject_HEAD
+  int enabled;
+  PyObject *callback;
+  long sweep_interval;
+  double time_interval;
+  double start_time;
+  double last_time;
+  int stop_requested;
+};
+
+
+/* "spyns/data_cython.pxd":91
  * 
  * 
  * cdef class SimulationHeisenbergData_t:             # <<<<<<<<<<<<<<
@@ -1083,6 +1194,12 @@ struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t {
   struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t *state;
   struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t *trace;
   struct __pyx_obj_5spyns_11data_cython_Estimators_t *estimators;
+  struct __pyx_obj_5spyns_11data_cython_Histograms_t *histograms;
+  struct __pyx_obj_5spyns_11data_cython_Metrics_t *metrics;
+  struct __pyx_obj_5spyns_11data_cython_Progress_t *progress;
+  struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t *hamiltonian;
+  struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t *shell_correlations;
+  struct __pyx_obj_5spyns_11data_cython_OrderParameters_t *order_parameters;
   PyObject *_data;
 };
 
@@ -1858,6 +1975,12 @@ static PyTypeObject *__pyx_ptype_5spyns_11data_cython_LookupTables_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_HeisenbergState_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Estimators_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_SimulationTrace_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Histograms_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Metrics_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_ShellCorrelations_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_OrderParameters_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Hamiltonian_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Progress_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t = 0;
 
 /* Module declarations from 'libc.math' */
@@ -2230,37 +2353,75 @@ static int __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_accept_or_reje
   int __pyx_r;
   __Pyx_RefNannyDeclarations
   int __pyx_t_1;
+  int __pyx_t_2;
   __Pyx_RefNannySetupContext("accept_or_reject", 0);
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":29
+  /* "spyns/algorithms/metropolis/base_cython.pyx":31
  *     cdef double random_number
  * 
  *     cdef bint accept = True             # <<<<<<<<<<<<<<
  * 
- *     if energy_difference >= 0:
+ *     if energy_difference >= 0 and temperature <= 0:
  */
   __pyx_v_accept = 1;
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":31
+  /* "spyns/algorithms/metropolis/base_cython.pyx":33
  *     cdef bint accept = True
  * 
- *     if energy_difference >= 0:             # <<<<<<<<<<<<<<
+ *     if energy_difference >= 0 and temperature <= 0:             # <<<<<<<<<<<<<<
+ *         accept = False
+ * 
+ */
+  __pyx_t_2 = ((__pyx_v_energy_difference >= 0.0) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = ((__pyx_v_temperature <= 0.0) != 0);
+  __pyx_t_1 = __pyx_t_2;
+  __pyx_L4_bool_binop_done:;
+  if (__pyx_t_1) {
+
+    /* "spyns/algorithms/metropolis/base_cython.pyx":34
+ * 
+ *     if energy_difference >= 0 and temperature <= 0:
+ *         accept = False             # <<<<<<<<<<<<<<
+ * 
+ *     elif energy_difference >= 0:
+ */
+    __pyx_v_accept = 0;
+
+    /* "spyns/algorithms/metropolis/base_cython.pyx":33
+ *     cdef bint accept = True
+ * 
+ *     if energy_difference >= 0 and temperature <= 0:             # <<<<<<<<<<<<<<
+ *         accept = False
+ * 
+ */
+    goto __pyx_L3;
+  }
+
+  /* "spyns/algorithms/metropolis/base_cython.pyx":36
+ *         accept = False
+ * 
+ *     elif energy_difference >= 0:             # <<<<<<<<<<<<<<
  *         acceptance_probability = proposal_distribution(
  *             energy_difference=energy_difference, temperature=temperature
  */
   __pyx_t_1 = ((__pyx_v_energy_difference >= 0.0) != 0);
   if (__pyx_t_1) {
 
-    /* "spyns/algorithms/metropolis/base_cython.pyx":32
+    /* "spyns/algorithms/metropolis/base_cython.pyx":37
  * 
- *     if energy_difference >= 0:
+ *     elif energy_difference >= 0:
  *         acceptance_probability = proposal_distribution(             # <<<<<<<<<<<<<<
  *             energy_difference=energy_difference, temperature=temperature
  *         )
  */
     __pyx_v_acceptance_probability = __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_proposal_distribution(__pyx_v_energy_difference, __pyx_v_temperature);
 
-    /* "spyns/algorithms/metropolis/base_cython.pyx":35
+    /* "spyns/algorithms/metropolis/base_cython.pyx":40
  *             energy_difference=energy_difference, temperature=temperature
  *         )
  *         random_number = data.random_number_generator.uniform()             # <<<<<<<<<<<<<<
@@ -2269,7 +2430,7 @@ static int __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_accept_or_reje
  */
     __pyx_v_random_number = ((struct __pyx_vtabstruct_5spyns_14random_numbers_12distribution_RandomNumberGenerator *)__pyx_v_data->random_number_generator->__pyx_vtab)->uniform(__pyx_v_data->random_number_generator);
 
-    /* "spyns/algorithms/metropolis/base_cython.pyx":36
+    /* "spyns/algorithms/metropolis/base_cython.pyx":41
  *         )
  *         random_number = data.random_number_generator.uniform()
  *         accept = random_number <= acceptance_probability             # <<<<<<<<<<<<<<
@@ -2278,16 +2439,17 @@ static int __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_accept_or_reje
  */
     __pyx_v_accept = (__pyx_v_random_number <= __pyx_v_acceptance_probability);
 
-    /* "spyns/algorithms/metropolis/base_cython.pyx":31
- *     cdef bint accept = True
+    /* "spyns/algorithms/metropolis/base_cython.pyx":36
+ *         accept = False
  * 
- *     if energy_difference >= 0:             # <<<<<<<<<<<<<<
+ *     elif energy_difference >= 0:             # <<<<<<<<<<<<<<
  *         acceptance_probability = proposal_distribution(
  *             energy_difference=energy_difference, temperature=temperature
  */
   }
+  __pyx_L3:;
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":38
+  /* "spyns/algorithms/metropolis/base_cython.pyx":43
  *         accept = random_number <= acceptance_probability
  * 
  *     return accept             # <<<<<<<<<<<<<<
@@ -2311,7 +2473,7 @@ static int __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_accept_or_reje
   return __pyx_r;
 }
 
-/* "spyns/algorithms/metropolis/base_cython.pyx":41
+/* "spyns/algorithms/metropolis/base_cython.pyx":46
  * 
  * 
  * cdef double proposal_distribution(double energy_difference, double temperature):             # <<<<<<<<<<<<<<
@@ -2326,7 +2488,7 @@ static double __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_proposal_di
   double __pyx_t_1;
   __Pyx_RefNannySetupContext("proposal_distribution", 0);
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":48
+  /* "spyns/algorithms/metropolis/base_cython.pyx":53
  *     :return: Probability of accepting trial sample.
  *     """
  *     cdef double acceptance_probability = exp(-energy_difference / temperature)             # <<<<<<<<<<<<<<
@@ -2336,11 +2498,11 @@ static double __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_proposal_di
   __pyx_t_1 = (-__pyx_v_energy_difference);
   if (unlikely(__pyx_v_temperature == 0)) {
     PyErr_SetString(PyExc_ZeroDivisionError, "float division");
-    __PYX_ERR(0, 48, __pyx_L1_error)
+    __PYX_ERR(0, 53, __pyx_L1_error)
   }
   __pyx_v_acceptance_probability = exp((__pyx_t_1 / __pyx_v_temperature));
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":50
+  /* "spyns/algorithms/metropolis/base_cython.pyx":55
  *     cdef double acceptance_probability = exp(-energy_difference / temperature)
  * 
  *     return acceptance_probability             # <<<<<<<<<<<<<<
@@ -2348,7 +2510,7 @@ static double __pyx_f_5spyns_10algorithms_10metropolis_11base_cython_proposal_di
   __pyx_r = __pyx_v_acceptance_probability;
   goto __pyx_L0;
 
-  /* "spyns/algorithms/metropolis/base_cython.pyx":41
+  /* "spyns/algorithms/metropolis/base_cython.pyx":46
  * 
  * 
  * cdef double proposal_distribution(double energy_difference, double temperature):             # <<<<<<<<<<<<<<
@@ -16351,13 +16513,25 @@ static int __Pyx_modinit_type_import_code(void) {
   __pyx_ptype_5spyns_11data_cython_LookupTables_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "LookupTables_t", sizeof(struct __pyx_obj_5spyns_11data_cython_LookupTables_t), __Pyx_ImportType_CheckSize_Warn);
    if (!__pyx_ptype_5spyns_11data_cython_LookupTables_t) __PYX_ERR(3, 10, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_HeisenbergState_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "HeisenbergState_t", sizeof(struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_HeisenbergState_t) __PYX_ERR(3, 20, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_HeisenbergState_t) __PYX_ERR(3, 21, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_Estimators_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Estimators_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Estimators_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_Estimators_t) __PYX_ERR(3, 26, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_Estimators_t) __PYX_ERR(3, 27, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_SimulationTrace_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "SimulationTrace_t", sizeof(struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_SimulationTrace_t) __PYX_ERR(3, 33, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_SimulationTrace_t) __PYX_ERR(3, 34, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Histograms_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Histograms_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Histograms_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Histograms_t) __PYX_ERR(3, 41, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Metrics_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Metrics_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Metrics_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Metrics_t) __PYX_ERR(3, 53, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_ShellCorrelations_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "ShellCorrelations_t", sizeof(struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_ShellCorrelations_t) __PYX_ERR(3, 59, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_OrderParameters_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "OrderParameters_t", sizeof(struct __pyx_obj_5spyns_11data_cython_OrderParameters_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_OrderParameters_t) __PYX_ERR(3, 66, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Hamiltonian_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Hamiltonian_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Hamiltonian_t) __PYX_ERR(3, 72, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Progress_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Progress_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Progress_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Progress_t) __PYX_ERR(3, 81, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "SimulationHeisenbergData_t", sizeof(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t) __PYX_ERR(3, 40, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t) __PYX_ERR(3, 91, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_RefNannyFinishContext();
   return 0;
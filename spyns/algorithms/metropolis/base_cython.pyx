@@ -19,6 +19,8 @@ cdef bint accept_or_reject(double temperature, double energy_difference,
                            SimulationHeisenbergData_t data):
     """Accept or reject trial flip using the Metropolis algorithm.
 
+    At zero temperature, only trial flips that lower the energy are accepted.
+
     :param temperature: Simulation temperature.
     :param energy_difference: Energy difference for the trial spin flip.
     :return: Boolean specifying if trial flip was accepted or not.
@@ -28,7 +30,10 @@ cdef bint accept_or_reject(double temperature, double energy_difference,
 
     cdef bint accept = True
 
-    if energy_difference >= 0:
+    if energy_difference >= 0 and temperature <= 0:
+        accept = False
+
+    elif energy_difference >= 0:
         acceptance_probability = proposal_distribution(
             energy_difference=energy_difference, temperature=temperature
         )
@@ -4,4 +4,14 @@ from spyns.random_numbers.distribution cimport RandomNumberGenerator
 cdef void step(SimulationHeisenbergData_t data)
 cdef void sweep(SimulationHeisenbergData_t data, long sweep_index,
                 bint equilibration_run)
-cpdef void run_sweeps(SimulationHeisenbergData_t data, bint equilibration_run)
+cdef void update_histograms(SimulationHeisenbergData_t data)
+cdef void update_order_parameters(SimulationHeisenbergData_t data, long sweep_index)
+cdef bint report_progress(SimulationHeisenbergData_t data, long sweeps_run,
+                          bint equilibration_run) except *
+cpdef long run_sweeps(SimulationHeisenbergData_t data, bint equilibration_run) except -1
+cpdef long run_sweep_range(SimulationHeisenbergData_t data, long start, long stop,
+                           bint equilibration_run) except -1
+cpdef double run_annealing(SimulationHeisenbergData_t data, double[:] temperatures,
+                           long sweeps_per_stage, double[:] stage_energies,
+                           double[:] best_x, double[:] best_y, double[:] best_z,
+                           double best_energy)
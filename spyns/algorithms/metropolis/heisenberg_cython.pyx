@@ -1,20 +1,33 @@
 from spyns.random_numbers.distribution cimport RandomNumberGenerator
 from spyns.data_cython cimport SimulationHeisenbergData_t
 from spyns.model.heisenberg_cython cimport \
-    TrialFlip_t, keep_flip_and_update_state, flip
+    TrialFlip_t, keep_flip_and_update_state, flip, update_shell_correlations
 from base_cython cimport pick_site, accept_or_reject
+from libc.math cimport floor, sqrt
 
+import time
+
+import cython
 import numpy as np
 
 from spyns.data import dump_state_snapshot_to_disk
+from spyns.metrics import record_phase
+from spyns.progress import make_progress_report
 from spyns.statistics import update_trace
+from spyns.structure_factor import update_structure_factor
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
 cdef void step(SimulationHeisenbergData_t data):
     """Update system state of the Heisenberg model using the Metropolis algorithm.
 
+    When run metrics are enabled, the attempted and accepted flips are counted per
+    sublattice.
+
     :param data: Data container for the simulation.
     """
+    cdef short sublattice
     cdef long site_index = pick_site(
         data=data,
     )
@@ -27,6 +40,14 @@ cdef void step(SimulationHeisenbergData_t data):
         energy_difference=trial_flip.energy_difference,
         data=data,
     )
+
+    if data.metrics.enabled:
+        sublattice = data.lookup_tables.sublattice_table[site_index]
+        data.metrics.attempted_flips[sublattice] += 1
+
+        if accept_state:
+            data.metrics.accepted_flips[sublattice] += 1
+
     if accept_state:
         keep_flip_and_update_state(
             data=data,
@@ -57,15 +78,104 @@ cdef void sweep(SimulationHeisenbergData_t data, long sweep_index, bint equilibr
         data.estimators.number_samples[0] += 1
         update_trace(data=data.container, sweep_index=sweep_index)
 
+        if data.histograms.enabled:
+            update_histograms(data=data)
+
+        if data.order_parameters.enabled:
+            update_order_parameters(data=data, sweep_index=sweep_index)
+
+        if (
+            data.shell_correlations.enabled and
+            (data.estimators.number_samples[0] - 1) %
+            data.shell_correlations.sample_interval == 0
+        ):
+            update_shell_correlations(data=data)
+
+        if data.container.structure_factor is not None:
+            update_structure_factor(data=data.container)
+
         if data.container.parameters.snapshot_filepath:
-            dump_state_snapshot_to_disk(
-                data=data.container,
-                sweep_index=sweep_index + 1,
-            )
+            with record_phase(data=data.container, phase="io"):
+                dump_state_snapshot_to_disk(
+                    data=data.container,
+                    sweep_index=sweep_index + 1,
+                )
 
 
-cpdef void run_sweeps(SimulationHeisenbergData_t data, bint equilibration_run):
-    cdef long sweep_index
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void update_histograms(SimulationHeisenbergData_t data):
+    """Add the current energy and magnetization estimators to the histograms.
+
+    Samples whose energy falls outside of the histogram bounds are only counted in
+    ``out_of_range``.
+
+    :param data: Data container for the simulation.
+    """
+    cdef long energy_bin
+    cdef long magnetization_bin
+
+    energy_bin = <long>floor(
+        (data.estimators.energy[0] - data.histograms.energy_min) /
+        data.histograms.energy_width
+    )
+
+    if energy_bin < 0 or energy_bin >= data.histograms.energy_bins:
+        data.histograms.out_of_range[0] += 1
+        return
+
+    data.histograms.energy_counts[energy_bin] += 1
+
+    if data.histograms.magnetization_bins > 0:
+        magnetization_bin = <long>floor(
+            data.estimators.magnetization[0] / data.histograms.magnetization_width
+        )
+        magnetization_bin = min(magnetization_bin, data.histograms.magnetization_bins - 1)
+        data.histograms.energy_magnetization_counts[energy_bin, magnetization_bin] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void update_order_parameters(SimulationHeisenbergData_t data, long sweep_index):
+    """Trace the order parameter of each sublattice pattern.
+
+    Same as ``spyns.statistics.compute_order_parameters`` applied to the current
+    spin vector estimator.
+
+    :param data: Data container for the simulation.
+    :param sweep_index: Sweep index for the simulation.
+    """
+    cdef long pattern
+    cdef long sublattice
+    cdef double weight
+    cdef double order_x
+    cdef double order_y
+    cdef double order_z
+
+    for pattern in range(data.order_parameters.weights.shape[0]):
+        order_x = 0.0
+        order_y = 0.0
+        order_z = 0.0
+
+        for sublattice in range(data.lookup_tables.number_sublattices):
+            weight = data.order_parameters.weights[pattern, sublattice]
+            order_x += weight * data.estimators.spin_vector[sublattice, 0]
+            order_y += weight * data.estimators.spin_vector[sublattice, 1]
+            order_z += weight * data.estimators.spin_vector[sublattice, 2]
+
+        data.order_parameters.values[sweep_index, pattern] = sqrt(
+            order_x * order_x + order_y * order_y + order_z * order_z
+        ) / data.lookup_tables.number_sites
+
+
+cpdef long run_sweeps(SimulationHeisenbergData_t data, bint equilibration_run) except -1:
+    """Run the full block of equilibration or production sweeps.
+
+    :param data: Data container for the simulation.
+    :param equilibration_run: Whether or not to run the equilibration sweeps.
+    :return: Number of sweeps that were run, fewer than the full block if a progress
+        callback requested a stop.
+    """
     cdef long sweeps
     
     if equilibration_run:
@@ -74,9 +184,135 @@ cpdef void run_sweeps(SimulationHeisenbergData_t data, bint equilibration_run):
     else:
         sweeps = data.parameters.sweeps
 
-    for sweep_index in range(sweeps):
+    return run_sweep_range(
+        data=data,
+        start=0,
+        stop=sweeps,
+        equilibration_run=equilibration_run,
+    )
+
+
+cpdef long run_sweep_range(SimulationHeisenbergData_t data, long start, long stop,
+                           bint equilibration_run) except -1:
+    """Run the sweeps whose indices fall within the half-open interval [start, stop).
+
+    If a progress hook is registered, it is checked once per sweep and the range ends
+    early when its callback requests a stop.
+
+    :param data: Data container for the simulation.
+    :param start: Index of the first sweep to run.
+    :param stop: Index one past the last sweep to run.
+    :param equilibration_run: Whether or not the sweeps are part of equilibration run.
+    :return: Index one past the last sweep that was run.
+    """
+    cdef long sweep_index
+
+    if data.progress.stop_requested:
+        return start
+
+    for sweep_index in range(start, stop):
         sweep(
             data=data,
             sweep_index=sweep_index,
             equilibration_run=equilibration_run,
         )
+
+        if data.progress.enabled and report_progress(
+            data=data,
+            sweeps_run=sweep_index + 1,
+            equilibration_run=equilibration_run,
+        ):
+            return sweep_index + 1
+
+    return stop
+
+
+cdef bint report_progress(SimulationHeisenbergData_t data, long sweeps_run,
+                          bint equilibration_run) except *:
+    """Call the progress callback if a reporting interval has elapsed.
+
+    :param data: Data container for the simulation.
+    :param sweeps_run: Number of sweeps of the current phase that have been run.
+    :param equilibration_run: Whether or not the sweeps are part of equilibration run.
+    :return: Whether or not the callback requested a stop.
+    """
+    cdef double now = time.perf_counter()
+    cdef bint sweeps_due = (
+        data.progress.sweep_interval > 0 and
+        sweeps_run % data.progress.sweep_interval == 0
+    )
+    cdef bint time_due = (
+        data.progress.time_interval > 0 and
+        now - data.progress.last_time >= data.progress.time_interval
+    )
+
+    if not (sweeps_due or time_due):
+        return False
+
+    data.progress.last_time = now
+    data.progress.stop_requested = bool(
+        data.progress.callback(
+            make_progress_report(
+                data=data.container,
+                phase="equilibration" if equilibration_run else "production",
+                sweep=sweeps_run,
+                sweeps=(
+                    data.parameters.equilibration_sweeps if equilibration_run
+                    else data.parameters.sweeps
+                ),
+                elapsed_time=now - data.progress.start_time,
+            )
+        )
+    )
+
+    return data.progress.stop_requested
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef double run_annealing(SimulationHeisenbergData_t data, double[:] temperatures,
+                           long sweeps_per_stage, double[:] stage_energies,
+                           double[:] best_x, double[:] best_y, double[:] best_z,
+                           double best_energy):
+    """Run sweeps while stepping the temperature down a schedule.
+
+    The lowest-energy state seen at the end of any sweep is copied into the
+    ``best_x``, ``best_y``, and ``best_z`` arrays.
+
+    :param data: Data container for the simulation. The energy estimator must hold the
+        total energy of the state.
+    :param temperatures: Temperature of each annealing stage.
+    :param sweeps_per_stage: Number of sweeps to run at each temperature.
+    :param stage_energies: Filled with the energy at the end of each stage.
+    :param best_x: Filled with the x components of the lowest-energy state.
+    :param best_y: Filled with the y components of the lowest-energy state.
+    :param best_z: Filled with the z components of the lowest-energy state.
+    :param best_energy: Energy of the state currently stored in the ``best_*``
+        arrays.
+    :return: Energy of the lowest-energy state.
+    """
+    cdef long _
+    cdef long stage
+    cdef long sweep_index
+    cdef long site_index
+
+    cdef long number_sites = data.lookup_tables.number_sites
+
+    for stage in range(temperatures.shape[0]):
+        data.parameters.temperature = temperatures[stage]
+
+        for sweep_index in range(sweeps_per_stage):
+            for _ in range(number_sites):
+                step(data=data)
+
+            if data.estimators.energy[0] < best_energy:
+                best_energy = data.estimators.energy[0]
+
+                for site_index in range(number_sites):
+                    best_x[site_index] = data.state.x[site_index]
+                    best_y[site_index] = data.state.y[site_index]
+                    best_z[site_index] = data.state.z[site_index]
+
+        stage_energies[stage] = data.estimators.energy[0]
+
+    return best_energy
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+import spyns.algorithms.wang_landau.heisenberg_cython
@@ -0,0 +1,13 @@
+from spyns.data_cython cimport SimulationHeisenbergData_t
+
+cdef long find_energy_bin(double energy, double energy_min, double bin_width)
+cdef double compute_window_distance(double energy, double energy_min,
+                                    double energy_max)
+cdef bint accept_or_reject(double log_density_of_states_difference,
+                           SimulationHeisenbergData_t data)
+cpdef bint enter_energy_window(SimulationHeisenbergData_t data, double energy_min,
+                               double energy_max, long max_sweeps)
+cpdef void run_sweeps(SimulationHeisenbergData_t data,
+                      double[:] log_density_of_states, long[:] histogram,
+                      double energy_min, double bin_width,
+                      double log_modification_factor, long sweeps)
@@ -0,0 +1,165 @@
+from libc.math cimport exp, floor
+from spyns.data_cython cimport SimulationHeisenbergData_t
+from spyns.model.heisenberg_cython cimport \
+    TrialFlip_t, keep_flip_and_update_state, flip
+from spyns.algorithms.metropolis.base_cython cimport pick_site
+
+import cython
+
+
+cdef long find_energy_bin(double energy, double energy_min, double bin_width):
+    """Find the index of the energy bin that contains an energy.
+
+    :param energy: Total energy of a state.
+    :param energy_min: Lower edge of the first energy bin.
+    :param bin_width: Width of the energy bins.
+    :return: Index of the energy bin, which can fall outside of the histogram.
+    """
+    return <long>floor((energy - energy_min) / bin_width)
+
+
+cdef double compute_window_distance(double energy, double energy_min,
+                                    double energy_max):
+    """Compute how far an energy lies outside of an energy window.
+
+    :param energy: Total energy of a state.
+    :param energy_min: Lower edge of the energy window.
+    :param energy_max: Upper edge of the energy window.
+    :return: Distance to the nearest window edge, or zero inside the window.
+    """
+    if energy < energy_min:
+        return energy_min - energy
+
+    if energy >= energy_max:
+        return energy - energy_max
+
+    return 0.0
+
+
+cdef bint accept_or_reject(double log_density_of_states_difference,
+                           SimulationHeisenbergData_t data):
+    """Accept or reject trial flip using the Wang–Landau acceptance rule.
+
+    :param log_density_of_states_difference: Log density of states of the current
+        energy minus the log density of states of the trial energy.
+    :param data: Data container for the simulation.
+    :return: Boolean specifying if trial flip was accepted or not.
+    """
+    cdef bint accept = True
+
+    if log_density_of_states_difference < 0:
+        accept = (
+            data.random_number_generator.uniform() <=
+            exp(log_density_of_states_difference)
+        )
+
+    return accept
+
+
+cpdef bint enter_energy_window(SimulationHeisenbergData_t data, double energy_min,
+                               double energy_max, long max_sweeps):
+    """Move the state into an energy window by rejecting flips that move away from it.
+
+    :param data: Data container for the simulation. The energy estimator must hold the
+        total energy of the state.
+    :param energy_min: Lower edge of the energy window.
+    :param energy_max: Upper edge of the energy window.
+    :param max_sweeps: Maximum number of sweeps to attempt.
+    :return: Boolean specifying if the state ended up inside of the window.
+    """
+    cdef long _
+    cdef long sweep_index
+    cdef long site_index
+    cdef TrialFlip_t trial_flip
+    cdef double current_distance
+    cdef double trial_distance
+
+    cdef long number_sites = data.lookup_tables.number_sites
+
+    for sweep_index in range(max_sweeps):
+        if compute_window_distance(
+            data.estimators.energy[0], energy_min, energy_max
+        ) == 0.0:
+            return True
+
+        for _ in range(number_sites):
+            site_index = pick_site(data=data)
+            trial_flip = flip(site_index=site_index, data=data)
+            current_distance = compute_window_distance(
+                data.estimators.energy[0], energy_min, energy_max
+            )
+            trial_distance = compute_window_distance(
+                data.estimators.energy[0] + trial_flip.energy_difference,
+                energy_min,
+                energy_max,
+            )
+
+            if trial_distance <= current_distance:
+                keep_flip_and_update_state(
+                    data=data,
+                    site_index=site_index,
+                    trial_flip=trial_flip,
+                )
+
+    return compute_window_distance(
+        data.estimators.energy[0], energy_min, energy_max
+    ) == 0.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef void run_sweeps(SimulationHeisenbergData_t data,
+                      double[:] log_density_of_states, long[:] histogram,
+                      double energy_min, double bin_width,
+                      double log_modification_factor, long sweeps):
+    """Run Wang–Landau sweeps inside of an energy window.
+
+    Trial flips that leave the window are rejected. After every step, the log density
+    of states and the histogram of the current energy bin are updated.
+
+    :param data: Data container for the simulation. The state must already lie inside
+        of the energy window.
+    :param log_density_of_states: Running estimate of the log density of states for
+        each bin of the window.
+    :param histogram: Visit counts for each bin of the window.
+    :param energy_min: Lower edge of the energy window.
+    :param bin_width: Width of the energy bins.
+    :param log_modification_factor: Amount added to the log density of states of the
+        current bin after every step.
+    :param sweeps: Number of sweeps to run.
+    """
+    cdef long _
+    cdef long sweep_index
+    cdef long site_index
+    cdef long trial_bin
+    cdef TrialFlip_t trial_flip
+
+    cdef long number_sites = data.lookup_tables.number_sites
+    cdef long number_bins = log_density_of_states.shape[0]
+    cdef long current_bin = find_energy_bin(
+        data.estimators.energy[0], energy_min, bin_width
+    )
+
+    for sweep_index in range(sweeps):
+        for _ in range(number_sites):
+            site_index = pick_site(data=data)
+            trial_flip = flip(site_index=site_index, data=data)
+            trial_bin = find_energy_bin(
+                data.estimators.energy[0] + trial_flip.energy_difference,
+                energy_min,
+                bin_width,
+            )
+
+            if 0 <= trial_bin < number_bins and accept_or_reject(
+                log_density_of_states[current_bin] - log_density_of_states[trial_bin],
+                data,
+            ):
+                keep_flip_and_update_state(
+                    data=data,
+                    site_index=site_index,
+                    trial_flip=trial_flip,
+                )
+                current_bin = trial_bin
+
+            log_density_of_states[current_bin] += log_modification_factor
+            histogram[current_bin] += 1
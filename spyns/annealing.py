@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+from spyns.data import (
+    AnnealingParameters,
+    AnnealingResult,
+    HeisenbergState,
+    LookupTables,
+    SimulationData,
+    SimulationParameters,
+)
+import spyns
+import spyns.algorithms.metropolis.heisenberg_cython
+import spyns.model.heisenberg
+import spyns.model.heisenberg_cython
+from spyns.data_cython import SimulationHeisenbergData_t
+from spyns.random_numbers.distribution import RandomNumberGenerator
+
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+
+
+def simulation(
+    lattice: Union["Lattice", LookupTables], parameters: AnnealingParameters
+) -> AnnealingResult:
+    """Search for the ground state of the Heisenberg model with simulated annealing.
+
+    A single random state is carried through every stage of the temperature schedule,
+    and the whole schedule runs inside of the compiled sweep loop. The
+    lowest-energy state seen along the way is kept. If ``quench_sweeps`` is positive,
+    that state is then relaxed further with zero-temperature sweeps.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation.
+    :param parameters: Parameters to use for the annealing run.
+    :return: Temperature and final energy of each stage, along with the lowest-energy
+        state found and its energy. A quench is recorded as a final stage at zero
+        temperature.
+    """
+    temperatures: np.ndarray = make_temperature_schedule(parameters=parameters)
+
+    np.random.seed(parameters.seed)
+
+    heisenberg_state: HeisenbergState = spyns.model.heisenberg.sample_random_state(
+        lattice.number_sites
+    )
+    data_object: SimulationData = spyns.data.setup_containers(
+        parameters=SimulationParameters(
+            seed=parameters.seed,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=0,
+            equilibration_sweeps=0,
+            sample_interval=1,
+            temperature=temperatures[0],
+        ),
+        state=heisenberg_state,
+        lattice=lattice,
+    )
+    data: SimulationHeisenbergData_t = SimulationHeisenbergData_t(
+        data=data_object,
+        random_number_generator=RandomNumberGenerator(
+            seed=parameters.seed, number_sites=lattice.number_sites
+        ),
+    )
+
+    spyns.model.heisenberg_cython.save_full_state(data)
+
+    best_state: HeisenbergState = HeisenbergState(
+        x=np.copy(data_object.state.x),
+        y=np.copy(data_object.state.y),
+        z=np.copy(data_object.state.z),
+    )
+    stage_energies: np.ndarray = np.zeros(shape=len(temperatures), dtype=np.float)
+    best_energy: float = spyns.algorithms.metropolis.heisenberg_cython.run_annealing(
+        data=data,
+        temperatures=temperatures,
+        sweeps_per_stage=parameters.sweeps_per_stage,
+        stage_energies=stage_energies,
+        best_x=best_state.x,
+        best_y=best_state.y,
+        best_z=best_state.z,
+        best_energy=data_object.estimators.energy[0],
+    )
+
+    if parameters.quench_sweeps > 0:
+        data_object.state.x[:] = best_state.x
+        data_object.state.y[:] = best_state.y
+        data_object.state.z[:] = best_state.z
+        spyns.model.heisenberg_cython.save_full_state(data)
+
+        quench_temperatures: np.ndarray = np.zeros(shape=1, dtype=np.float)
+        quench_energies: np.ndarray = np.zeros(shape=1, dtype=np.float)
+        best_energy = spyns.algorithms.metropolis.heisenberg_cython.run_annealing(
+            data=data,
+            temperatures=quench_temperatures,
+            sweeps_per_stage=parameters.quench_sweeps,
+            stage_energies=quench_energies,
+            best_x=best_state.x,
+            best_y=best_state.y,
+            best_z=best_state.z,
+            best_energy=best_energy,
+        )
+        temperatures = np.concatenate((temperatures, quench_temperatures))
+        stage_energies = np.concatenate((stage_energies, quench_energies))
+
+    return AnnealingResult(
+        temperatures=temperatures,
+        stage_energies=stage_energies,
+        best_energy=best_energy,
+        best_state=best_state,
+    )
+
+
+def make_temperature_schedule(parameters: AnnealingParameters) -> np.ndarray:
+    """Build the temperature of each annealing stage.
+
+    :param parameters: Parameters to use for the annealing run. The ``schedule`` field
+        is ``"linear"``, ``"geometric"``, or ``"custom"``. A custom schedule is read
+        from the ``temperatures`` field, and the other schedules interpolate between
+        ``temperature_initial`` and ``temperature_final`` in ``number_stages`` steps.
+    :return: Array of stage temperatures.
+    :raises ValueError: An error will be raised if the schedule is unknown or contains
+        a non-positive temperature.
+    """
+    if parameters.schedule == "linear":
+        temperatures: np.ndarray = np.linspace(
+            parameters.temperature_initial,
+            parameters.temperature_final,
+            parameters.number_stages,
+        )
+
+    elif parameters.schedule == "geometric":
+        temperatures = np.geomspace(
+            parameters.temperature_initial,
+            parameters.temperature_final,
+            parameters.number_stages,
+        )
+
+    elif parameters.schedule == "custom":
+        temperatures = np.array(parameters.temperatures, dtype=np.float)
+
+    else:
+        raise ValueError(
+            f"Unknown annealing schedule {parameters.schedule}. Use linear, "
+            "geometric, or custom."
+        )
+
+    if len(temperatures) == 0 or np.any(temperatures <= 0):
+        raise ValueError(
+            "Annealing schedules must contain at least one stage and only positive "
+            "temperatures. Use quench_sweeps for a zero-temperature stage."
+        )
+
+    return temperatures
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import functools
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from spyns.data import (
+    BatchParameters,
+    LookupTables,
+    ProgressParameters,
+    SharedLookupTables,
+    SimulationData,
+    SimulationParameters,
+    StructureFile,
+    StructureParameters,
+)
+import spyns.run
+import spyns.shared
+
+BatchPoint = Tuple[float, int]
+
+RESULT_COLUMNS: List[str] = [
+    "temperature",
+    "seed",
+    "energy",
+    "magnetization",
+    "heat_capacity",
+    "susceptibility",
+    "binder_parameter",
+]
+SIMULATION_SETTINGS: Set[str] = {"sweeps", "equilibration_sweeps", "sample_interval"}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``spyns-batch`` command-line interface.
+
+    :param argv: Command-line arguments. Defaults to ``sys.argv[1:]``.
+    :return: Exit status, nonzero if any grid point failed on every attempt.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="spyns-batch",
+        description=(
+            "Run a grid of Heisenberg model simulations over temperatures and seeds "
+            "using a process pool."
+        ),
+    )
+    parser.add_argument("job_spec", help="Path to the JSON job spec file.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="results.csv",
+        help="Consolidated results file. Points already in it are skipped.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Number of times to try each grid point (default: 3).",
+    )
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    failures: List[Tuple[BatchPoint, str]] = run_batch(
+        parameters=read_job_spec(filepath=args.job_spec),
+        results_filepath=args.output,
+        workers=args.workers,
+        max_attempts=args.max_attempts,
+    )
+
+    for (temperature, seed), error in failures:
+        print(
+            f"Failed at temperature={temperature}, seed={seed}: {error}",
+            file=sys.stderr,
+        )
+
+    return 1 if failures else 0
+
+
+def read_job_spec(filepath: str) -> BatchParameters:
+    """Read a batch job spec from a JSON file.
+
+    The spec is an object with the following keys:
+
+    * ``structure``: Either ``{"from_parameters": {...}}`` with the fields of
+      ``StructureParameters`` or ``{"from_file": {"path": ...}}``.
+    * ``subspecies_labels``: Optional map of site index to subspecie label.
+    * ``scaling_factors``: Optional number of unit cells along each lattice vector.
+    * ``r``: Cutoff radius for finding neighbors in sphere.
+    * ``interactions``: List of objects with the ``subspecies_i``,
+      ``subspecies_j``, ``subspecies_ij_distance_rank``, and ``J_ij`` fields.
+    * ``simulation``: ``sweeps``, ``equilibration_sweeps``, and optionally
+      ``sample_interval``.
+    * ``temperatures``: List of temperatures, or ``{"start", "stop", "num"}`` for
+      evenly spaced temperatures.
+    * ``seeds``: List of random number generator seeds.
+    * ``cache_directory``: Optional lookup table cache directory, see
+      ``spyns.lattice.cache``.
+
+    :param filepath: Path to the job spec file.
+    :return: Parameters of the batch job.
+    :raises ValueError: An error will be raised if the spec is malformed.
+    """
+    with open(filepath, "r") as spec_file:
+        return parse_job_spec(spec=json.load(spec_file))
+
+
+def parse_job_spec(spec: Dict[str, Any]) -> BatchParameters:
+    """Parse a batch job spec, see ``read_job_spec``.
+
+    :param spec: Decoded JSON job spec.
+    :return: Parameters of the batch job.
+    :raises ValueError: An error will be raised if the spec is malformed.
+    """
+    structure_spec: Dict[str, Dict[str, Any]] = spec["structure"]
+
+    if set(structure_spec) == {"from_parameters"}:
+        structure: Any = StructureParameters(**structure_spec["from_parameters"])
+
+    elif set(structure_spec) == {"from_file"}:
+        structure = StructureFile(**structure_spec["from_file"])
+
+    else:
+        raise ValueError(
+            "The structure must be given by exactly one of from_parameters or "
+            "from_file."
+        )
+
+    simulation: Dict[str, int] = dict(sample_interval=1, **spec["simulation"])
+
+    if set(simulation) != SIMULATION_SETTINGS:
+        raise ValueError(
+            f"The simulation settings must be {sorted(SIMULATION_SETTINGS)}, got "
+            f"{sorted(simulation)}."
+        )
+
+    temperatures: Any = spec["temperatures"]
+
+    if isinstance(temperatures, dict):
+        temperatures = np.linspace(**temperatures).tolist()
+
+    scaling_factors: Optional[List[int]] = spec.get("scaling_factors")
+
+    return BatchParameters(
+        structure=structure,
+        subspecies_labels={
+            int(site): str(label)
+            for site, label in spec.get("subspecies_labels", {}).items()
+        },
+        scaling_factors=None if scaling_factors is None else tuple(scaling_factors),
+        r=float(spec["r"]),
+        interactions=spec["interactions"],
+        simulation={setting: int(value) for setting, value in simulation.items()},
+        temperatures=[float(temperature) for temperature in temperatures],
+        seeds=[int(seed) for seed in spec["seeds"]],
+        cache_directory=spec.get("cache_directory"),
+    )
+
+
+def run_batch(
+    parameters: BatchParameters, results_filepath: str, workers: int, max_attempts: int
+) -> List[Tuple[BatchPoint, str]]:
+    """Run every temperature and seed of a batch job that is not yet in the results.
+
+    The lattice is built once and its lookup tables are shared with the workers
+    through ``spyns.shared``. Each point is appended to the results file as soon as
+    it finishes, so an interrupted or partly failed job can be rerun with the same
+    results file to pick up only the missing points. Failed points are retried up to
+    ``max_attempts`` times, and the results file is sorted by temperature and seed
+    at the end.
+
+    :param parameters: Parameters of the batch job.
+    :param results_filepath: Consolidated CSV results file.
+    :param workers: Number of worker processes.
+    :param max_attempts: Number of times to try each point.
+    :return: Points that failed on every attempt, along with their last error.
+    """
+    completed: Set[BatchPoint] = read_completed_points(filepath=results_filepath)
+    pending: List[BatchPoint] = [
+        (temperature, seed)
+        for temperature in parameters.temperatures
+        for seed in parameters.seeds
+        if (temperature, seed) not in completed
+    ]
+    errors: Dict[BatchPoint, str] = {}
+
+    if pending:
+        with spyns.shared.shared_lookup_tables(
+            lattice=build_batch_lookup_tables(parameters=parameters)
+        ) as shared_lookup_tables, multiprocessing.Pool(processes=workers) as pool:
+            run_point = functools.partial(
+                run_batch_point,
+                shared_lookup_tables=shared_lookup_tables,
+                simulation=parameters.simulation,
+            )
+
+            for _ in range(max_attempts):
+                errors = {}
+
+                for point, result, error in pool.imap_unordered(run_point, pending):
+                    if error is None:
+                        append_result(filepath=results_filepath, result=result)
+
+                    else:
+                        errors[point] = error
+
+                pending = sorted(errors)
+
+                if not pending:
+                    break
+
+    sort_results(filepath=results_filepath)
+
+    return sorted(errors.items())
+
+
+def build_batch_lookup_tables(parameters: BatchParameters) -> LookupTables:
+    """Build the lookup tables of a batch job's lattice.
+
+    :param parameters: Parameters of the batch job.
+    :return: Lookup tables for the lattice, read from the cache if a cache directory
+        is set.
+    """
+    import pandas as pd
+    import pymatgen as pmg
+
+    import spyns.lattice
+
+    if isinstance(parameters.structure, StructureFile):
+        structure: pmg.Structure = spyns.lattice.generate.from_file(
+            structure_file=parameters.structure
+        )
+
+    else:
+        structure = spyns.lattice.generate.from_parameters(
+            structure_parameters=parameters.structure
+        )
+
+    structure = spyns.lattice.generate.label_subspecies(
+        structure=structure, subspecies_labels=parameters.subspecies_labels
+    )
+    interactions: pd.DataFrame = pd.DataFrame(parameters.interactions).astype(
+        {"subspecies_i": str, "subspecies_j": str}
+    )
+
+    if parameters.cache_directory is not None:
+        return spyns.lattice.cache.load_lookup_tables(
+            structure=structure,
+            r=parameters.r,
+            interactions=interactions,
+            cache_directory=parameters.cache_directory,
+            scaling_factors=parameters.scaling_factors,
+        )
+
+    return spyns.lattice.cache.build_lookup_tables(
+        structure=structure,
+        r=parameters.r,
+        interactions=interactions,
+        scaling_factors=parameters.scaling_factors,
+    )
+
+
+def run_batch_point(
+    point: BatchPoint,
+    shared_lookup_tables: SharedLookupTables,
+    simulation: Dict[str, int],
+) -> Tuple[BatchPoint, Optional[Dict[str, float]], Optional[str]]:
+    """Run the simulation of one grid point in a worker process.
+
+    :param point: Temperature and seed of the grid point.
+    :param shared_lookup_tables: Handle to the published lookup tables.
+    :param simulation: Sweep settings shared by every grid point.
+    :return: The grid point, along with its estimators on success or the error
+        message on failure.
+    """
+    try:
+        result: Dict[str, float] = simulate_point(
+            lattice=spyns.shared.attach_lookup_tables(
+                shared_lookup_tables=shared_lookup_tables
+            ),
+            point=point,
+            simulation=simulation,
+        )
+
+    except Exception as error:
+        return point, None, f"{type(error).__name__}: {error}"
+
+    return point, result, None
+
+
+def simulate_point(
+    lattice: LookupTables,
+    point: BatchPoint,
+    simulation: Dict[str, int],
+    progress_parameters: Optional[ProgressParameters] = None,
+) -> Dict[str, float]:
+    """Run the simulation of one grid point and summarize its estimators.
+
+    :param lattice: Lookup tables for the lattice.
+    :param point: Temperature and seed of the grid point.
+    :param simulation: Sweep settings shared by every grid point.
+    :param progress_parameters: Optional progress callback for the run.
+    :return: Estimators of the grid point, one entry for each of ``RESULT_COLUMNS``.
+    """
+    temperature, seed = point
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=SimulationParameters(
+            seed=seed,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            temperature=temperature,
+            **simulation,
+        ),
+        progress_parameters=progress_parameters,
+    ).container
+
+    number_sites: int = data.lookup_tables.number_sites
+    final_row: Dict[str, float] = {
+        name: data.trace_view[name][-1]
+        for name in ["<E**1>", "<M**1>", "C", "X", "Binder_M"]
+    }
+
+    return dict(
+        temperature=temperature,
+        seed=seed,
+        energy=final_row["<E**1>"] / number_sites,
+        magnetization=final_row["<M**1>"] / number_sites,
+        heat_capacity=final_row["C"],
+        susceptibility=final_row["X"],
+        binder_parameter=final_row["Binder_M"],
+    )
+
+
+def read_completed_points(filepath: str) -> Set[BatchPoint]:
+    """Read the grid points that already have results.
+
+    :param filepath: Consolidated CSV results file.
+    :return: Temperature and seed of every completed point. Empty if the file does
+        not exist.
+    """
+    if not os.path.exists(filepath):
+        return set()
+
+    with open(filepath, "r", newline="") as csvfile:
+        return {
+            (float(row["temperature"]), int(row["seed"]))
+            for row in csv.DictReader(csvfile)
+        }
+
+
+def append_result(filepath: str, result: Dict[str, float]) -> None:
+    """Append the estimators of one grid point to the results file.
+
+    :param filepath: Consolidated CSV results file. The header is written if the file
+        does not exist.
+    :param result: Estimators of the grid point.
+    """
+    write_header: bool = not os.path.exists(filepath)
+
+    with open(filepath, "a", newline="") as csvfile:
+        dictwriter = csv.DictWriter(csvfile, fieldnames=RESULT_COLUMNS)
+
+        if write_header:
+            dictwriter.writeheader()
+
+        dictwriter.writerow({column: repr(result[column]) for column in RESULT_COLUMNS})
+
+
+def sort_results(filepath: str) -> None:
+    """Sort the results file by temperature and seed, replacing it atomically.
+
+    :param filepath: Consolidated CSV results file.
+    """
+    if not os.path.exists(filepath):
+        return
+
+    with open(filepath, "r", newline="") as csvfile:
+        rows: List[Dict[str, str]] = sorted(
+            csv.DictReader(csvfile),
+            key=lambda row: (float(row["temperature"]), int(row["seed"])),
+        )
+
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        dir=os.path.dirname(os.path.abspath(filepath)),
+        suffix=".csv.tmp",
+        newline="",
+        delete=False,
+    ) as csvfile:
+        dictwriter = csv.DictWriter(csvfile, fieldnames=RESULT_COLUMNS)
+        dictwriter.writeheader()
+        dictwriter.writerows(rows)
+
+    os.replace(csvfile.name, filepath)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,14 @@
 
 import csv
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from spyns.trace import TraceView
 
 ScalingMatrix = Tuple[Tuple[int, int, int], Tuple[int, int, int], Tuple[int, int, int]]
 
@@ -48,6 +52,171 @@ class SimulationParameters(object):
     ]
 
 
+@dataclass(frozen=True)
+class AdaptiveParameters(object):
+    observables: List[str]
+    target_relative_error: float
+    check_interval: int
+    number_blocks: int
+    equilibration_tolerance: float
+    __slots__ = [
+        "observables",
+        "target_relative_error",
+        "check_interval",
+        "number_blocks",
+        "equilibration_tolerance",
+    ]
+
+
+@dataclass(frozen=True)
+class HistogramParameters(object):
+    energy_min: float
+    energy_max: float
+    energy_bins: int
+    magnetization_bins: int
+    __slots__ = ["energy_min", "energy_max", "energy_bins", "magnetization_bins"]
+
+
+@dataclass(frozen=True)
+class MetricsParameters(object):
+    log_filepath: Optional[str]
+    __slots__ = ["log_filepath"]
+
+
+@dataclass(frozen=True)
+class StructureFactorParameters(object):
+    scaling_factors: Tuple[int, int, int]
+    __slots__ = ["scaling_factors"]
+
+
+@dataclass(frozen=True)
+class ShellCorrelationParameters(object):
+    sample_interval: int
+    __slots__ = ["sample_interval"]
+
+
+@dataclass(frozen=True)
+class OrderPatternParameters(object):
+    names: List[str]
+    weights: np.ndarray
+    __slots__ = ["names", "weights"]
+
+
+@dataclass(frozen=True)
+class SnapshotParameters(object):
+    encoding: str
+    compression_level: Optional[int]
+    chunk_size: int
+    __slots__ = ["encoding", "compression_level", "chunk_size"]
+
+
+@dataclass(frozen=True)
+class ResultStoreParameters(object):
+    directory: str
+    max_bytes: Optional[int]
+    __slots__ = ["directory", "max_bytes"]
+
+
+@dataclass(frozen=True)
+class HamiltonianParameters(object):
+    magnetic_field: Optional[np.ndarray]
+    anisotropy: Optional[np.ndarray]
+    exchange_tensors: Optional[np.ndarray]
+    __slots__ = ["magnetic_field", "anisotropy", "exchange_tensors"]
+
+
+@dataclass(frozen=True)
+class ProgressParameters(object):
+    callback: Callable[["ProgressReport"], Optional[bool]]
+    sweep_interval: Optional[int]
+    time_interval: Optional[float]
+    __slots__ = ["callback", "sweep_interval", "time_interval"]
+
+
+@dataclass(frozen=True)
+class WangLandauParameters(object):
+    seed: int
+    energy_min: float
+    energy_max: float
+    energy_bins: int
+    flatness: float
+    log_modification_factor_initial: float
+    log_modification_factor_final: float
+    check_interval: int
+    max_sweeps: int
+    number_windows: int
+    window_overlap: float
+    exchange_interval: int
+    __slots__ = [
+        "seed",
+        "energy_min",
+        "energy_max",
+        "energy_bins",
+        "flatness",
+        "log_modification_factor_initial",
+        "log_modification_factor_final",
+        "check_interval",
+        "max_sweeps",
+        "number_windows",
+        "window_overlap",
+        "exchange_interval",
+    ]
+
+
+@dataclass(frozen=True)
+class AnnealingParameters(object):
+    seed: int
+    schedule: str
+    temperature_initial: float
+    temperature_final: float
+    number_stages: int
+    temperatures: Optional[List[float]]
+    sweeps_per_stage: int
+    quench_sweeps: int
+    __slots__ = [
+        "seed",
+        "schedule",
+        "temperature_initial",
+        "temperature_final",
+        "number_stages",
+        "temperatures",
+        "sweeps_per_stage",
+        "quench_sweeps",
+    ]
+
+
+@dataclass(frozen=True)
+class BatchParameters(object):
+    structure: Union[StructureParameters, StructureFile]
+    subspecies_labels: Dict[int, str]
+    scaling_factors: Optional[Tuple[int, int, int]]
+    r: float
+    interactions: List[Dict[str, Any]]
+    simulation: Dict[str, int]
+    temperatures: List[float]
+    seeds: List[int]
+    cache_directory: Optional[str]
+    __slots__ = [
+        "structure",
+        "subspecies_labels",
+        "scaling_factors",
+        "r",
+        "interactions",
+        "simulation",
+        "temperatures",
+        "seeds",
+        "cache_directory",
+    ]
+
+
+@dataclass(frozen=True)
+class DomainDecompositionParameters(object):
+    number_domains: int
+    partition: str
+    directory: Optional[str]
+    __slots__ = ["number_domains", "partition", "directory"]
+
+
 @dataclass(frozen=True)
 class LookupTables(object):
     sublattice_table: np.ndarray
@@ -56,6 +225,17 @@ class LookupTables(object):
     neighbors_count: np.ndarray
     neighbors_lookup_index: np.ndarray
     interaction_parameters_table: Optional[np.ndarray]
+    interaction_class_table: Optional[np.ndarray]
+    interaction_class_parameters: Optional[np.ndarray]
+    number_sites: int
+    number_sublattices: int
+
+
+@dataclass(frozen=True)
+class SharedLookupTables(object):
+    filepath: str
+    arrays: Dict[str, Dict[str, Any]]
+    sublattice_labels: Tuple[str, ...]
     number_sites: int
     number_sublattices: int
 
@@ -86,6 +266,192 @@ class SimulationTrace(object):
     __slots__ = ["sweep", "energy", "spin_vector", "magnetization"]
 
 
+@dataclass
+class Histograms(object):
+    energy_edges: np.ndarray
+    magnetization_edges: np.ndarray
+    energy_counts: np.ndarray
+    energy_magnetization_counts: np.ndarray
+    out_of_range: np.ndarray
+    __slots__ = [
+        "energy_edges",
+        "magnetization_edges",
+        "energy_counts",
+        "energy_magnetization_counts",
+        "out_of_range",
+    ]
+
+
+@dataclass
+class StructureFactor(object):
+    scaling_factors: Tuple[int, int, int]
+    correlations: np.ndarray
+    number_samples: np.ndarray
+    __slots__ = ["scaling_factors", "correlations", "number_samples"]
+
+
+@dataclass
+class ShellCorrelations(object):
+    sample_interval: int
+    interaction_class_parameters: np.ndarray
+    bond_counts: np.ndarray
+    correlation_sums: np.ndarray
+    number_samples: np.ndarray
+    __slots__ = [
+        "sample_interval",
+        "interaction_class_parameters",
+        "bond_counts",
+        "correlation_sums",
+        "number_samples",
+    ]
+
+
+@dataclass
+class OrderParameterTrace(object):
+    names: List[str]
+    weights: np.ndarray
+    values: np.ndarray
+    __slots__ = ["names", "weights", "values"]
+
+
+@dataclass
+class SnapshotBuffer(object):
+    encoding: str
+    compression_level: Optional[int]
+    chunk_size: int
+    sweeps: List[int]
+    encoded_states: List[np.ndarray]
+    number_chunks: int
+    __slots__ = [
+        "encoding",
+        "compression_level",
+        "chunk_size",
+        "sweeps",
+        "encoded_states",
+        "number_chunks",
+    ]
+
+
+@dataclass
+class RunMetrics(object):
+    phase_times: Dict[str, float]
+    attempted_flips: np.ndarray
+    accepted_flips: np.ndarray
+    number_samples: int
+    flips_per_second: float
+    peak_memory: Optional[int]
+    __slots__ = [
+        "phase_times",
+        "attempted_flips",
+        "accepted_flips",
+        "number_samples",
+        "flips_per_second",
+        "peak_memory",
+    ]
+
+
+@dataclass(frozen=True)
+class ProgressReport(object):
+    phase: str
+    sweep: int
+    sweeps: int
+    elapsed_time: float
+    estimators: Estimators
+    __slots__ = ["phase", "sweep", "sweeps", "elapsed_time", "estimators"]
+
+
+@dataclass
+class AdaptiveRunReport(object):
+    equilibrated: bool
+    equilibration_sweeps: int
+    production_sweeps: int
+    stop_reason: str
+    relative_errors: Dict[str, float]
+    __slots__ = [
+        "equilibrated",
+        "equilibration_sweeps",
+        "production_sweeps",
+        "stop_reason",
+        "relative_errors",
+    ]
+
+
+@dataclass
+class WangLandauResult(object):
+    energy_edges: np.ndarray
+    log_density_of_states: np.ndarray
+    visited: np.ndarray
+    sweeps: int
+    converged: bool
+    number_sites: int
+    __slots__ = [
+        "energy_edges",
+        "log_density_of_states",
+        "visited",
+        "sweeps",
+        "converged",
+        "number_sites",
+    ]
+
+
+@dataclass
+class AnnealingResult(object):
+    temperatures: np.ndarray
+    stage_energies: np.ndarray
+    best_energy: float
+    best_state: HeisenbergState
+    __slots__ = ["temperatures", "stage_energies", "best_energy", "best_state"]
+
+
+@dataclass(frozen=True)
+class SubdomainPhase(object):
+    sites: np.ndarray
+    global_sites: np.ndarray
+    rows: np.ndarray
+    neighbors: np.ndarray
+    interactions: np.ndarray
+    halo_sites: np.ndarray
+    halo_global_sites: np.ndarray
+    __slots__ = [
+        "sites",
+        "global_sites",
+        "rows",
+        "neighbors",
+        "interactions",
+        "halo_sites",
+        "halo_global_sites",
+    ]
+
+
+@dataclass
+class Subdomain(object):
+    owned_sites: np.ndarray
+    sublattices: np.ndarray
+    rows: np.ndarray
+    neighbors: np.ndarray
+    interactions: np.ndarray
+    spin_vectors: np.ndarray
+    phases: List[SubdomainPhase]
+    __slots__ = [
+        "owned_sites",
+        "sublattices",
+        "rows",
+        "neighbors",
+        "interactions",
+        "spin_vectors",
+        "phases",
+    ]
+
+
+@dataclass
+class StoredResult(object):
+    key: str
+    trace: Dict[str, np.ndarray]
+    observables: Dict[str, float]
+    hit: bool
+    __slots__ = ["key", "trace", "observables", "hit"]
+
+
 @dataclass
 class SimulationData(object):
     parameters: SimulationParameters
@@ -93,7 +459,17 @@ class SimulationData(object):
     state: Union[np.ndarray, HeisenbergState]
     trace: SimulationTrace
     estimators: Estimators
-    data_frame: Optional[pd.DataFrame]
+    data_frame: Optional["pd.DataFrame"]
+    trace_view: Optional["TraceView"]
+    adaptive_report: Optional[AdaptiveRunReport]
+    histograms: Optional[Histograms]
+    metrics: Optional[RunMetrics]
+    hamiltonian: Optional[HamiltonianParameters]
+    structure_factor: Optional[StructureFactor]
+    shell_correlations: Optional[ShellCorrelations]
+    order_parameters: Optional[OrderParameterTrace]
+    snapshots: Optional[SnapshotBuffer]
+    written_trace_filepath: Optional[str]
     __slots__ = [
         "parameters",
         "lookup_tables",
@@ -101,6 +477,16 @@ class SimulationData(object):
         "trace",
         "estimators",
         "data_frame",
+        "trace_view",
+        "adaptive_report",
+        "histograms",
+        "metrics",
+        "hamiltonian",
+        "structure_factor",
+        "shell_correlations",
+        "order_parameters",
+        "snapshots",
+        "written_trace_filepath",
     ]
 
 
@@ -108,13 +494,33 @@ def setup_containers(
     parameters: SimulationParameters,
     state: Union[np.ndarray, HeisenbergState],
     lattice: "Lattice",
+    histogram_parameters: Optional[HistogramParameters] = None,
+    metrics_parameters: Optional[MetricsParameters] = None,
+    hamiltonian_parameters: Optional[HamiltonianParameters] = None,
+    structure_factor_parameters: Optional[StructureFactorParameters] = None,
+    shell_correlation_parameters: Optional[ShellCorrelationParameters] = None,
+    order_pattern_parameters: Optional[OrderPatternParameters] = None,
+    snapshot_parameters: Optional[SnapshotParameters] = None,
 ) -> SimulationData:
     """Initialize sPyns simulation data container.
 
     :param parameters: Parameters to use for setting up and running the simulation.
     :param state: One-dimensional array of the simulation state.
     :param lattice: Neighbor and interaction tables that define the system under
-        simulation.
+        simulation. A ``LookupTables`` container can be passed in place of a
+        ``Lattice``.
+    :param histogram_parameters: Optional binning for the energy and
+        energy-magnetization histograms accumulated at sample time.
+    :param metrics_parameters: Optional settings for collecting run metrics.
+    :param hamiltonian_parameters: Optional field, anisotropy, and anisotropic
+        exchange terms added to the isotropic exchange.
+    :param structure_factor_parameters: Optional supercell shape for measuring the
+        spin structure factor at sample time.
+    :param shell_correlation_parameters: Optional settings for accumulating the spin
+        correlations of each interaction class at sample time.
+    :param order_pattern_parameters: Optional sublattice patterns whose order
+        parameters are traced at sample time.
+    :param snapshot_parameters: Optional encoding for compact state snapshots.
     :return: Data container for the simulation.
     """
     spin_components: int = 1
@@ -133,9 +539,13 @@ def setup_containers(
     )
 
     interaction_parameters_table: Optional[np.ndarray] = None
+    interaction_class_table: Optional[np.ndarray] = None
+    interaction_class_parameters: Optional[np.ndarray] = None
 
     if parameters.mode.strip().lower() in ["ising", "heisenberg", "heisenberg_cython"]:
         interaction_parameters_table = lattice.interaction_parameters_table
+        interaction_class_table = lattice.interaction_class_table
+        interaction_class_parameters = lattice.interaction_class_parameters
 
     return SimulationData(
         parameters=parameters,
@@ -146,6 +556,8 @@ def setup_containers(
             neighbors_count=lattice.neighbors_count,
             neighbors_lookup_index=lattice.neighbors_lookup_index,
             interaction_parameters_table=interaction_parameters_table,
+            interaction_class_table=interaction_class_table,
+            interaction_class_parameters=interaction_class_parameters,
             number_sites=lattice.number_sites,
             number_sublattices=lattice.number_sublattices,
         ),
@@ -163,55 +575,422 @@ def setup_containers(
             np.zeros(shape=1, dtype=np.float),
         ),
         data_frame=None,
+        trace_view=None,
+        adaptive_report=None,
+        histograms=setup_histograms(
+            histogram_parameters=histogram_parameters, number_sites=lattice.number_sites
+        ),
+        metrics=setup_metrics(
+            metrics_parameters=metrics_parameters,
+            number_sublattices=lattice.number_sublattices,
+        ),
+        hamiltonian=setup_hamiltonian(
+            hamiltonian_parameters=hamiltonian_parameters,
+            number_sublattices=lattice.number_sublattices,
+            interaction_class_parameters=interaction_class_parameters,
+        ),
+        structure_factor=setup_structure_factor(
+            structure_factor_parameters=structure_factor_parameters,
+            number_sites=lattice.number_sites,
+        ),
+        shell_correlations=setup_shell_correlations(
+            shell_correlation_parameters=shell_correlation_parameters,
+            interaction_parameters_table=interaction_parameters_table,
+            interaction_class_table=interaction_class_table,
+            interaction_class_parameters=interaction_class_parameters,
+        ),
+        order_parameters=setup_order_parameters(
+            order_pattern_parameters=order_pattern_parameters,
+            sweeps=parameters.sweeps,
+            number_sublattices=lattice.number_sublattices,
+        ),
+        snapshots=setup_snapshots(
+            snapshot_parameters=snapshot_parameters, mode=parameters.mode
+        ),
+        written_trace_filepath=None,
+    )
+
+
+def setup_hamiltonian(
+    hamiltonian_parameters: Optional[HamiltonianParameters],
+    number_sublattices: int,
+    interaction_class_parameters: Optional[np.ndarray],
+) -> Optional[HamiltonianParameters]:
+    """Check the shapes of the Hamiltonian terms and convert them to float arrays.
+
+    The site energy of a spin vector ``S`` on sublattice ``s`` gains the terms
+    ``-magnetic_field[s] . S`` and ``S . anisotropy[s] . S``, and the energy of a
+    bond from site ``i`` to neighbor ``j`` in interaction class ``c`` gains the term
+    ``S_i . exchange_tensors[c] . S_j``. The tensor of the reverse bond's class must
+    be the transpose, see ``spyns.model.heisenberg.make_dm_exchange_tensor``.
+
+    :param hamiltonian_parameters: Terms to add to the isotropic exchange. Unused
+        terms are ``None``.
+    :param number_sublattices: Number of sublattices in the lattice.
+    :param interaction_class_parameters: Interaction parameter of each interaction
+        class, or ``None`` if the lattice has no interaction classes.
+    :return: Hamiltonian terms as contiguous float arrays, or ``None`` if
+        ``hamiltonian_parameters`` is ``None``.
+    :raises ValueError: An error will be raised if a term has the wrong shape, or if
+        exchange tensors are given for a lattice without interaction classes.
+    """
+    if hamiltonian_parameters is None:
+        return None
+
+    if (
+        hamiltonian_parameters.exchange_tensors is not None
+        and interaction_class_parameters is None
+    ):
+        raise ValueError("Exchange tensors require a lattice with interaction classes.")
+
+    expected_shapes: Dict[str, Tuple[int, ...]] = {
+        "magnetic_field": (number_sublattices, 3),
+        "anisotropy": (number_sublattices, 3, 3),
+        "exchange_tensors": (
+            0
+            if interaction_class_parameters is None
+            else len(interaction_class_parameters),
+            3,
+            3,
+        ),
+    }
+    terms: Dict[str, Optional[np.ndarray]] = {}
+
+    for term, expected_shape in expected_shapes.items():
+        values: Optional[np.ndarray] = getattr(hamiltonian_parameters, term)
+
+        if values is not None:
+            values = np.ascontiguousarray(values, dtype=np.float64)
+
+            if values.shape != expected_shape:
+                raise ValueError(
+                    f"{term} must have shape {expected_shape}, got {values.shape}."
+                )
+
+        terms[term] = values
+
+    return HamiltonianParameters(**terms)
+
+
+def setup_structure_factor(
+    structure_factor_parameters: Optional[StructureFactorParameters], number_sites: int
+) -> Optional[StructureFactor]:
+    """Initialize the spin structure factor container.
+
+    The lattice must be a supercell built by ``spyns.lattice.generate.make_supercell``
+    or ``Lattice.from_unit_cell``, so that site ``u * number_cells + t`` is site ``u``
+    of the unit cell in the copy with C-ordered translation index ``t``.
+
+    :param structure_factor_parameters: Shape of the supercell.
+    :param number_sites: Number of sites in the lattice.
+    :return: Empty structure factor container, or ``None`` if
+        ``structure_factor_parameters`` is ``None``.
+    :raises ValueError: An error will be raised if the number of sites is not a
+        multiple of the number of unit cells.
+    """
+    if structure_factor_parameters is None:
+        return None
+
+    scaling_factors: Tuple[int, int, int] = tuple(
+        int(scaling_factor)
+        for scaling_factor in structure_factor_parameters.scaling_factors
+    )
+    number_cells: int = int(np.prod(scaling_factors))
+
+    if number_sites % number_cells != 0:
+        raise ValueError(
+            f"A lattice of {number_sites} sites is not a supercell with scaling "
+            f"factors {scaling_factors}."
+        )
+
+    number_unit_sites: int = number_sites // number_cells
+
+    return StructureFactor(
+        scaling_factors=scaling_factors,
+        correlations=np.zeros(
+            shape=(number_unit_sites, number_unit_sites) + scaling_factors,
+            dtype=np.complex128,
+        ),
+        number_samples=np.zeros(shape=1, dtype=np.int),
     )
 
 
+def setup_shell_correlations(
+    shell_correlation_parameters: Optional[ShellCorrelationParameters],
+    interaction_parameters_table: Optional[np.ndarray],
+    interaction_class_table: Optional[np.ndarray],
+    interaction_class_parameters: Optional[np.ndarray],
+) -> Optional[ShellCorrelations]:
+    """Initialize the shell correlation container.
+
+    Interaction classes index the rows of ``Lattice.sublattice_pairs_data_frame``, so
+    each class is one neighbor shell of one sublattice pair. Lookup tables without
+    interaction classes are grouped by their distinct interaction parameters, which
+    matches the classes used by the compiled kernels.
+
+    :param shell_correlation_parameters: Settings for the shell correlations.
+    :param interaction_parameters_table: Interaction parameter of each neighbor.
+    :param interaction_class_table: Interaction class of each neighbor, if known.
+    :param interaction_class_parameters: Interaction parameter of each class, if
+        known.
+    :return: Empty shell correlation container, or ``None`` if
+        ``shell_correlation_parameters`` is ``None``.
+    """
+    if shell_correlation_parameters is None:
+        return None
+
+    if interaction_class_table is None:
+        interaction_class_parameters, interaction_class_table = np.unique(
+            interaction_parameters_table, return_inverse=True
+        )
+
+    number_classes: int = len(interaction_class_parameters)
+
+    return ShellCorrelations(
+        sample_interval=shell_correlation_parameters.sample_interval,
+        interaction_class_parameters=np.asarray(
+            interaction_class_parameters, dtype=np.float64
+        ),
+        bond_counts=np.bincount(interaction_class_table, minlength=number_classes),
+        correlation_sums=np.zeros(shape=number_classes, dtype=np.float64),
+        number_samples=np.zeros(shape=1, dtype=np.int),
+    )
+
+
+def setup_order_parameters(
+    order_pattern_parameters: Optional[OrderPatternParameters],
+    sweeps: int,
+    number_sublattices: int,
+) -> Optional[OrderParameterTrace]:
+    """Initialize the order parameter trace.
+
+    :param order_pattern_parameters: Names of the patterns and their
+        ``(patterns, sublattices)`` weight matrix, see
+        ``spyns.statistics.make_pattern_weights``.
+    :param sweeps: Number of production sweeps.
+    :param number_sublattices: Number of sublattices in the lattice.
+    :return: Empty order parameter trace, or ``None`` if
+        ``order_pattern_parameters`` is ``None``.
+    :raises ValueError: An error will be raised if the weight matrix does not have
+        one row per pattern name and one column per sublattice.
+    """
+    if order_pattern_parameters is None:
+        return None
+
+    weights: np.ndarray = np.ascontiguousarray(
+        order_pattern_parameters.weights, dtype=np.float64
+    )
+    names: List[str] = list(order_pattern_parameters.names)
+
+    if weights.shape != (len(names), number_sublattices):
+        raise ValueError(
+            f"weights must have shape {(len(names), number_sublattices)}, got "
+            f"{weights.shape}."
+        )
+
+    return OrderParameterTrace(
+        names=names,
+        weights=weights,
+        values=np.zeros(shape=(sweeps, len(names)), dtype=np.float64),
+    )
+
+
+def setup_snapshots(
+    snapshot_parameters: Optional[SnapshotParameters], mode: str
+) -> Optional[SnapshotBuffer]:
+    """Initialize the buffer of encoded state snapshots.
+
+    :param snapshot_parameters: Encoding, optional ``zlib`` compression level, and
+        number of snapshots per chunk, see ``spyns.snapshots``.
+    :param mode: Simulation mode.
+    :return: Empty snapshot buffer, or ``None`` if ``snapshot_parameters`` is
+        ``None``.
+    :raises ValueError: An error will be raised if the encoding does not suit the
+        simulation mode or the chunk size is not positive.
+    """
+    if snapshot_parameters is None:
+        return None
+
+    import spyns.snapshots
+
+    spyns.snapshots.check_encoding(
+        encoding=snapshot_parameters.encoding,
+        encodings=(
+            spyns.snapshots.HEISENBERG_ENCODINGS
+            if mode.strip().lower() in ["heisenberg", "heisenberg_cython"]
+            else spyns.snapshots.ISING_ENCODINGS
+        ),
+    )
+
+    if snapshot_parameters.chunk_size < 1:
+        raise ValueError(
+            f"chunk_size must be positive, got {snapshot_parameters.chunk_size}."
+        )
+
+    return SnapshotBuffer(
+        encoding=snapshot_parameters.encoding,
+        compression_level=snapshot_parameters.compression_level,
+        chunk_size=snapshot_parameters.chunk_size,
+        sweeps=[],
+        encoded_states=[],
+        number_chunks=0,
+    )
+
+
+def setup_histograms(
+    histogram_parameters: Optional[HistogramParameters], number_sites: int
+) -> Optional[Histograms]:
+    """Initialize the energy and energy-magnetization histogram containers.
+
+    The bounds in ``histogram_parameters`` are given per site, while the stored bin
+    edges are in units of the total energy and total magnetization, matching the
+    ``E`` and ``M`` estimators.
+
+    :param histogram_parameters: Binning for the histograms. Set
+        ``magnetization_bins`` to zero to only accumulate the energy histogram.
+    :param number_sites: Number of sites in the lattice.
+    :return: Empty histogram container, or ``None`` if ``histogram_parameters`` is
+        ``None``.
+    """
+    if histogram_parameters is None:
+        return None
+
+    energy_edges: np.ndarray = number_sites * np.linspace(
+        start=histogram_parameters.energy_min,
+        stop=histogram_parameters.energy_max,
+        num=histogram_parameters.energy_bins + 1,
+    )
+    magnetization_edges: np.ndarray = np.linspace(
+        start=0, stop=number_sites, num=histogram_parameters.magnetization_bins + 1
+    )
+
+    return Histograms(
+        energy_edges=energy_edges,
+        magnetization_edges=magnetization_edges,
+        energy_counts=np.zeros(shape=histogram_parameters.energy_bins, dtype=np.int),
+        energy_magnetization_counts=np.zeros(
+            shape=(
+                histogram_parameters.energy_bins,
+                histogram_parameters.magnetization_bins,
+            ),
+            dtype=np.int,
+        ),
+        out_of_range=np.zeros(shape=1, dtype=np.int),
+    )
+
+
+def setup_metrics(
+    metrics_parameters: Optional[MetricsParameters], number_sublattices: int
+) -> Optional[RunMetrics]:
+    """Initialize the run metrics container.
+
+    :param metrics_parameters: Settings for collecting run metrics.
+    :param number_sublattices: Number of sublattices in the lattice.
+    :return: Empty run metrics container, or ``None`` if ``metrics_parameters`` is
+        ``None``.
+    """
+    if metrics_parameters is None:
+        return None
+
+    return RunMetrics(
+        phase_times={},
+        attempted_flips=np.zeros(shape=number_sublattices, dtype=np.int64),
+        accepted_flips=np.zeros(shape=number_sublattices, dtype=np.int64),
+        number_samples=0,
+        flips_per_second=0.0,
+        peak_memory=None,
+    )
+
+
+def make_trace_view(data: SimulationData) -> "TraceView":
+    """Make a lazy view of the trace history and store in simulation data container.
+
+    :param data: Data container for the simulation.
+    :return: Trace view of the simulation.
+    """
+    from spyns.trace import TraceView
+
+    data.trace_view = TraceView(data=data)
+
+    return data.trace_view
+
+
 def make_trace_data_frame(data: SimulationData) -> None:
     """Make data frame of the trace history and store in simulation data container.
 
+    Every raw and derived column of the trace view is included, so prefer indexing
+    ``data.trace_view`` directly when only a few columns are needed.
+
     :param data: Data container for the simulation.
     """
-    trace: Dict[str, np.ndarray] = {
-        "sweep": data.trace.sweep,
-        "E": data.trace.energy,
-        "M": data.trace.magnetization,
-    }
+    if data.trace_view is None:
+        make_trace_view(data=data)
 
-    if data.parameters.mode.strip().lower() in ["ising", "voter"]:
-        for sublattice in range(data.lookup_tables.number_sublattices):
-            trace[f"S{sublattice}"] = data.trace.spin_vector[:, sublattice, 0]
-
-    elif data.parameters.mode.strip().lower() == "heisenberg":
-        for sublattice in range(data.lookup_tables.number_sublattices):
-            trace[f"S{sublattice}x"] = data.trace.spin_vector[:, sublattice, 0]
-            trace[f"S{sublattice}y"] = data.trace.spin_vector[:, sublattice, 1]
-            trace[f"S{sublattice}z"] = data.trace.spin_vector[:, sublattice, 2]
-            trace[f"theta{sublattice}"] = np.arctan(
-                (trace[f"S{sublattice}x"] ** 2 + trace[f"S{sublattice}y"] ** 2)
-                / trace[f"S{sublattice}z"]
-            )
-            trace[f"phi{sublattice}"] = np.arctan(
-                trace[f"S{sublattice}y"] / trace[f"S{sublattice}x"]
-            )
-
-    data.data_frame = pd.DataFrame(trace)
-
-
-def write_trace_history_to_disk(data: SimulationData) -> None:
+    data.data_frame = data.trace_view.to_data_frame()
+
+
+def truncate_trace(data: SimulationData, sweeps: int) -> None:
+    """Discard the trace entries of sweeps that were never run.
+
+    :param data: Data container for the simulation.
+    :param sweeps: Number of production sweeps to keep in the trace.
+    """
+    data.trace = SimulationTrace(
+        sweep=data.trace.sweep[:sweeps],
+        energy=data.trace.energy[:sweeps],
+        spin_vector=data.trace.spin_vector[:sweeps],
+        magnetization=data.trace.magnetization[:sweeps],
+    )
+
+    if data.order_parameters is not None:
+        data.order_parameters.values = data.order_parameters.values[:sweeps]
+
+    data.trace_view = None
+
+
+def write_trace_history_to_disk(
+    data: SimulationData, trace_format: Optional[str] = None
+) -> None:
     """Save simulation history to disk.
 
+    The path of the file that was written is stored in the ``written_trace_filepath``
+    field of the data container. It differs from ``trace_filepath`` when a
+    ``feather`` or ``parquet`` trace falls back to ``npz`` because ``pyarrow`` is not
+    installed, see ``spyns.trace.write_trace``.
+
     :param data: Data container for the simulation.
+    :param trace_format: One of ``csv``, ``feather``, ``npz``, or ``parquet``. If not
+        provided, the format is taken from the extension of the trace file path.
     """
     if data.parameters.trace_filepath:
-        data.data_frame.to_csv(path_or_buf=data.parameters.trace_filepath, index=False)
+        import spyns.trace
+
+        if data.trace_view is None:
+            make_trace_view(data=data)
+
+        data.written_trace_filepath = spyns.trace.write_trace(
+            trace_view=data.trace_view,
+            filepath=data.parameters.trace_filepath,
+            trace_format=trace_format,
+        )
 
 
 def dump_state_snapshot_to_disk(data: SimulationData, sweep_index: int) -> None:
     """Save snapshot of simulation state to disk.
 
+    Snapshots are appended as CSV rows unless snapshot encoding is set up, in which
+    case they are buffered and written in binary chunks, see ``spyns.snapshots``.
+
     :param data: Data container for the simulation.
     :param sweep_index: Sweep index for the simulation.
     """
+    if data.snapshots is not None:
+        import spyns.snapshots
+
+        spyns.snapshots.add_snapshot(data=data, sweep_index=sweep_index)
+
+        return
+
     components: Optional[List[str]] = []
     snapshot: List[Union[int, float]] = [sweep_index]
 
@@ -219,7 +998,7 @@ def dump_state_snapshot_to_disk(data: SimulationData, sweep_index: int) -> None:
         components.extend([""])
         snapshot += data.state.tolist()
 
-    elif data.parameters.mode.strip().lower() == "heisenberg":
+    elif data.parameters.mode.strip().lower() in ["heisenberg", "heisenberg_cython"]:
         components.extend(["x", "y", "z"])
         snapshot += (
             data.state.x.tolist() + data.state.y.tolist() + data.state.z.tolist()
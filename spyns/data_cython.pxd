@@ -8,11 +8,12 @@ cdef class SimulationParameters_t:
 
 
 cdef class LookupTables_t:
-    cdef long[:] sublattice_table
-    cdef long[:] neighbors_table
-    cdef long[:] neighbors_count
-    cdef long[:] neighbors_lookup_index
-    cdef double[:] interaction_parameters_table
+    cdef const short[:] sublattice_table
+    cdef const int[:] neighbors_table
+    cdef const int[:] neighbors_count
+    cdef const long[:] neighbors_lookup_index
+    cdef const short[:] interaction_class_table
+    cdef const double[:] interaction_class_parameters
     cdef long number_sites
     cdef long number_sublattices
 
@@ -37,6 +38,56 @@ cdef class SimulationTrace_t:
     cdef double[:] magnetization
 
 
+cdef class Histograms_t:
+    cdef bint enabled
+    cdef double energy_min
+    cdef double energy_width
+    cdef long energy_bins
+    cdef double magnetization_width
+    cdef long magnetization_bins
+    cdef long[:] energy_counts
+    cdef long[:, :] energy_magnetization_counts
+    cdef long[:] out_of_range
+
+
+cdef class Metrics_t:
+    cdef bint enabled
+    cdef long[:] attempted_flips
+    cdef long[:] accepted_flips
+
+
+cdef class ShellCorrelations_t:
+    cdef bint enabled
+    cdef long sample_interval
+    cdef double[:] correlation_sums
+    cdef long[:] number_samples
+
+
+cdef class OrderParameters_t:
+    cdef bint enabled
+    cdef const double[:, :] weights
+    cdef double[:, :] values
+
+
+cdef class Hamiltonian_t:
+    cdef bint field_enabled
+    cdef bint anisotropy_enabled
+    cdef bint exchange_enabled
+    cdef const double[:, :] magnetic_field
+    cdef const double[:, :, :] anisotropy
+    cdef const double[:, :, :] exchange_tensors
+
+
+cdef class Progress_t:
+    cdef bint enabled
+    cdef object callback
+    cdef long sweep_interval
+    cdef double time_interval
+    cdef double start_time
+    cdef double last_time
+    cdef bint stop_requested
+
+
 cdef class SimulationHeisenbergData_t:
     cdef RandomNumberGenerator random_number_generator
     cdef SimulationParameters_t parameters
@@ -44,4 +95,10 @@ cdef class SimulationHeisenbergData_t:
     cdef HeisenbergState_t state
     cdef SimulationTrace_t trace
     cdef Estimators_t estimators
+    cdef Histograms_t histograms
+    cdef Metrics_t metrics
+    cdef Progress_t progress
+    cdef Hamiltonian_t hamiltonian
+    cdef ShellCorrelations_t shell_correlations
+    cdef OrderParameters_t order_parameters
     cdef object _data
@@ -1,3 +1,7 @@
+import time
+
+import numpy as np
+
 from spyns.random_numbers.distribution cimport RandomNumberGenerator
 
 
@@ -13,6 +17,12 @@ cdef class SimulationHeisenbergData_t:
         self.state = HeisenbergState_t()
         self.trace = SimulationTrace_t()
         self.estimators = Estimators_t()
+        self.histograms = Histograms_t()
+        self.metrics = Metrics_t()
+        self.progress = Progress_t()
+        self.hamiltonian = Hamiltonian_t()
+        self.shell_correlations = ShellCorrelations_t()
+        self.order_parameters = OrderParameters_t()
 
         self._data = data
 
@@ -25,11 +35,36 @@ cdef class SimulationHeisenbergData_t:
 
         self.lookup_tables.number_sites = self._data.lookup_tables.number_sites
         self.lookup_tables.number_sublattices = self._data.lookup_tables.number_sublattices
-        self.lookup_tables.sublattice_table = self._data.lookup_tables.sublattice_table
-        self.lookup_tables.neighbors_table = self._data.lookup_tables.neighbors_table
-        self.lookup_tables.neighbors_count = self._data.lookup_tables.neighbors_count
-        self.lookup_tables.neighbors_lookup_index = self._data.lookup_tables.neighbors_lookup_index
-        self.lookup_tables.interaction_parameters_table = self._data.lookup_tables.interaction_parameters_table
+        self.lookup_tables.sublattice_table = np.asarray(
+            self._data.lookup_tables.sublattice_table
+        ).astype(np.int16, copy=False)
+        self.lookup_tables.neighbors_table = np.asarray(
+            self._data.lookup_tables.neighbors_table
+        ).astype(np.int32, copy=False)
+        self.lookup_tables.neighbors_count = np.asarray(
+            self._data.lookup_tables.neighbors_count
+        ).astype(np.int32, copy=False)
+        self.lookup_tables.neighbors_lookup_index = np.asarray(
+            self._data.lookup_tables.neighbors_lookup_index
+        ).astype(np.int64, copy=False)
+
+        if self._data.lookup_tables.interaction_class_table is not None:
+            self.lookup_tables.interaction_class_table = np.asarray(
+                self._data.lookup_tables.interaction_class_table
+            ).astype(np.int16, copy=False)
+            self.lookup_tables.interaction_class_parameters = np.asarray(
+                self._data.lookup_tables.interaction_class_parameters
+            ).astype(np.float64, copy=False)
+
+        else:
+            interaction_class_parameters, interaction_class_table = np.unique(
+                self._data.lookup_tables.interaction_parameters_table,
+                return_inverse=True,
+            )
+            self.lookup_tables.interaction_class_table = \
+                interaction_class_table.astype(np.int16)
+            self.lookup_tables.interaction_class_parameters = \
+                interaction_class_parameters.astype(np.float64)
 
         self.state.x = self._data.state.x
         self.state.y = self._data.state.y
@@ -45,6 +80,96 @@ cdef class SimulationHeisenbergData_t:
         self.estimators.spin_vector = self._data.estimators.spin_vector
         self.estimators.magnetization = self._data.estimators.magnetization
 
+        self.histograms.enabled = self._data.histograms is not None
+
+        if self.histograms.enabled:
+            self.histograms.energy_bins = len(self._data.histograms.energy_counts)
+            self.histograms.energy_min = self._data.histograms.energy_edges[0]
+            self.histograms.energy_width = (
+                self._data.histograms.energy_edges[1] -
+                self._data.histograms.energy_edges[0]
+            )
+            self.histograms.magnetization_bins = \
+                self._data.histograms.energy_magnetization_counts.shape[1]
+            self.histograms.magnetization_width = (
+                self._data.histograms.magnetization_edges[-1] /
+                max(self.histograms.magnetization_bins, 1)
+            )
+            self.histograms.energy_counts = self._data.histograms.energy_counts
+            self.histograms.energy_magnetization_counts = \
+                self._data.histograms.energy_magnetization_counts
+            self.histograms.out_of_range = self._data.histograms.out_of_range
+
+        self.metrics.enabled = self._data.metrics is not None
+
+        if self.metrics.enabled:
+            self.metrics.attempted_flips = self._data.metrics.attempted_flips
+            self.metrics.accepted_flips = self._data.metrics.accepted_flips
+
+        self.shell_correlations.enabled = self._data.shell_correlations is not None
+
+        if self.shell_correlations.enabled:
+            self.shell_correlations.sample_interval = \
+                self._data.shell_correlations.sample_interval
+            self.shell_correlations.correlation_sums = \
+                self._data.shell_correlations.correlation_sums
+            self.shell_correlations.number_samples = \
+                self._data.shell_correlations.number_samples
+
+        self.order_parameters.enabled = self._data.order_parameters is not None
+
+        if self.order_parameters.enabled:
+            self.order_parameters.weights = self._data.order_parameters.weights
+            self.order_parameters.values = self._data.order_parameters.values
+
+        if self._data.hamiltonian is not None:
+            self.hamiltonian.field_enabled = \
+                self._data.hamiltonian.magnetic_field is not None
+            self.hamiltonian.anisotropy_enabled = \
+                self._data.hamiltonian.anisotropy is not None
+            self.hamiltonian.exchange_enabled = \
+                self._data.hamiltonian.exchange_tensors is not None
+
+            if self.hamiltonian.field_enabled:
+                self.hamiltonian.magnetic_field = self._data.hamiltonian.magnetic_field
+
+            if self.hamiltonian.anisotropy_enabled:
+                self.hamiltonian.anisotropy = self._data.hamiltonian.anisotropy
+
+            if self.hamiltonian.exchange_enabled:
+                self.hamiltonian.exchange_tensors = \
+                    self._data.hamiltonian.exchange_tensors
+
+    def set_progress_hook(self, object progress_parameters):
+        """Register a callback to call every few sweeps or seconds during the run.
+
+        :param progress_parameters: Callback and reporting intervals, or ``None`` to
+            remove the hook.
+        """
+        self.progress.enabled = progress_parameters is not None
+        self.progress.stop_requested = False
+        self.progress.callback = None
+        self.progress.sweep_interval = 0
+        self.progress.time_interval = 0.0
+
+        if not self.progress.enabled:
+            return
+
+        self.progress.callback = progress_parameters.callback
+
+        if progress_parameters.sweep_interval is not None:
+            self.progress.sweep_interval = progress_parameters.sweep_interval
+
+        if progress_parameters.time_interval is not None:
+            self.progress.time_interval = progress_parameters.time_interval
+
+        self.progress.start_time = time.perf_counter()
+        self.progress.last_time = self.progress.start_time
+
     @property
     def container(self):
         return self._data
+
+    @property
+    def stop_requested(self):
+        return self.progress.stop_requested
@@ -0,0 +1,711 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from spyns.data import (
+    DomainDecompositionParameters,
+    HeisenbergState,
+    LookupTables,
+    SharedLookupTables,
+    SimulationData,
+    SimulationParameters,
+    Subdomain,
+    SubdomainPhase,
+)
+import spyns.data
+import spyns.model.heisenberg
+import spyns.shared
+
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+
+PARTITIONS: List[str] = ["blocks", "graph"]
+SharedArrays = Tuple[str, Dict[str, Dict[str, Any]]]
+
+
+def simulation(
+    lattice: Union["Lattice", LookupTables],
+    parameters: SimulationParameters,
+    decomposition_parameters: DomainDecompositionParameters,
+) -> SimulationData:
+    """Run a Heisenberg model simulation with the sites split across processes.
+
+    The sites are partitioned into ``number_domains`` subdomains, see
+    ``partition_sites``, and each subdomain is swept by its own worker process. The
+    lookup tables are published once with ``spyns.shared``, and the spin vectors
+    live in a shared file that every worker maps. A worker keeps a local copy of
+    its own spins and of the halo, the neighbors of its spins that other workers
+    own.
+
+    Each sweep is split into one phase per color of ``color_sites``. No two sites
+    of a color are neighbors, so during a phase every worker tries one Metropolis
+    move at each of its sites of that color, all at once, and no spin that any of
+    them reads changes. After each phase the workers wait at a barrier and then
+    refresh the halo spins of that color from the shared file. Every site is
+    visited once per sweep, in color order instead of at random, so the Markov
+    chain differs from the one of ``spyns.run.simulation`` but has the same
+    equilibrium distribution.
+
+    At sample time each worker writes the energy and sublattice spin vector sums of
+    its subdomain, and the first worker reduces them into the trace. Only the
+    isotropic exchange is supported, and the trace matches the one of
+    ``heisenberg_cython`` runs.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation. A ``LookupTables`` container can be passed in place of a
+        ``Lattice``.
+    :param parameters: Parameters to use for setting up and running the simulation.
+    :param decomposition_parameters: Number of subdomains, partitioning method, and
+        directory for the shared files.
+    :return: Data container of results for the simulation.
+    :raises ValueError: An error will be raised if the mode is not
+        ``heisenberg_cython``, if the temperature is not set, or if the number of
+        subdomains or partitioning method is invalid.
+    :raises RuntimeError: An error will be raised if a worker process fails.
+    """
+    if parameters.mode.strip().lower() != "heisenberg_cython":
+        raise ValueError(
+            f"Domain decomposition needs the heisenberg_cython mode, got "
+            f"{parameters.mode!r}."
+        )
+
+    if parameters.temperature is None:
+        raise ValueError("Domain decomposition needs a simulation temperature.")
+
+    if not 1 <= decomposition_parameters.number_domains <= lattice.number_sites:
+        raise ValueError(
+            f"number_domains must be between 1 and the number of sites, got "
+            f"{decomposition_parameters.number_domains}."
+        )
+
+    if decomposition_parameters.partition not in PARTITIONS:
+        raise ValueError(
+            f"Unknown partition {decomposition_parameters.partition!r}, expected one "
+            f"of {PARTITIONS}."
+        )
+
+    np.random.seed(parameters.seed)
+
+    data: SimulationData = spyns.data.setup_containers(
+        parameters=parameters,
+        state=spyns.model.heisenberg.sample_random_state(lattice.number_sites),
+        lattice=lattice,
+    )
+    number_sites: int = data.lookup_tables.number_sites
+    number_sublattices: int = data.lookup_tables.number_sublattices
+    number_domains: int = decomposition_parameters.number_domains
+    trace_length: int = max(parameters.sweeps, 1)
+    shared_arrays: SharedArrays = spyns.shared.allocate_shared_arrays(
+        array_specs=dict(
+            spin_vectors=(np.float64, (number_sites, 3)),
+            partition=(np.int32, (number_sites,)),
+            colors=(np.int16, (number_sites,)),
+            partial_estimators=(
+                np.float64,
+                (number_domains, 1 + 3 * number_sublattices),
+            ),
+            energy=(np.float64, (trace_length,)),
+            spin_vector=(np.float64, (trace_length, number_sublattices, 3)),
+            magnetization=(np.float64, (trace_length,)),
+        ),
+        directory=decomposition_parameters.directory,
+    )
+
+    try:
+        arrays: Dict[str, np.ndarray] = map_shared_arrays(shared_arrays=shared_arrays)
+        arrays["spin_vectors"][:] = spyns.model.heisenberg.get_spin_vectors(data=data)
+        arrays["partition"][:] = partition_sites(
+            lookup_tables=data.lookup_tables,
+            number_domains=number_domains,
+            partition=decomposition_parameters.partition,
+            number_cells=(
+                None if isinstance(lattice, LookupTables) else lattice.number_cells
+            ),
+        )
+        arrays["colors"][:] = color_sites(
+            lookup_tables=data.lookup_tables, seed=parameters.seed
+        )
+
+        with spyns.shared.shared_lookup_tables(
+            lattice=data.lookup_tables, directory=decomposition_parameters.directory
+        ) as shared_lookup_tables:
+            run_domains(
+                shared_lookup_tables=shared_lookup_tables,
+                shared_arrays=shared_arrays,
+                parameters=parameters,
+                number_domains=number_domains,
+            )
+
+        spin_vectors: np.ndarray = np.array(arrays["spin_vectors"])
+        data.state = HeisenbergState(
+            x=np.ascontiguousarray(spin_vectors[:, 0]),
+            y=np.ascontiguousarray(spin_vectors[:, 1]),
+            z=np.ascontiguousarray(spin_vectors[:, 2]),
+        )
+        data.trace.energy[:] = arrays["energy"][: parameters.sweeps]
+        data.trace.spin_vector[:] = arrays["spin_vector"][: parameters.sweeps]
+        data.trace.magnetization[:] = arrays["magnetization"][: parameters.sweeps]
+
+    finally:
+        os.unlink(shared_arrays[0])
+
+    spyns.model.heisenberg.save_full_state(data=data)
+    data.estimators.magnetization[0] = np.linalg.norm(
+        data.estimators.spin_vector.sum(axis=0)
+    )
+    data.estimators.number_samples[0] = len(
+        range(0, parameters.sweeps, parameters.sample_interval)
+    )
+    spyns.data.make_trace_view(data=data)
+    spyns.data.write_trace_history_to_disk(data=data)
+
+    return data
+
+
+def run_domains(
+    shared_lookup_tables: SharedLookupTables,
+    shared_arrays: SharedArrays,
+    parameters: SimulationParameters,
+    number_domains: int,
+) -> None:
+    """Start one worker process per subdomain and wait for all of them to finish.
+
+    If a worker fails, the barrier is aborted so the others stop instead of waiting
+    for it forever.
+
+    :param shared_lookup_tables: Handle to the published lookup tables.
+    :param shared_arrays: Path and array manifests of the shared working arrays.
+    :param parameters: Parameters of the simulation.
+    :param number_domains: Number of subdomains.
+    :raises RuntimeError: An error will be raised if a worker process fails.
+    """
+    barrier: threading.Barrier = multiprocessing.Barrier(parties=number_domains)
+    processes: List[multiprocessing.Process] = [
+        multiprocessing.Process(
+            target=run_domain,
+            args=(
+                domain_index,
+                shared_lookup_tables,
+                shared_arrays,
+                parameters,
+                barrier,
+            ),
+        )
+        for domain_index in range(number_domains)
+    ]
+
+    for process in processes:
+        process.start()
+
+    while any(process.exitcode is None for process in processes):
+        if any(process.exitcode for process in processes):
+            barrier.abort()
+
+        for process in processes:
+            process.join(timeout=0.1)
+
+    if any(process.exitcode for process in processes):
+        raise RuntimeError(
+            "Worker processes failed with exit codes "
+            f"{[process.exitcode for process in processes]}."
+        )
+
+
+def run_domain(
+    domain_index: int,
+    shared_lookup_tables: SharedLookupTables,
+    shared_arrays: SharedArrays,
+    parameters: SimulationParameters,
+    barrier: threading.Barrier,
+) -> None:
+    """Run the equilibration and production sweeps of one subdomain.
+
+    :param domain_index: Index of the subdomain.
+    :param shared_lookup_tables: Handle to the published lookup tables.
+    :param shared_arrays: Path and array manifests of the shared working arrays.
+    :param parameters: Parameters of the simulation.
+    :param barrier: Barrier shared by the workers of every subdomain.
+    """
+    lookup_tables: LookupTables = spyns.shared.attach_lookup_tables(
+        shared_lookup_tables=shared_lookup_tables
+    )
+    arrays: Dict[str, np.ndarray] = map_shared_arrays(shared_arrays=shared_arrays)
+    subdomain: Subdomain = build_subdomain(
+        lookup_tables=lookup_tables,
+        partition=arrays["partition"],
+        colors=arrays["colors"],
+        spin_vectors=arrays["spin_vectors"],
+        domain_index=domain_index,
+    )
+    random_state: np.random.RandomState = np.random.RandomState(
+        [parameters.seed, domain_index]
+    )
+
+    for _ in range(parameters.equilibration_sweeps):
+        sweep_subdomain(
+            subdomain=subdomain,
+            spin_vectors=arrays["spin_vectors"],
+            temperature=parameters.temperature,
+            random_state=random_state,
+            barrier=barrier,
+        )
+
+    for sweep_index in range(parameters.sweeps):
+        sweep_subdomain(
+            subdomain=subdomain,
+            spin_vectors=arrays["spin_vectors"],
+            temperature=parameters.temperature,
+            random_state=random_state,
+            barrier=barrier,
+        )
+
+        if sweep_index % parameters.sample_interval != 0:
+            continue
+
+        arrays["partial_estimators"][domain_index] = compute_partial_estimators(
+            subdomain=subdomain, number_sublattices=lookup_tables.number_sublattices
+        )
+        barrier.wait()
+
+        if domain_index == 0:
+            estimators: np.ndarray = arrays["partial_estimators"].sum(axis=0)
+            spin_vector: np.ndarray = estimators[1:].reshape(-1, 3)
+            arrays["energy"][sweep_index] = estimators[0]
+            arrays["spin_vector"][sweep_index] = spin_vector
+            arrays["magnetization"][sweep_index] = np.linalg.norm(
+                spin_vector.sum(axis=0)
+            )
+
+
+def sweep_subdomain(
+    subdomain: Subdomain,
+    spin_vectors: np.ndarray,
+    temperature: float,
+    random_state: np.random.RandomState,
+    barrier: threading.Barrier,
+) -> None:
+    """Try a Metropolis move at every site of a subdomain, one color at a time.
+
+    :param subdomain: Local tables and spins of the subdomain.
+    :param spin_vectors: Shared spin vectors of every site.
+    :param temperature: Simulation temperature.
+    :param random_state: Random number generator of the subdomain.
+    :param barrier: Barrier shared by the workers of every subdomain.
+    """
+    local_spin_vectors: np.ndarray = subdomain.spin_vectors
+
+    for phase in subdomain.phases:
+        number_phase_sites: int = len(phase.sites)
+
+        if number_phase_sites:
+            local_fields: np.ndarray = compute_local_fields(
+                rows=phase.rows,
+                neighbors=phase.neighbors,
+                interactions=phase.interactions,
+                spin_vectors=local_spin_vectors,
+                number_rows=number_phase_sites,
+            )
+            trial_spin_vectors: np.ndarray = sample_spin_vectors(
+                number_sites=number_phase_sites, random_state=random_state
+            )
+            energy_differences: np.ndarray = np.sum(
+                (trial_spin_vectors - local_spin_vectors[phase.sites]) * local_fields,
+                axis=1,
+            )
+            accept: np.ndarray = accept_or_reject(
+                energy_differences=energy_differences,
+                temperature=temperature,
+                random_state=random_state,
+            )
+            local_spin_vectors[phase.sites[accept]] = trial_spin_vectors[accept]
+            spin_vectors[phase.global_sites[accept]] = trial_spin_vectors[accept]
+
+        barrier.wait()
+        local_spin_vectors[phase.halo_sites] = spin_vectors[phase.halo_global_sites]
+
+
+def accept_or_reject(
+    energy_differences: np.ndarray,
+    temperature: float,
+    random_state: np.random.RandomState,
+) -> np.ndarray:
+    """Accept or reject trial moves using the Metropolis algorithm.
+
+    At zero temperature, only trial moves that lower the energy are accepted.
+
+    :param energy_differences: Energy difference of each trial move.
+    :param temperature: Simulation temperature.
+    :param random_state: Random number generator of the subdomain.
+    :return: Boolean array of the accepted moves.
+    """
+    if temperature <= 0:
+        return energy_differences < 0
+
+    with np.errstate(over="ignore"):
+        return (energy_differences < 0) | (
+            random_state.uniform(size=len(energy_differences))
+            < np.exp(-energy_differences / temperature)
+        )
+
+
+def sample_spin_vectors(
+    number_sites: int, random_state: np.random.RandomState
+) -> np.ndarray:
+    """Sample random unit vectors.
+
+    :param number_sites: Number of vectors to sample.
+    :param random_state: Random number generator of the subdomain.
+    :return: Array of shape ``(number_sites, 3)``.
+    """
+    theta: np.ndarray = 2 * np.pi * random_state.uniform(size=number_sites)
+    cos_phi: np.ndarray = random_state.uniform(low=-1, high=1, size=number_sites)
+    sin_phi: np.ndarray = np.sqrt(1 - cos_phi ** 2)
+
+    return np.column_stack([sin_phi * np.cos(theta), sin_phi * np.sin(theta), cos_phi])
+
+
+def compute_local_fields(
+    rows: np.ndarray,
+    neighbors: np.ndarray,
+    interactions: np.ndarray,
+    spin_vectors: np.ndarray,
+    number_rows: int,
+) -> np.ndarray:
+    """Compute the interaction-weighted sum of neighbor spin vectors of some sites.
+
+    :param rows: Row of each neighbor entry.
+    :param neighbors: Local index of each neighbor entry.
+    :param interactions: Interaction parameter of each neighbor entry.
+    :param spin_vectors: Local spin vectors.
+    :param number_rows: Number of sites.
+    :return: Array of shape ``(number_rows, 3)``.
+    """
+    return np.column_stack(
+        [
+            np.bincount(
+                rows,
+                weights=interactions * spin_vectors[neighbors, axis],
+                minlength=number_rows,
+            )
+            for axis in range(3)
+        ]
+    )
+
+
+def compute_partial_estimators(
+    subdomain: Subdomain, number_sublattices: int
+) -> np.ndarray:
+    """Compute the energy and sublattice spin vector sums of a subdomain.
+
+    :param subdomain: Local tables and spins of the subdomain.
+    :param number_sublattices: Number of sublattices.
+    :return: The energy of the subdomain's sites, with each bond split evenly
+        between its two sites, followed by the flattened ``(number_sublattices, 3)``
+        spin vector sums.
+    """
+    number_owned_sites: int = len(subdomain.owned_sites)
+    owned_spin_vectors: np.ndarray = subdomain.spin_vectors[:number_owned_sites]
+    local_fields: np.ndarray = compute_local_fields(
+        rows=subdomain.rows,
+        neighbors=subdomain.neighbors,
+        interactions=subdomain.interactions,
+        spin_vectors=subdomain.spin_vectors,
+        number_rows=number_owned_sites,
+    )
+    spin_vector_sums: np.ndarray = np.column_stack(
+        [
+            np.bincount(
+                subdomain.sublattices,
+                weights=owned_spin_vectors[:, axis],
+                minlength=number_sublattices,
+            )
+            for axis in range(3)
+        ]
+    )
+
+    return np.concatenate(
+        [
+            [np.sum(owned_spin_vectors * local_fields) / 2.0],
+            spin_vector_sums.flatten(),
+        ]
+    )
+
+
+def build_subdomain(
+    lookup_tables: LookupTables,
+    partition: np.ndarray,
+    colors: np.ndarray,
+    spin_vectors: np.ndarray,
+    domain_index: int,
+) -> Subdomain:
+    """Build the local tables and spins of a subdomain.
+
+    Local indices number the owned sites first and the halo sites after them, both
+    in increasing order of their global index.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :param partition: Subdomain of each site.
+    :param colors: Color of each site.
+    :param spin_vectors: Shared spin vectors of every site.
+    :param domain_index: Index of the subdomain.
+    :return: Local tables and spins of the subdomain.
+    """
+    owned_sites: np.ndarray = np.flatnonzero(partition == domain_index)
+    rows, global_neighbors, interactions = gather_neighbors(
+        lookup_tables=lookup_tables, sites=owned_sites
+    )
+    halo_sites: np.ndarray = np.setdiff1d(global_neighbors, owned_sites)
+    local_sites: np.ndarray = np.concatenate([owned_sites, halo_sites])
+    sorter: np.ndarray = np.argsort(local_sites)
+    neighbors: np.ndarray = sorter[
+        np.searchsorted(local_sites, global_neighbors, sorter=sorter)
+    ]
+    owned_colors: np.ndarray = np.asarray(colors[owned_sites])
+    halo_colors: np.ndarray = np.asarray(colors[halo_sites])
+    number_colors: int = int(colors.max()) + 1 if len(colors) else 0
+    phase_rows: np.ndarray = np.zeros(shape=len(owned_sites), dtype=np.int64)
+    phases: List[SubdomainPhase] = []
+
+    for color in range(number_colors):
+        phase_sites: np.ndarray = np.flatnonzero(owned_colors == color)
+        entries: np.ndarray = owned_colors[rows] == color
+        phase_rows[phase_sites] = np.arange(len(phase_sites))
+        phase_halo_sites: np.ndarray = np.flatnonzero(halo_colors == color)
+        phases.append(
+            SubdomainPhase(
+                sites=phase_sites,
+                global_sites=owned_sites[phase_sites],
+                rows=phase_rows[rows[entries]],
+                neighbors=neighbors[entries],
+                interactions=interactions[entries],
+                halo_sites=len(owned_sites) + phase_halo_sites,
+                halo_global_sites=halo_sites[phase_halo_sites],
+            )
+        )
+
+    return Subdomain(
+        owned_sites=owned_sites,
+        sublattices=np.asarray(lookup_tables.sublattice_table[owned_sites]),
+        rows=rows,
+        neighbors=neighbors,
+        interactions=interactions,
+        spin_vectors=np.array(spin_vectors[local_sites]),
+        phases=phases,
+    )
+
+
+def partition_sites(
+    lookup_tables: LookupTables,
+    number_domains: int,
+    partition: str,
+    number_cells: Optional[int] = None,
+) -> np.ndarray:
+    """Split the sites of a lattice into subdomains of nearly equal size.
+
+    * ``blocks`` cuts the supercell translations into contiguous ranges. Lattices
+      built with ``Lattice.from_unit_cell`` give site ``u`` of unit cell copy ``t``
+      the index ``u * number_cells + t``, so the translation of a site is its index
+      modulo ``number_cells``. Every basis site of a unit cell goes to the same
+      subdomain, and each subdomain is a slab of unit cells.
+    * ``graph`` cuts a breadth-first ordering of ``neighbors_table`` instead, which
+      keeps subdomains compact, and their halos small, whatever the site order.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :param number_domains: Number of subdomains.
+    :param partition: Partitioning method, either ``blocks`` or ``graph``.
+    :param number_cells: Number of unit cells in the supercell, see
+        ``Lattice.number_cells``. Each site is treated as its own unit cell if not
+        provided.
+    :return: Subdomain of each site.
+    :raises ValueError: An error will be raised if the method is unknown, or if
+        ``blocks`` is asked for more subdomains than there are unit cells.
+    """
+    number_sites: int = lookup_tables.number_sites
+
+    if partition == "blocks":
+        if number_cells is None:
+            number_cells = number_sites
+
+        if number_domains > number_cells:
+            raise ValueError(
+                f"blocks needs at most one subdomain per unit cell, got "
+                f"{number_domains} subdomains for {number_cells} unit cells."
+            )
+
+        site_cells: np.ndarray = np.arange(number_sites, dtype=np.int64) % number_cells
+
+        return (site_cells * number_domains // number_cells).astype(np.int32)
+
+    if partition == "graph":
+        site_domains: np.ndarray = np.empty(shape=number_sites, dtype=np.int32)
+        site_domains[order_sites_breadth_first(lookup_tables=lookup_tables)] = (
+            np.arange(number_sites, dtype=np.int64) * number_domains // number_sites
+        )
+
+        return site_domains
+
+    raise ValueError(f"Unknown partition {partition!r}, expected one of {PARTITIONS}.")
+
+
+def order_sites_breadth_first(lookup_tables: LookupTables) -> np.ndarray:
+    """Order the sites of a lattice by a breadth-first search of its neighbors.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :return: Site indices in breadth-first order.
+    """
+    return np.concatenate(
+        [frontier for _, frontier in search_breadth_first(lookup_tables=lookup_tables)]
+    )
+
+
+def search_breadth_first(lookup_tables: LookupTables) -> List[Tuple[int, np.ndarray]]:
+    """Search the neighbors of a lattice breadth first.
+
+    Each connected component is searched in turn, starting from its lowest site
+    index.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :return: Distance from the start of its component and sites of each frontier,
+        in search order.
+    """
+    visited: np.ndarray = np.zeros(shape=lookup_tables.number_sites, dtype=np.bool_)
+    frontiers: List[Tuple[int, np.ndarray]] = []
+
+    while not visited.all():
+        frontier: np.ndarray = np.array([np.argmin(visited)])
+        visited[frontier] = True
+        level: int = 0
+
+        while len(frontier):
+            frontiers.append((level, frontier))
+            _, neighbors, _ = gather_neighbors(
+                lookup_tables=lookup_tables, sites=frontier
+            )
+            frontier = np.unique(neighbors[~visited[neighbors]])
+            visited[frontier] = True
+            level += 1
+
+    return frontiers
+
+
+def color_sites(lookup_tables: LookupTables, seed: int) -> np.ndarray:
+    """Color the sites of a lattice so that no two neighbors share a color.
+
+    Bipartite lattices, such as the square and simple cubic lattices with nearest
+    neighbor interactions, are detected with a breadth-first search and get two
+    colors, the parity of the distance of each site from the start of the search.
+    Other lattices are colored in rounds with the Jones-Plassmann algorithm. Every
+    round, the uncolored sites whose random priority beats that of all their
+    uncolored neighbors take the smallest color that none of their neighbors has.
+    This can take more colors than the lattice strictly needs, and each color adds
+    a phase to every sweep. Sites that list themselves as a neighbor are colored as
+    if they did not.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :param seed: Random number generator seed for the Jones-Plassmann priorities.
+    :return: Color of each site.
+    """
+    number_sites: int = lookup_tables.number_sites
+    rows, neighbors, _ = gather_neighbors(
+        lookup_tables=lookup_tables, sites=np.arange(number_sites)
+    )
+    distinct: np.ndarray = rows != neighbors
+    rows, neighbors = rows[distinct], neighbors[distinct]
+    parities: np.ndarray = np.empty(shape=number_sites, dtype=np.int16)
+
+    for level, frontier in search_breadth_first(lookup_tables=lookup_tables):
+        parities[frontier] = level % 2
+
+    if np.all(parities[rows] != parities[neighbors]):
+        return parities
+
+    row_starts: np.ndarray = np.searchsorted(rows, np.arange(number_sites))
+    has_neighbors: np.ndarray = np.bincount(rows, minlength=number_sites) > 0
+    priorities: np.ndarray = np.random.RandomState(seed).permutation(number_sites)
+    colors: np.ndarray = np.full(shape=number_sites, fill_value=-1, dtype=np.int64)
+
+    while (colors < 0).any():
+        uncolored: np.ndarray = colors < 0
+        highest_neighbor_priority: np.ndarray = np.full(
+            shape=number_sites, fill_value=-1, dtype=np.int64
+        )
+
+        if has_neighbors.any():
+            highest_neighbor_priority[has_neighbors] = np.maximum.reduceat(
+                np.where(uncolored[neighbors], priorities[neighbors], -1),
+                row_starts[has_neighbors],
+            )
+
+        selected: np.ndarray = uncolored & (priorities > highest_neighbor_priority)
+        colors[selected] = 0
+        entries: np.ndarray = selected[rows] & ~uncolored[neighbors]
+
+        if not entries.any():
+            continue
+
+        color_limit: int = int(colors.max()) + 2
+        keys: np.ndarray = np.unique(
+            rows[entries] * color_limit + colors[neighbors[entries]]
+        )
+        key_rows: np.ndarray = keys // color_limit
+        key_colors: np.ndarray = keys % color_limit
+        group_starts: np.ndarray = np.flatnonzero(
+            np.concatenate([[True], key_rows[1:] != key_rows[:-1]])
+        )
+        group_sizes: np.ndarray = np.diff(np.append(group_starts, len(keys)))
+        ranks: np.ndarray = np.arange(len(keys)) - np.repeat(group_starts, group_sizes)
+        colors[key_rows[group_starts]] = np.minimum(
+            np.minimum.reduceat(
+                np.where(key_colors != ranks, ranks, len(keys)), group_starts
+            ),
+            group_sizes,
+        )
+
+    return colors.astype(np.int16)
+
+
+def gather_neighbors(
+    lookup_tables: LookupTables, sites: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gather the neighbor entries of some sites.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :param sites: Sites whose neighbors are gathered.
+    :return: Position in ``sites`` of the site of each entry, followed by the
+        neighbor and interaction parameter of each entry, grouped by site in the
+        order of ``sites``.
+    """
+    counts: np.ndarray = np.asarray(
+        lookup_tables.neighbors_count[sites], dtype=np.int64
+    )
+    starts: np.ndarray = np.asarray(
+        lookup_tables.neighbors_lookup_index[sites], dtype=np.int64
+    )
+    entry_offsets: np.ndarray = np.cumsum(counts) - counts
+    entries: np.ndarray = np.repeat(starts - entry_offsets, counts) + np.arange(
+        counts.sum()
+    )
+
+    return (
+        np.repeat(np.arange(len(sites)), counts),
+        np.asarray(lookup_tables.neighbors_table[entries], dtype=np.int64),
+        np.asarray(lookup_tables.interaction_parameters_table[entries]),
+    )
+
+
+def map_shared_arrays(shared_arrays: SharedArrays) -> Dict[str, np.ndarray]:
+    """Map the shared working arrays read-write.
+
+    :param shared_arrays: Path and array manifests of the shared working arrays.
+    :return: Memory maps, keyed by array name.
+    """
+    filepath, array_manifests = shared_arrays
+
+    return spyns.shared.map_lookup_arrays(
+        filepath=filepath, array_manifests=array_manifests, mode="r+"
+    )
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
 from spyns.lattice.lattice import Lattice
+import spyns.lattice.cache
 import spyns.lattice.generate
 import spyns.lattice.neighborhood
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pymatgen as pmg
+
+from spyns.data import LookupTables
+from spyns.lattice.lattice import Lattice
+import spyns.shared
+
+CACHE_FORMAT_VERSION: int = 2
+INTERACTION_COLUMNS = ["subspecies_i", "subspecies_j", "subspecies_ij_distance_rank"]
+
+
+def load_lookup_tables(
+    structure: pmg.Structure,
+    r: float,
+    interactions: pd.DataFrame,
+    cache_directory: str,
+    scaling_factors: Optional[Tuple[int, int, int]] = None,
+    verify_checksums: bool = True,
+) -> LookupTables:
+    """Load lattice lookup tables from an on-disk cache, building them on a miss.
+
+    Cache entries are addressed by a hash of the structure's lattice, species,
+    coordinates, and subspecie labels, along with ``r``, ``scaling_factors``, and the
+    interactions. Each entry is a single binary file of the lookup arrays and a JSON
+    manifest of their offsets, shapes, and checksums. Cache hits map the binary file
+    into memory read-only instead of reading it. Entries with a missing, mismatched,
+    truncated, or corrupted file are rebuilt and overwritten.
+
+    When ``scaling_factors`` is given, ``structure`` is the unit cell and the tables
+    are built with ``Lattice.from_unit_cell``. Hashing a unit cell is much cheaper
+    than hashing a large supercell, so this is the fastest way to use the cache.
+
+    :param structure: A pymatgen ``Structure`` object.
+    :param r: Cutoff radius for finding neighbors in sphere.
+    :param interactions: Interaction coefficients, given as a data frame with the
+        ``subspecies_i``, ``subspecies_j``, ``subspecies_ij_distance_rank``, and
+        ``J_ij`` columns of ``Lattice.sublattice_pairs_data_frame`` after adding the
+        interactions.
+    :param cache_directory: Directory where cache entries are stored. It is created
+        if it does not exist.
+    :param scaling_factors: Optional number of unit cells along each lattice vector.
+    :param verify_checksums: Check the array checksums on a cache hit. Disabling
+        this skips reading the arrays, but then only truncated entries are caught.
+    :return: Lookup tables for the lattice. On a cache hit the arrays are read-only
+        memory maps.
+    """
+    key: str = compute_cache_key(
+        structure=structure,
+        r=r,
+        interactions=interactions,
+        scaling_factors=scaling_factors,
+    )
+    cache_path: Path = Path(cache_directory)
+    lookup_tables: Optional[LookupTables] = read_cache_entry(
+        cache_path=cache_path, key=key, verify_checksums=verify_checksums
+    )
+
+    if lookup_tables is not None:
+        return lookup_tables
+
+    cache_path.mkdir(parents=True, exist_ok=True)
+    write_cache_entry(
+        cache_path=cache_path,
+        key=key,
+        lookup_tables=build_lookup_tables(
+            structure=structure,
+            r=r,
+            interactions=interactions,
+            scaling_factors=scaling_factors,
+        ),
+    )
+
+    return read_cache_entry(cache_path=cache_path, key=key, verify_checksums=False)
+
+
+def build_lookup_tables(
+    structure: pmg.Structure,
+    r: float,
+    interactions: pd.DataFrame,
+    scaling_factors: Optional[Tuple[int, int, int]] = None,
+) -> LookupTables:
+    """Build lattice lookup tables without using the cache.
+
+    :param structure: A pymatgen ``Structure`` object.
+    :param r: Cutoff radius for finding neighbors in sphere.
+    :param interactions: Interaction coefficients for each sublattice pair and
+        distance rank.
+    :param scaling_factors: Optional number of unit cells along each lattice vector.
+    :return: Lookup tables for the lattice.
+    """
+    if scaling_factors is not None:
+        lattice: Lattice = Lattice.from_unit_cell(
+            structure=structure, r=r, scaling_factors=scaling_factors
+        )
+
+    else:
+        lattice = Lattice(structure=structure, r=r)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.merge(
+            interactions.loc[:, INTERACTION_COLUMNS + ["J_ij"]], on=INTERACTION_COLUMNS
+        )
+    )
+
+    return LookupTables(
+        sublattice_table=lattice.sublattice_table,
+        sublattice_labels=lattice.sublattice_labels,
+        neighbors_table=lattice.neighbors_table,
+        neighbors_count=lattice.neighbors_count,
+        neighbors_lookup_index=lattice.neighbors_lookup_index,
+        interaction_parameters_table=lattice.interaction_parameters_table,
+        interaction_class_table=lattice.interaction_class_table,
+        interaction_class_parameters=lattice.interaction_class_parameters,
+        number_sites=lattice.number_sites,
+        number_sublattices=lattice.number_sublattices,
+    )
+
+
+def compute_cache_key(
+    structure: pmg.Structure,
+    r: float,
+    interactions: pd.DataFrame,
+    scaling_factors: Optional[Tuple[int, int, int]] = None,
+) -> str:
+    """Hash everything that determines the lookup tables of a lattice.
+
+    :param structure: A pymatgen ``Structure`` object.
+    :param r: Cutoff radius for finding neighbors in sphere.
+    :param interactions: Interaction coefficients for each sublattice pair and
+        distance rank.
+    :param scaling_factors: Optional number of unit cells along each lattice vector.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    sorted_interactions: pd.DataFrame = interactions.loc[
+        :, INTERACTION_COLUMNS + ["J_ij"]
+    ].sort_values(INTERACTION_COLUMNS)
+    key_hash = hashlib.sha256()
+
+    for part in (
+        str(CACHE_FORMAT_VERSION),
+        repr(float(r)),
+        repr(None if scaling_factors is None else tuple(scaling_factors)),
+        np.ascontiguousarray(structure.lattice.matrix, dtype=np.float64).tobytes(),
+        json.dumps([str(specie) for specie in structure.species]),
+        np.ascontiguousarray(structure.frac_coords, dtype=np.float64).tobytes(),
+        json.dumps(structure.site_properties.get("subspecie")),
+        json.dumps(sorted_interactions.loc[:, INTERACTION_COLUMNS].values.tolist()),
+        sorted_interactions["J_ij"].values.astype(np.float64).tobytes(),
+    ):
+        key_hash.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        key_hash.update(b"\0")
+
+    return key_hash.hexdigest()
+
+
+def read_cache_entry(
+    cache_path: Path, key: str, verify_checksums: bool
+) -> Optional[LookupTables]:
+    """Map a cache entry into memory if it exists and is intact.
+
+    :param cache_path: Directory where cache entries are stored.
+    :param key: Cache key of the entry.
+    :param verify_checksums: Check the checksum of each array.
+    :return: Lookup tables backed by read-only memory maps, or ``None`` if the entry
+        is missing, stale, or corrupt.
+    """
+    manifest_path: Path = cache_path / f"{key}.json"
+    binary_path: Path = cache_path / f"{key}.bin"
+
+    try:
+        manifest: Dict[str, Any] = json.loads(manifest_path.read_text())
+        binary_size: int = binary_path.stat().st_size
+
+    except (OSError, ValueError):
+        return None
+
+    if (
+        manifest.get("format_version") != CACHE_FORMAT_VERSION
+        or manifest.get("key") != key
+        or manifest.get("size") != binary_size
+        or set(manifest.get("arrays", {})) != set(spyns.shared.LOOKUP_ARRAYS)
+    ):
+        return None
+
+    arrays: Dict[str, np.ndarray] = spyns.shared.map_lookup_arrays(
+        filepath=str(binary_path), array_manifests=manifest["arrays"]
+    )
+
+    if verify_checksums and any(
+        hashlib.sha256(array).hexdigest() != manifest["arrays"][name]["sha256"]
+        for name, array in arrays.items()
+    ):
+        return None
+
+    return LookupTables(
+        sublattice_table=arrays["sublattice_table"],
+        sublattice_labels=np.array(manifest["sublattice_labels"], dtype=object),
+        neighbors_table=arrays["neighbors_table"],
+        neighbors_count=arrays["neighbors_count"],
+        neighbors_lookup_index=arrays["neighbors_lookup_index"],
+        interaction_parameters_table=arrays["interaction_parameters_table"],
+        interaction_class_table=arrays["interaction_class_table"],
+        interaction_class_parameters=arrays["interaction_class_parameters"],
+        number_sites=manifest["number_sites"],
+        number_sublattices=manifest["number_sublattices"],
+    )
+
+
+def write_cache_entry(cache_path: Path, key: str, lookup_tables: LookupTables) -> None:
+    """Write a cache entry so that concurrent readers never see a partial entry.
+
+    The binary file and manifest are written to temporary files and then renamed
+    into place. The manifest is renamed last, so its presence marks a complete entry.
+
+    :param cache_path: Directory where cache entries are stored.
+    :param key: Cache key of the entry.
+    :param lookup_tables: Lookup tables to store.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=str(cache_path), suffix=".bin.tmp", delete=False
+    ) as binary_file:
+        array_manifests: Dict[str, Dict[str, Any]] = spyns.shared.write_lookup_arrays(
+            binary_file=binary_file, lookup_tables=lookup_tables, checksums=True
+        )
+        size: int = binary_file.tell()
+
+    os.replace(binary_file.name, str(cache_path / f"{key}.bin"))
+
+    manifest: Dict[str, Any] = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "key": key,
+        "size": size,
+        "number_sites": int(lookup_tables.number_sites),
+        "number_sublattices": int(lookup_tables.number_sublattices),
+        "sublattice_labels": [str(label) for label in lookup_tables.sublattice_labels],
+        "arrays": array_manifests,
+    }
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", dir=str(cache_path), suffix=".json.tmp", delete=False
+    ) as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    os.replace(manifest_file.name, str(cache_path / f"{key}.json"))
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import time
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -7,7 +8,7 @@ import pandas as pd
 import pymatgen as pmg
 
 import spyns
-from spyns.lattice.neighborhood import NeighborsDataFrames
+from spyns.lattice.neighborhood import NeighborsDataFrames, TiledNeighborTables
 
 Neighbor = Tuple[pmg.PeriodicSite, float, int]
 SiteNeighbors = List[Optional[Neighbor]]
@@ -29,8 +30,15 @@ class Lattice(object):
     :ivar neighbors_lookup_index: Lookup starting index for site's neighbors in
         ``neighbors_table``.
     :ivar interaction_parameters_table: Lookup table of interaction parameters.
+    :ivar interaction_class_table: Lookup table of interaction classes, which index
+        the rows of ``sublattice_pairs_data_frame`` and
+        ``interaction_class_parameters``.
+    :ivar interaction_class_parameters: Interaction parameter of each interaction
+        class.
     :ivar number_sites: Total sites in the lattice.
     :ivar number_sublattices: Total unique sublattices defined in the lattice.
+    :ivar number_cells: Number of unit cells in a lattice built with
+        ``from_unit_cell``.
     """
 
     __slots__ = [
@@ -41,12 +49,17 @@ class Lattice(object):
         "_sublattice_table",
         "_sublattice_labels",
         "_interaction_parameters_table",
+        "_interaction_class_table",
+        "_interaction_class_parameters",
         "_number_sites",
         "_number_sublattices",
         "_neighbor_count_df",
         "_sublattice_pairs_df",
         "_sublattice_pairs_interaction_df",
         "_r",
+        "_scaling_factors",
+        "_tiled_neighbors",
+        "_build_time",
     ]
 
     def __init__(self, structure: pmg.Structure, r: float):
@@ -56,11 +69,44 @@ class Lattice(object):
         :param r: Radius of sphere.
         :param interaction_parameters: Interaction parameters for site neighbors.
         """
+        start: float = time.perf_counter()
         self._structure: pmg.Structure = structure
         self._r: float = r
+        self._scaling_factors: Optional[Tuple[int, int, int]] = None
         self._number_sites = self._structure.num_sites
         self._build_and_cache_neighbor_table()
         self._build_and_cache_sublattice_table()
+        self._build_time: float = time.perf_counter() - start
+
+    @classmethod
+    def from_unit_cell(
+        cls, structure: pmg.Structure, r: float, scaling_factors: Tuple[int, int, int]
+    ) -> "Lattice":
+        """Build the lattice of a supercell from its unit cell.
+
+        Neighbors are only searched for in the unit cell. The supercell tables are
+        then built by translating the unit cell tables, which avoids constructing the
+        supercell ``Structure``. The result is the same as
+        ``Lattice(make_supercell(structure, scaling_factors=scaling_factors), r)``.
+
+        :param structure: Unit cell in pymatgen structure format.
+        :param r: Radius of sphere.
+        :param scaling_factors: Number of unit cells along each lattice vector.
+        :return: Lattice of the supercell.
+        :raises ValueError: An error will be raised if the supercell is too small for
+            the neighbor cutoff.
+        """
+        start: float = time.perf_counter()
+        lattice: Lattice = cls.__new__(cls)
+        lattice._structure = structure
+        lattice._r = r
+        lattice._scaling_factors = tuple(scaling_factors)
+        lattice._number_sites = structure.num_sites * int(np.prod(scaling_factors))
+        lattice._build_and_cache_tiled_neighbor_table()
+        lattice._build_and_cache_sublattice_table()
+        lattice._build_time = time.perf_counter() - start
+
+        return lattice
 
     @property
     def neighbors_data_frame(self):
@@ -124,6 +170,24 @@ class Lattice(object):
         except AttributeError:
             raise AttributeError("Interaction parameters not set.")
 
+    @property
+    def interaction_class_table(self):
+        """Lookup table of interaction classes."""
+        try:
+            return self._interaction_class_table
+
+        except AttributeError:
+            raise AttributeError("Interaction parameters not set.")
+
+    @property
+    def interaction_class_parameters(self):
+        """Interaction parameter of each interaction class."""
+        try:
+            return self._interaction_class_parameters
+
+        except AttributeError:
+            raise AttributeError("Interaction parameters not set.")
+
     @property
     def number_sites(self):
         """Total sites in the lattice."""
@@ -134,6 +198,19 @@ class Lattice(object):
         """Total unique sublattices defined in the lattice."""
         return self._number_sublattices
 
+    @property
+    def number_cells(self) -> Optional[int]:
+        """Unit cells tiled by ``from_unit_cell``, or ``None`` for other lattices."""
+        if self._scaling_factors is None:
+            return None
+
+        return int(np.prod(self._scaling_factors))
+
+    @property
+    def build_time(self) -> float:
+        """Wall time in seconds spent building the lookup tables."""
+        return self._build_time
+
     def set_sublattice_pair_interactions(self, interaction_df: pd.DataFrame) -> None:
         """Set the pairwise interaction coefficients.
 
@@ -172,16 +249,60 @@ class Lattice(object):
                 "sublattice_pairs_data_frame."
             )
 
+        start: float = time.perf_counter()
         self._build_and_cache_interaction_table(self._sublattice_pairs_interaction_df)
+        self._build_time += time.perf_counter() - start
 
     def _cache_neighbor_data_frames(self) -> None:
         """Cache data frame of pairs as a function of distance and sublattice."""
+        if self._scaling_factors is not None:
+            self._cache_tiled_neighbor_data_frame()
+            return
+
         neighbors_df: NeighborsDataFrames = spyns.lattice.neighborhood.build_neighbors_data_frames(
             structure=self._structure, r=self._r
         )
         self._neighbor_count_df = neighbors_df.neighbor_count
         self._sublattice_pairs_df = neighbors_df.sublattice_pairs
 
+    def _cache_tiled_neighbor_data_frame(self) -> None:
+        """Cache data frame of supercell pairs built from the translated tables."""
+        tiled_neighbors: TiledNeighborTables = self._tiled_neighbors
+        unit_cell_pairs: pd.DataFrame = tiled_neighbors.unit_cell_pairs.iloc[
+            tiled_neighbors.unit_cell_pair_index
+        ]
+
+        self._neighbor_count_df = pd.DataFrame(
+            data={
+                "i": np.repeat(
+                    np.arange(self._number_sites), tiled_neighbors.neighbors_count
+                ),
+                "j": tiled_neighbors.neighbors_table,
+                "subspecies_i": unit_cell_pairs["subspecies_i"].values,
+                "subspecies_j": unit_cell_pairs["subspecies_j"].values,
+                "distance_bin": unit_cell_pairs["distance_bin"].values,
+                "n": np.ones(len(tiled_neighbors.neighbors_table), dtype=np.int64),
+            }
+        )
+
+    def _build_and_cache_tiled_neighbor_table(self) -> None:
+        """Build and save supercell neighbor tables from the unit cell tables."""
+        tiled_neighbors: TiledNeighborTables = spyns.lattice.neighborhood.build_tiled_neighbor_tables(
+            structure=self._structure, r=self._r, scaling_factors=self._scaling_factors
+        )
+
+        self._tiled_neighbors: TiledNeighborTables = tiled_neighbors
+        self._sublattice_pairs_df = tiled_neighbors.sublattice_pairs
+        self._neighbor_table: np.ndarray = self._compact_site_indices(
+            tiled_neighbors.neighbors_table
+        )
+        self._neighbor_count_list: np.ndarray = tiled_neighbors.neighbors_count.astype(
+            np.int32
+        )
+        self._neighbor_table_lookup_index: np.ndarray = (
+            tiled_neighbors.neighbors_lookup_index
+        )
+
     def _build_and_cache_neighbor_table(self) -> None:
         """Build and save neighbor tables for lattice."""
         neighbor_count_df: pd.DataFrame = self.neighbors_data_frame
@@ -195,8 +316,10 @@ class Lattice(object):
         ].groupby("i").first().values.flatten()
 
         if neighbor_count_list.sum() == len(neighbor_table):
-            self._neighbor_table: np.ndarray = neighbor_table
-            self._neighbor_count_list: np.ndarray = neighbor_count_list
+            self._neighbor_table: np.ndarray = self._compact_site_indices(
+                neighbor_table
+            )
+            self._neighbor_count_list: np.ndarray = neighbor_count_list.astype(np.int32)
             self._neighbor_table_lookup_index: np.ndarray = neighbor_table_lookup_index
 
         else:
@@ -211,14 +334,37 @@ class Lattice(object):
             cell_structure=self._structure
         )
 
+        sublattice_labels: List[str] = structure.site_properties["subspecie"]
+
+        if self._scaling_factors is not None:
+            sublattice_labels = np.repeat(
+                sublattice_labels, int(np.prod(self._scaling_factors))
+            ).tolist()
+
         sublattice_table, distinct_sublattices = self._factorize_sublattice_labels(
-            sublattice_labels=structure.site_properties["subspecie"]
+            sublattice_labels=sublattice_labels
         )
 
-        self._sublattice_table: np.ndarray = sublattice_table
+        if len(distinct_sublattices) > np.iinfo(np.int16).max:
+            raise ValueError("Lattice has too many sublattices for an int16 table.")
+
+        self._sublattice_table: np.ndarray = sublattice_table.astype(np.int16)
         self._sublattice_labels: np.ndarray = distinct_sublattices
         self._number_sublattices: int = len(distinct_sublattices.tolist())
 
+    def _compact_site_indices(self, site_indices: np.ndarray) -> np.ndarray:
+        """Store site indices as 32-bit integers to halve the memory traffic.
+
+        :param site_indices: Array of site indices.
+        :return: Array of site indices with an int32 data type.
+        :raises ValueError: An error will be raised if the lattice has too many sites
+            to index with 32-bit integers.
+        """
+        if self._number_sites > np.iinfo(np.int32).max:
+            raise ValueError("Lattice has too many sites for an int32 neighbor table.")
+
+        return site_indices.astype(np.int32)
+
     def _factorize_sublattice_labels(
         self, sublattice_labels: List[str]
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -244,10 +390,42 @@ class Lattice(object):
         except AttributeError:
             raise AttributeError("Sublattice interactions not set.")
 
-        self._interaction_parameters_table: np.ndarray = self.neighbors_data_frame.merge(
-            interaction_df
-        ).sort_values(
-            ["i", "distance_bin", "j"]
-        ).loc[
+        if len(interaction_df) > np.iinfo(np.int16).max:
+            raise ValueError("Lattice has too many interaction classes for int16.")
+
+        interaction_df = interaction_df.assign(
+            interaction_class=np.arange(len(interaction_df))
+        )
+
+        if self._scaling_factors is not None:
+            unit_cell_interactions: pd.DataFrame = self._tiled_neighbors.unit_cell_pairs.merge(
+                interaction_df,
+                how="left",
+                on=["subspecies_i", "subspecies_j", "distance_bin"],
+            )
+            interactions: pd.DataFrame = unit_cell_interactions.iloc[
+                self._tiled_neighbors.unit_cell_pair_index
+            ]
+
+        else:
+            interactions = self.neighbors_data_frame.merge(interaction_df).sort_values(
+                ["i", "distance_bin", "j"]
+            )
+
+        if len(interactions) != len(self._neighbor_table) or np.any(
+            interactions["interaction_class"].isna()
+        ):
+            raise ValueError(
+                "interaction_df must define J_ij for every sublattice pair in "
+                "sublattice_pairs_data_frame."
+            )
+
+        self._interaction_parameters_table: np.ndarray = interactions.loc[
             :, "J_ij"
         ].values
+        self._interaction_class_table: np.ndarray = interactions.loc[
+            :, "interaction_class"
+        ].values.astype(np.int16)
+        self._interaction_class_parameters: np.ndarray = interaction_df.loc[
+            :, "J_ij"
+        ].values.astype(np.float64)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import itertools
 from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
@@ -19,13 +20,34 @@ class NeighborsDataFrames(NamedTuple):
     sublattice_pairs: pd.DataFrame
 
 
+class NeighborPairs(NamedTuple):
+    i: np.ndarray
+    j: np.ndarray
+    distance_ij: np.ndarray
+    translation_ij: np.ndarray
+
+
+class TiledNeighborTables(NamedTuple):
+    unit_cell_pairs: pd.DataFrame
+    sublattice_pairs: pd.DataFrame
+    neighbors_table: np.ndarray
+    neighbors_count: np.ndarray
+    neighbors_lookup_index: np.ndarray
+    unit_cell_pair_index: np.ndarray
+
+
 def build_neighbors_data_frames(
-    structure: pmg.Structure, r: float
+    structure: pmg.Structure, r: float, method: str = "cell_list"
 ) -> NeighborsDataFrames:
     """Find neighbor and sublattice pairs in a structure within a cutoff distance.
 
     :param structure: A pymatgen ``Structure`` object.
     :param r: Cutoff radius for finding neighbors in sphere.
+    :param method: Neighbor search to use. ``"cell_list"`` finds and counts the
+        neighbor pairs with vectorized NumPy operations, and ``"pymatgen"`` uses
+        pymatgen's ``get_all_neighbors`` followed by a pandas group-by. The two
+        methods can disagree on neighbors lying within rounding error of ``r``,
+        which ``"cell_list"`` always keeps.
     :return: A ``NeighborsDataFrames`` named tuple with two field names:
 
         ``neighbor_count``
@@ -35,22 +57,48 @@ def build_neighbors_data_frames(
         ``sublattice_pairs``
             A pandas ``DataFrame`` of neighbor distances mapped to unique bin
             intervals.
+    :raises ValueError: An error will be raised if ``method`` is unknown.
     """
     cell_structure = spyns.lattice.generate.add_subspecie_labels_if_missing(
         cell_structure=structure
     )
 
-    neighbor_distances_df: pd.DataFrame = get_neighbor_distances_data_frame(
-        cell_structure=cell_structure, r=r
-    )
-
-    distance_bins_df: pd.DataFrame = neighbor_distances_df.pipe(
-        define_bins_to_group_and_sort_by_distance
-    )
+    if method == "cell_list":
+        neighbor_pairs: NeighborPairs = find_neighbor_pairs_with_cell_list(
+            cell_structure=cell_structure, r=r
+        )
+        distance_bins_df: pd.DataFrame = define_bins_to_group_and_sort_by_distance(
+            neighbor_distances_df=pd.DataFrame(
+                data={"distance_ij": neighbor_pairs.distance_ij}
+            )
+        )
+        neighbor_count_df: pd.DataFrame = count_neighbor_pairs_within_distance_bins(
+            neighbor_pairs=neighbor_pairs,
+            subspecies=np.array(
+                cell_structure.site_properties["subspecie"], dtype=object
+            ),
+            distance_bins_df=distance_bins_df,
+        ).pipe(sort_neighbors_by_site_index_i)
+
+    elif method == "pymatgen":
+        neighbor_distances_df: pd.DataFrame = get_neighbor_distances_data_frame(
+            cell_structure=cell_structure, r=r
+        )
+        distance_bins_df = neighbor_distances_df.pipe(
+            define_bins_to_group_and_sort_by_distance
+        )
+        neighbor_count_df = (
+            neighbor_distances_df.pipe(
+                group_site_index_pairs_by_distance, distance_bins_df=distance_bins_df
+            )
+            .pipe(count_neighbors_within_distance_groups)
+            .pipe(sort_neighbors_by_site_index_i)
+        )
 
-    neighbor_count_df: pd.DataFrame = neighbor_distances_df.pipe(
-        group_site_index_pairs_by_distance, distance_bins_df=distance_bins_df
-    ).pipe(count_neighbors_within_distance_groups).pipe(sort_neighbors_by_site_index_i)
+    else:
+        raise ValueError(
+            f"Unknown neighbor search method {method}. Use cell_list or pymatgen."
+        )
 
     sublattice_pairs_df: pd.DataFrame = neighbor_count_df.pipe(
         sort_and_rank_unique_sublattice_pairs
@@ -117,6 +165,57 @@ def count_neighbors_within_distance_groups(
     )
 
 
+def count_neighbor_pairs_within_distance_bins(
+    neighbor_pairs: NeighborPairs,
+    subspecies: np.ndarray,
+    distance_bins_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """Count number of neighbors for each site-index pair and distance bin.
+
+    This is the vectorized equivalent of ``group_site_index_pairs_by_distance``
+    followed by ``count_neighbors_within_distance_groups``. Each pair is encoded as a
+    single integer key ordered by site index i, then distance bin, then site index j,
+    so a single ``np.unique`` call both counts and sorts the pairs.
+
+    :param neighbor_pairs: Site indices and separation distance of every neighbor
+        pair.
+    :param subspecies: Subspecies label of each site.
+    :param distance_bins_df: A pandas ``DataFrame`` of neighbor distances mapped to
+        unique bin intervals.
+    :return: A pandas ``DataFrame`` of neighbor counts aggregated over site-index pairs
+        and separation distances.
+    """
+    bin_intervals: pd.IntervalIndex = distance_bins_df.index
+    number_bins: int = len(bin_intervals)
+    number_sites: int = len(subspecies)
+
+    bin_codes: np.ndarray = np.searchsorted(
+        bin_intervals.right.values, neighbor_pairs.distance_ij, side="left"
+    )
+    in_bins: np.ndarray = bin_codes < number_bins
+
+    pair_keys: np.ndarray = (
+        neighbor_pairs.i[in_bins].astype(np.int64) * number_bins + bin_codes[in_bins]
+    ) * number_sites + neighbor_pairs.j[in_bins]
+    unique_keys, counts = np.unique(pair_keys, return_counts=True)
+
+    site_j: np.ndarray = unique_keys % number_sites
+    site_i, distance_bin_codes = np.divmod(unique_keys // number_sites, number_bins)
+
+    return pd.DataFrame(
+        data={
+            "i": site_i,
+            "j": site_j,
+            "subspecies_i": subspecies[site_i],
+            "subspecies_j": subspecies[site_j],
+            "distance_bin": pd.Categorical.from_codes(
+                codes=distance_bin_codes, categories=bin_intervals, ordered=True
+            ),
+            "n": counts.astype(np.int64),
+        }
+    )
+
+
 def group_site_index_pairs_by_distance(
     neighbor_distances_df: pd.DataFrame, distance_bins_df: pd.DataFrame
 ) -> pd.core.groupby.DataFrameGroupBy:
@@ -206,6 +305,244 @@ def define_bin_intervals(unique_distances: np.ndarray) -> pd.IntervalIndex:
     return pd.IntervalIndex.from_breaks(breaks=bin_edges)
 
 
+def find_neighbor_pairs_with_cell_list(
+    cell_structure: pmg.Structure, r: float
+) -> NeighborPairs:
+    """Find every periodic neighbor pair out to a distance ``r`` using a cell list.
+
+    Sites are binned into a grid of cells over their fractional coordinates, with
+    cells no thinner than ``r`` wherever the unit cell allows it. Each site then only
+    needs to be compared against the sites in nearby cells. Cell offsets that cross
+    the boundary of the unit cell pick up the matching periodic image, so unit cells
+    that are thinner than ``r`` are handled by searching more than one image deep.
+    Every offset is processed for all sites at once. Pairs are kept out to
+    ``r + 1e-8``, the same tolerance used to size the cells, so that bonds whose
+    length equals ``r`` are not dropped by rounding errors. Some pymatgen versions
+    compare against ``r`` without a tolerance and miss such bonds.
+
+    :param cell_structure: A pymatgen ``Structure`` object.
+    :param r: Cut-off distance to use when detecting site neighbors.
+    :return: Site indices, separation distance, and lattice translation of every
+        neighbor pair. The translation is the number of unit cells between site i and
+        the image of site j, measured along each lattice vector. Pairs that connect a
+        site to more than one periodic image of a neighbor appear once per image.
+    """
+    cell_size: float = r + 1e-8
+    lattice_matrix: np.ndarray = cell_structure.lattice.matrix
+    site_coordinates: np.ndarray = cell_structure.cart_coords
+    fractional_coordinates: np.ndarray = cell_structure.frac_coords
+    home_images: np.ndarray = np.floor(fractional_coordinates)
+    fractional_coordinates = np.mod(fractional_coordinates, 1.0)
+    cartesian_coordinates: np.ndarray = fractional_coordinates @ lattice_matrix
+    number_sites: int = len(fractional_coordinates)
+
+    reciprocal_lengths: np.ndarray = np.linalg.norm(
+        np.linalg.inv(lattice_matrix), axis=0
+    )
+    number_cells: np.ndarray = np.maximum(
+        1, np.floor(1 / (cell_size * reciprocal_lengths))
+    ).astype(np.int64)
+    search_depth: np.ndarray = np.ceil(
+        cell_size * number_cells * reciprocal_lengths
+    ).astype(np.int64)
+
+    cell_coordinates: np.ndarray = np.minimum(
+        np.floor(fractional_coordinates * number_cells).astype(np.int64),
+        number_cells - 1,
+    )
+    cell_index: np.ndarray = np.ravel_multi_index(cell_coordinates.T, number_cells)
+    sites_sorted_by_cell: np.ndarray = np.argsort(cell_index, kind="stable")
+    cell_counts: np.ndarray = np.bincount(
+        cell_index, minlength=int(np.prod(number_cells))
+    )
+    cell_starts: np.ndarray = np.cumsum(cell_counts) - cell_counts
+
+    site_i_blocks: List[np.ndarray] = []
+    site_j_blocks: List[np.ndarray] = []
+    distance_blocks: List[np.ndarray] = []
+    translation_blocks: List[np.ndarray] = []
+
+    offset: Tuple[int, ...]
+    for offset in itertools.product(
+        *(range(-depth, depth + 1) for depth in search_depth)
+    ):
+        shifted_coordinates: np.ndarray = cell_coordinates + np.array(offset)
+        images: np.ndarray = np.floor_divide(shifted_coordinates, number_cells)
+        target_cells: np.ndarray = np.ravel_multi_index(
+            (shifted_coordinates - images * number_cells).T, number_cells
+        )
+
+        pair_counts: np.ndarray = cell_counts[target_cells]
+        pair_starts: np.ndarray = np.cumsum(pair_counts) - pair_counts
+        site_i: np.ndarray = np.repeat(np.arange(number_sites), pair_counts)
+        position_in_cell: np.ndarray = np.arange(pair_counts.sum()) - np.repeat(
+            pair_starts, pair_counts
+        )
+        site_j: np.ndarray = sites_sorted_by_cell[
+            np.repeat(cell_starts[target_cells], pair_counts) + position_in_cell
+        ]
+
+        pair_images: np.ndarray = (
+            np.repeat(images, pair_counts, axis=0) + home_images[site_i]
+        )
+        displacements: np.ndarray = (
+            pair_images @ lattice_matrix
+            + cartesian_coordinates[site_j]
+            - site_coordinates[site_i]
+        )
+        distances: np.ndarray = np.sqrt(np.sum(displacements ** 2, axis=1))
+        within_cutoff: np.ndarray = (distances <= cell_size) & (distances > 1e-8)
+
+        site_i_blocks.append(site_i[within_cutoff])
+        site_j_blocks.append(site_j[within_cutoff])
+        distance_blocks.append(distances[within_cutoff])
+        translation_blocks.append(
+            (pair_images - home_images[site_j])[within_cutoff].astype(np.int64)
+        )
+
+    return NeighborPairs(
+        i=np.concatenate(site_i_blocks),
+        j=np.concatenate(site_j_blocks),
+        distance_ij=np.concatenate(distance_blocks),
+        translation_ij=np.concatenate(translation_blocks),
+    )
+
+
+def build_tiled_neighbor_tables(
+    structure: pmg.Structure, r: float, scaling_factors: Tuple[int, int, int]
+) -> TiledNeighborTables:
+    """Build the neighbor tables of a supercell by translating unit cell neighbors.
+
+    The neighbor search runs once over the unit cell. Site ``u`` of unit cell copy
+    ``t`` in the supercell is given the index ``u * number_cells + t``, where ``t`` is
+    the C-ordered index of the copy's translation. This is the same ordering that
+    ``spyns.lattice.generate.make_supercell`` uses. Each unit cell neighbor pair
+    ``u -> v`` with lattice translation ``m`` then maps to the supercell pair
+    ``(u, t) -> (v, (t + m) mod scaling_factors)``. The tables are identical to
+    those built by running the neighbor search on the full supercell.
+
+    :param structure: A pymatgen ``Structure`` object for the unit cell.
+    :param r: Cutoff radius for finding neighbors in sphere.
+    :param scaling_factors: Number of unit cells along each lattice vector.
+    :return: A ``TiledNeighborTables`` named tuple with the following field names:
+
+        ``unit_cell_pairs``
+            A pandas ``DataFrame`` with one row per unit cell neighbor pair and
+            periodic image, holding the subspecies and distance bin of the pair.
+
+        ``sublattice_pairs``
+            A pandas ``DataFrame`` of neighbor distances mapped to unique bin
+            intervals.
+
+        ``neighbors_table``, ``neighbors_count``, ``neighbors_lookup_index``
+            Supercell neighbor lookup tables.
+
+        ``unit_cell_pair_index``
+            Row of ``unit_cell_pairs`` that each ``neighbors_table`` entry was
+            translated from.
+    :raises ValueError: An error will be raised if the supercell is too small for a
+        site to see each of its neighbors at a given distance only once.
+    """
+    cell_structure = spyns.lattice.generate.add_subspecie_labels_if_missing(
+        cell_structure=structure
+    )
+    subspecies: np.ndarray = np.array(
+        cell_structure.site_properties["subspecie"], dtype=object
+    )
+    neighbor_pairs: NeighborPairs = find_neighbor_pairs_with_cell_list(
+        cell_structure=cell_structure, r=r
+    )
+    distance_bins_df: pd.DataFrame = define_bins_to_group_and_sort_by_distance(
+        neighbor_distances_df=pd.DataFrame(
+            data={"distance_ij": neighbor_pairs.distance_ij}
+        )
+    )
+    bin_intervals: pd.IntervalIndex = distance_bins_df.index
+
+    pair_order: np.ndarray = np.argsort(neighbor_pairs.i, kind="stable")
+    unit_site_i: np.ndarray = neighbor_pairs.i[pair_order]
+    unit_site_j: np.ndarray = neighbor_pairs.j[pair_order]
+    unit_translations: np.ndarray = neighbor_pairs.translation_ij[pair_order]
+    unit_bin_codes: np.ndarray = np.searchsorted(
+        bin_intervals.right.values, neighbor_pairs.distance_ij[pair_order], side="left"
+    )
+
+    unit_cell_pairs: pd.DataFrame = pd.DataFrame(
+        data={
+            "i": unit_site_i,
+            "subspecies_i": subspecies[unit_site_i],
+            "subspecies_j": subspecies[unit_site_j],
+            "distance_bin": pd.Categorical.from_codes(
+                codes=unit_bin_codes, categories=bin_intervals, ordered=True
+            ),
+        }
+    )
+    sublattice_pairs_df: pd.DataFrame = count_neighbor_pairs_within_distance_bins(
+        neighbor_pairs=neighbor_pairs,
+        subspecies=subspecies,
+        distance_bins_df=distance_bins_df,
+    ).pipe(sort_and_rank_unique_sublattice_pairs)
+
+    scaling: np.ndarray = np.array(scaling_factors, dtype=np.int64)
+    number_cells: int = int(np.prod(scaling))
+    number_unit_sites: int = len(subspecies)
+    cell_translations: np.ndarray = np.column_stack(
+        np.unravel_index(np.arange(number_cells), scaling)
+    )
+
+    unit_neighbors_count: np.ndarray = np.bincount(
+        unit_site_i, minlength=number_unit_sites
+    )
+    unit_neighbors_start: np.ndarray = (
+        np.cumsum(unit_neighbors_count) - unit_neighbors_count
+    )
+    neighbors_count: np.ndarray = np.repeat(unit_neighbors_count, number_cells)
+    neighbors_lookup_index: np.ndarray = np.cumsum(neighbors_count) - neighbors_count
+
+    site_i: np.ndarray = np.repeat(
+        np.arange(number_unit_sites * number_cells), neighbors_count
+    )
+    unit_cell_pair_index: np.ndarray = (
+        np.repeat(np.repeat(unit_neighbors_start, number_cells), neighbors_count)
+        + np.arange(neighbors_count.sum())
+        - np.repeat(neighbors_lookup_index, neighbors_count)
+    )
+    cell_j: np.ndarray = np.ravel_multi_index(
+        np.mod(
+            cell_translations[site_i % number_cells]
+            + unit_translations[unit_cell_pair_index],
+            scaling,
+        ).T,
+        scaling,
+    )
+    site_j: np.ndarray = unit_site_j[unit_cell_pair_index] * number_cells + cell_j
+    bin_codes: np.ndarray = unit_bin_codes[unit_cell_pair_index]
+
+    table_order: np.ndarray = np.lexsort((site_j, bin_codes, site_i))
+    site_i = site_i[table_order]
+    site_j = site_j[table_order]
+    bin_codes = bin_codes[table_order]
+
+    if np.any(
+        (site_i[1:] == site_i[:-1])
+        & (bin_codes[1:] == bin_codes[:-1])
+        & (site_j[1:] == site_j[:-1])
+    ):
+        raise ValueError(
+            f"Supercell is too small to use neighbor cutoff r={r}. Either reduce "
+            "neighbor cutoff or increase the scaling factors."
+        )
+
+    return TiledNeighborTables(
+        unit_cell_pairs=unit_cell_pairs,
+        sublattice_pairs=sublattice_pairs_df,
+        neighbors_table=site_j,
+        neighbors_count=neighbors_count,
+        neighbors_lookup_index=neighbors_lookup_index,
+        unit_cell_pair_index=unit_cell_pair_index[table_order],
+    )
+
+
 def get_neighbor_distances_data_frame(
     cell_structure: pmg.Structure, r: float
 ) -> pd.DataFrame:
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from spyns.data import RunMetrics, SimulationData
+
+try:
+    import resource
+
+except ImportError:
+    resource = None
+
+SWEEP_PHASES = ["pre_simulation", "main_simulation"]
+
+
+@contextmanager
+def record_phase(data: SimulationData, phase: str) -> Iterator[None]:
+    """Add the wall time of a ``with`` block to a phase of the run metrics.
+
+    Nothing is recorded if run metrics are disabled. Phases can nest, for example the
+    ``io`` phase is also counted in the phase it happens in.
+
+    :param data: Data container for the simulation.
+    :param phase: Name of the phase.
+    """
+    if data.metrics is None:
+        yield
+        return
+
+    start: float = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        data.metrics.phase_times[phase] = (
+            data.metrics.phase_times.get(phase, 0.0) + time.perf_counter() - start
+        )
+
+
+def finalize_metrics(
+    data: SimulationData,
+    lattice_build_time: Optional[float] = None,
+    log_filepath: Optional[str] = None,
+) -> None:
+    """Compute the derived run metrics and optionally append them to a log file.
+
+    :param data: Data container for the simulation.
+    :param lattice_build_time: Wall time spent building the lattice, if known.
+    :param log_filepath: Optional path of a JSON lines file. One line is appended per
+        run.
+    """
+    metrics: Optional[RunMetrics] = data.metrics
+
+    if metrics is None:
+        return
+
+    if lattice_build_time is not None:
+        metrics.phase_times["lattice_build"] = lattice_build_time
+
+    sweep_time: float = sum(
+        metrics.phase_times.get(phase, 0.0) for phase in SWEEP_PHASES
+    )
+    metrics.number_samples = int(data.estimators.number_samples[0])
+    metrics.flips_per_second = (
+        float(metrics.attempted_flips.sum()) / sweep_time if sweep_time > 0 else 0.0
+    )
+    metrics.peak_memory = get_peak_memory()
+
+    if log_filepath is not None:
+        with open(log_filepath, "a") as log_file:
+            log_file.write(json.dumps(make_metrics_record(data=data)) + "\n")
+
+
+def make_metrics_record(data: SimulationData) -> Dict[str, Any]:
+    """Collect the run metrics and the run's identifying parameters for logging.
+
+    :param data: Data container for the simulation.
+    :return: JSON-serializable record of the run metrics.
+    """
+    metrics: RunMetrics = data.metrics
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acceptance_rates: np.ndarray = metrics.accepted_flips / metrics.attempted_flips
+
+    return {
+        "seed": int(data.parameters.seed),
+        "mode": data.parameters.mode,
+        "temperature": float(data.parameters.temperature),
+        "number_sites": int(data.lookup_tables.number_sites),
+        "phase_times": metrics.phase_times,
+        "flips_per_second": metrics.flips_per_second,
+        "number_samples": metrics.number_samples,
+        "peak_memory": metrics.peak_memory,
+        "sublattices": [
+            {
+                "label": str(label),
+                "attempted_flips": int(attempted),
+                "accepted_flips": int(accepted),
+                "acceptance_rate": None if np.isnan(rate) else float(rate),
+            }
+            for label, attempted, accepted, rate in zip(
+                data.lookup_tables.sublattice_labels,
+                metrics.attempted_flips,
+                metrics.accepted_flips,
+                acceptance_rates,
+            )
+        ],
+    }
+
+
+def get_peak_memory() -> Optional[int]:
+    """Look up the peak resident memory of the current process.
+
+    :return: Peak resident set size in bytes, or ``None`` where the ``resource``
+        module is unavailable.
+    """
+    if resource is None:
+        return None
+
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == "darwin":
+        return max_rss
+
+    return 1024 * max_rss
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+import spyns.model.heisenberg
+import spyns.model.heisenberg_cython
@@ -1,10 +1,19 @@
 # -*- coding: utf-8 -*-
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 
-from spyns.data import HeisenbergState, SimulationData
+from spyns.data import (
+    HamiltonianParameters,
+    HeisenbergState,
+    LookupTables,
+    SimulationData,
+)
+
+if TYPE_CHECKING:
+    import scipy.sparse
 
 
 @dataclass(frozen=True)
@@ -31,27 +40,158 @@ def sample_random_state(number_sites: int) -> HeisenbergState:
     )
 
 
-def save_full_state(data: SimulationData) -> None:
+def save_full_state(
+    data: SimulationData, coupling_matrix: Optional["scipy.sparse.csr_matrix"] = None
+) -> None:
     """Compute the total energy and total magnetization estimators for the lattice.
 
     :param data: Data container for the simulation.
+    :param coupling_matrix: Sparse matrix of interaction parameters built by
+        ``build_coupling_matrix``. Built on the fly if not provided.
     """
-    data.estimators.energy[0] = compute_total_energy(data=data)
+    data.estimators.energy[0] = compute_total_energy(
+        data=data, coupling_matrix=coupling_matrix
+    )
     data.estimators.spin_vector[:, :] = sum_spin_vectors_within_sublattices(data=data)
 
 
-def compute_total_energy(data: SimulationData) -> float:
+def build_coupling_matrix(lookup_tables: LookupTables) -> "scipy.sparse.csr_matrix":
+    """Build a sparse matrix of the interaction parameters between all site pairs.
+
+    The neighbor lookup tables already follow the compressed sparse row layout, so
+    the matrix wraps ``neighbors_table`` and ``interaction_parameters_table``
+    without any per-site work.
+
+    :param lookup_tables: Neighbor and interaction lookup tables.
+    :return: Sparse ``(number_sites, number_sites)`` matrix whose ``(i, j)`` element
+        is the interaction parameter between sites ``i`` and ``j``.
+    """
+    import scipy.sparse
+
+    row_pointers: np.ndarray = np.append(
+        lookup_tables.neighbors_lookup_index,
+        lookup_tables.neighbors_lookup_index[-1] + lookup_tables.neighbors_count[-1],
+    )
+
+    return scipy.sparse.csr_matrix(
+        (
+            lookup_tables.interaction_parameters_table,
+            lookup_tables.neighbors_table,
+            row_pointers,
+        ),
+        shape=(lookup_tables.number_sites, lookup_tables.number_sites),
+    )
+
+
+def get_spin_vectors(data: SimulationData) -> np.ndarray:
+    """Stack the spin vector components of every site into a single array.
+
+    :param data: Data container for the simulation.
+    :return: Array of shape ``(number_sites, 3)``.
+    """
+    return np.stack([data.state.x, data.state.y, data.state.z], axis=1)
+
+
+def compute_local_fields(
+    data: SimulationData, coupling_matrix: Optional["scipy.sparse.csr_matrix"] = None
+) -> np.ndarray:
+    """Compute the interaction-weighted sum of neighbor spin vectors at every site.
+
+    :param data: Data container for the simulation.
+    :param coupling_matrix: Sparse matrix of interaction parameters built by
+        ``build_coupling_matrix``. Built on the fly if not provided.
+    :return: Array of shape ``(number_sites, 3)``.
+    """
+    if coupling_matrix is None:
+        coupling_matrix = build_coupling_matrix(lookup_tables=data.lookup_tables)
+
+    return coupling_matrix @ get_spin_vectors(data=data)
+
+
+def compute_total_energy(
+    data: SimulationData, coupling_matrix: Optional["scipy.sparse.csr_matrix"] = None
+) -> float:
     """Compute the total energy estimator for the lattice.
 
     :param data: Data container for the simulation.
+    :param coupling_matrix: Sparse matrix of interaction parameters built by
+        ``build_coupling_matrix``. Built on the fly if not provided.
     :return: Total energy of the simulation state.
     """
-    total_energy: float = 0
+    spin_vectors: np.ndarray = get_spin_vectors(data=data)
+    local_fields: np.ndarray = compute_local_fields(
+        data=data, coupling_matrix=coupling_matrix
+    )
+    total_energy: float = float(np.sum(spin_vectors * local_fields)) / 2.0
+
+    if data.hamiltonian is not None:
+        total_energy += compute_hamiltonian_terms_energy(
+            data=data, spin_vectors=spin_vectors
+        )
+
+    return total_energy
+
+
+def compute_hamiltonian_terms_energy(
+    data: SimulationData, spin_vectors: np.ndarray
+) -> float:
+    """Compute the total energy of the field, anisotropy, and anisotropic exchange.
+
+    :param data: Data container for the simulation.
+    :param spin_vectors: Array of shape ``(number_sites, 3)`` from
+        ``get_spin_vectors``.
+    :return: Energy of the Hamiltonian terms, see ``spyns.data.setup_hamiltonian``.
+    """
+    hamiltonian: HamiltonianParameters = data.hamiltonian
+    sublattice_table: np.ndarray = data.lookup_tables.sublattice_table
+    energy: float = 0.0
+
+    if hamiltonian.magnetic_field is not None:
+        energy -= float(
+            np.sum(hamiltonian.magnetic_field[sublattice_table] * spin_vectors)
+        )
+
+    if hamiltonian.anisotropy is not None:
+        energy += float(
+            np.einsum(
+                "ni,nij,nj->",
+                spin_vectors,
+                hamiltonian.anisotropy[sublattice_table],
+                spin_vectors,
+            )
+        )
+
+    if hamiltonian.exchange_tensors is not None:
+        sites: np.ndarray = np.repeat(
+            np.arange(data.lookup_tables.number_sites),
+            data.lookup_tables.neighbors_count,
+        )
+        energy += 0.5 * float(
+            np.einsum(
+                "ni,nij,nj->",
+                spin_vectors[sites],
+                hamiltonian.exchange_tensors[
+                    data.lookup_tables.interaction_class_table
+                ],
+                spin_vectors[data.lookup_tables.neighbors_table],
+            )
+        )
+
+    return energy
+
 
-    for site_index in range(data.lookup_tables.number_sites):
-        total_energy += compute_site_energy(site_index=site_index, data=data)
+def make_dm_exchange_tensor(dm_vector: np.ndarray) -> np.ndarray:
+    """Build the exchange tensor of a Dzyaloshinskii-Moriya interaction.
 
-    return total_energy / 2.0
+    The bond energy ``S_i . tensor . S_j`` equals ``D . (S_i x S_j)``. The reverse
+    bond has the opposite DM vector, whose tensor is the transpose.
+
+    :param dm_vector: Three component DM vector ``D`` of the bond.
+    :return: Antisymmetric ``(3, 3)`` exchange tensor.
+    """
+    d_x, d_y, d_z = dm_vector
+
+    return np.array([[0.0, d_z, -d_y], [-d_z, 0.0, d_x], [d_y, -d_x, 0.0]])
 
 
 def sum_spin_vectors_within_sublattices(data: SimulationData) -> np.ndarray:
@@ -60,22 +200,18 @@ def sum_spin_vectors_within_sublattices(data: SimulationData) -> np.ndarray:
     :param data: Data container for the simulation.
     :return: Array of summed spin vectors grouped by sublattice.
     """
-    sublattice_indices: np.ndarray = data.lookup_tables.sublattice_table
-    spin_vector: np.ndarray = np.zeros(
-        shape=(data.lookup_tables.number_sublattices, 3), dtype=np.float
+    return np.stack(
+        [
+            np.bincount(
+                data.lookup_tables.sublattice_table,
+                weights=component,
+                minlength=data.lookup_tables.number_sublattices,
+            )
+            for component in (data.state.x, data.state.y, data.state.z)
+        ],
+        axis=1,
     )
 
-    for sublattice in range(data.lookup_tables.number_sublattices):
-        spin_vector[sublattice] = np.array(
-            [
-                data.state.x[sublattice_indices == sublattice].sum(),
-                data.state.y[sublattice_indices == sublattice].sum(),
-                data.state.z[sublattice_indices == sublattice].sum(),
-            ]
-        )
-
-    return spin_vector
-
 
 def get_site_spin_vector(site_index: int, data: SimulationData) -> np.ndarray:
     """Read and return the spin vector at a site.
@@ -130,6 +266,60 @@ def compute_energy_of_spin_vector_at_site(
         )
     )
 
+    if data.hamiltonian is not None:
+        energy += compute_site_hamiltonian_terms_energy(
+            site_spin=site_spin, site_index=site_index, data=data
+        )
+
+    return energy
+
+
+def compute_site_hamiltonian_terms_energy(
+    site_spin: np.ndarray, site_index: int, data: SimulationData
+) -> float:
+    """Compute the field, anisotropy, and anisotropic exchange energy of a spin vector.
+
+    :param site_spin: Spin vector as a three component array.
+    :param site_index: Site at which to place spin vector.
+    :param data: Data container for the simulation.
+    :return: Energy of the Hamiltonian terms at the site specified by
+        ``site_index``.
+    """
+    hamiltonian: HamiltonianParameters = data.hamiltonian
+    sublattice: int = data.lookup_tables.sublattice_table[site_index]
+    energy: float = 0.0
+
+    if hamiltonian.magnetic_field is not None:
+        energy -= float(hamiltonian.magnetic_field[sublattice] @ site_spin)
+
+    if hamiltonian.anisotropy is not None:
+        energy += float(site_spin @ hamiltonian.anisotropy[sublattice] @ site_spin)
+
+    if hamiltonian.exchange_tensors is not None:
+        lookup_start: int = data.lookup_tables.neighbors_lookup_index[site_index]
+        lookup_end: int = lookup_start + data.lookup_tables.neighbors_count[site_index]
+        neighbor_indices: np.ndarray = data.lookup_tables.neighbors_table[
+            lookup_start:lookup_end
+        ]
+        interaction_classes: np.ndarray = data.lookup_tables.interaction_class_table[
+            lookup_start:lookup_end
+        ]
+        energy += float(
+            np.einsum(
+                "i,nij,nj->",
+                site_spin,
+                hamiltonian.exchange_tensors[interaction_classes],
+                np.stack(
+                    [
+                        data.state.x[neighbor_indices],
+                        data.state.y[neighbor_indices],
+                        data.state.z[neighbor_indices],
+                    ],
+                    axis=1,
+                ),
+            )
+        )
+
     return energy
 
 
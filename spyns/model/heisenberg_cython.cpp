@@ -961,6 +961,12 @@ struct __pyx_obj_5spyns_11data_cython_LookupTables_t;
 struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t;
 struct __pyx_obj_5spyns_11data_cython_Estimators_t;
 struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t;
+struct __pyx_obj_5spyns_11data_cython_Histograms_t;
+struct __pyx_obj_5spyns_11data_cython_Metrics_t;
+struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t;
+struct __pyx_obj_5spyns_11data_cython_OrderParameters_t;
+struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t;
+struct __pyx_obj_5spyns_11data_cython_Progress_t;
 struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t;
 struct __pyx_obj_5spyns_5model_17heisenberg_cython_TrialFlip_t;
 struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t;
@@ -1009,8 +1015,8 @@ struct __pyx_obj_5spyns_11data_cython_SimulationParameters_t {
  * 
  * 
  * cdef class LookupTables_t:             # <<<<<<<<<<<<<<
- *     cdef long[:] sublattice_table
- *     cdef long[:] neighbors_table
+ *     cdef const short[:] sublattice_table
+ *     cdef const int[:] neighbors_table
  */
 struct __pyx_obj_5spyns_11data_cython_LookupTables_t {
   PyObject_HEAD
@@ -1018,13 +1024,14 @@ struct __pyx_obj_5spyns_11data_cython_LookupTables_t {
   __Pyx_memviewslice neighbors_table;
   __Pyx_memviewslice neighbors_count;
   __Pyx_memviewslice neighbors_lookup_index;
-  __Pyx_memviewslice interaction_parameters_table;
+  __Pyx_memviewslice interaction_class_table;
+  __Pyx_memviewslice interaction_class_parameters;
   long number_sites;
   long number_sublattices;
 };
 
 
-/* "spyns/data_cython.pxd":20
+/* "spyns/data_cython.pxd":21
  * 
  * 
  * cdef class HeisenbergState_t:             # <<<<<<<<<<<<<<
@@ -1039,7 +1046,7 @@ struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t {
 };
 
 
-/* "spyns/data_cython.pxd":26
+/* "spyns/data_cython.pxd":27
  * 
  * 
  * cdef class Estimators_t:             # <<<<<<<<<<<<<<
@@ -1055,7 +1062,7 @@ struct __pyx_obj_5spyns_11data_cython_Estimators_t {
 };
 
 
-/* "spyns/data_cython.pxd":33
+/* "spyns/data_cython.pxd":34
  * 
  * 
  * cdef class SimulationTrace_t:             # <<<<<<<<<<<<<<
@@ -1071,7 +1078,111 @@ struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t {
 };
 
 
-/* "spyns/data_cython.pxd":40
+/* "spyns/data_cython.pxd":41
+ * 
+ * 
+ * cdef class Histograms_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef double energy_min
+ */
+struct __pyx_obj_5spyns_11data_cython_Histograms_t {
+  PyObject_HEAD
+  int enabled;
+  double energy_min;
+  double energy_width;
+  long energy_bins;
+  double magnetization_width;
+  long magnetization_bins;
+  __Pyx_memviewslice energy_counts;
+  __Pyx_memviewslice energy_magnetization_counts;
+  __Pyx_memviewslice out_of_range;
+};
+
+
+/* "spyns/data_cython.pxd":53
+ * 
+ * 
+ * cdef class Metrics_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef long[:] attempted_flips
+ */
+struct __pyx_obj_5spyns_11data_cython_Metrics_t {
+  PyObject_HEAD
+  int enabled;
+  __Pyx_memviewslice attempted_flips;
+  __Pyx_memviewslice accepted_flips;
+};
+
+
+/* "spyns/data_cython.pxd":59
+ * 
+ * 
+ * cdef class ShellCorrelations_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef long sample_interval
+ */
+struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t {
+  PyObject_HEAD
+  int enabled;
+  long sample_interval;
+  __Pyx_memviewslice correlation_sums;
+  __Pyx_memviewslice number_samples;
+};
+
+
+/* "spyns/data_cython.pxd":66
+ * 
+ * 
+ * cdef class OrderParameters_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef const double[:, :] weights
+ */
+struct __pyx_obj_5spyns_11data_cython_OrderParameters_t {
+  PyObject_HEAD
+  int enabled;
+  __Pyx_memviewslice weights;
+  __Pyx_memviewslice values;
+};
+
+
+/* "spyns/data_cython.pxd":72
+ * 
+ * 
+ * cdef class Hamiltonian_t:             # <<<<<<<<<<<<<<
+ *     cdef bint field_enabled
+ *     cdef bint anisotropy_enabled
+ */
+struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t {
+  PyObject_HEAD
+  int field_enabled;
+  int anisotropy_enabled;
+  int exchange_enabled;
+  __Pyx_memviewslice magnetic_field;
+  __Pyx_memviewslice anisotropy;
+  __Pyx_memviewslice exchange_tensors;
+};
+
+
+/* "spyns/data_cython.pxd":81
+ * 
+ * 
+ * cdef class Progress_t:             # <<<<<<<<<<<<<<
+ *     cdef bint enabled
+ *     cdef object callback
+ */
+struct __pyx_obj_5spyns_11data_cython_Progress_t {
+  PyObject_HEAD
+  int enabled;
+  PyObject *callback;
+  long sweep_interval;
+  double time_interval;
+  double start_time;
+  double last_time;
+  int stop_requested;
+};
+
+
+/* "spyns/data_cython.pxd":91
  * 
  * 
  * cdef class SimulationHeisenbergData_t:             # <<<<<<<<<<<<<<
@@ -1086,6 +1197,12 @@ struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t {
   struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t *state;
   struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t *trace;
   struct __pyx_obj_5spyns_11data_cython_Estimators_t *estimators;
+  struct __pyx_obj_5spyns_11data_cython_Histograms_t *histograms;
+  struct __pyx_obj_5spyns_11data_cython_Metrics_t *metrics;
+  struct __pyx_obj_5spyns_11data_cython_Progress_t *progress;
+  struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t *hamiltonian;
+  struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t *shell_correlations;
+  struct __pyx_obj_5spyns_11data_cython_OrderParameters_t *order_parameters;
   PyObject *_data;
 };
 
@@ -1502,6 +1619,9 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func);
         __Pyx__ArgTypeTest(obj, type, name, exact))
 static int __Pyx__ArgTypeTest(PyObject *obj, PyTypeObject *type, const char *name, int exact);
 
+/* BufferIndexError.proto */
+static void __Pyx_RaiseBufferIndexError(int axis);
+
 /* MemviewSliceInit.proto */
 #define __Pyx_BUF_MAX_NDIMS %(BUF_MAX_NDIMS)d
 #define __Pyx_MEMVIEW_DIRECT   1
@@ -1949,6 +2069,12 @@ static PyTypeObject *__pyx_ptype_5spyns_11data_cython_LookupTables_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_HeisenbergState_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Estimators_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_SimulationTrace_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Histograms_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Metrics_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_ShellCorrelations_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_OrderParameters_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Hamiltonian_t = 0;
+static PyTypeObject *__pyx_ptype_5spyns_11data_cython_Progress_t = 0;
 static PyTypeObject *__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t = 0;
 
 /* Module declarations from 'libc.math' */
@@ -1970,10 +2096,12 @@ static PyThread_type_lock __pyx_memoryview_thread_locks[8];
 static std::vector<double>  __pyx_f_5spyns_5model_17heisenberg_cython_sample_random_spin_vector(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
 static void __pyx_f_5spyns_5model_17heisenberg_cython_save_full_state(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch); /*proto*/
 static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch); /*proto*/
+static void __pyx_f_5spyns_5model_17heisenberg_cython_update_shell_correlations(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch); /*proto*/
 static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cython_sum_spin_vectors_within_sublattices(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch); /*proto*/
 static std::vector<double>  __pyx_f_5spyns_5model_17heisenberg_cython_get_site_spin_vector(long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
 static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
 static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_vector_at_site(std::vector<double> , long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
+static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_single_site_energy(double, double, double, long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
 static struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__pyx_f_5spyns_5model_17heisenberg_cython_lookup_neighbor_states(long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *); /*proto*/
 static PyObject *__pyx_convert_vector_to_py_double(const std::vector<double>  &); /*proto*/
 static PyObject *__pyx_convert_vector_to_py_std_3a__3a_vector_3c_double_3e___(const std::vector<std::vector<double> >  &); /*proto*/
@@ -2237,7 +2365,8 @@ static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_11TrialFlip_t_2__red
 static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_11TrialFlip_t_4__setstate_cython__(CYTHON_UNUSED struct __pyx_obj_5spyns_5model_17heisenberg_cython_TrialFlip_t *__pyx_v_self, CYTHON_UNUSED PyObject *__pyx_v___pyx_state); /* proto */
 static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_save_full_state(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data); /* proto */
 static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_2compute_total_energy(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data); /* proto */
-static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_within_sublattices(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data); /* proto */
+static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_4update_shell_correlations(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data); /* proto */
+static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_6sum_spin_vectors_within_sublattices(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data); /* proto */
 static int __pyx_array___pyx_pf_15View_dot_MemoryView_5array___cinit__(struct __pyx_array_obj *__pyx_v_self, PyObject *__pyx_v_shape, Py_ssize_t __pyx_v_itemsize, PyObject *__pyx_v_format, PyObject *__pyx_v_mode, int __pyx_v_allocate_buffer); /* proto */
 static int __pyx_array___pyx_pf_15View_dot_MemoryView_5array_2__getbuffer__(struct __pyx_array_obj *__pyx_v_self, Py_buffer *__pyx_v_info, int __pyx_v_flags); /* proto */
 static void __pyx_array___pyx_pf_15View_dot_MemoryView_5array_4__dealloc__(struct __pyx_array_obj *__pyx_v_self); /* proto */
@@ -3362,7 +3491,7 @@ static void __pyx_f_5spyns_5model_17heisenberg_cython_keep_flip_and_update_state
  */
   if (unlikely(!__pyx_v_data->lookup_tables->sublattice_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 126, __pyx_L1_error)}
   __pyx_t_1 = __pyx_v_site_index;
-  __pyx_v_sublattice_index = (*((long *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->sublattice_table.data + __pyx_t_1 * __pyx_v_data->lookup_tables->sublattice_table.strides[0]) )));
+  __pyx_v_sublattice_index = (*((short const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->sublattice_table.data + __pyx_t_1 * __pyx_v_data->lookup_tables->sublattice_table.strides[0]) )));
 
   /* "spyns/model/heisenberg_cython.pyx":128
  *     cdef long sublattice_index = data.lookup_tables.sublattice_table[site_index]
@@ -3646,9 +3775,15 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
   long __pyx_t_1;
   long __pyx_t_2;
   long __pyx_t_3;
+  int __pyx_t_4;
+  int __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  int __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
   __Pyx_RefNannySetupContext("compute_total_energy", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":175
+  /* "spyns/model/heisenberg_cython.pyx":178
  *     cdef long site_index
  * 
  *     cdef double total_energy = 0             # <<<<<<<<<<<<<<
@@ -3657,7 +3792,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
  */
   __pyx_v_total_energy = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":177
+  /* "spyns/model/heisenberg_cython.pyx":180
  *     cdef double total_energy = 0
  * 
  *     for site_index in range(data.lookup_tables.number_sites):             # <<<<<<<<<<<<<<
@@ -3669,7 +3804,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
   for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
     __pyx_v_site_index = __pyx_t_3;
 
-    /* "spyns/model/heisenberg_cython.pyx":178
+    /* "spyns/model/heisenberg_cython.pyx":181
  * 
  *     for site_index in range(data.lookup_tables.number_sites):
  *         total_energy += compute_site_energy(             # <<<<<<<<<<<<<<
@@ -3677,11 +3812,104 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
  *             data=data,
  */
     __pyx_v_total_energy = (__pyx_v_total_energy + __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(__pyx_v_site_index, __pyx_v_data));
-  }
 
-  /* "spyns/model/heisenberg_cython.pyx":183
+    /* "spyns/model/heisenberg_cython.pyx":186
+ *         )
+ * 
+ *         if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *             total_energy += compute_single_site_energy(
+ *                 site_spin_x=data.state.x[site_index],
+ */
+    __pyx_t_5 = (__pyx_v_data->hamiltonian->field_enabled != 0);
+    if (!__pyx_t_5) {
+    } else {
+      __pyx_t_4 = __pyx_t_5;
+      goto __pyx_L6_bool_binop_done;
+    }
+    __pyx_t_5 = (__pyx_v_data->hamiltonian->anisotropy_enabled != 0);
+    __pyx_t_4 = __pyx_t_5;
+    __pyx_L6_bool_binop_done:;
+    if (__pyx_t_4) {
+
+      /* "spyns/model/heisenberg_cython.pyx":188
+ *         if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:
+ *             total_energy += compute_single_site_energy(
+ *                 site_spin_x=data.state.x[site_index],             # <<<<<<<<<<<<<<
+ *                 site_spin_y=data.state.y[site_index],
+ *                 site_spin_z=data.state.z[site_index],
+ */
+      if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 188, __pyx_L1_error)}
+      __pyx_t_6 = __pyx_v_site_index;
+      __pyx_t_7 = -1;
+      if (__pyx_t_6 < 0) {
+        __pyx_t_6 += __pyx_v_data->state->x.shape[0];
+        if (unlikely(__pyx_t_6 < 0)) __pyx_t_7 = 0;
+      } else if (unlikely(__pyx_t_6 >= __pyx_v_data->state->x.shape[0])) __pyx_t_7 = 0;
+      if (unlikely(__pyx_t_7 != -1)) {
+        __Pyx_RaiseBufferIndexError(__pyx_t_7);
+        __PYX_ERR(0, 188, __pyx_L1_error)
+      }
+
+      /* "spyns/model/heisenberg_cython.pyx":189
+ *             total_energy += compute_single_site_energy(
+ *                 site_spin_x=data.state.x[site_index],
+ *                 site_spin_y=data.state.y[site_index],             # <<<<<<<<<<<<<<
+ *                 site_spin_z=data.state.z[site_index],
+ *                 site_index=site_index,
+ */
+      if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 189, __pyx_L1_error)}
+      __pyx_t_8 = __pyx_v_site_index;
+      __pyx_t_7 = -1;
+      if (__pyx_t_8 < 0) {
+        __pyx_t_8 += __pyx_v_data->state->y.shape[0];
+        if (unlikely(__pyx_t_8 < 0)) __pyx_t_7 = 0;
+      } else if (unlikely(__pyx_t_8 >= __pyx_v_data->state->y.shape[0])) __pyx_t_7 = 0;
+      if (unlikely(__pyx_t_7 != -1)) {
+        __Pyx_RaiseBufferIndexError(__pyx_t_7);
+        __PYX_ERR(0, 189, __pyx_L1_error)
+      }
+
+      /* "spyns/model/heisenberg_cython.pyx":190
+ *                 site_spin_x=data.state.x[site_index],
+ *                 site_spin_y=data.state.y[site_index],
+ *                 site_spin_z=data.state.z[site_index],             # <<<<<<<<<<<<<<
+ *                 site_index=site_index,
+ *                 data=data,
+ */
+      if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 190, __pyx_L1_error)}
+      __pyx_t_9 = __pyx_v_site_index;
+      __pyx_t_7 = -1;
+      if (__pyx_t_9 < 0) {
+        __pyx_t_9 += __pyx_v_data->state->z.shape[0];
+        if (unlikely(__pyx_t_9 < 0)) __pyx_t_7 = 0;
+      } else if (unlikely(__pyx_t_9 >= __pyx_v_data->state->z.shape[0])) __pyx_t_7 = 0;
+      if (unlikely(__pyx_t_7 != -1)) {
+        __Pyx_RaiseBufferIndexError(__pyx_t_7);
+        __PYX_ERR(0, 190, __pyx_L1_error)
+      }
+
+      /* "spyns/model/heisenberg_cython.pyx":187
+ * 
+ *         if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:
+ *             total_energy += compute_single_site_energy(             # <<<<<<<<<<<<<<
+ *                 site_spin_x=data.state.x[site_index],
+ *                 site_spin_y=data.state.y[site_index],
+ */
+      __pyx_v_total_energy = (__pyx_v_total_energy + __pyx_f_5spyns_5model_17heisenberg_cython_compute_single_site_energy((*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_6 * __pyx_v_data->state->x.strides[0]) ))), (*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_8 * __pyx_v_data->state->y.strides[0]) ))), (*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_9 * __pyx_v_data->state->z.strides[0]) ))), __pyx_v_site_index, __pyx_v_data));
+
+      /* "spyns/model/heisenberg_cython.pyx":186
  *         )
  * 
+ *         if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *             total_energy += compute_single_site_energy(
+ *                 site_spin_x=data.state.x[site_index],
+ */
+    }
+  }
+
+  /* "spyns/model/heisenberg_cython.pyx":195
+ *             )
+ * 
  *     return total_energy / 2.0             # <<<<<<<<<<<<<<
  * 
  * 
@@ -3698,6 +3926,9 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
  */
 
   /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_WriteUnraisable("spyns.model.heisenberg_cython.compute_total_energy", __pyx_clineno, __pyx_lineno, __pyx_filename, 1, 0);
+  __pyx_r = 0;
   __pyx_L0:;
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
@@ -3705,7 +3936,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy(str
 
 /* Python wrapper */
 static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_3compute_total_energy(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
-static char __pyx_doc_5spyns_5model_17heisenberg_cython_2compute_total_energy[] = "Compute the total energy estimator for the lattice.\n\n    :param data: Data container for the simulation.\n    :return: Total energy of the simulation state.\n    ";
+static char __pyx_doc_5spyns_5model_17heisenberg_cython_2compute_total_energy[] = "Compute the total energy estimator for the lattice.\n\n    Site energies count every bond twice and every single-site term once, so the\n    single-site terms are added a second time before halving the sum.\n\n    :param data: Data container for the simulation.\n    :return: Total energy of the simulation state.\n    ";
 static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_3compute_total_energy(PyObject *__pyx_self, PyObject *__pyx_v_data) {
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
@@ -3745,7 +3976,228 @@ static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_2compute_total_energ
   return __pyx_r;
 }
 
-/* "spyns/model/heisenberg_cython.pyx":188
+/* "spyns/model/heisenberg_cython.pyx":200
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cpdef void update_shell_correlations(SimulationHeisenbergData_t data):             # <<<<<<<<<<<<<<
+ *     """Add the spin correlations of the current state to the shell correlation sums.
+ * 
+ */
+
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5update_shell_correlations(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
+static void __pyx_f_5spyns_5model_17heisenberg_cython_update_shell_correlations(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data, CYTHON_UNUSED int __pyx_skip_dispatch) {
+  long __pyx_v_site_index;
+  long __pyx_v_lookup_index;
+  long __pyx_v_neighbor_index;
+  long __pyx_v_lookup_start;
+  long __pyx_v_lookup_end;
+  __Pyx_RefNannyDeclarations
+  long __pyx_t_1;
+  long __pyx_t_2;
+  long __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  long __pyx_t_6;
+  long __pyx_t_7;
+  long __pyx_t_8;
+  Py_ssize_t __pyx_t_9;
+  Py_ssize_t __pyx_t_10;
+  Py_ssize_t __pyx_t_11;
+  Py_ssize_t __pyx_t_12;
+  Py_ssize_t __pyx_t_13;
+  Py_ssize_t __pyx_t_14;
+  Py_ssize_t __pyx_t_15;
+  Py_ssize_t __pyx_t_16;
+  Py_ssize_t __pyx_t_17;
+  Py_ssize_t __pyx_t_18;
+  __Pyx_RefNannySetupContext("update_shell_correlations", 0);
+
+  /* "spyns/model/heisenberg_cython.pyx":214
+ *     cdef long lookup_end
+ * 
+ *     for site_index in range(data.lookup_tables.number_sites):             # <<<<<<<<<<<<<<
+ *         lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]
+ *         lookup_end = lookup_start + data.lookup_tables.neighbors_count[site_index]
+ */
+  __pyx_t_1 = __pyx_v_data->lookup_tables->number_sites;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_site_index = __pyx_t_3;
+
+    /* "spyns/model/heisenberg_cython.pyx":215
+ * 
+ *     for site_index in range(data.lookup_tables.number_sites):
+ *         lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]             # <<<<<<<<<<<<<<
+ *         lookup_end = lookup_start + data.lookup_tables.neighbors_count[site_index]
+ * 
+ */
+    if (unlikely(!__pyx_v_data->lookup_tables->neighbors_lookup_index.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 215, __pyx_L1_error)}
+    __pyx_t_4 = __pyx_v_site_index;
+    __pyx_v_lookup_start = (*((long const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_lookup_index.data + __pyx_t_4 * __pyx_v_data->lookup_tables->neighbors_lookup_index.strides[0]) )));
+
+    /* "spyns/model/heisenberg_cython.pyx":216
+ *     for site_index in range(data.lookup_tables.number_sites):
+ *         lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]
+ *         lookup_end = lookup_start + data.lookup_tables.neighbors_count[site_index]             # <<<<<<<<<<<<<<
+ * 
+ *         for lookup_index in range(lookup_start, lookup_end):
+ */
+    if (unlikely(!__pyx_v_data->lookup_tables->neighbors_count.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 216, __pyx_L1_error)}
+    __pyx_t_5 = __pyx_v_site_index;
+    __pyx_v_lookup_end = (__pyx_v_lookup_start + (*((int const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_count.data + __pyx_t_5 * __pyx_v_data->lookup_tables->neighbors_count.strides[0]) ))));
+
+    /* "spyns/model/heisenberg_cython.pyx":218
+ *         lookup_end = lookup_start + data.lookup_tables.neighbors_count[site_index]
+ * 
+ *         for lookup_index in range(lookup_start, lookup_end):             # <<<<<<<<<<<<<<
+ *             neighbor_index = data.lookup_tables.neighbors_table[lookup_index]
+ * 
+ */
+    __pyx_t_6 = __pyx_v_lookup_end;
+    __pyx_t_7 = __pyx_t_6;
+    for (__pyx_t_8 = __pyx_v_lookup_start; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
+      __pyx_v_lookup_index = __pyx_t_8;
+
+      /* "spyns/model/heisenberg_cython.pyx":219
+ * 
+ *         for lookup_index in range(lookup_start, lookup_end):
+ *             neighbor_index = data.lookup_tables.neighbors_table[lookup_index]             # <<<<<<<<<<<<<<
+ * 
+ *             data.shell_correlations.correlation_sums[
+ */
+      if (unlikely(!__pyx_v_data->lookup_tables->neighbors_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 219, __pyx_L1_error)}
+      __pyx_t_9 = __pyx_v_lookup_index;
+      __pyx_v_neighbor_index = (*((int const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_table.data + __pyx_t_9 * __pyx_v_data->lookup_tables->neighbors_table.strides[0]) )));
+
+      /* "spyns/model/heisenberg_cython.pyx":224
+ *                 data.lookup_tables.interaction_class_table[lookup_index]
+ *             ] += (
+ *                 data.state.x[site_index] * data.state.x[neighbor_index] +             # <<<<<<<<<<<<<<
+ *                 data.state.y[site_index] * data.state.y[neighbor_index] +
+ *                 data.state.z[site_index] * data.state.z[neighbor_index]
+ */
+      if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 224, __pyx_L1_error)}
+      __pyx_t_10 = __pyx_v_site_index;
+      if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 224, __pyx_L1_error)}
+      __pyx_t_11 = __pyx_v_neighbor_index;
+
+      /* "spyns/model/heisenberg_cython.pyx":225
+ *             ] += (
+ *                 data.state.x[site_index] * data.state.x[neighbor_index] +
+ *                 data.state.y[site_index] * data.state.y[neighbor_index] +             # <<<<<<<<<<<<<<
+ *                 data.state.z[site_index] * data.state.z[neighbor_index]
+ *             )
+ */
+      if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 225, __pyx_L1_error)}
+      __pyx_t_12 = __pyx_v_site_index;
+      if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 225, __pyx_L1_error)}
+      __pyx_t_13 = __pyx_v_neighbor_index;
+
+      /* "spyns/model/heisenberg_cython.pyx":226
+ *                 data.state.x[site_index] * data.state.x[neighbor_index] +
+ *                 data.state.y[site_index] * data.state.y[neighbor_index] +
+ *                 data.state.z[site_index] * data.state.z[neighbor_index]             # <<<<<<<<<<<<<<
+ *             )
+ * 
+ */
+      if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 226, __pyx_L1_error)}
+      __pyx_t_14 = __pyx_v_site_index;
+      if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 226, __pyx_L1_error)}
+      __pyx_t_15 = __pyx_v_neighbor_index;
+
+      /* "spyns/model/heisenberg_cython.pyx":221
+ *             neighbor_index = data.lookup_tables.neighbors_table[lookup_index]
+ * 
+ *             data.shell_correlations.correlation_sums[             # <<<<<<<<<<<<<<
+ *                 data.lookup_tables.interaction_class_table[lookup_index]
+ *             ] += (
+ */
+      if (unlikely(!__pyx_v_data->shell_correlations->correlation_sums.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 221, __pyx_L1_error)}
+
+      /* "spyns/model/heisenberg_cython.pyx":222
+ * 
+ *             data.shell_correlations.correlation_sums[
+ *                 data.lookup_tables.interaction_class_table[lookup_index]             # <<<<<<<<<<<<<<
+ *             ] += (
+ *                 data.state.x[site_index] * data.state.x[neighbor_index] +
+ */
+      if (unlikely(!__pyx_v_data->lookup_tables->interaction_class_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 222, __pyx_L1_error)}
+      __pyx_t_16 = __pyx_v_lookup_index;
+      __pyx_t_17 = (*((short const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->interaction_class_table.data + __pyx_t_16 * __pyx_v_data->lookup_tables->interaction_class_table.strides[0]) )));
+      *((double *) ( /* dim=0 */ (__pyx_v_data->shell_correlations->correlation_sums.data + __pyx_t_17 * __pyx_v_data->shell_correlations->correlation_sums.strides[0]) )) += ((((*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_10 * __pyx_v_data->state->x.strides[0]) ))) * (*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_11 * __pyx_v_data->state->x.strides[0]) )))) + ((*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_12 * __pyx_v_data->state->y.strides[0]) ))) * (*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_13 * __pyx_v_data->state->y.strides[0]) ))))) + ((*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_14 * __pyx_v_data->state->z.strides[0]) ))) * (*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_15 * __pyx_v_data->state->z.strides[0]) )))));
+    }
+  }
+
+  /* "spyns/model/heisenberg_cython.pyx":229
+ *             )
+ * 
+ *     data.shell_correlations.number_samples[0] += 1             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  if (unlikely(!__pyx_v_data->shell_correlations->number_samples.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 229, __pyx_L1_error)}
+  __pyx_t_18 = 0;
+  *((long *) ( /* dim=0 */ (__pyx_v_data->shell_correlations->number_samples.data + __pyx_t_18 * __pyx_v_data->shell_correlations->number_samples.strides[0]) )) += 1;
+
+  /* "spyns/model/heisenberg_cython.pyx":200
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cpdef void update_shell_correlations(SimulationHeisenbergData_t data):             # <<<<<<<<<<<<<<
+ *     """Add the spin correlations of the current state to the shell correlation sums.
+ * 
+ */
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_WriteUnraisable("spyns.model.heisenberg_cython.update_shell_correlations", __pyx_clineno, __pyx_lineno, __pyx_filename, 1, 0);
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+}
+
+/* Python wrapper */
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5update_shell_correlations(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
+static char __pyx_doc_5spyns_5model_17heisenberg_cython_4update_shell_correlations[] = "Add the spin correlations of the current state to the shell correlation sums.\n\n    One pass over the neighbor table adds ``S_i . S_j`` of every neighbor pair to the\n    sum of the pair's interaction class.\n\n    :param data: Data container for the simulation.\n    ";
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5update_shell_correlations(PyObject *__pyx_self, PyObject *__pyx_v_data) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("update_shell_correlations (wrapper)", 0);
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_data), __pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t, 1, "data", 0))) __PYX_ERR(0, 200, __pyx_L1_error)
+  __pyx_r = __pyx_pf_5spyns_5model_17heisenberg_cython_4update_shell_correlations(__pyx_self, ((struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)__pyx_v_data));
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_4update_shell_correlations(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  __Pyx_RefNannySetupContext("update_shell_correlations", 0);
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = __Pyx_void_to_None(__pyx_f_5spyns_5model_17heisenberg_cython_update_shell_correlations(__pyx_v_data, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 200, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("spyns.model.heisenberg_cython.update_shell_correlations", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "spyns/model/heisenberg_cython.pyx":234
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef vector[vector[double]] sum_spin_vectors_within_sublattices(SimulationHeisenbergData_t data):             # <<<<<<<<<<<<<<
@@ -3753,7 +4205,7 @@ static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_2compute_total_energ
  * 
  */
 
-static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_7sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
 static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cython_sum_spin_vectors_within_sublattices(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data, CYTHON_UNUSED int __pyx_skip_dispatch) {
   long __pyx_v_sublattice;
   CYTHON_UNUSED long __pyx_v_axis;
@@ -3773,7 +4225,7 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
   Py_ssize_t __pyx_t_9;
   __Pyx_RefNannySetupContext("sum_spin_vectors_within_sublattices", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":200
+  /* "spyns/model/heisenberg_cython.pyx":246
  *     cdef vector[vector[double]] spin_vector
  * 
  *     for axis in range(3):             # <<<<<<<<<<<<<<
@@ -3783,7 +4235,7 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
   for (__pyx_t_1 = 0; __pyx_t_1 < 3; __pyx_t_1+=1) {
     __pyx_v_axis = __pyx_t_1;
 
-    /* "spyns/model/heisenberg_cython.pyx":201
+    /* "spyns/model/heisenberg_cython.pyx":247
  * 
  *     for axis in range(3):
  *         sublattice_spin_vector.push_back(0.0)             # <<<<<<<<<<<<<<
@@ -3794,11 +4246,11 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
       __pyx_v_sublattice_spin_vector.push_back(0.0);
     } catch(...) {
       __Pyx_CppExn2PyErr();
-      __PYX_ERR(0, 201, __pyx_L1_error)
+      __PYX_ERR(0, 247, __pyx_L1_error)
     }
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":203
+  /* "spyns/model/heisenberg_cython.pyx":249
  *         sublattice_spin_vector.push_back(0.0)
  * 
  *     for sublattice in range(data.lookup_tables.number_sublattices):             # <<<<<<<<<<<<<<
@@ -3810,7 +4262,7 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
   for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
     __pyx_v_sublattice = __pyx_t_3;
 
-    /* "spyns/model/heisenberg_cython.pyx":204
+    /* "spyns/model/heisenberg_cython.pyx":250
  * 
  *     for sublattice in range(data.lookup_tables.number_sublattices):
  *         spin_vector.push_back(sublattice_spin_vector)             # <<<<<<<<<<<<<<
@@ -3821,11 +4273,11 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
       __pyx_v_spin_vector.push_back(__pyx_v_sublattice_spin_vector);
     } catch(...) {
       __Pyx_CppExn2PyErr();
-      __PYX_ERR(0, 204, __pyx_L1_error)
+      __PYX_ERR(0, 250, __pyx_L1_error)
     }
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":206
+  /* "spyns/model/heisenberg_cython.pyx":252
  *         spin_vector.push_back(sublattice_spin_vector)
  * 
  *     for site_index in range(data.lookup_tables.number_sites):             # <<<<<<<<<<<<<<
@@ -3837,18 +4289,18 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
   for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
     __pyx_v_site_index = __pyx_t_3;
 
-    /* "spyns/model/heisenberg_cython.pyx":207
+    /* "spyns/model/heisenberg_cython.pyx":253
  * 
  *     for site_index in range(data.lookup_tables.number_sites):
  *         sublattice = data.lookup_tables.sublattice_table[site_index]             # <<<<<<<<<<<<<<
  * 
  *         spin_vector[sublattice][0] += data.state.x[site_index]
  */
-    if (unlikely(!__pyx_v_data->lookup_tables->sublattice_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 207, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->lookup_tables->sublattice_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 253, __pyx_L1_error)}
     __pyx_t_4 = __pyx_v_site_index;
-    __pyx_v_sublattice = (*((long *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->sublattice_table.data + __pyx_t_4 * __pyx_v_data->lookup_tables->sublattice_table.strides[0]) )));
+    __pyx_v_sublattice = (*((short const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->sublattice_table.data + __pyx_t_4 * __pyx_v_data->lookup_tables->sublattice_table.strides[0]) )));
 
-    /* "spyns/model/heisenberg_cython.pyx":209
+    /* "spyns/model/heisenberg_cython.pyx":255
  *         sublattice = data.lookup_tables.sublattice_table[site_index]
  * 
  *         spin_vector[sublattice][0] += data.state.x[site_index]             # <<<<<<<<<<<<<<
@@ -3857,11 +4309,11 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
  */
     __pyx_t_5 = __pyx_v_sublattice;
     __pyx_t_6 = 0;
-    if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 209, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 255, __pyx_L1_error)}
     __pyx_t_7 = __pyx_v_site_index;
     ((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) = (((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) + (*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_7 * __pyx_v_data->state->x.strides[0]) ))));
 
-    /* "spyns/model/heisenberg_cython.pyx":210
+    /* "spyns/model/heisenberg_cython.pyx":256
  * 
  *         spin_vector[sublattice][0] += data.state.x[site_index]
  *         spin_vector[sublattice][1] += data.state.y[site_index]             # <<<<<<<<<<<<<<
@@ -3870,11 +4322,11 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
  */
     __pyx_t_5 = __pyx_v_sublattice;
     __pyx_t_6 = 1;
-    if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 210, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 256, __pyx_L1_error)}
     __pyx_t_8 = __pyx_v_site_index;
     ((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) = (((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) + (*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_8 * __pyx_v_data->state->y.strides[0]) ))));
 
-    /* "spyns/model/heisenberg_cython.pyx":211
+    /* "spyns/model/heisenberg_cython.pyx":257
  *         spin_vector[sublattice][0] += data.state.x[site_index]
  *         spin_vector[sublattice][1] += data.state.y[site_index]
  *         spin_vector[sublattice][2] += data.state.z[site_index]             # <<<<<<<<<<<<<<
@@ -3883,12 +4335,12 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
  */
     __pyx_t_5 = __pyx_v_sublattice;
     __pyx_t_6 = 2;
-    if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 211, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 257, __pyx_L1_error)}
     __pyx_t_9 = __pyx_v_site_index;
     ((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) = (((__pyx_v_spin_vector[__pyx_t_5])[__pyx_t_6]) + (*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_9 * __pyx_v_data->state->z.strides[0]) ))));
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":213
+  /* "spyns/model/heisenberg_cython.pyx":259
  *         spin_vector[sublattice][2] += data.state.z[site_index]
  * 
  *     return spin_vector             # <<<<<<<<<<<<<<
@@ -3898,7 +4350,7 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
   __pyx_r = __pyx_v_spin_vector;
   goto __pyx_L0;
 
-  /* "spyns/model/heisenberg_cython.pyx":188
+  /* "spyns/model/heisenberg_cython.pyx":234
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef vector[vector[double]] sum_spin_vectors_within_sublattices(SimulationHeisenbergData_t data):             # <<<<<<<<<<<<<<
@@ -3916,14 +4368,14 @@ static std::vector<std::vector<double> >  __pyx_f_5spyns_5model_17heisenberg_cyt
 }
 
 /* Python wrapper */
-static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
-static char __pyx_doc_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_within_sublattices[] = "Sum the spin vectors within each sublattice.\n\n    :param data: Data container for the simulation.\n    :return: Array of summed spin vectors grouped by sublattice.\n    ";
-static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data) {
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_7sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
+static char __pyx_doc_5spyns_5model_17heisenberg_cython_6sum_spin_vectors_within_sublattices[] = "Sum the spin vectors within each sublattice.\n\n    :param data: Data container for the simulation.\n    :return: Array of summed spin vectors grouped by sublattice.\n    ";
+static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_7sum_spin_vectors_within_sublattices(PyObject *__pyx_self, PyObject *__pyx_v_data) {
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("sum_spin_vectors_within_sublattices (wrapper)", 0);
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_data), __pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t, 1, "data", 0))) __PYX_ERR(0, 188, __pyx_L1_error)
-  __pyx_r = __pyx_pf_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_within_sublattices(__pyx_self, ((struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)__pyx_v_data));
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_data), __pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t, 1, "data", 0))) __PYX_ERR(0, 234, __pyx_L1_error)
+  __pyx_r = __pyx_pf_5spyns_5model_17heisenberg_cython_6sum_spin_vectors_within_sublattices(__pyx_self, ((struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)__pyx_v_data));
 
   /* function exit code */
   goto __pyx_L0;
@@ -3934,13 +4386,13 @@ static PyObject *__pyx_pw_5spyns_5model_17heisenberg_cython_5sum_spin_vectors_wi
   return __pyx_r;
 }
 
-static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_within_sublattices(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data) {
+static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_6sum_spin_vectors_within_sublattices(CYTHON_UNUSED PyObject *__pyx_self, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data) {
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   PyObject *__pyx_t_1 = NULL;
   __Pyx_RefNannySetupContext("sum_spin_vectors_within_sublattices", 0);
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = __pyx_convert_vector_to_py_std_3a__3a_vector_3c_double_3e___(__pyx_f_5spyns_5model_17heisenberg_cython_sum_spin_vectors_within_sublattices(__pyx_v_data, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 188, __pyx_L1_error)
+  __pyx_t_1 = __pyx_convert_vector_to_py_std_3a__3a_vector_3c_double_3e___(__pyx_f_5spyns_5model_17heisenberg_cython_sum_spin_vectors_within_sublattices(__pyx_v_data, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 234, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
@@ -3957,7 +4409,7 @@ static PyObject *__pyx_pf_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_wi
   return __pyx_r;
 }
 
-/* "spyns/model/heisenberg_cython.pyx":218
+/* "spyns/model/heisenberg_cython.pyx":264
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef vector[double] get_site_spin_vector(             # <<<<<<<<<<<<<<
@@ -3974,55 +4426,55 @@ static std::vector<double>  __pyx_f_5spyns_5model_17heisenberg_cython_get_site_s
   Py_ssize_t __pyx_t_3;
   __Pyx_RefNannySetupContext("get_site_spin_vector", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":230
+  /* "spyns/model/heisenberg_cython.pyx":276
  *     cdef vector[double] site_spin
  * 
  *     site_spin.push_back(data.state.x[site_index])             # <<<<<<<<<<<<<<
  *     site_spin.push_back(data.state.y[site_index])
  *     site_spin.push_back(data.state.z[site_index])
  */
-  if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 230, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 276, __pyx_L1_error)}
   __pyx_t_1 = __pyx_v_site_index;
   try {
     __pyx_v_site_spin.push_back((*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_1 * __pyx_v_data->state->x.strides[0]) ))));
   } catch(...) {
     __Pyx_CppExn2PyErr();
-    __PYX_ERR(0, 230, __pyx_L1_error)
+    __PYX_ERR(0, 276, __pyx_L1_error)
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":231
+  /* "spyns/model/heisenberg_cython.pyx":277
  * 
  *     site_spin.push_back(data.state.x[site_index])
  *     site_spin.push_back(data.state.y[site_index])             # <<<<<<<<<<<<<<
  *     site_spin.push_back(data.state.z[site_index])
  * 
  */
-  if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 231, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 277, __pyx_L1_error)}
   __pyx_t_2 = __pyx_v_site_index;
   try {
     __pyx_v_site_spin.push_back((*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_2 * __pyx_v_data->state->y.strides[0]) ))));
   } catch(...) {
     __Pyx_CppExn2PyErr();
-    __PYX_ERR(0, 231, __pyx_L1_error)
+    __PYX_ERR(0, 277, __pyx_L1_error)
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":232
+  /* "spyns/model/heisenberg_cython.pyx":278
  *     site_spin.push_back(data.state.x[site_index])
  *     site_spin.push_back(data.state.y[site_index])
  *     site_spin.push_back(data.state.z[site_index])             # <<<<<<<<<<<<<<
  * 
  *     return site_spin
  */
-  if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 232, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 278, __pyx_L1_error)}
   __pyx_t_3 = __pyx_v_site_index;
   try {
     __pyx_v_site_spin.push_back((*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_3 * __pyx_v_data->state->z.strides[0]) ))));
   } catch(...) {
     __Pyx_CppExn2PyErr();
-    __PYX_ERR(0, 232, __pyx_L1_error)
+    __PYX_ERR(0, 278, __pyx_L1_error)
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":234
+  /* "spyns/model/heisenberg_cython.pyx":280
  *     site_spin.push_back(data.state.z[site_index])
  * 
  *     return site_spin             # <<<<<<<<<<<<<<
@@ -4032,7 +4484,7 @@ static std::vector<double>  __pyx_f_5spyns_5model_17heisenberg_cython_get_site_s
   __pyx_r = __pyx_v_site_spin;
   goto __pyx_L0;
 
-  /* "spyns/model/heisenberg_cython.pyx":218
+  /* "spyns/model/heisenberg_cython.pyx":264
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef vector[double] get_site_spin_vector(             # <<<<<<<<<<<<<<
@@ -4049,7 +4501,7 @@ static std::vector<double>  __pyx_f_5spyns_5model_17heisenberg_cython_get_site_s
   return __pyx_r;
 }
 
-/* "spyns/model/heisenberg_cython.pyx":237
+/* "spyns/model/heisenberg_cython.pyx":283
  * 
  * 
  * cdef double compute_site_energy(             # <<<<<<<<<<<<<<
@@ -4064,7 +4516,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("compute_site_energy", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":247
+  /* "spyns/model/heisenberg_cython.pyx":293
  *     :return: Energy of site specified by ``site_index``.
  *     """
  *     cdef vector[double] site_spin = get_site_spin_vector(site_index=site_index, data=data)             # <<<<<<<<<<<<<<
@@ -4073,7 +4525,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
  */
   __pyx_v_site_spin = __pyx_f_5spyns_5model_17heisenberg_cython_get_site_spin_vector(__pyx_v_site_index, __pyx_v_data);
 
-  /* "spyns/model/heisenberg_cython.pyx":249
+  /* "spyns/model/heisenberg_cython.pyx":295
  *     cdef vector[double] site_spin = get_site_spin_vector(site_index=site_index, data=data)
  * 
  *     cdef double energy = compute_energy_of_spin_vector_at_site(             # <<<<<<<<<<<<<<
@@ -4082,7 +4534,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
  */
   __pyx_v_energy = __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_vector_at_site(__pyx_v_site_spin, __pyx_v_site_index, __pyx_v_data);
 
-  /* "spyns/model/heisenberg_cython.pyx":255
+  /* "spyns/model/heisenberg_cython.pyx":301
  *     )
  * 
  *     return energy             # <<<<<<<<<<<<<<
@@ -4092,7 +4544,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
   __pyx_r = __pyx_v_energy;
   goto __pyx_L0;
 
-  /* "spyns/model/heisenberg_cython.pyx":237
+  /* "spyns/model/heisenberg_cython.pyx":283
  * 
  * 
  * cdef double compute_site_energy(             # <<<<<<<<<<<<<<
@@ -4106,7 +4558,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
   return __pyx_r;
 }
 
-/* "spyns/model/heisenberg_cython.pyx":260
+/* "spyns/model/heisenberg_cython.pyx":306
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef double compute_energy_of_spin_vector_at_site(             # <<<<<<<<<<<<<<
@@ -4116,6 +4568,8 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy(long
 
 static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_vector_at_site(std::vector<double>  __pyx_v_site_spin, long __pyx_v_site_index, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data) {
   long __pyx_v_neighbor;
+  short __pyx_v_interaction_class;
+  __Pyx_memviewslice __pyx_v_exchange_tensor = { 0, 0, { 0 }, { 0 }, { 0 } };
   long __pyx_v_number_neighbors;
   double __pyx_v_energy;
   double __pyx_v_interaction_parameter;
@@ -4133,20 +4587,43 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
   long __pyx_t_3;
   long __pyx_t_4;
   long __pyx_t_5;
+  int __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  __Pyx_memviewslice __pyx_t_9 = { 0, 0, { 0 }, { 0 }, { 0 } };
+  Py_ssize_t __pyx_t_10;
+  Py_ssize_t __pyx_t_11;
+  Py_ssize_t __pyx_t_12;
+  Py_ssize_t __pyx_t_13;
+  Py_ssize_t __pyx_t_14;
+  Py_ssize_t __pyx_t_15;
+  Py_ssize_t __pyx_t_16;
+  Py_ssize_t __pyx_t_17;
+  Py_ssize_t __pyx_t_18;
+  Py_ssize_t __pyx_t_19;
+  Py_ssize_t __pyx_t_20;
+  Py_ssize_t __pyx_t_21;
+  Py_ssize_t __pyx_t_22;
+  Py_ssize_t __pyx_t_23;
+  Py_ssize_t __pyx_t_24;
+  Py_ssize_t __pyx_t_25;
+  Py_ssize_t __pyx_t_26;
+  Py_ssize_t __pyx_t_27;
+  int __pyx_t_28;
   __Pyx_RefNannySetupContext("compute_energy_of_spin_vector_at_site", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":274
- *     cdef long neighbor
+  /* "spyns/model/heisenberg_cython.pyx":325
+ *     cdef const double[:, :] exchange_tensor
  * 
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]             # <<<<<<<<<<<<<<
  *     cdef double energy = 0.0
  *     cdef double interaction_parameter = 0.0
  */
-  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_count.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 274, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_count.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 325, __pyx_L1_error)}
   __pyx_t_1 = __pyx_v_site_index;
-  __pyx_v_number_neighbors = (*((long *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_count.data + __pyx_t_1 * __pyx_v_data->lookup_tables->neighbors_count.strides[0]) )));
+  __pyx_v_number_neighbors = (*((int const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_count.data + __pyx_t_1 * __pyx_v_data->lookup_tables->neighbors_count.strides[0]) )));
 
-  /* "spyns/model/heisenberg_cython.pyx":275
+  /* "spyns/model/heisenberg_cython.pyx":326
  * 
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]
  *     cdef double energy = 0.0             # <<<<<<<<<<<<<<
@@ -4155,7 +4632,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_energy = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":276
+  /* "spyns/model/heisenberg_cython.pyx":327
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]
  *     cdef double energy = 0.0
  *     cdef double interaction_parameter = 0.0             # <<<<<<<<<<<<<<
@@ -4164,7 +4641,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_interaction_parameter = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":277
+  /* "spyns/model/heisenberg_cython.pyx":328
  *     cdef double energy = 0.0
  *     cdef double interaction_parameter = 0.0
  *     cdef double site_spin_x = site_spin[0]             # <<<<<<<<<<<<<<
@@ -4173,7 +4650,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_site_spin_x = (__pyx_v_site_spin[0]);
 
-  /* "spyns/model/heisenberg_cython.pyx":278
+  /* "spyns/model/heisenberg_cython.pyx":329
  *     cdef double interaction_parameter = 0.0
  *     cdef double site_spin_x = site_spin[0]
  *     cdef double site_spin_y = site_spin[1]             # <<<<<<<<<<<<<<
@@ -4182,7 +4659,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_site_spin_y = (__pyx_v_site_spin[1]);
 
-  /* "spyns/model/heisenberg_cython.pyx":279
+  /* "spyns/model/heisenberg_cython.pyx":330
  *     cdef double site_spin_x = site_spin[0]
  *     cdef double site_spin_y = site_spin[1]
  *     cdef double site_spin_z = site_spin[2]             # <<<<<<<<<<<<<<
@@ -4191,7 +4668,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_site_spin_z = (__pyx_v_site_spin[2]);
 
-  /* "spyns/model/heisenberg_cython.pyx":280
+  /* "spyns/model/heisenberg_cython.pyx":331
  *     cdef double site_spin_y = site_spin[1]
  *     cdef double site_spin_z = site_spin[2]
  *     cdef double neighbor_spin_x = 0.0             # <<<<<<<<<<<<<<
@@ -4200,7 +4677,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_neighbor_spin_x = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":281
+  /* "spyns/model/heisenberg_cython.pyx":332
  *     cdef double site_spin_z = site_spin[2]
  *     cdef double neighbor_spin_x = 0.0
  *     cdef double neighbor_spin_y = 0.0             # <<<<<<<<<<<<<<
@@ -4209,7 +4686,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_neighbor_spin_y = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":282
+  /* "spyns/model/heisenberg_cython.pyx":333
  *     cdef double neighbor_spin_x = 0.0
  *     cdef double neighbor_spin_y = 0.0
  *     cdef double neighbor_spin_z = 0.0             # <<<<<<<<<<<<<<
@@ -4218,19 +4695,19 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
   __pyx_v_neighbor_spin_z = 0.0;
 
-  /* "spyns/model/heisenberg_cython.pyx":284
+  /* "spyns/model/heisenberg_cython.pyx":335
  *     cdef double neighbor_spin_z = 0.0
  * 
  *     cdef NeighborStates_t neighbor_states = lookup_neighbor_states(             # <<<<<<<<<<<<<<
  *         site_index=site_index,
  *         data=data,
  */
-  __pyx_t_2 = ((PyObject *)__pyx_f_5spyns_5model_17heisenberg_cython_lookup_neighbor_states(__pyx_v_site_index, __pyx_v_data)); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 284, __pyx_L1_error)
+  __pyx_t_2 = ((PyObject *)__pyx_f_5spyns_5model_17heisenberg_cython_lookup_neighbor_states(__pyx_v_site_index, __pyx_v_data)); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 335, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __pyx_v_neighbor_states = ((struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *)__pyx_t_2);
   __pyx_t_2 = 0;
 
-  /* "spyns/model/heisenberg_cython.pyx":289
+  /* "spyns/model/heisenberg_cython.pyx":340
  *     )
  * 
  *     for neighbor in range(number_neighbors):             # <<<<<<<<<<<<<<
@@ -4242,7 +4719,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
   for (__pyx_t_5 = 0; __pyx_t_5 < __pyx_t_4; __pyx_t_5+=1) {
     __pyx_v_neighbor = __pyx_t_5;
 
-    /* "spyns/model/heisenberg_cython.pyx":290
+    /* "spyns/model/heisenberg_cython.pyx":341
  * 
  *     for neighbor in range(number_neighbors):
  *         interaction_parameter = neighbor_states.interaction_parameters[neighbor]             # <<<<<<<<<<<<<<
@@ -4251,7 +4728,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
     __pyx_v_interaction_parameter = (__pyx_v_neighbor_states->interaction_parameters[__pyx_v_neighbor]);
 
-    /* "spyns/model/heisenberg_cython.pyx":291
+    /* "spyns/model/heisenberg_cython.pyx":342
  *     for neighbor in range(number_neighbors):
  *         interaction_parameter = neighbor_states.interaction_parameters[neighbor]
  *         neighbor_spin_x = neighbor_states.x[neighbor]             # <<<<<<<<<<<<<<
@@ -4260,7 +4737,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
     __pyx_v_neighbor_spin_x = (__pyx_v_neighbor_states->x[__pyx_v_neighbor]);
 
-    /* "spyns/model/heisenberg_cython.pyx":292
+    /* "spyns/model/heisenberg_cython.pyx":343
  *         interaction_parameter = neighbor_states.interaction_parameters[neighbor]
  *         neighbor_spin_x = neighbor_states.x[neighbor]
  *         neighbor_spin_y = neighbor_states.y[neighbor]             # <<<<<<<<<<<<<<
@@ -4269,7 +4746,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
     __pyx_v_neighbor_spin_y = (__pyx_v_neighbor_states->y[__pyx_v_neighbor]);
 
-    /* "spyns/model/heisenberg_cython.pyx":293
+    /* "spyns/model/heisenberg_cython.pyx":344
  *         neighbor_spin_x = neighbor_states.x[neighbor]
  *         neighbor_spin_y = neighbor_states.y[neighbor]
  *         neighbor_spin_z = neighbor_states.z[neighbor]             # <<<<<<<<<<<<<<
@@ -4278,7 +4755,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  */
     __pyx_v_neighbor_spin_z = (__pyx_v_neighbor_states->z[__pyx_v_neighbor]);
 
-    /* "spyns/model/heisenberg_cython.pyx":295
+    /* "spyns/model/heisenberg_cython.pyx":346
  *         neighbor_spin_z = neighbor_states.z[neighbor]
  * 
  *         energy += interaction_parameter * (             # <<<<<<<<<<<<<<
@@ -4286,9 +4763,223 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
  *             site_spin_z * neighbor_spin_z
  */
     __pyx_v_energy = (__pyx_v_energy + (__pyx_v_interaction_parameter * (((__pyx_v_site_spin_x * __pyx_v_neighbor_spin_x) + (__pyx_v_site_spin_y * __pyx_v_neighbor_spin_y)) + (__pyx_v_site_spin_z * __pyx_v_neighbor_spin_z))));
+
+    /* "spyns/model/heisenberg_cython.pyx":351
+ *         )
+ * 
+ *         if data.hamiltonian.exchange_enabled:             # <<<<<<<<<<<<<<
+ *             interaction_class = data.lookup_tables.interaction_class_table[
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+ */
+    __pyx_t_6 = (__pyx_v_data->hamiltonian->exchange_enabled != 0);
+    if (__pyx_t_6) {
+
+      /* "spyns/model/heisenberg_cython.pyx":352
+ * 
+ *         if data.hamiltonian.exchange_enabled:
+ *             interaction_class = data.lookup_tables.interaction_class_table[             # <<<<<<<<<<<<<<
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+ *             ]
+ */
+      if (unlikely(!__pyx_v_data->lookup_tables->interaction_class_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 352, __pyx_L1_error)}
+
+      /* "spyns/model/heisenberg_cython.pyx":353
+ *         if data.hamiltonian.exchange_enabled:
+ *             interaction_class = data.lookup_tables.interaction_class_table[
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor             # <<<<<<<<<<<<<<
+ *             ]
+ *             exchange_tensor = data.hamiltonian.exchange_tensors[interaction_class]
+ */
+      if (unlikely(!__pyx_v_data->lookup_tables->neighbors_lookup_index.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 353, __pyx_L1_error)}
+      __pyx_t_7 = __pyx_v_site_index;
+
+      /* "spyns/model/heisenberg_cython.pyx":352
+ * 
+ *         if data.hamiltonian.exchange_enabled:
+ *             interaction_class = data.lookup_tables.interaction_class_table[             # <<<<<<<<<<<<<<
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+ *             ]
+ */
+      __pyx_t_8 = ((*((long const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_lookup_index.data + __pyx_t_7 * __pyx_v_data->lookup_tables->neighbors_lookup_index.strides[0]) ))) + __pyx_v_neighbor);
+      __pyx_v_interaction_class = (*((short const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->interaction_class_table.data + __pyx_t_8 * __pyx_v_data->lookup_tables->interaction_class_table.strides[0]) )));
+
+      /* "spyns/model/heisenberg_cython.pyx":355
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+ *             ]
+ *             exchange_tensor = data.hamiltonian.exchange_tensors[interaction_class]             # <<<<<<<<<<<<<<
+ * 
+ *             energy += (
+ */
+      if (unlikely(!__pyx_v_data->hamiltonian->exchange_tensors.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 355, __pyx_L1_error)}
+      __pyx_t_9.data = __pyx_v_data->hamiltonian->exchange_tensors.data;
+      __pyx_t_9.memview = __pyx_v_data->hamiltonian->exchange_tensors.memview;
+      __PYX_INC_MEMVIEW(&__pyx_t_9, 0);
+      {
+    Py_ssize_t __pyx_tmp_idx = __pyx_v_interaction_class;
+    Py_ssize_t __pyx_tmp_stride = __pyx_v_data->hamiltonian->exchange_tensors.strides[0];
+        if ((0)) __PYX_ERR(0, 355, __pyx_L1_error)
+        __pyx_t_9.data += __pyx_tmp_idx * __pyx_tmp_stride;
+}
+
+__pyx_t_9.shape[0] = __pyx_v_data->hamiltonian->exchange_tensors.shape[1];
+__pyx_t_9.strides[0] = __pyx_v_data->hamiltonian->exchange_tensors.strides[1];
+    __pyx_t_9.suboffsets[0] = -1;
+
+__pyx_t_9.shape[1] = __pyx_v_data->hamiltonian->exchange_tensors.shape[2];
+__pyx_t_9.strides[1] = __pyx_v_data->hamiltonian->exchange_tensors.strides[2];
+    __pyx_t_9.suboffsets[1] = -1;
+
+__PYX_XDEC_MEMVIEW(&__pyx_v_exchange_tensor, 1);
+      __pyx_v_exchange_tensor = __pyx_t_9;
+      __pyx_t_9.memview = NULL;
+      __pyx_t_9.data = NULL;
+
+      /* "spyns/model/heisenberg_cython.pyx":359
+ *             energy += (
+ *                 site_spin_x * (
+ *                     exchange_tensor[0, 0] * neighbor_spin_x +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[0, 1] * neighbor_spin_y +
+ *                     exchange_tensor[0, 2] * neighbor_spin_z
+ */
+      __pyx_t_10 = 0;
+      __pyx_t_11 = 0;
+
+      /* "spyns/model/heisenberg_cython.pyx":360
+ *                 site_spin_x * (
+ *                     exchange_tensor[0, 0] * neighbor_spin_x +
+ *                     exchange_tensor[0, 1] * neighbor_spin_y +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[0, 2] * neighbor_spin_z
+ *                 ) +
+ */
+      __pyx_t_12 = 0;
+      __pyx_t_13 = 1;
+
+      /* "spyns/model/heisenberg_cython.pyx":361
+ *                     exchange_tensor[0, 0] * neighbor_spin_x +
+ *                     exchange_tensor[0, 1] * neighbor_spin_y +
+ *                     exchange_tensor[0, 2] * neighbor_spin_z             # <<<<<<<<<<<<<<
+ *                 ) +
+ *                 site_spin_y * (
+ */
+      __pyx_t_14 = 0;
+      __pyx_t_15 = 2;
+
+      /* "spyns/model/heisenberg_cython.pyx":364
+ *                 ) +
+ *                 site_spin_y * (
+ *                     exchange_tensor[1, 0] * neighbor_spin_x +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[1, 1] * neighbor_spin_y +
+ *                     exchange_tensor[1, 2] * neighbor_spin_z
+ */
+      __pyx_t_16 = 1;
+      __pyx_t_17 = 0;
+
+      /* "spyns/model/heisenberg_cython.pyx":365
+ *                 site_spin_y * (
+ *                     exchange_tensor[1, 0] * neighbor_spin_x +
+ *                     exchange_tensor[1, 1] * neighbor_spin_y +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[1, 2] * neighbor_spin_z
+ *                 ) +
+ */
+      __pyx_t_18 = 1;
+      __pyx_t_19 = 1;
+
+      /* "spyns/model/heisenberg_cython.pyx":366
+ *                     exchange_tensor[1, 0] * neighbor_spin_x +
+ *                     exchange_tensor[1, 1] * neighbor_spin_y +
+ *                     exchange_tensor[1, 2] * neighbor_spin_z             # <<<<<<<<<<<<<<
+ *                 ) +
+ *                 site_spin_z * (
+ */
+      __pyx_t_20 = 1;
+      __pyx_t_21 = 2;
+
+      /* "spyns/model/heisenberg_cython.pyx":369
+ *                 ) +
+ *                 site_spin_z * (
+ *                     exchange_tensor[2, 0] * neighbor_spin_x +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[2, 1] * neighbor_spin_y +
+ *                     exchange_tensor[2, 2] * neighbor_spin_z
+ */
+      __pyx_t_22 = 2;
+      __pyx_t_23 = 0;
+
+      /* "spyns/model/heisenberg_cython.pyx":370
+ *                 site_spin_z * (
+ *                     exchange_tensor[2, 0] * neighbor_spin_x +
+ *                     exchange_tensor[2, 1] * neighbor_spin_y +             # <<<<<<<<<<<<<<
+ *                     exchange_tensor[2, 2] * neighbor_spin_z
+ *                 )
+ */
+      __pyx_t_24 = 2;
+      __pyx_t_25 = 1;
+
+      /* "spyns/model/heisenberg_cython.pyx":371
+ *                     exchange_tensor[2, 0] * neighbor_spin_x +
+ *                     exchange_tensor[2, 1] * neighbor_spin_y +
+ *                     exchange_tensor[2, 2] * neighbor_spin_z             # <<<<<<<<<<<<<<
+ *                 )
+ *             )
+ */
+      __pyx_t_26 = 2;
+      __pyx_t_27 = 2;
+
+      /* "spyns/model/heisenberg_cython.pyx":357
+ *             exchange_tensor = data.hamiltonian.exchange_tensors[interaction_class]
+ * 
+ *             energy += (             # <<<<<<<<<<<<<<
+ *                 site_spin_x * (
+ *                     exchange_tensor[0, 0] * neighbor_spin_x +
+ */
+      __pyx_v_energy = (__pyx_v_energy + (((__pyx_v_site_spin_x * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_10 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_11 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_12 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_13 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_14 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_15 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_z))) + (__pyx_v_site_spin_y * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_16 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_17 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_18 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_19 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_20 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_21 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_z)))) + (__pyx_v_site_spin_z * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_22 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_23 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_24 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_25 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_exchange_tensor.data + __pyx_t_26 * __pyx_v_exchange_tensor.strides[0]) ) + __pyx_t_27 * __pyx_v_exchange_tensor.strides[1]) ))) * __pyx_v_neighbor_spin_z)))));
+
+      /* "spyns/model/heisenberg_cython.pyx":351
+ *         )
+ * 
+ *         if data.hamiltonian.exchange_enabled:             # <<<<<<<<<<<<<<
+ *             interaction_class = data.lookup_tables.interaction_class_table[
+ *                 data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+ */
+    }
+  }
+
+  /* "spyns/model/heisenberg_cython.pyx":375
+ *             )
+ * 
+ *     if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *         energy += compute_single_site_energy(
+ *             site_spin_x=site_spin_x,
+ */
+  __pyx_t_28 = (__pyx_v_data->hamiltonian->field_enabled != 0);
+  if (!__pyx_t_28) {
+  } else {
+    __pyx_t_6 = __pyx_t_28;
+    goto __pyx_L7_bool_binop_done;
+  }
+  __pyx_t_28 = (__pyx_v_data->hamiltonian->anisotropy_enabled != 0);
+  __pyx_t_6 = __pyx_t_28;
+  __pyx_L7_bool_binop_done:;
+  if (__pyx_t_6) {
+
+    /* "spyns/model/heisenberg_cython.pyx":376
+ * 
+ *     if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:
+ *         energy += compute_single_site_energy(             # <<<<<<<<<<<<<<
+ *             site_spin_x=site_spin_x,
+ *             site_spin_y=site_spin_y,
+ */
+    __pyx_v_energy = (__pyx_v_energy + __pyx_f_5spyns_5model_17heisenberg_cython_compute_single_site_energy(__pyx_v_site_spin_x, __pyx_v_site_spin_y, __pyx_v_site_spin_z, __pyx_v_site_index, __pyx_v_data));
+
+    /* "spyns/model/heisenberg_cython.pyx":375
+ *             )
+ * 
+ *     if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *         energy += compute_single_site_energy(
+ *             site_spin_x=site_spin_x,
+ */
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":300
+  /* "spyns/model/heisenberg_cython.pyx":384
  *         )
  * 
  *     return energy             # <<<<<<<<<<<<<<
@@ -4298,7 +4989,7 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
   __pyx_r = __pyx_v_energy;
   goto __pyx_L0;
 
-  /* "spyns/model/heisenberg_cython.pyx":260
+  /* "spyns/model/heisenberg_cython.pyx":306
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef double compute_energy_of_spin_vector_at_site(             # <<<<<<<<<<<<<<
@@ -4309,15 +5000,318 @@ static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_v
   /* function exit code */
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_2);
+  __PYX_XDEC_MEMVIEW(&__pyx_t_9, 1);
   __Pyx_WriteUnraisable("spyns.model.heisenberg_cython.compute_energy_of_spin_vector_at_site", __pyx_clineno, __pyx_lineno, __pyx_filename, 1, 0);
   __pyx_r = 0;
   __pyx_L0:;
+  __PYX_XDEC_MEMVIEW(&__pyx_v_exchange_tensor, 1);
   __Pyx_XDECREF((PyObject *)__pyx_v_neighbor_states);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "spyns/model/heisenberg_cython.pyx":305
+/* "spyns/model/heisenberg_cython.pyx":389
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cdef double compute_single_site_energy(             # <<<<<<<<<<<<<<
+ *     double site_spin_x,
+ *     double site_spin_y,
+ */
+
+static double __pyx_f_5spyns_5model_17heisenberg_cython_compute_single_site_energy(double __pyx_v_site_spin_x, double __pyx_v_site_spin_y, double __pyx_v_site_spin_z, long __pyx_v_site_index, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *__pyx_v_data) {
+  __Pyx_memviewslice __pyx_v_anisotropy = { 0, 0, { 0 }, { 0 }, { 0 } };
+  long __pyx_v_sublattice;
+  double __pyx_v_energy;
+  double __pyx_r;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  int __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  __Pyx_memviewslice __pyx_t_9 = { 0, 0, { 0 }, { 0 }, { 0 } };
+  Py_ssize_t __pyx_t_10;
+  Py_ssize_t __pyx_t_11;
+  Py_ssize_t __pyx_t_12;
+  Py_ssize_t __pyx_t_13;
+  Py_ssize_t __pyx_t_14;
+  Py_ssize_t __pyx_t_15;
+  Py_ssize_t __pyx_t_16;
+  Py_ssize_t __pyx_t_17;
+  Py_ssize_t __pyx_t_18;
+  Py_ssize_t __pyx_t_19;
+  Py_ssize_t __pyx_t_20;
+  Py_ssize_t __pyx_t_21;
+  Py_ssize_t __pyx_t_22;
+  Py_ssize_t __pyx_t_23;
+  Py_ssize_t __pyx_t_24;
+  Py_ssize_t __pyx_t_25;
+  Py_ssize_t __pyx_t_26;
+  Py_ssize_t __pyx_t_27;
+  __Pyx_RefNannySetupContext("compute_single_site_energy", 0);
+
+  /* "spyns/model/heisenberg_cython.pyx":407
+ *     cdef const double[:, :] anisotropy
+ * 
+ *     cdef long sublattice = data.lookup_tables.sublattice_table[site_index]             # <<<<<<<<<<<<<<
+ *     cdef double energy = 0.0
+ * 
+ */
+  if (unlikely(!__pyx_v_data->lookup_tables->sublattice_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 407, __pyx_L1_error)}
+  __pyx_t_1 = __pyx_v_site_index;
+  __pyx_v_sublattice = (*((short const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->sublattice_table.data + __pyx_t_1 * __pyx_v_data->lookup_tables->sublattice_table.strides[0]) )));
+
+  /* "spyns/model/heisenberg_cython.pyx":408
+ * 
+ *     cdef long sublattice = data.lookup_tables.sublattice_table[site_index]
+ *     cdef double energy = 0.0             # <<<<<<<<<<<<<<
+ * 
+ *     if data.hamiltonian.field_enabled:
+ */
+  __pyx_v_energy = 0.0;
+
+  /* "spyns/model/heisenberg_cython.pyx":410
+ *     cdef double energy = 0.0
+ * 
+ *     if data.hamiltonian.field_enabled:             # <<<<<<<<<<<<<<
+ *         energy -= (
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+ */
+  __pyx_t_2 = (__pyx_v_data->hamiltonian->field_enabled != 0);
+  if (__pyx_t_2) {
+
+    /* "spyns/model/heisenberg_cython.pyx":412
+ *     if data.hamiltonian.field_enabled:
+ *         energy -= (
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +             # <<<<<<<<<<<<<<
+ *             data.hamiltonian.magnetic_field[sublattice, 1] * site_spin_y +
+ *             data.hamiltonian.magnetic_field[sublattice, 2] * site_spin_z
+ */
+    if (unlikely(!__pyx_v_data->hamiltonian->magnetic_field.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 412, __pyx_L1_error)}
+    __pyx_t_3 = __pyx_v_sublattice;
+    __pyx_t_4 = 0;
+
+    /* "spyns/model/heisenberg_cython.pyx":413
+ *         energy -= (
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+ *             data.hamiltonian.magnetic_field[sublattice, 1] * site_spin_y +             # <<<<<<<<<<<<<<
+ *             data.hamiltonian.magnetic_field[sublattice, 2] * site_spin_z
+ *         )
+ */
+    if (unlikely(!__pyx_v_data->hamiltonian->magnetic_field.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 413, __pyx_L1_error)}
+    __pyx_t_5 = __pyx_v_sublattice;
+    __pyx_t_6 = 1;
+
+    /* "spyns/model/heisenberg_cython.pyx":414
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+ *             data.hamiltonian.magnetic_field[sublattice, 1] * site_spin_y +
+ *             data.hamiltonian.magnetic_field[sublattice, 2] * site_spin_z             # <<<<<<<<<<<<<<
+ *         )
+ * 
+ */
+    if (unlikely(!__pyx_v_data->hamiltonian->magnetic_field.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 414, __pyx_L1_error)}
+    __pyx_t_7 = __pyx_v_sublattice;
+    __pyx_t_8 = 2;
+
+    /* "spyns/model/heisenberg_cython.pyx":411
+ * 
+ *     if data.hamiltonian.field_enabled:
+ *         energy -= (             # <<<<<<<<<<<<<<
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+ *             data.hamiltonian.magnetic_field[sublattice, 1] * site_spin_y +
+ */
+    __pyx_v_energy = (__pyx_v_energy - ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_data->hamiltonian->magnetic_field.data + __pyx_t_3 * __pyx_v_data->hamiltonian->magnetic_field.strides[0]) ) + __pyx_t_4 * __pyx_v_data->hamiltonian->magnetic_field.strides[1]) ))) * __pyx_v_site_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_data->hamiltonian->magnetic_field.data + __pyx_t_5 * __pyx_v_data->hamiltonian->magnetic_field.strides[0]) ) + __pyx_t_6 * __pyx_v_data->hamiltonian->magnetic_field.strides[1]) ))) * __pyx_v_site_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_data->hamiltonian->magnetic_field.data + __pyx_t_7 * __pyx_v_data->hamiltonian->magnetic_field.strides[0]) ) + __pyx_t_8 * __pyx_v_data->hamiltonian->magnetic_field.strides[1]) ))) * __pyx_v_site_spin_z)));
+
+    /* "spyns/model/heisenberg_cython.pyx":410
+ *     cdef double energy = 0.0
+ * 
+ *     if data.hamiltonian.field_enabled:             # <<<<<<<<<<<<<<
+ *         energy -= (
+ *             data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+ */
+  }
+
+  /* "spyns/model/heisenberg_cython.pyx":417
+ *         )
+ * 
+ *     if data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *         anisotropy = data.hamiltonian.anisotropy[sublattice]
+ * 
+ */
+  __pyx_t_2 = (__pyx_v_data->hamiltonian->anisotropy_enabled != 0);
+  if (__pyx_t_2) {
+
+    /* "spyns/model/heisenberg_cython.pyx":418
+ * 
+ *     if data.hamiltonian.anisotropy_enabled:
+ *         anisotropy = data.hamiltonian.anisotropy[sublattice]             # <<<<<<<<<<<<<<
+ * 
+ *         energy += (
+ */
+    if (unlikely(!__pyx_v_data->hamiltonian->anisotropy.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 418, __pyx_L1_error)}
+    __pyx_t_9.data = __pyx_v_data->hamiltonian->anisotropy.data;
+    __pyx_t_9.memview = __pyx_v_data->hamiltonian->anisotropy.memview;
+    __PYX_INC_MEMVIEW(&__pyx_t_9, 0);
+    {
+    Py_ssize_t __pyx_tmp_idx = __pyx_v_sublattice;
+    Py_ssize_t __pyx_tmp_stride = __pyx_v_data->hamiltonian->anisotropy.strides[0];
+        if ((0)) __PYX_ERR(0, 418, __pyx_L1_error)
+        __pyx_t_9.data += __pyx_tmp_idx * __pyx_tmp_stride;
+}
+
+__pyx_t_9.shape[0] = __pyx_v_data->hamiltonian->anisotropy.shape[1];
+__pyx_t_9.strides[0] = __pyx_v_data->hamiltonian->anisotropy.strides[1];
+    __pyx_t_9.suboffsets[0] = -1;
+
+__pyx_t_9.shape[1] = __pyx_v_data->hamiltonian->anisotropy.shape[2];
+__pyx_t_9.strides[1] = __pyx_v_data->hamiltonian->anisotropy.strides[2];
+    __pyx_t_9.suboffsets[1] = -1;
+
+__pyx_v_anisotropy = __pyx_t_9;
+    __pyx_t_9.memview = NULL;
+    __pyx_t_9.data = NULL;
+
+    /* "spyns/model/heisenberg_cython.pyx":422
+ *         energy += (
+ *             site_spin_x * (
+ *                 anisotropy[0, 0] * site_spin_x +             # <<<<<<<<<<<<<<
+ *                 anisotropy[0, 1] * site_spin_y +
+ *                 anisotropy[0, 2] * site_spin_z
+ */
+    __pyx_t_10 = 0;
+    __pyx_t_11 = 0;
+
+    /* "spyns/model/heisenberg_cython.pyx":423
+ *             site_spin_x * (
+ *                 anisotropy[0, 0] * site_spin_x +
+ *                 anisotropy[0, 1] * site_spin_y +             # <<<<<<<<<<<<<<
+ *                 anisotropy[0, 2] * site_spin_z
+ *             ) +
+ */
+    __pyx_t_12 = 0;
+    __pyx_t_13 = 1;
+
+    /* "spyns/model/heisenberg_cython.pyx":424
+ *                 anisotropy[0, 0] * site_spin_x +
+ *                 anisotropy[0, 1] * site_spin_y +
+ *                 anisotropy[0, 2] * site_spin_z             # <<<<<<<<<<<<<<
+ *             ) +
+ *             site_spin_y * (
+ */
+    __pyx_t_14 = 0;
+    __pyx_t_15 = 2;
+
+    /* "spyns/model/heisenberg_cython.pyx":427
+ *             ) +
+ *             site_spin_y * (
+ *                 anisotropy[1, 0] * site_spin_x +             # <<<<<<<<<<<<<<
+ *                 anisotropy[1, 1] * site_spin_y +
+ *                 anisotropy[1, 2] * site_spin_z
+ */
+    __pyx_t_16 = 1;
+    __pyx_t_17 = 0;
+
+    /* "spyns/model/heisenberg_cython.pyx":428
+ *             site_spin_y * (
+ *                 anisotropy[1, 0] * site_spin_x +
+ *                 anisotropy[1, 1] * site_spin_y +             # <<<<<<<<<<<<<<
+ *                 anisotropy[1, 2] * site_spin_z
+ *             ) +
+ */
+    __pyx_t_18 = 1;
+    __pyx_t_19 = 1;
+
+    /* "spyns/model/heisenberg_cython.pyx":429
+ *                 anisotropy[1, 0] * site_spin_x +
+ *                 anisotropy[1, 1] * site_spin_y +
+ *                 anisotropy[1, 2] * site_spin_z             # <<<<<<<<<<<<<<
+ *             ) +
+ *             site_spin_z * (
+ */
+    __pyx_t_20 = 1;
+    __pyx_t_21 = 2;
+
+    /* "spyns/model/heisenberg_cython.pyx":432
+ *             ) +
+ *             site_spin_z * (
+ *                 anisotropy[2, 0] * site_spin_x +             # <<<<<<<<<<<<<<
+ *                 anisotropy[2, 1] * site_spin_y +
+ *                 anisotropy[2, 2] * site_spin_z
+ */
+    __pyx_t_22 = 2;
+    __pyx_t_23 = 0;
+
+    /* "spyns/model/heisenberg_cython.pyx":433
+ *             site_spin_z * (
+ *                 anisotropy[2, 0] * site_spin_x +
+ *                 anisotropy[2, 1] * site_spin_y +             # <<<<<<<<<<<<<<
+ *                 anisotropy[2, 2] * site_spin_z
+ *             )
+ */
+    __pyx_t_24 = 2;
+    __pyx_t_25 = 1;
+
+    /* "spyns/model/heisenberg_cython.pyx":434
+ *                 anisotropy[2, 0] * site_spin_x +
+ *                 anisotropy[2, 1] * site_spin_y +
+ *                 anisotropy[2, 2] * site_spin_z             # <<<<<<<<<<<<<<
+ *             )
+ *         )
+ */
+    __pyx_t_26 = 2;
+    __pyx_t_27 = 2;
+
+    /* "spyns/model/heisenberg_cython.pyx":420
+ *         anisotropy = data.hamiltonian.anisotropy[sublattice]
+ * 
+ *         energy += (             # <<<<<<<<<<<<<<
+ *             site_spin_x * (
+ *                 anisotropy[0, 0] * site_spin_x +
+ */
+    __pyx_v_energy = (__pyx_v_energy + (((__pyx_v_site_spin_x * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_10 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_11 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_12 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_13 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_14 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_15 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_z))) + (__pyx_v_site_spin_y * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_16 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_17 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_18 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_19 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_20 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_21 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_z)))) + (__pyx_v_site_spin_z * ((((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_22 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_23 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_x) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_24 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_25 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_y)) + ((*((double const  *) ( /* dim=1 */ (( /* dim=0 */ (__pyx_v_anisotropy.data + __pyx_t_26 * __pyx_v_anisotropy.strides[0]) ) + __pyx_t_27 * __pyx_v_anisotropy.strides[1]) ))) * __pyx_v_site_spin_z)))));
+
+    /* "spyns/model/heisenberg_cython.pyx":417
+ *         )
+ * 
+ *     if data.hamiltonian.anisotropy_enabled:             # <<<<<<<<<<<<<<
+ *         anisotropy = data.hamiltonian.anisotropy[sublattice]
+ * 
+ */
+  }
+
+  /* "spyns/model/heisenberg_cython.pyx":438
+ *         )
+ * 
+ *     return energy             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = __pyx_v_energy;
+  goto __pyx_L0;
+
+  /* "spyns/model/heisenberg_cython.pyx":389
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cdef double compute_single_site_energy(             # <<<<<<<<<<<<<<
+ *     double site_spin_x,
+ *     double site_spin_y,
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __PYX_XDEC_MEMVIEW(&__pyx_t_9, 1);
+  __Pyx_WriteUnraisable("spyns.model.heisenberg_cython.compute_single_site_energy", __pyx_clineno, __pyx_lineno, __pyx_filename, 1, 0);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __PYX_XDEC_MEMVIEW(&__pyx_v_anisotropy, 1);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "spyns/model/heisenberg_cython.pyx":443
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef NeighborStates_t lookup_neighbor_states(             # <<<<<<<<<<<<<<
@@ -4333,7 +5327,7 @@ static struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__py
   long __pyx_v_lookup_end;
   struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__pyx_v_neighbor_states = 0;
   __Pyx_memviewslice __pyx_v_neighbor_indices = { 0, 0, { 0 }, { 0 }, { 0 } };
-  __Pyx_memviewslice __pyx_v_interaction_parameters = { 0, 0, { 0 }, { 0 }, { 0 } };
+  __Pyx_memviewslice __pyx_v_interaction_classes = { 0, 0, { 0 }, { 0 }, { 0 } };
   struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   Py_ssize_t __pyx_t_1;
@@ -4351,31 +5345,32 @@ static struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__py
   Py_ssize_t __pyx_t_13;
   Py_ssize_t __pyx_t_14;
   Py_ssize_t __pyx_t_15;
+  Py_ssize_t __pyx_t_16;
   __Pyx_RefNannySetupContext("lookup_neighbor_states", 0);
 
-  /* "spyns/model/heisenberg_cython.pyx":318
+  /* "spyns/model/heisenberg_cython.pyx":456
  *     cdef long neighbor_index
  * 
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]             # <<<<<<<<<<<<<<
  *     cdef long lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]
  *     cdef long lookup_end = lookup_start + number_neighbors
  */
-  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_count.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 318, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_count.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 456, __pyx_L1_error)}
   __pyx_t_1 = __pyx_v_site_index;
-  __pyx_v_number_neighbors = (*((long *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_count.data + __pyx_t_1 * __pyx_v_data->lookup_tables->neighbors_count.strides[0]) )));
+  __pyx_v_number_neighbors = (*((int const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_count.data + __pyx_t_1 * __pyx_v_data->lookup_tables->neighbors_count.strides[0]) )));
 
-  /* "spyns/model/heisenberg_cython.pyx":319
+  /* "spyns/model/heisenberg_cython.pyx":457
  * 
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]
  *     cdef long lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]             # <<<<<<<<<<<<<<
  *     cdef long lookup_end = lookup_start + number_neighbors
  * 
  */
-  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_lookup_index.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 319, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_lookup_index.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 457, __pyx_L1_error)}
   __pyx_t_2 = __pyx_v_site_index;
-  __pyx_v_lookup_start = (*((long *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_lookup_index.data + __pyx_t_2 * __pyx_v_data->lookup_tables->neighbors_lookup_index.strides[0]) )));
+  __pyx_v_lookup_start = (*((long const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->neighbors_lookup_index.data + __pyx_t_2 * __pyx_v_data->lookup_tables->neighbors_lookup_index.strides[0]) )));
 
-  /* "spyns/model/heisenberg_cython.pyx":320
+  /* "spyns/model/heisenberg_cython.pyx":458
  *     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]
  *     cdef long lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]
  *     cdef long lookup_end = lookup_start + number_neighbors             # <<<<<<<<<<<<<<
@@ -4384,33 +5379,33 @@ static struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__py
  */
   __pyx_v_lookup_end = (__pyx_v_lookup_start + __pyx_v_number_neighbors);
 
-  /* "spyns/model/heisenberg_cython.pyx":322
+  /* "spyns/model/heisenberg_cython.pyx":460
  *     cdef long lookup_end = lookup_start + number_neighbors
  * 
  *     cdef NeighborStates_t neighbor_states = NeighborStates_t(number_neighbors=number_neighbors)             # <<<<<<<<<<<<<<
  * 
- *     cdef long[:] neighbor_indices = \
+ *     cdef const int[:] neighbor_indices = \
  */
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 322, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 460, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  __pyx_t_4 = __Pyx_PyInt_From_long(__pyx_v_number_neighbors); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 322, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyInt_From_long(__pyx_v_number_neighbors); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 460, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_number_neighbors, __pyx_t_4) < 0) __PYX_ERR(0, 322, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_number_neighbors, __pyx_t_4) < 0) __PYX_ERR(0, 460, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-  __pyx_t_4 = __Pyx_PyObject_Call(((PyObject *)__pyx_ptype_5spyns_5model_17heisenberg_cython_NeighborStates_t), __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 322, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyObject_Call(((PyObject *)__pyx_ptype_5spyns_5model_17heisenberg_cython_NeighborStates_t), __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 460, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __pyx_v_neighbor_states = ((struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *)__pyx_t_4);
   __pyx_t_4 = 0;
 
-  /* "spyns/model/heisenberg_cython.pyx":325
+  /* "spyns/model/heisenberg_cython.pyx":463
  * 
- *     cdef long[:] neighbor_indices = \
+ *     cdef const int[:] neighbor_indices = \
  *         data.lookup_tables.neighbors_table[lookup_start:lookup_end]             # <<<<<<<<<<<<<<
  * 
- *     cdef double[:] interaction_parameters = \
+ *     cdef const short[:] interaction_classes = \
  */
-  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 325, __pyx_L1_error)}
+  if (unlikely(!__pyx_v_data->lookup_tables->neighbors_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 463, __pyx_L1_error)}
   __pyx_t_5.data = __pyx_v_data->lookup_tables->neighbors_table.data;
   __pyx_t_5.memview = __pyx_v_data->lookup_tables->neighbors_table.memview;
   __PYX_INC_MEMVIEW(&__pyx_t_5, 0);
@@ -4429,28 +5424,28 @@ static struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *__py
     0,
     1) < 0))
 {
-    __PYX_ERR(0, 325, __pyx_L1_error)
+    __PYX_ERR(0, 463, __pyx_L1_error)
 }
 
 __pyx_v_neighbor_indices = __pyx_t_5;
   __pyx_t_5.memview = NULL;
   __pyx_t_5.data = NULL;
 
-  /* "spyns/model/heisenberg_cython.pyx":328
+  /* "spyns/model/heisenberg_cython.pyx":466
  * 
- *     cdef double[:] interaction_parameters = \
- *             data.lookup_tables.interaction_parameters_table[lookup_start:lookup_end]             # <<<<<<<<<<<<<<
+ *     cdef const short[:] interaction_classes = \
+ *             data.lookup_tables.interaction_class_table[lookup_start:lookup_end]             # <<<<<<<<<<<<<<
  * 
  *     for neighbor in range(number_neighbors):
  */
-  if (unlikely(!__pyx_v_data->lookup_tables->interaction_parameters_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 328, __pyx_L1_error)}
-  __pyx_t_7.data = __pyx_v_data->lookup_tables->interaction_parameters_table.data;
-  __pyx_t_7.memview = __pyx_v_data->lookup_tables->interaction_parameters_table.memview;
+  if (unlikely(!__pyx_v_data->lookup_tables->interaction_class_table.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 466, __pyx_L1_error)}
+  __pyx_t_7.data = __pyx_v_data->lookup_tables->interaction_class_table.data;
+  __pyx_t_7.memview = __pyx_v_data->lookup_tables->interaction_class_table.memview;
   __PYX_INC_MEMVIEW(&__pyx_t_7, 0);
   __pyx_t_6 = -1;
   if (unlikely(__pyx_memoryview_slice_memviewslice(
     &__pyx_t_7,
-    __pyx_v_data->lookup_tables->interaction_parameters_table.shape[0], __pyx_v_data->lookup_tables->interaction_parameters_table.strides[0], __pyx_v_data->lookup_tables->interaction_parameters_table.suboffsets[0],
+    __pyx_v_data->lookup_tables->interaction_class_table.shape[0], __pyx_v_data->lookup_tables->interaction_class_table.strides[0], __pyx_v_data->lookup_tables->interaction_class_table.suboffsets[0],
     0,
     0,
     &__pyx_t_6,
@@ -4462,15 +5457,15 @@ __pyx_v_neighbor_indices = __pyx_t_5;
     0,
     1) < 0))
 {
-    __PYX_ERR(0, 328, __pyx_L1_error)
+    __PYX_ERR(0, 466, __pyx_L1_error)
 }
 
-__pyx_v_interaction_parameters = __pyx_t_7;
+__pyx_v_interaction_classes = __pyx_t_7;
   __pyx_t_7.memview = NULL;
   __pyx_t_7.data = NULL;
 
-  /* "spyns/model/heisenberg_cython.pyx":330
- *             data.lookup_tables.interaction_parameters_table[lookup_start:lookup_end]
+  /* "spyns/model/heisenberg_cython.pyx":468
+ *             data.lookup_tables.interaction_class_table[lookup_start:lookup_end]
  * 
  *     for neighbor in range(number_neighbors):             # <<<<<<<<<<<<<<
  *         neighbor_index = neighbor_indices[neighbor]
@@ -4481,7 +5476,7 @@ __pyx_v_interaction_parameters = __pyx_t_7;
   for (__pyx_t_10 = 0; __pyx_t_10 < __pyx_t_9; __pyx_t_10+=1) {
     __pyx_v_neighbor = __pyx_t_10;
 
-    /* "spyns/model/heisenberg_cython.pyx":331
+    /* "spyns/model/heisenberg_cython.pyx":469
  * 
  *     for neighbor in range(number_neighbors):
  *         neighbor_index = neighbor_indices[neighbor]             # <<<<<<<<<<<<<<
@@ -4489,54 +5484,64 @@ __pyx_v_interaction_parameters = __pyx_t_7;
  *         neighbor_states.x[neighbor] = data.state.x[neighbor_index]
  */
     __pyx_t_11 = __pyx_v_neighbor;
-    __pyx_v_neighbor_index = (*((long *) ( /* dim=0 */ (__pyx_v_neighbor_indices.data + __pyx_t_11 * __pyx_v_neighbor_indices.strides[0]) )));
+    __pyx_v_neighbor_index = (*((int const  *) ( /* dim=0 */ (__pyx_v_neighbor_indices.data + __pyx_t_11 * __pyx_v_neighbor_indices.strides[0]) )));
 
-    /* "spyns/model/heisenberg_cython.pyx":333
+    /* "spyns/model/heisenberg_cython.pyx":471
  *         neighbor_index = neighbor_indices[neighbor]
  * 
  *         neighbor_states.x[neighbor] = data.state.x[neighbor_index]             # <<<<<<<<<<<<<<
  *         neighbor_states.y[neighbor] = data.state.y[neighbor_index]
  *         neighbor_states.z[neighbor] = data.state.z[neighbor_index]
  */
-    if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 333, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->x.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 471, __pyx_L1_error)}
     __pyx_t_12 = __pyx_v_neighbor_index;
     (__pyx_v_neighbor_states->x[__pyx_v_neighbor]) = (*((double *) ( /* dim=0 */ (__pyx_v_data->state->x.data + __pyx_t_12 * __pyx_v_data->state->x.strides[0]) )));
 
-    /* "spyns/model/heisenberg_cython.pyx":334
+    /* "spyns/model/heisenberg_cython.pyx":472
  * 
  *         neighbor_states.x[neighbor] = data.state.x[neighbor_index]
  *         neighbor_states.y[neighbor] = data.state.y[neighbor_index]             # <<<<<<<<<<<<<<
  *         neighbor_states.z[neighbor] = data.state.z[neighbor_index]
  * 
  */
-    if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 334, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->y.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 472, __pyx_L1_error)}
     __pyx_t_13 = __pyx_v_neighbor_index;
     (__pyx_v_neighbor_states->y[__pyx_v_neighbor]) = (*((double *) ( /* dim=0 */ (__pyx_v_data->state->y.data + __pyx_t_13 * __pyx_v_data->state->y.strides[0]) )));
 
-    /* "spyns/model/heisenberg_cython.pyx":335
+    /* "spyns/model/heisenberg_cython.pyx":473
  *         neighbor_states.x[neighbor] = data.state.x[neighbor_index]
  *         neighbor_states.y[neighbor] = data.state.y[neighbor_index]
  *         neighbor_states.z[neighbor] = data.state.z[neighbor_index]             # <<<<<<<<<<<<<<
  * 
- *         neighbor_states.interaction_parameters[neighbor] = interaction_parameters[neighbor]
+ *         neighbor_states.interaction_parameters[neighbor] = \
  */
-    if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 335, __pyx_L1_error)}
+    if (unlikely(!__pyx_v_data->state->z.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 473, __pyx_L1_error)}
     __pyx_t_14 = __pyx_v_neighbor_index;
     (__pyx_v_neighbor_states->z[__pyx_v_neighbor]) = (*((double *) ( /* dim=0 */ (__pyx_v_data->state->z.data + __pyx_t_14 * __pyx_v_data->state->z.strides[0]) )));
 
-    /* "spyns/model/heisenberg_cython.pyx":337
- *         neighbor_states.z[neighbor] = data.state.z[neighbor_index]
+    /* "spyns/model/heisenberg_cython.pyx":476
  * 
- *         neighbor_states.interaction_parameters[neighbor] = interaction_parameters[neighbor]             # <<<<<<<<<<<<<<
+ *         neighbor_states.interaction_parameters[neighbor] = \
+ *             data.lookup_tables.interaction_class_parameters[interaction_classes[neighbor]]             # <<<<<<<<<<<<<<
  * 
  *     return neighbor_states
  */
+    if (unlikely(!__pyx_v_data->lookup_tables->interaction_class_parameters.memview)) {PyErr_SetString(PyExc_AttributeError,"Memoryview is not initialized");__PYX_ERR(0, 476, __pyx_L1_error)}
     __pyx_t_15 = __pyx_v_neighbor;
-    (__pyx_v_neighbor_states->interaction_parameters[__pyx_v_neighbor]) = (*((double *) ( /* dim=0 */ (__pyx_v_interaction_parameters.data + __pyx_t_15 * __pyx_v_interaction_parameters.strides[0]) )));
+    __pyx_t_16 = (*((short const  *) ( /* dim=0 */ (__pyx_v_interaction_classes.data + __pyx_t_15 * __pyx_v_interaction_classes.strides[0]) )));
+
+    /* "spyns/model/heisenberg_cython.pyx":475
+ *         neighbor_states.z[neighbor] = data.state.z[neighbor_index]
+ * 
+ *         neighbor_states.interaction_parameters[neighbor] = \             # <<<<<<<<<<<<<<
+ *             data.lookup_tables.interaction_class_parameters[interaction_classes[neighbor]]
+ * 
+ */
+    (__pyx_v_neighbor_states->interaction_parameters[__pyx_v_neighbor]) = (*((double const  *) ( /* dim=0 */ (__pyx_v_data->lookup_tables->interaction_class_parameters.data + __pyx_t_16 * __pyx_v_data->lookup_tables->interaction_class_parameters.strides[0]) )));
   }
 
-  /* "spyns/model/heisenberg_cython.pyx":339
- *         neighbor_states.interaction_parameters[neighbor] = interaction_parameters[neighbor]
+  /* "spyns/model/heisenberg_cython.pyx":478
+ *             data.lookup_tables.interaction_class_parameters[interaction_classes[neighbor]]
  * 
  *     return neighbor_states             # <<<<<<<<<<<<<<
  */
@@ -4545,7 +5550,7 @@ __pyx_v_interaction_parameters = __pyx_t_7;
   __pyx_r = __pyx_v_neighbor_states;
   goto __pyx_L0;
 
-  /* "spyns/model/heisenberg_cython.pyx":305
+  /* "spyns/model/heisenberg_cython.pyx":443
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cdef NeighborStates_t lookup_neighbor_states(             # <<<<<<<<<<<<<<
@@ -4564,7 +5569,7 @@ __pyx_v_interaction_parameters = __pyx_t_7;
   __pyx_L0:;
   __Pyx_XDECREF((PyObject *)__pyx_v_neighbor_states);
   __PYX_XDEC_MEMVIEW(&__pyx_v_neighbor_indices, 1);
-  __PYX_XDEC_MEMVIEW(&__pyx_v_interaction_parameters, 1);
+  __PYX_XDEC_MEMVIEW(&__pyx_v_interaction_classes, 1);
   __Pyx_XGIVEREF((PyObject *)__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
@@ -18328,7 +19333,8 @@ static PyTypeObject __pyx_type___pyx_memoryviewslice = {
 static PyMethodDef __pyx_methods[] = {
   {"save_full_state", (PyCFunction)__pyx_pw_5spyns_5model_17heisenberg_cython_1save_full_state, METH_O, __pyx_doc_5spyns_5model_17heisenberg_cython_save_full_state},
   {"compute_total_energy", (PyCFunction)__pyx_pw_5spyns_5model_17heisenberg_cython_3compute_total_energy, METH_O, __pyx_doc_5spyns_5model_17heisenberg_cython_2compute_total_energy},
-  {"sum_spin_vectors_within_sublattices", (PyCFunction)__pyx_pw_5spyns_5model_17heisenberg_cython_5sum_spin_vectors_within_sublattices, METH_O, __pyx_doc_5spyns_5model_17heisenberg_cython_4sum_spin_vectors_within_sublattices},
+  {"update_shell_correlations", (PyCFunction)__pyx_pw_5spyns_5model_17heisenberg_cython_5update_shell_correlations, METH_O, __pyx_doc_5spyns_5model_17heisenberg_cython_4update_shell_correlations},
+  {"sum_spin_vectors_within_sublattices", (PyCFunction)__pyx_pw_5spyns_5model_17heisenberg_cython_7sum_spin_vectors_within_sublattices, METH_O, __pyx_doc_5spyns_5model_17heisenberg_cython_6sum_spin_vectors_within_sublattices},
   {0, 0, 0, 0}
 };
 
@@ -18850,10 +19856,12 @@ static int __Pyx_modinit_function_export_code(void) {
   if (__Pyx_ExportFunction("keep_flip_and_update_state", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_keep_flip_and_update_state, "void (struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, long, struct __pyx_obj_5spyns_5model_17heisenberg_cython_TrialFlip_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("save_full_state", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_save_full_state, "void (struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("compute_total_energy", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_compute_total_energy, "double (struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  if (__Pyx_ExportFunction("update_shell_correlations", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_update_shell_correlations, "void (struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("sum_spin_vectors_within_sublattices", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_sum_spin_vectors_within_sublattices, "std::vector<std::vector<double> >  (struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *, int __pyx_skip_dispatch)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("get_site_spin_vector", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_get_site_spin_vector, "std::vector<double>  (long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("compute_site_energy", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_compute_site_energy, "double (long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("compute_energy_of_spin_vector_at_site", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_compute_energy_of_spin_vector_at_site, "double (std::vector<double> , long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  if (__Pyx_ExportFunction("compute_single_site_energy", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_compute_single_site_energy, "double (double, double, double, long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   if (__Pyx_ExportFunction("lookup_neighbor_states", (void (*)(void))__pyx_f_5spyns_5model_17heisenberg_cython_lookup_neighbor_states, "struct __pyx_obj_5spyns_5model_17heisenberg_cython_NeighborStates_t *(long, struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t *)") < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_RefNannyFinishContext();
   return 0;
@@ -18950,13 +19958,25 @@ static int __Pyx_modinit_type_import_code(void) {
   __pyx_ptype_5spyns_11data_cython_LookupTables_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "LookupTables_t", sizeof(struct __pyx_obj_5spyns_11data_cython_LookupTables_t), __Pyx_ImportType_CheckSize_Warn);
    if (!__pyx_ptype_5spyns_11data_cython_LookupTables_t) __PYX_ERR(3, 10, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_HeisenbergState_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "HeisenbergState_t", sizeof(struct __pyx_obj_5spyns_11data_cython_HeisenbergState_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_HeisenbergState_t) __PYX_ERR(3, 20, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_HeisenbergState_t) __PYX_ERR(3, 21, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_Estimators_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Estimators_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Estimators_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_Estimators_t) __PYX_ERR(3, 26, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_Estimators_t) __PYX_ERR(3, 27, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_SimulationTrace_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "SimulationTrace_t", sizeof(struct __pyx_obj_5spyns_11data_cython_SimulationTrace_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_SimulationTrace_t) __PYX_ERR(3, 33, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_SimulationTrace_t) __PYX_ERR(3, 34, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Histograms_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Histograms_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Histograms_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Histograms_t) __PYX_ERR(3, 41, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Metrics_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Metrics_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Metrics_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Metrics_t) __PYX_ERR(3, 53, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_ShellCorrelations_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "ShellCorrelations_t", sizeof(struct __pyx_obj_5spyns_11data_cython_ShellCorrelations_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_ShellCorrelations_t) __PYX_ERR(3, 59, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_OrderParameters_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "OrderParameters_t", sizeof(struct __pyx_obj_5spyns_11data_cython_OrderParameters_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_OrderParameters_t) __PYX_ERR(3, 66, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Hamiltonian_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Hamiltonian_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Hamiltonian_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Hamiltonian_t) __PYX_ERR(3, 72, __pyx_L1_error)
+  __pyx_ptype_5spyns_11data_cython_Progress_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "Progress_t", sizeof(struct __pyx_obj_5spyns_11data_cython_Progress_t), __Pyx_ImportType_CheckSize_Warn);
+   if (!__pyx_ptype_5spyns_11data_cython_Progress_t) __PYX_ERR(3, 81, __pyx_L1_error)
   __pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t = __Pyx_ImportType(__pyx_t_1, "spyns.data_cython", "SimulationHeisenbergData_t", sizeof(struct __pyx_obj_5spyns_11data_cython_SimulationHeisenbergData_t), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t) __PYX_ERR(3, 40, __pyx_L1_error)
+   if (!__pyx_ptype_5spyns_11data_cython_SimulationHeisenbergData_t) __PYX_ERR(3, 91, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_RefNannyFinishContext();
   return 0;
@@ -20211,6 +21231,12 @@ static int __Pyx__ArgTypeTest(PyObject *obj, PyTypeObject *type, const char *nam
     return 0;
 }
 
+/* BufferIndexError */
+static void __Pyx_RaiseBufferIndexError(int axis) {
+  PyErr_Format(PyExc_IndexError,
+     "Out of bounds on buffer access (axis %d)", axis);
+}
+
 /* MemviewSliceInit */
 static int
 __Pyx_init_memviewslice(struct __pyx_memoryview_obj *memview,
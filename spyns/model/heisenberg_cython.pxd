@@ -23,9 +23,13 @@ cdef void keep_flip_and_update_state(SimulationHeisenbergData_t data, long site_
                                      TrialFlip_t trial_flip)
 cpdef void save_full_state(SimulationHeisenbergData_t data)
 cpdef double compute_total_energy(SimulationHeisenbergData_t data)
+cpdef void update_shell_correlations(SimulationHeisenbergData_t data)
 cpdef vector[vector[double]] sum_spin_vectors_within_sublattices(SimulationHeisenbergData_t data)
 cdef vector[double] get_site_spin_vector(long site_index, SimulationHeisenbergData_t data)
 cdef double compute_site_energy(long site_index, SimulationHeisenbergData_t data)
 cdef double compute_energy_of_spin_vector_at_site(vector[double] site_spin, long site_index,
                                                   SimulationHeisenbergData_t data)
+cdef double compute_single_site_energy(double site_spin_x, double site_spin_y,
+                                       double site_spin_z, long site_index,
+                                       SimulationHeisenbergData_t data)
 cdef NeighborStates_t lookup_neighbor_states(long site_index, SimulationHeisenbergData_t data)
@@ -167,6 +167,9 @@ cpdef void save_full_state(SimulationHeisenbergData_t data):
 cpdef double compute_total_energy(SimulationHeisenbergData_t data):
     """Compute the total energy estimator for the lattice.
 
+    Site energies count every bond twice and every single-site term once, so the
+    single-site terms are added a second time before halving the sum.
+
     :param data: Data container for the simulation.
     :return: Total energy of the simulation state.
     """
@@ -180,9 +183,52 @@ cpdef double compute_total_energy(SimulationHeisenbergData_t data):
             data=data,
         )
 
+        if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:
+            total_energy += compute_single_site_energy(
+                site_spin_x=data.state.x[site_index],
+                site_spin_y=data.state.y[site_index],
+                site_spin_z=data.state.z[site_index],
+                site_index=site_index,
+                data=data,
+            )
+
     return total_energy / 2.0
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef void update_shell_correlations(SimulationHeisenbergData_t data):
+    """Add the spin correlations of the current state to the shell correlation sums.
+
+    One pass over the neighbor table adds ``S_i . S_j`` of every neighbor pair to the
+    sum of the pair's interaction class.
+
+    :param data: Data container for the simulation.
+    """
+    cdef long site_index
+    cdef long lookup_index
+    cdef long neighbor_index
+    cdef long lookup_start
+    cdef long lookup_end
+
+    for site_index in range(data.lookup_tables.number_sites):
+        lookup_start = data.lookup_tables.neighbors_lookup_index[site_index]
+        lookup_end = lookup_start + data.lookup_tables.neighbors_count[site_index]
+
+        for lookup_index in range(lookup_start, lookup_end):
+            neighbor_index = data.lookup_tables.neighbors_table[lookup_index]
+
+            data.shell_correlations.correlation_sums[
+                data.lookup_tables.interaction_class_table[lookup_index]
+            ] += (
+                data.state.x[site_index] * data.state.x[neighbor_index] +
+                data.state.y[site_index] * data.state.y[neighbor_index] +
+                data.state.z[site_index] * data.state.z[neighbor_index]
+            )
+
+    data.shell_correlations.number_samples[0] += 1
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cpdef vector[vector[double]] sum_spin_vectors_within_sublattices(SimulationHeisenbergData_t data):
@@ -264,12 +310,17 @@ cdef double compute_energy_of_spin_vector_at_site(
 ):
     """Compute a spin vector's energy when placed within a given site's neighborhood.
 
+    The isotropic and anisotropic exchange of every bond are summed in one pass over
+    the neighbors, followed by the field and anisotropy of the site's sublattice.
+
     :return: Spin vector as a three component array.
     :param site_index: Site at which to place spin vector.
     :param data: Data container for the simulation.
     :return: Energy of site specified by ``site_index``.
     """
     cdef long neighbor
+    cdef short interaction_class
+    cdef const double[:, :] exchange_tensor
 
     cdef long number_neighbors = data.lookup_tables.neighbors_count[site_index]
     cdef double energy = 0.0
@@ -297,6 +348,93 @@ cdef double compute_energy_of_spin_vector_at_site(
             site_spin_z * neighbor_spin_z
         )
 
+        if data.hamiltonian.exchange_enabled:
+            interaction_class = data.lookup_tables.interaction_class_table[
+                data.lookup_tables.neighbors_lookup_index[site_index] + neighbor
+            ]
+            exchange_tensor = data.hamiltonian.exchange_tensors[interaction_class]
+
+            energy += (
+                site_spin_x * (
+                    exchange_tensor[0, 0] * neighbor_spin_x +
+                    exchange_tensor[0, 1] * neighbor_spin_y +
+                    exchange_tensor[0, 2] * neighbor_spin_z
+                ) +
+                site_spin_y * (
+                    exchange_tensor[1, 0] * neighbor_spin_x +
+                    exchange_tensor[1, 1] * neighbor_spin_y +
+                    exchange_tensor[1, 2] * neighbor_spin_z
+                ) +
+                site_spin_z * (
+                    exchange_tensor[2, 0] * neighbor_spin_x +
+                    exchange_tensor[2, 1] * neighbor_spin_y +
+                    exchange_tensor[2, 2] * neighbor_spin_z
+                )
+            )
+
+    if data.hamiltonian.field_enabled or data.hamiltonian.anisotropy_enabled:
+        energy += compute_single_site_energy(
+            site_spin_x=site_spin_x,
+            site_spin_y=site_spin_y,
+            site_spin_z=site_spin_z,
+            site_index=site_index,
+            data=data,
+        )
+
+    return energy
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double compute_single_site_energy(
+    double site_spin_x,
+    double site_spin_y,
+    double site_spin_z,
+    long site_index,
+    SimulationHeisenbergData_t data,
+):
+    """Compute the field and anisotropy energy of a spin vector at a given site.
+
+    :param site_spin_x: The x component of the spin vector.
+    :param site_spin_y: The y component of the spin vector.
+    :param site_spin_z: The z component of the spin vector.
+    :param site_index: Site at which to place spin vector.
+    :param data: Data container for the simulation.
+    :return: Energy of the single-site terms of the site's sublattice.
+    """
+    cdef const double[:, :] anisotropy
+
+    cdef long sublattice = data.lookup_tables.sublattice_table[site_index]
+    cdef double energy = 0.0
+
+    if data.hamiltonian.field_enabled:
+        energy -= (
+            data.hamiltonian.magnetic_field[sublattice, 0] * site_spin_x +
+            data.hamiltonian.magnetic_field[sublattice, 1] * site_spin_y +
+            data.hamiltonian.magnetic_field[sublattice, 2] * site_spin_z
+        )
+
+    if data.hamiltonian.anisotropy_enabled:
+        anisotropy = data.hamiltonian.anisotropy[sublattice]
+
+        energy += (
+            site_spin_x * (
+                anisotropy[0, 0] * site_spin_x +
+                anisotropy[0, 1] * site_spin_y +
+                anisotropy[0, 2] * site_spin_z
+            ) +
+            site_spin_y * (
+                anisotropy[1, 0] * site_spin_x +
+                anisotropy[1, 1] * site_spin_y +
+                anisotropy[1, 2] * site_spin_z
+            ) +
+            site_spin_z * (
+                anisotropy[2, 0] * site_spin_x +
+                anisotropy[2, 1] * site_spin_y +
+                anisotropy[2, 2] * site_spin_z
+            )
+        )
+
     return energy
 
 
@@ -321,11 +459,11 @@ cdef NeighborStates_t lookup_neighbor_states(
 
     cdef NeighborStates_t neighbor_states = NeighborStates_t(number_neighbors=number_neighbors)
 
-    cdef long[:] neighbor_indices = \
+    cdef const int[:] neighbor_indices = \
         data.lookup_tables.neighbors_table[lookup_start:lookup_end]
 
-    cdef double[:] interaction_parameters = \
-            data.lookup_tables.interaction_parameters_table[lookup_start:lookup_end]
+    cdef const short[:] interaction_classes = \
+            data.lookup_tables.interaction_class_table[lookup_start:lookup_end]
 
     for neighbor in range(number_neighbors):
         neighbor_index = neighbor_indices[neighbor]
@@ -334,6 +472,7 @@ cdef NeighborStates_t lookup_neighbor_states(
         neighbor_states.y[neighbor] = data.state.y[neighbor_index]
         neighbor_states.z[neighbor] = data.state.z[neighbor_index]
 
-        neighbor_states.interaction_parameters[neighbor] = interaction_parameters[neighbor]
+        neighbor_states.interaction_parameters[neighbor] = \
+            data.lookup_tables.interaction_class_parameters[interaction_classes[neighbor]]
 
     return neighbor_states
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from typing import Optional
+
+import numpy as np
+
+from spyns.data import Estimators, ProgressReport, SimulationData
+
+
+def make_progress_report(
+    data: SimulationData, phase: str, sweep: int, sweeps: int, elapsed_time: float
+) -> ProgressReport:
+    """Package the current state of a run for a progress callback.
+
+    The estimators are read-only views of the live estimators, so they are cheap to
+    build but are overwritten as the run continues. Copy them to keep them.
+
+    :param data: Data container for the simulation.
+    :param phase: Either ``equilibration`` or ``production``.
+    :param sweep: Number of sweeps of the phase that have been run.
+    :param sweeps: Number of sweeps in the phase.
+    :param elapsed_time: Wall time since the progress hook was registered.
+    :return: Progress report for the callback.
+    """
+    return ProgressReport(
+        phase=phase,
+        sweep=sweep,
+        sweeps=sweeps,
+        elapsed_time=elapsed_time,
+        estimators=Estimators(
+            number_samples=read_only_view(data.estimators.number_samples),
+            energy=read_only_view(data.estimators.energy),
+            spin_vector=read_only_view(data.estimators.spin_vector),
+            magnetization=read_only_view(data.estimators.magnetization),
+        ),
+    )
+
+
+def read_only_view(array: np.ndarray) -> np.ndarray:
+    """Make a view of an array that cannot be written through.
+
+    :param array: Array to view.
+    :return: Read-only view of the array.
+    """
+    view: np.ndarray = array.view()
+    view.flags.writeable = False
+
+    return view
+
+
+def print_progress(report: ProgressReport) -> Optional[bool]:
+    """Progress callback that prints a one-line status to standard error.
+
+    :param report: Progress report for the run.
+    :return: ``None``, the run is never stopped.
+    """
+    print(
+        f"{report.phase}: sweep {report.sweep}/{report.sweeps}, "
+        f"elapsed {report.elapsed_time:.1f} s, E = {report.estimators.energy[0]}",
+        file=sys.stderr,
+    )
+
+    return None
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from spyns.data import (
+    LookupTables,
+    ResultStoreParameters,
+    SimulationData,
+    SimulationParameters,
+    StoredResult,
+)
+import spyns
+import spyns.run
+import spyns.shared
+import spyns.trace
+
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+
+STORE_FORMAT_VERSION: int = 1
+SUMMARY_OBSERVABLES: List[str] = ["<E**1>", "<M**1>", "C", "X", "Binder_M"]
+
+
+def cached_simulation(
+    lattice: Union["Lattice", LookupTables],
+    parameters: SimulationParameters,
+    store_parameters: ResultStoreParameters,
+) -> StoredResult:
+    """Run a simulation, or load its results if an identical run is in the store.
+
+    Runs are keyed by a hash of the lattice lookup arrays, every field of
+    ``parameters`` including the seed, and the package version, see
+    ``compute_result_key``. A hit returns the stored raw trace columns and the
+    final values of the ``SUMMARY_OBSERVABLES`` without running anything, and marks
+    the entry as recently used. A miss runs ``spyns.run.simulation`` and stores its
+    results, evicting the least recently used entries if the store grows past
+    ``max_bytes``. Trace and snapshot files are only written on a miss.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation. A ``LookupTables`` container can be passed in place of a
+        ``Lattice``.
+    :param parameters: Parameters to use for setting up and running the simulation.
+    :param store_parameters: Directory of the store and its optional size limit.
+    :return: Raw trace columns and summary observables of the run.
+    """
+    key: str = compute_result_key(lattice=lattice, parameters=parameters)
+    store_path: Path = Path(store_parameters.directory)
+    stored_result: Optional[StoredResult] = read_result(store_path=store_path, key=key)
+
+    if stored_result is not None:
+        return stored_result
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice, parameters=parameters
+    ).container
+    stored_result = StoredResult(
+        key=key,
+        trace={
+            name: np.array(values)
+            for name, values in data.trace_view.raw_columns.items()
+        },
+        observables={
+            name: float(data.trace_view[name][-1]) if len(data.trace_view) else np.nan
+            for name in SUMMARY_OBSERVABLES
+        },
+        hit=False,
+    )
+
+    store_path.mkdir(parents=True, exist_ok=True)
+    write_result(store_path=store_path, stored_result=stored_result, data=data)
+
+    if store_parameters.max_bytes is not None:
+        evict_results(
+            store_path=store_path, max_bytes=store_parameters.max_bytes, keep=key
+        )
+
+    return stored_result
+
+
+def compute_result_key(
+    lattice: Union["Lattice", LookupTables], parameters: SimulationParameters
+) -> str:
+    """Hash everything that determines the results of a simulation.
+
+    :param lattice: Neighbor and interaction tables of the system under simulation.
+    :param parameters: Parameters of the simulation.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    key_hash = hashlib.sha256()
+
+    for part in (
+        str(STORE_FORMAT_VERSION),
+        spyns.__version__,
+        json.dumps(dataclasses.asdict(parameters), sort_keys=True),
+        repr((int(lattice.number_sites), int(lattice.number_sublattices))),
+    ):
+        key_hash.update(part.encode("utf-8"))
+        key_hash.update(b"\0")
+
+    for name in spyns.shared.LOOKUP_ARRAYS:
+        array: Optional[np.ndarray] = getattr(lattice, name)
+
+        if array is None:
+            key_hash.update(f"{name}:None".encode("utf-8"))
+
+        else:
+            key_hash.update(f"{name}:{array.dtype.str}:{array.shape}".encode("utf-8"))
+            key_hash.update(np.ascontiguousarray(array).tobytes())
+
+        key_hash.update(b"\0")
+
+    return key_hash.hexdigest()
+
+
+def read_result(store_path: Path, key: str) -> Optional[StoredResult]:
+    """Load a stored result and mark it as recently used.
+
+    :param store_path: Directory of the store.
+    :param key: Result key of the entry.
+    :return: Stored result, or ``None`` if the entry is missing, incomplete, or was
+        written by another package version.
+    """
+    manifest_path: Path = store_path / f"{key}.json"
+    trace_path: Path = store_path / f"{key}.npz"
+
+    try:
+        manifest: Dict[str, Any] = json.loads(manifest_path.read_text())
+
+    except (OSError, ValueError):
+        return None
+
+    if (
+        manifest.get("format_version") != STORE_FORMAT_VERSION
+        or manifest.get("version") != spyns.__version__
+        or manifest.get("key") != key
+    ):
+        return None
+
+    try:
+        trace: Dict[str, np.ndarray] = spyns.trace.read_trace(
+            filepath=str(trace_path), trace_format="npz"
+        )
+        os.utime(str(manifest_path))
+
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+    return StoredResult(
+        key=key,
+        trace=trace,
+        observables={
+            name: float(value) for name, value in manifest["observables"].items()
+        },
+        hit=True,
+    )
+
+
+def write_result(
+    store_path: Path, stored_result: StoredResult, data: SimulationData
+) -> None:
+    """Add a result to the store.
+
+    The raw trace columns are written with ``spyns.trace.write_trace`` as
+    compressed ``npz``, followed by a JSON manifest of the summary observables.
+    Both files are written to temporary names and then renamed, and the manifest
+    goes last, so concurrent readers never see a partial entry.
+
+    :param store_path: Directory of the store.
+    :param stored_result: Result to store.
+    :param data: Data container of the simulation that produced the result.
+    """
+    key: str = stored_result.key
+
+    with tempfile.NamedTemporaryFile(
+        dir=str(store_path), suffix=".npz.tmp", delete=False
+    ) as trace_file:
+        pass
+
+    spyns.trace.write_trace(
+        trace_view=data.trace_view, filepath=trace_file.name, trace_format="npz"
+    )
+    os.replace(trace_file.name, str(store_path / f"{key}.npz"))
+
+    with tempfile.NamedTemporaryFile(
+        mode="w", dir=str(store_path), suffix=".json.tmp", delete=False
+    ) as manifest_file:
+        json.dump(
+            dict(
+                format_version=STORE_FORMAT_VERSION,
+                version=spyns.__version__,
+                key=key,
+                observables=stored_result.observables,
+            ),
+            manifest_file,
+        )
+
+    os.replace(manifest_file.name, str(store_path / f"{key}.json"))
+
+
+def evict_results(
+    store_path: Path, max_bytes: int, keep: Optional[str] = None
+) -> List[str]:
+    """Remove the least recently used results until the store fits in ``max_bytes``.
+
+    An entry is used when it is written or read, which updates the modification
+    time of its manifest.
+
+    :param store_path: Directory of the store.
+    :param max_bytes: Largest total size of the stored files.
+    :param keep: Key of an entry that is never evicted, such as the one just
+        written.
+    :return: Keys of the evicted entries.
+    """
+    entries: List[Tuple[float, str, int]] = list_results(store_path=store_path)
+    total_bytes: int = sum(size for _, _, size in entries)
+    evicted: List[str] = []
+
+    for _, key, size in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+
+        if key == keep:
+            continue
+
+        remove_result(store_path=store_path, key=key)
+        total_bytes -= size
+        evicted.append(key)
+
+    return evicted
+
+
+def invalidate_results(directory: str, version: Optional[str] = None) -> List[str]:
+    """Remove stored results, such as the ones made by an older package version.
+
+    :param directory: Directory of the store.
+    :param version: Keep the results written by this package version. Every result
+        is removed if not provided. Pass ``spyns.__version__`` to only clear stale
+        results.
+    :return: Keys of the removed entries.
+    """
+    store_path: Path = Path(directory)
+    removed: List[str] = []
+
+    for _, key, _ in list_results(store_path=store_path):
+        try:
+            manifest: Dict[str, Any] = json.loads(
+                (store_path / f"{key}.json").read_text()
+            )
+
+        except (OSError, ValueError):
+            manifest = {}
+
+        if version is None or manifest.get("version") != version:
+            remove_result(store_path=store_path, key=key)
+            removed.append(key)
+
+    return removed
+
+
+def list_results(store_path: Path) -> List[Tuple[float, str, int]]:
+    """List the entries of the store.
+
+    :param store_path: Directory of the store.
+    :return: Last use time, key, and total file size of each entry. Empty if the
+        store does not exist.
+    """
+    if not store_path.is_dir():
+        return []
+
+    entries: List[Tuple[float, str, int]] = []
+
+    for manifest_path in store_path.glob("*.json"):
+        trace_path: Path = manifest_path.with_suffix(".npz")
+
+        try:
+            manifest_stat: os.stat_result = manifest_path.stat()
+            trace_size: int = trace_path.stat().st_size if trace_path.exists() else 0
+
+        except OSError:
+            continue
+
+        entries.append(
+            (
+                manifest_stat.st_mtime,
+                manifest_path.stem,
+                manifest_stat.st_size + trace_size,
+            )
+        )
+
+    return entries
+
+
+def remove_result(store_path: Path, key: str) -> None:
+    """Delete the files of a stored result.
+
+    The manifest is removed first so the entry stops being a hit before its trace
+    disappears.
+
+    :param store_path: Directory of the store.
+    :param key: Result key of the entry.
+    """
+    for suffix in [".json", ".npz"]:
+        try:
+            (store_path / f"{key}{suffix}").unlink()
+
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from spyns.data import Histograms, SimulationData
+
+
+@dataclass(frozen=True)
+class ReweightedEstimators(object):
+    temperature: np.ndarray
+    energy: np.ndarray
+    heat_capacity: np.ndarray
+    magnetization: np.ndarray
+    susceptibility: np.ndarray
+    __slots__ = [
+        "temperature",
+        "energy",
+        "heat_capacity",
+        "magnetization",
+        "susceptibility",
+    ]
+
+
+def reweight_simulations(
+    data: List[SimulationData],
+    temperatures: np.ndarray,
+    tolerance: float = 1e-10,
+    max_iterations: int = 10000,
+) -> ReweightedEstimators:
+    """Estimate thermodynamic averages at arbitrary temperatures from histograms.
+
+    A single simulation is reweighted with the Ferrenberg–Swendsen single-histogram
+    method. Several simulations are combined with the multiple-histogram (WHAM)
+    method. The magnetization and susceptibility are only estimated if every
+    simulation accumulated an energy-magnetization histogram.
+
+    :param data: Data containers of simulations run with histogram accumulation
+        enabled. All simulations must share the same lattice and histogram binning.
+    :param temperatures: Temperatures at which to estimate the averages.
+    :param tolerance: Convergence tolerance for the WHAM free energies.
+    :param max_iterations: Maximum number of WHAM iterations.
+    :return: Energy and magnetization per site, heat capacity, and susceptibility at
+        each of the requested temperatures.
+    :raises ValueError: An error will be raised if a simulation has no histograms or
+        if the simulations use different histogram binnings.
+    """
+    histograms: List[Histograms] = [simulation.histograms for simulation in data]
+
+    if any(histogram is None for histogram in histograms):
+        raise ValueError("Every simulation must be run with histogram accumulation.")
+
+    if any(
+        not np.array_equal(histogram.energy_edges, histograms[0].energy_edges)
+        or not np.array_equal(
+            histogram.magnetization_edges, histograms[0].magnetization_edges
+        )
+        for histogram in histograms
+    ):
+        raise ValueError("Every simulation must use the same histogram binning.")
+
+    use_magnetization: bool = all(
+        histogram.energy_magnetization_counts.shape[1] > 0 for histogram in histograms
+    )
+    counts: np.ndarray = np.stack(
+        [
+            histogram.energy_magnetization_counts
+            if use_magnetization
+            else histogram.energy_counts
+            for histogram in histograms
+        ]
+    )
+    simulation_temperatures: np.ndarray = np.array(
+        [simulation.parameters.temperature for simulation in data], dtype=np.float
+    )
+    energies: np.ndarray = compute_bin_centers(edges=histograms[0].energy_edges)
+
+    if len(data) == 1:
+        log_density_of_states: np.ndarray = compute_single_histogram_log_density_of_states(
+            counts=counts[0], energies=energies, temperature=simulation_temperatures[0]
+        )
+
+    else:
+        log_density_of_states = compute_multiple_histogram_log_density_of_states(
+            counts=counts,
+            energies=energies,
+            temperatures=simulation_temperatures,
+            tolerance=tolerance,
+            max_iterations=max_iterations,
+        )
+
+    return compute_reweighted_estimators(
+        log_density_of_states=log_density_of_states,
+        energies=energies,
+        magnetizations=(
+            compute_bin_centers(edges=histograms[0].magnetization_edges)
+            if use_magnetization
+            else None
+        ),
+        temperatures=temperatures,
+        number_sites=data[0].lookup_tables.number_sites,
+    )
+
+
+def compute_single_histogram_log_density_of_states(
+    counts: np.ndarray, energies: np.ndarray, temperature: float
+) -> np.ndarray:
+    """Estimate the log density of states from one canonical histogram.
+
+    :param counts: Energy histogram, or energy-magnetization histogram with energy
+        along the first axis.
+    :param energies: Energy of each histogram bin.
+    :param temperature: Temperature at which the histogram was sampled.
+    :return: Log density of states, up to an additive constant, with the same shape
+        as ``counts``. Empty bins are set to negative infinity.
+    """
+    return compute_log_counts(counts=counts) + broadcast_energies(
+        values=energies / temperature, counts=counts
+    )
+
+
+def compute_multiple_histogram_log_density_of_states(
+    counts: np.ndarray,
+    energies: np.ndarray,
+    temperatures: np.ndarray,
+    tolerance: float,
+    max_iterations: int,
+) -> np.ndarray:
+    """Estimate the log density of states by combining canonical histograms (WHAM).
+
+    The free energies of the simulations are solved for self-consistently, with every
+    sum carried out in log space to avoid overflow.
+
+    :param counts: Stacked histograms with the simulation index along the first axis
+        and energy along the second axis.
+    :param energies: Energy of each histogram bin.
+    :param temperatures: Temperature of each simulation.
+    :param tolerance: Convergence tolerance for the free energies.
+    :param max_iterations: Maximum number of self-consistent iterations.
+    :return: Log density of states, up to an additive constant, with the shape of a
+        single histogram. Bins that are empty in every histogram are set to negative
+        infinity.
+    """
+    inverse_temperatures: np.ndarray = 1 / temperatures
+    log_number_samples: np.ndarray = compute_log_counts(
+        counts=counts.reshape(len(counts), -1).sum(axis=1)
+    )
+    log_numerator: np.ndarray = compute_log_counts(counts=counts.sum(axis=0))
+    log_weights: np.ndarray = -np.outer(inverse_temperatures, energies)
+    free_energies: np.ndarray = np.zeros(shape=len(counts), dtype=np.float)
+
+    for _ in range(max_iterations):
+        log_denominator: np.ndarray = log_sum_exp(
+            values=(log_number_samples + free_energies)[:, np.newaxis] + log_weights,
+            axis=0,
+        )
+        log_density_of_states: np.ndarray = log_numerator - broadcast_energies(
+            values=log_denominator, counts=log_numerator
+        )
+        updated_free_energies: np.ndarray = -log_sum_exp(
+            values=log_sum_exp_over_magnetization(
+                log_density_of_states=log_density_of_states
+            )[np.newaxis, :]
+            + log_weights,
+            axis=1,
+        )
+        updated_free_energies -= updated_free_energies[0]
+        converged: bool = np.max(
+            np.abs(updated_free_energies - free_energies)
+        ) < tolerance
+        free_energies = updated_free_energies
+
+        if converged:
+            break
+
+    return log_density_of_states
+
+
+def compute_reweighted_estimators(
+    log_density_of_states: np.ndarray,
+    energies: np.ndarray,
+    magnetizations: Optional[np.ndarray],
+    temperatures: np.ndarray,
+    number_sites: int,
+) -> ReweightedEstimators:
+    """Compute canonical averages from a log density of states.
+
+    :param log_density_of_states: Log density of states over energy, or over energy
+        and magnetization.
+    :param energies: Energy of each energy bin.
+    :param magnetizations: Magnetization of each magnetization bin, or ``None`` if the
+        density of states only resolves the energy.
+    :param temperatures: Temperatures at which to compute the averages.
+    :param number_sites: Number of sites in the lattice.
+    :return: Energy and magnetization per site, heat capacity, and susceptibility at
+        each temperature. Magnetic quantities are ``nan`` if ``magnetizations`` is
+        ``None``.
+    """
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=np.float))
+    log_energy_density: np.ndarray = log_sum_exp_over_magnetization(
+        log_density_of_states=log_density_of_states
+    )
+    log_probabilities: np.ndarray = log_energy_density[np.newaxis, :] - np.outer(
+        1 / temperatures, energies
+    )
+    log_probabilities -= log_sum_exp(values=log_probabilities, axis=1)[:, np.newaxis]
+    probabilities: np.ndarray = np.exp(log_probabilities)
+
+    energy: np.ndarray = probabilities @ energies
+    energy_squared: np.ndarray = probabilities @ energies ** 2
+
+    magnetization: np.ndarray = np.full(shape=len(temperatures), fill_value=np.nan)
+    magnetization_squared: np.ndarray = np.full(
+        shape=len(temperatures), fill_value=np.nan
+    )
+
+    if magnetizations is not None:
+        with np.errstate(invalid="ignore"):
+            log_conditional: np.ndarray = log_density_of_states - log_energy_density[
+                :, np.newaxis
+            ]
+
+        conditional: np.ndarray = np.exp(
+            np.where(np.isfinite(log_conditional), log_conditional, -np.inf)
+        )
+        magnetization = probabilities @ (conditional @ magnetizations)
+        magnetization_squared = probabilities @ (conditional @ magnetizations ** 2)
+
+    return ReweightedEstimators(
+        temperature=temperatures,
+        energy=energy / number_sites,
+        heat_capacity=(energy_squared - energy ** 2) / temperatures ** 2 / number_sites,
+        magnetization=magnetization / number_sites,
+        susceptibility=(
+            (magnetization_squared - magnetization ** 2) / temperatures / number_sites
+        ),
+    )
+
+
+def compute_bin_centers(edges: np.ndarray) -> np.ndarray:
+    """Compute the center of each histogram bin.
+
+    :param edges: Histogram bin edges.
+    :return: Array of bin centers.
+    """
+    return (edges[1:] + edges[:-1]) / 2
+
+
+def compute_log_counts(counts: np.ndarray) -> np.ndarray:
+    """Take the logarithm of histogram counts, mapping empty bins to negative infinity.
+
+    :param counts: Histogram counts.
+    :return: Log of the histogram counts.
+    """
+    with np.errstate(divide="ignore"):
+        return np.log(counts.astype(np.float))
+
+
+def broadcast_energies(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Reshape a per-energy-bin array so it broadcasts against a histogram.
+
+    :param values: One value per energy bin.
+    :param counts: Histogram with energy along its first axis.
+    :return: View of ``values`` with trailing axes added for the magnetization.
+    """
+    if counts.ndim == 2:
+        return values[:, np.newaxis]
+
+    return values
+
+
+def log_sum_exp_over_magnetization(log_density_of_states: np.ndarray) -> np.ndarray:
+    """Marginalize a log density of states over the magnetization, if present.
+
+    :param log_density_of_states: Log density of states over energy, or over energy
+        and magnetization.
+    :return: Log density of states over energy.
+    """
+    if log_density_of_states.ndim == 1:
+        return log_density_of_states
+
+    return log_sum_exp(values=log_density_of_states, axis=1)
+
+
+def log_sum_exp(values: np.ndarray, axis: int) -> np.ndarray:
+    """Compute ``log(sum(exp(values)))`` along an axis without overflowing.
+
+    :param values: Array of log values. Negative infinity marks zero terms.
+    :param axis: Axis to sum along.
+    :return: Log of the sum of the exponentiated values.
+    """
+    maximum: np.ndarray = np.max(values, axis=axis, keepdims=True)
+    maximum = np.where(np.isfinite(maximum), maximum, 0)
+
+    with np.errstate(divide="ignore"):
+        return np.squeeze(
+            maximum
+            + np.log(np.sum(np.exp(values - maximum), axis=axis, keepdims=True)),
+            axis=axis,
+        )
@@ -1,26 +1,113 @@
 # -*- coding: utf-8 -*-
 
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
 import numpy as np
 
-from spyns.data import HeisenbergState, SimulationData, SimulationParameters
-from spyns.lattice import Lattice
+from spyns.data import (
+    AdaptiveParameters,
+    AdaptiveRunReport,
+    HamiltonianParameters,
+    HeisenbergState,
+    HistogramParameters,
+    MetricsParameters,
+    OrderPatternParameters,
+    ProgressParameters,
+    SimulationData,
+    ShellCorrelationParameters,
+    SimulationParameters,
+    SnapshotParameters,
+    StructureFactorParameters,
+)
 import spyns
+import spyns.metrics
 import spyns.model.heisenberg
 import spyns.algorithms.metropolis.heisenberg_cython
 import spyns.model.heisenberg_cython
+import spyns.snapshots
 from spyns.data_cython import SimulationHeisenbergData_t
 from spyns.random_numbers.distribution import RandomNumberGenerator
 
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+    from spyns.trace import TraceView
+
 
-def simulation(lattice: Lattice, parameters: SimulationParameters) -> SimulationData:
+def simulation(
+    lattice: "Lattice",
+    parameters: SimulationParameters,
+    adaptive_parameters: Optional[AdaptiveParameters] = None,
+    histogram_parameters: Optional[HistogramParameters] = None,
+    metrics_parameters: Optional[MetricsParameters] = None,
+    progress_parameters: Optional[ProgressParameters] = None,
+    hamiltonian_parameters: Optional[HamiltonianParameters] = None,
+    structure_factor_parameters: Optional[StructureFactorParameters] = None,
+    shell_correlation_parameters: Optional[ShellCorrelationParameters] = None,
+    order_pattern_parameters: Optional[OrderPatternParameters] = None,
+    snapshot_parameters: Optional[SnapshotParameters] = None,
+) -> SimulationData:
     """Run a sPyns simulation.
 
     sPyns currently supports one model of spin simulations on a periodic lattice, the
     Heisenberg model.
 
+    When ``adaptive_parameters`` is provided, the run switches to the adaptive mode.
+    The ``equilibration_sweeps`` and ``sweeps`` fields of ``parameters`` then act as
+    the maximum sweep budgets. Equilibration ends as soon as the energy trace stops
+    drifting, and production ends as soon as the requested observables reach the
+    target relative error. The outcome is recorded in the ``adaptive_report`` field of
+    the data container.
+
+    When ``histogram_parameters`` is provided, energy and energy-magnetization
+    histograms are accumulated at sample time for use with ``spyns.reweighting``.
+
+    When ``metrics_parameters`` is provided, the wall time of each phase, the flip
+    rate, the attempted and accepted flips of each sublattice, the number of samples,
+    and the peak memory are recorded in the ``metrics`` field of the data container,
+    see ``spyns.metrics``.
+
+    When ``progress_parameters`` is provided, its callback is called from the sweep
+    loop every ``sweep_interval`` sweeps or ``time_interval`` seconds with a
+    ``ProgressReport`` holding read-only views of the current estimators. The run
+    stops early if the callback returns ``True``, and the trace then only covers the
+    production sweeps that were run. Without a callback the sweep loop is unchanged,
+    see ``spyns.progress``.
+
+    When ``hamiltonian_parameters`` is provided, a magnetic field and a single-ion
+    anisotropy per sublattice and an anisotropic exchange tensor per interaction
+    class are added to the isotropic exchange, see ``spyns.data.setup_hamiltonian``.
+
+    When ``structure_factor_parameters`` is provided, the spin structure factor of
+    every unit cell site pair is accumulated at sample time with an FFT over the
+    supercell translations, see ``spyns.structure_factor``.
+
+    When ``shell_correlation_parameters`` is provided, ``Si . Sj`` is summed over the
+    neighbor table by interaction class every ``sample_interval`` samples, see
+    ``spyns.statistics.compute_shell_correlations``.
+
+    When ``order_pattern_parameters`` is provided, the order parameter of each
+    sublattice pattern is traced at sample time and added to the trace data frame
+    under the pattern's name, see ``spyns.statistics.compute_order_parameters``.
+
+    When ``snapshot_parameters`` is provided, the state snapshots saved to
+    ``snapshot_filepath`` are quantized or bit-packed and written in optionally
+    compressed binary chunks instead of CSV rows, see ``spyns.snapshots``.
+
     :param lattice: Neighbor and interaction tables that define the system under
         simulation.
     :param parameters: Parameters to use for setting up and running the simulation.
+    :param adaptive_parameters: Optional stopping criteria for an adaptive run.
+    :param histogram_parameters: Optional binning for the sample-time histograms.
+    :param metrics_parameters: Optional settings for collecting run metrics.
+    :param progress_parameters: Optional progress callback and reporting intervals.
+    :param hamiltonian_parameters: Optional terms to add to the isotropic exchange.
+    :param structure_factor_parameters: Optional supercell shape for measuring the
+        spin structure factor.
+    :param shell_correlation_parameters: Optional settings for accumulating the
+        shell correlations.
+    :param order_pattern_parameters: Optional sublattice patterns to trace order
+        parameters for.
+    :param snapshot_parameters: Optional encoding for compact state snapshots.
     :return: Data container of results for the sPyns simulation.
     """
     np.random.seed(parameters.seed)
@@ -29,7 +116,16 @@ def simulation(lattice: Lattice, parameters: SimulationParameters) -> Simulation
         lattice.number_sites
     )
     data_object: SimulationData = spyns.data.setup_containers(
-        parameters=parameters, state=heisenberg_state, lattice=lattice
+        parameters=parameters,
+        state=heisenberg_state,
+        lattice=lattice,
+        histogram_parameters=histogram_parameters,
+        metrics_parameters=metrics_parameters,
+        hamiltonian_parameters=hamiltonian_parameters,
+        structure_factor_parameters=structure_factor_parameters,
+        shell_correlation_parameters=shell_correlation_parameters,
+        order_pattern_parameters=order_pattern_parameters,
+        snapshot_parameters=snapshot_parameters,
     )
     random_number_generator: RandomNumberGenerator = RandomNumberGenerator(
         seed=data_object.parameters.seed,
@@ -38,10 +134,27 @@ def simulation(lattice: Lattice, parameters: SimulationParameters) -> Simulation
     data: SimulationHeisenbergData_t = SimulationHeisenbergData_t(
         data=data_object, random_number_generator=random_number_generator
     )
+    data.set_progress_hook(progress_parameters)
+
+    if adaptive_parameters is not None:
+        adaptive_simulation(data=data, adaptive_parameters=adaptive_parameters)
 
-    pre_simulation(data=data)
-    main_simulation(data=data)
-    post_simulation(data=data)
+    else:
+        with spyns.metrics.record_phase(data=data_object, phase="pre_simulation"):
+            pre_simulation(data=data)
+
+        with spyns.metrics.record_phase(data=data_object, phase="main_simulation"):
+            main_simulation(data=data)
+
+    with spyns.metrics.record_phase(data=data_object, phase="post_simulation"):
+        post_simulation(data=data)
+
+    if metrics_parameters is not None:
+        spyns.metrics.finalize_metrics(
+            data=data_object,
+            lattice_build_time=getattr(lattice, "build_time", None),
+            log_filepath=metrics_parameters.log_filepath,
+        )
 
     return data
 
@@ -62,54 +175,164 @@ def main_simulation(data: SimulationData) -> None:
     :param data: Data container for the simulation.
     """
     spyns.model.heisenberg.save_full_state(data=data.container)
-    spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+    sweeps_run: int = spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
         data=data, equilibration_run=False
     )
 
+    if sweeps_run < data.container.parameters.sweeps:
+        spyns.data.truncate_trace(data=data.container, sweeps=sweeps_run)
 
-def post_simulation(data: SimulationData) -> None:
-    """Make (and optionally save) a trace history data frame and print estimators.
+
+def adaptive_simulation(
+    data: SimulationData, adaptive_parameters: AdaptiveParameters
+) -> None:
+    """Run equilibration and production sweeps until the stopping criteria are met.
 
     :param data: Data container for the simulation.
+    :param adaptive_parameters: Stopping criteria for the adaptive run.
     """
-    spyns.data.make_trace_data_frame(data=data.container)
+    with spyns.metrics.record_phase(data=data.container, phase="pre_simulation"):
+        equilibrated, equilibration_sweeps = adaptive_pre_simulation(
+            data=data, adaptive_parameters=adaptive_parameters
+        )
 
-    for estimator in ["E", "M"]:
-        spyns.statistics.compute_estimator_moments(
-            trace_df=data.container.data_frame, estimator_name=estimator
+    with spyns.metrics.record_phase(data=data.container, phase="main_simulation"):
+        stop_reason, production_sweeps, relative_errors = adaptive_main_simulation(
+            data=data, adaptive_parameters=adaptive_parameters
         )
 
-        for power in range(1, 5):
-            spyns.statistics.compute_running_average(
-                trace_df=data.container.data_frame,
-                estimator_name=f"{estimator}**{power}",
-            )
+    spyns.data.truncate_trace(data=data.container, sweeps=production_sweeps)
 
-    if data.container.parameters.mode.strip().lower() in ["heisenberg_cython"]:
-        for fluctuation_name, estimator_name, temperature_power in [
-            ("C", "E", 2),
-            ("X", "M", 1),
-        ]:
-            spyns.statistics.compute_estimator_fluctuations(
-                trace_df=data.container.data_frame,
-                fluctuation_name=fluctuation_name,
-                estimator_name=estimator_name,
-                number_sites=data.container.lookup_tables.number_sites,
-                coefficient=(
-                    1 / data.container.parameters.temperature ** temperature_power
-                ),
-            )
+    data.container.adaptive_report = AdaptiveRunReport(
+        equilibrated=equilibrated,
+        equilibration_sweeps=equilibration_sweeps,
+        production_sweeps=production_sweeps,
+        stop_reason=stop_reason,
+        relative_errors=relative_errors,
+    )
+
+
+def adaptive_pre_simulation(
+    data: SimulationData, adaptive_parameters: AdaptiveParameters
+) -> Tuple[bool, int]:
+    """Run equilibration sweeps until the energy trace stops drifting.
+
+    The trailing half of the energy trace is checked every ``check_interval`` sweeps,
+    so that the initial transient never enters the comparison of block means.
+
+    :param data: Data container for the simulation.
+    :param adaptive_parameters: Stopping criteria for the adaptive run.
+    :return: Tuple where the first element specifies if equilibration was detected and
+        the second element is the number of equilibration sweeps that were run.
+    """
+    max_sweeps: int = data.container.parameters.equilibration_sweeps
+    energy_trace: np.ndarray = np.zeros(shape=max_sweeps, dtype=np.float)
+
+    spyns.model.heisenberg.save_full_state(data=data.container)
+
+    for sweep_index in range(max_sweeps):
+        sweeps_run: int = spyns.algorithms.metropolis.heisenberg_cython.run_sweep_range(
+            data=data, start=sweep_index, stop=sweep_index + 1, equilibration_run=True
+        )
+
+        if data.stop_requested:
+            return False, sweeps_run
+
+        energy_trace[sweep_index] = data.container.estimators.energy[0]
+        window_start: int = sweeps_run // 2
+
+        if sweeps_run % adaptive_parameters.check_interval == 0:
+            if spyns.statistics.detect_equilibration(
+                samples=energy_trace[window_start:sweeps_run],
+                number_blocks=adaptive_parameters.number_blocks,
+                tolerance=adaptive_parameters.equilibration_tolerance,
+            ):
+                return True, sweeps_run
+
+    return False, max_sweeps
+
+
+def adaptive_main_simulation(
+    data: SimulationData, adaptive_parameters: AdaptiveParameters
+) -> Tuple[str, int, Dict[str, float]]:
+    """Run production sweeps until the target relative error is reached.
+
+    :param data: Data container for the simulation.
+    :param adaptive_parameters: Stopping criteria for the adaptive run.
+    :return: Tuple of the reason the run stopped, the number of production sweeps that
+        were run, and the final relative error of each requested observable.
+    """
+    max_sweeps: int = data.container.parameters.sweeps
+    sample_interval: int = data.container.parameters.sample_interval
+    relative_errors: Dict[str, float] = {}
+
+    spyns.model.heisenberg.save_full_state(data=data.container)
 
-        spyns.statistics.compute_binder_parameter(
-            trace_df=data.container.data_frame, estimator_name="M"
+    for start in range(0, max_sweeps, adaptive_parameters.check_interval):
+        stop: int = min(start + adaptive_parameters.check_interval, max_sweeps)
+
+        sweeps_run: int = spyns.algorithms.metropolis.heisenberg_cython.run_sweep_range(
+            data=data, start=start, stop=stop, equilibration_run=False
         )
 
-    spyns.data.write_trace_history_to_disk(data=data.container)
+        relative_errors = {
+            observable: spyns.statistics.compute_relative_error(
+                samples=get_trace_samples(
+                    data=data.container, observable=observable, sweeps=sweeps_run
+                )[::sample_interval],
+                number_blocks=adaptive_parameters.number_blocks,
+            )
+            for observable in adaptive_parameters.observables
+        }
+
+        if data.stop_requested:
+            return "stop_requested", sweeps_run, relative_errors
+
+        if all(
+            relative_error <= adaptive_parameters.target_relative_error
+            for relative_error in relative_errors.values()
+        ):
+            return "target_error_reached", stop, relative_errors
+
+    return "max_sweeps_reached", max_sweeps, relative_errors
+
+
+def get_trace_samples(data: SimulationData, observable: str, sweeps: int) -> np.ndarray:
+    """Read the trace of an observable over the first few production sweeps.
+
+    :param data: Data container for the simulation.
+    :param observable: Name of the observable, either ``E`` or ``M``.
+    :param sweeps: Number of production sweeps to read.
+    :return: Array of the observable's trace history.
+    :raises ValueError: An error will be raised if the observable is not recognized.
+    """
+    if observable == "E":
+        return data.trace.energy[:sweeps]
+
+    elif observable == "M":
+        return data.trace.magnetization[:sweeps]
+
+    raise ValueError(f"Unknown observable {observable}, expected one of 'E' or 'M'.")
+
+
+def post_simulation(data: SimulationData) -> None:
+    """Make a lazy trace view, optionally save the trace history, and print estimators.
+
+    :param data: Data container for the simulation.
+    """
+    trace_view: TraceView = spyns.data.make_trace_view(data=data.container)
+
+    with spyns.metrics.record_phase(data=data.container, phase="io"):
+        spyns.snapshots.flush_snapshots(data=data.container)
+        spyns.data.write_trace_history_to_disk(data=data.container)
+
+    if len(trace_view) == 0:
+        return
 
-    average_energy: float = data.container.data_frame["<E**1>"].values[
+    average_energy: float = trace_view["<E**1>"][
         -1
     ] / data.container.lookup_tables.number_sites
-    magnetization: float = data.container.data_frame["<M**1>"].values[
+    magnetization: float = trace_view["<M**1>"][
         -1
     ] / data.container.lookup_tables.number_sites
 
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from typing import Optional
+
+import numpy as np
+
+from spyns.data import (
+    HamiltonianParameters,
+    HeisenbergState,
+    HistogramParameters,
+    LookupTables,
+    MetricsParameters,
+    OrderPatternParameters,
+    ProgressParameters,
+    SimulationData,
+    ShellCorrelationParameters,
+    SimulationParameters,
+    SnapshotParameters,
+    StructureFactorParameters,
+)
+import spyns.algorithms.metropolis.heisenberg_cython
+import spyns.data
+import spyns.metrics
+import spyns.model.heisenberg
+import spyns.model.heisenberg_cython
+import spyns.snapshots
+from spyns.data_cython import SimulationHeisenbergData_t
+from spyns.random_numbers.distribution import RandomNumberGenerator
+
+
+def simulation(
+    lookup_tables: LookupTables,
+    parameters: SimulationParameters,
+    histogram_parameters: Optional[HistogramParameters] = None,
+    metrics_parameters: Optional[MetricsParameters] = None,
+    progress_parameters: Optional[ProgressParameters] = None,
+    hamiltonian_parameters: Optional[HamiltonianParameters] = None,
+    structure_factor_parameters: Optional[StructureFactorParameters] = None,
+    shell_correlation_parameters: Optional[ShellCorrelationParameters] = None,
+    order_pattern_parameters: Optional[OrderPatternParameters] = None,
+    snapshot_parameters: Optional[SnapshotParameters] = None,
+) -> SimulationData:
+    """Run a Heisenberg model simulation using only NumPy and the compiled kernels.
+
+    Unlike ``spyns.run.simulation``, no lattice is built and the trace is not
+    post-processed into a data frame, so neither pymatgen nor pandas is imported. The
+    raw trace, estimators, and histograms are left in the data container.
+
+    :param lookup_tables: Neighbor and interaction tables that define the system under
+        simulation, for example from ``make_lookup_tables`` or
+        ``spyns.lattice.cache.load_lookup_tables``.
+    :param parameters: Parameters to use for setting up and running the simulation.
+    :param histogram_parameters: Optional binning for the sample-time histograms.
+    :param metrics_parameters: Optional settings for collecting run metrics, see
+        ``spyns.run.simulation``.
+    :param progress_parameters: Optional progress callback and reporting intervals,
+        see ``spyns.run.simulation``.
+    :param hamiltonian_parameters: Optional terms to add to the isotropic exchange,
+        see ``spyns.run.simulation``.
+    :param structure_factor_parameters: Optional supercell shape for measuring the
+        spin structure factor, see ``spyns.run.simulation``.
+    :param shell_correlation_parameters: Optional settings for accumulating the
+        shell correlations, see ``spyns.run.simulation``.
+    :param order_pattern_parameters: Optional sublattice patterns to trace order
+        parameters for, see ``spyns.run.simulation``.
+    :param snapshot_parameters: Optional encoding for compact state snapshots, see
+        ``spyns.run.simulation``.
+    :return: Data container of results for the simulation.
+    """
+    np.random.seed(parameters.seed)
+
+    heisenberg_state: HeisenbergState = spyns.model.heisenberg.sample_random_state(
+        lookup_tables.number_sites
+    )
+    data_object: SimulationData = spyns.data.setup_containers(
+        parameters=parameters,
+        state=heisenberg_state,
+        lattice=lookup_tables,
+        histogram_parameters=histogram_parameters,
+        metrics_parameters=metrics_parameters,
+        hamiltonian_parameters=hamiltonian_parameters,
+        structure_factor_parameters=structure_factor_parameters,
+        shell_correlation_parameters=shell_correlation_parameters,
+        order_pattern_parameters=order_pattern_parameters,
+        snapshot_parameters=snapshot_parameters,
+    )
+    data: SimulationHeisenbergData_t = SimulationHeisenbergData_t(
+        data=data_object,
+        random_number_generator=RandomNumberGenerator(
+            seed=parameters.seed, number_sites=lookup_tables.number_sites
+        ),
+    )
+    data.set_progress_hook(progress_parameters)
+
+    with spyns.metrics.record_phase(data=data_object, phase="pre_simulation"):
+        spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=data, equilibration_run=True
+        )
+
+    with spyns.metrics.record_phase(data=data_object, phase="main_simulation"):
+        spyns.model.heisenberg_cython.save_full_state(data)
+        sweeps_run: int = spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+            data=data, equilibration_run=False
+        )
+
+    if sweeps_run < parameters.sweeps:
+        spyns.data.truncate_trace(data=data_object, sweeps=sweeps_run)
+
+    with spyns.metrics.record_phase(data=data_object, phase="io"):
+        spyns.snapshots.flush_snapshots(data=data_object)
+
+    if metrics_parameters is not None:
+        spyns.metrics.finalize_metrics(
+            data=data_object, log_filepath=metrics_parameters.log_filepath
+        )
+
+    return data_object
+
+
+def make_lookup_tables(
+    neighbors_table: np.ndarray,
+    neighbors_count: np.ndarray,
+    interaction_parameters_table: np.ndarray,
+    sublattice_table: Optional[np.ndarray] = None,
+) -> LookupTables:
+    """Assemble lookup tables from plain NumPy arrays.
+
+    :param neighbors_table: Flattened neighbor site indices, with the neighbors of
+        site ``i`` stored contiguously and in site order.
+    :param neighbors_count: Number of neighbors of each site.
+    :param interaction_parameters_table: Interaction parameter of each entry in
+        ``neighbors_table``.
+    :param sublattice_table: Optional sublattice index of each site. Every site is
+        placed on a single sublattice if not provided.
+    :return: Lookup tables for the simulation kernels.
+    :raises ValueError: An error will be raised if the array lengths are
+        inconsistent.
+    """
+    neighbors_table = np.asarray(neighbors_table, dtype=np.int32)
+    neighbors_count = np.asarray(neighbors_count, dtype=np.int32)
+    interaction_parameters_table = np.asarray(
+        interaction_parameters_table, dtype=np.float64
+    )
+    number_sites: int = len(neighbors_count)
+
+    if sublattice_table is None:
+        sublattice_table = np.zeros(shape=number_sites, dtype=np.int16)
+
+    sublattice_table = np.asarray(sublattice_table, dtype=np.int16)
+
+    if (
+        len(neighbors_table) != int(neighbors_count.sum())
+        or len(interaction_parameters_table) != len(neighbors_table)
+        or len(sublattice_table) != number_sites
+    ):
+        raise ValueError(
+            "neighbors_table and interaction_parameters_table must have one entry per "
+            "neighbor, and neighbors_count and sublattice_table one entry per site."
+        )
+
+    neighbors_lookup_index: np.ndarray = np.zeros(shape=number_sites, dtype=np.int64)
+    np.cumsum(neighbors_count[:-1], out=neighbors_lookup_index[1:])
+    number_sublattices: int = int(sublattice_table.max()) + 1 if number_sites else 0
+
+    return LookupTables(
+        sublattice_table=sublattice_table,
+        sublattice_labels=np.array(
+            [str(sublattice) for sublattice in range(number_sublattices)], dtype=object
+        ),
+        neighbors_table=neighbors_table,
+        neighbors_count=neighbors_count,
+        neighbors_lookup_index=neighbors_lookup_index,
+        interaction_parameters_table=interaction_parameters_table,
+        interaction_class_table=None,
+        interaction_class_parameters=None,
+        number_sites=number_sites,
+        number_sublattices=number_sublattices,
+    )
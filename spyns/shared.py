@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from spyns.data import LookupTables, SharedLookupTables
+
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+
+ARRAY_ALIGNMENT: int = 64
+LOOKUP_ARRAYS: Tuple[str, ...] = (
+    "sublattice_table",
+    "neighbors_table",
+    "neighbors_count",
+    "neighbors_lookup_index",
+    "interaction_parameters_table",
+    "interaction_class_table",
+    "interaction_class_parameters",
+)
+SHARED_MEMORY_DIRECTORY: str = "/dev/shm"
+
+
+def publish_lookup_tables(
+    lattice: Union["Lattice", LookupTables], directory: Optional[str] = None
+) -> SharedLookupTables:
+    """Write the lookup arrays of a lattice once so worker processes can share them.
+
+    The arrays are written to a single file, by default in the shared memory
+    filesystem, and described by a small handle. Pickling the handle instead of the
+    lattice means workers do not receive the pymatgen structure or the neighbor data
+    frames, and ``attach_lookup_tables`` maps the arrays without copying them, so
+    every worker reads the same physical pages.
+
+    The file is not removed automatically. Call ``release_lookup_tables`` when the
+    workers are done, or use ``shared_lookup_tables``.
+
+    :param lattice: Neighbor and interaction tables to publish. A ``LookupTables``
+        container can be passed in place of a ``Lattice``.
+    :param directory: Directory for the shared file. Defaults to ``/dev/shm`` if it
+        exists and to the temporary directory otherwise.
+    :return: Picklable handle to the published tables.
+    """
+    if directory is None:
+        directory = (
+            SHARED_MEMORY_DIRECTORY
+            if os.path.isdir(SHARED_MEMORY_DIRECTORY)
+            else tempfile.gettempdir()
+        )
+
+    with tempfile.NamedTemporaryFile(
+        dir=directory, prefix="spyns-", suffix=".bin", delete=False
+    ) as binary_file:
+        arrays: Dict[str, Dict[str, Any]] = write_lookup_arrays(
+            binary_file=binary_file, lookup_tables=lattice, checksums=False
+        )
+
+    return SharedLookupTables(
+        filepath=binary_file.name,
+        arrays=arrays,
+        sublattice_labels=tuple(str(label) for label in lattice.sublattice_labels),
+        number_sites=int(lattice.number_sites),
+        number_sublattices=int(lattice.number_sublattices),
+    )
+
+
+def attach_lookup_tables(shared_lookup_tables: SharedLookupTables) -> LookupTables:
+    """Map published lookup arrays into the calling process.
+
+    :param shared_lookup_tables: Handle returned by ``publish_lookup_tables``.
+    :return: Lookup tables backed by read-only memory maps.
+    """
+    arrays: Dict[str, np.ndarray] = map_lookup_arrays(
+        filepath=shared_lookup_tables.filepath,
+        array_manifests=shared_lookup_tables.arrays,
+    )
+
+    return LookupTables(
+        sublattice_table=arrays["sublattice_table"],
+        sublattice_labels=np.array(
+            shared_lookup_tables.sublattice_labels, dtype=object
+        ),
+        neighbors_table=arrays["neighbors_table"],
+        neighbors_count=arrays["neighbors_count"],
+        neighbors_lookup_index=arrays["neighbors_lookup_index"],
+        interaction_parameters_table=arrays.get("interaction_parameters_table"),
+        interaction_class_table=arrays.get("interaction_class_table"),
+        interaction_class_parameters=arrays.get("interaction_class_parameters"),
+        number_sites=shared_lookup_tables.number_sites,
+        number_sublattices=shared_lookup_tables.number_sublattices,
+    )
+
+
+def release_lookup_tables(shared_lookup_tables: SharedLookupTables) -> None:
+    """Remove the file behind published lookup tables.
+
+    Processes that still have the arrays mapped keep their mapping until they drop
+    it, so the tables can be released as soon as every worker has attached.
+
+    :param shared_lookup_tables: Handle returned by ``publish_lookup_tables``.
+    """
+    try:
+        os.unlink(shared_lookup_tables.filepath)
+
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def shared_lookup_tables(
+    lattice: Union["Lattice", LookupTables], directory: Optional[str] = None
+) -> Iterator[SharedLookupTables]:
+    """Publish the lookup arrays of a lattice for the duration of a ``with`` block.
+
+    :param lattice: Neighbor and interaction tables to publish.
+    :param directory: Directory for the shared file.
+    :return: Picklable handle to the published tables.
+    """
+    handle: SharedLookupTables = publish_lookup_tables(
+        lattice=lattice, directory=directory
+    )
+
+    try:
+        yield handle
+
+    finally:
+        release_lookup_tables(shared_lookup_tables=handle)
+
+
+def write_lookup_arrays(
+    binary_file: IO[bytes],
+    lookup_tables: Union["Lattice", LookupTables],
+    checksums: bool,
+) -> Dict[str, Dict[str, Any]]:
+    """Write the lookup arrays back to back, each aligned to ``ARRAY_ALIGNMENT``.
+
+    :param binary_file: File opened for binary writing, positioned at its start.
+    :param lookup_tables: Neighbor and interaction tables to write. Arrays that are
+        ``None`` are skipped.
+    :param checksums: Record the SHA-256 checksum of each array.
+    :return: Dtype, shape, and byte offset of each array, keyed by name, along with
+        its checksum if requested.
+    """
+    array_manifests: Dict[str, Dict[str, Any]] = {}
+    offset: int = 0
+
+    for name in LOOKUP_ARRAYS:
+        if getattr(lookup_tables, name) is None:
+            continue
+
+        array: np.ndarray = np.ascontiguousarray(getattr(lookup_tables, name))
+        padding: int = -offset % ARRAY_ALIGNMENT
+        binary_file.write(b"\0" * padding)
+        offset += padding
+        binary_file.write(array.tobytes())
+        array_manifests[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+
+        if checksums:
+            array_manifests[name]["sha256"] = hashlib.sha256(array).hexdigest()
+
+        offset += array.nbytes
+
+    return array_manifests
+
+
+def allocate_shared_arrays(
+    array_specs: Dict[str, Tuple[np.dtype, Tuple[int, ...]]],
+    directory: Optional[str] = None,
+) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """Create a zero-filled file of arrays that worker processes can write to.
+
+    The arrays are laid out like the ones of ``write_lookup_arrays``, so they are
+    mapped with ``map_lookup_arrays`` using ``mode="r+"``. The file is not removed
+    automatically.
+
+    :param array_specs: Dtype and shape of each array, keyed by name.
+    :param directory: Directory for the shared file. Defaults to ``/dev/shm`` if it
+        exists and to the temporary directory otherwise.
+    :return: Path to the shared file, along with the dtype, shape, and byte offset
+        of each array.
+    """
+    if directory is None:
+        directory = (
+            SHARED_MEMORY_DIRECTORY
+            if os.path.isdir(SHARED_MEMORY_DIRECTORY)
+            else tempfile.gettempdir()
+        )
+
+    array_manifests: Dict[str, Dict[str, Any]] = {}
+    offset: int = 0
+
+    for name, (dtype, shape) in array_specs.items():
+        offset += -offset % ARRAY_ALIGNMENT
+        array_manifests[name] = {
+            "dtype": np.dtype(dtype).str,
+            "shape": list(shape),
+            "offset": offset,
+        }
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+
+    with tempfile.NamedTemporaryFile(
+        dir=directory, prefix="spyns-", suffix=".bin", delete=False
+    ) as binary_file:
+        binary_file.truncate(offset)
+
+    return binary_file.name, array_manifests
+
+
+def map_lookup_arrays(
+    filepath: str, array_manifests: Dict[str, Dict[str, Any]], mode: str = "r"
+) -> Dict[str, np.ndarray]:
+    """Map the arrays written by ``write_lookup_arrays`` into memory.
+
+    :param filepath: Path to the binary file.
+    :param array_manifests: Dtype, shape, and byte offset of each array.
+    :param mode: Memory map mode, ``r`` for read-only or ``r+`` for read-write.
+    :return: Memory maps, keyed by array name.
+    """
+    return {
+        name: np.memmap(
+            filename=filepath,
+            dtype=np.dtype(array_manifest["dtype"]),
+            mode=mode,
+            offset=array_manifest["offset"],
+            shape=tuple(array_manifest["shape"]),
+        )
+        for name, array_manifest in array_manifests.items()
+    }
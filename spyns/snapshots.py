@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from spyns.data import HeisenbergState, SimulationData, SnapshotBuffer
+
+MAGIC: bytes = b"SPYNSNAP"
+CHUNK_HEADER: struct.Struct = struct.Struct("<IQ")
+HEISENBERG_ENCODINGS: Dict[str, str] = {
+    "float64": "<f8",
+    "float32": "<f4",
+    "angles16": "<u2",
+    "octahedral16": "<i2",
+}
+ISING_ENCODINGS: Dict[str, str] = {"bits": "u1"}
+ANGLE_LEVELS: int = 2 ** 16
+OCTAHEDRAL_SCALE: int = 2 ** 15 - 1
+
+State = Union[np.ndarray, HeisenbergState]
+
+
+def encode_heisenberg_state(state: HeisenbergState, encoding: str) -> np.ndarray:
+    """Encode the spin vectors of a Heisenberg state.
+
+    The encodings and the largest angle between an encoded unit vector and the
+    decoded one are:
+
+    * ``float64``, 24 bytes per site, lossless.
+    * ``float32``, 12 bytes per site, at most about ``6e-8`` rad. Decoded vectors
+      are not renormalized.
+    * ``angles16``, 4 bytes per site, the polar and azimuthal angles rounded to 16
+      bits each. The error is at most ``sqrt((pi / 2**17)**2 + (pi / 2**16)**2)``,
+      about ``5.4e-5`` rad, and shrinks toward the poles.
+    * ``octahedral16``, 4 bytes per site, the octahedral projection of the vector
+      onto the unit square rounded to two 16-bit integers. The error is at most
+      about ``7e-5`` rad. Decoding is cheaper than with ``angles16`` as it needs no
+      trigonometric functions.
+
+    :param state: Container of spin vectors on the Heisenberg lattice.
+    :param encoding: Name of the encoding.
+    :return: Array of shape ``(number_sites, components)`` of encoded spin vectors.
+    :raises ValueError: An error will be raised if the encoding is unknown.
+    """
+    check_encoding(encoding=encoding, encodings=HEISENBERG_ENCODINGS)
+    dtype: str = HEISENBERG_ENCODINGS[encoding]
+
+    if encoding in ["float64", "float32"]:
+        return np.column_stack([state.x, state.y, state.z]).astype(dtype)
+
+    if encoding == "angles16":
+        theta: np.ndarray = np.arccos(np.clip(state.z, -1.0, 1.0))
+        phi: np.ndarray = np.mod(np.arctan2(state.y, state.x), 2 * np.pi)
+
+        return np.column_stack(
+            [
+                np.rint(theta / np.pi * (ANGLE_LEVELS - 1)),
+                np.mod(np.rint(phi / (2 * np.pi) * ANGLE_LEVELS), ANGLE_LEVELS),
+            ]
+        ).astype(dtype)
+
+    norm: np.ndarray = np.abs(state.x) + np.abs(state.y) + np.abs(state.z)
+    u: np.ndarray = state.x / norm
+    v: np.ndarray = state.y / norm
+    lower: np.ndarray = state.z < 0
+    u[lower], v[lower] = (
+        (1 - np.abs(v[lower])) * sign(u[lower]),
+        (1 - np.abs(u[lower])) * sign(v[lower]),
+    )
+
+    return np.rint(
+        np.clip(np.column_stack([u, v]), -1.0, 1.0) * OCTAHEDRAL_SCALE
+    ).astype(dtype)
+
+
+def decode_heisenberg_state(encoded: np.ndarray, encoding: str) -> HeisenbergState:
+    """Decode the spin vectors of a Heisenberg state.
+
+    :param encoded: Encoded spin vectors from ``encode_heisenberg_state``.
+    :param encoding: Name of the encoding.
+    :return: Container of contiguous ``float64`` spin vectors on the Heisenberg
+        lattice.
+    :raises ValueError: An error will be raised if the encoding is unknown.
+    """
+    check_encoding(encoding=encoding, encodings=HEISENBERG_ENCODINGS)
+
+    if encoding in ["float64", "float32"]:
+        x, y, z = encoded.astype(np.float64).T
+
+    elif encoding == "angles16":
+        theta: np.ndarray = encoded[:, 0] * (np.pi / (ANGLE_LEVELS - 1))
+        phi: np.ndarray = encoded[:, 1] * (2 * np.pi / ANGLE_LEVELS)
+        sin_theta: np.ndarray = np.sin(theta)
+        x, y, z = sin_theta * np.cos(phi), sin_theta * np.sin(phi), np.cos(theta)
+
+    else:
+        u, v = encoded.T / OCTAHEDRAL_SCALE
+        z = 1 - np.abs(u) - np.abs(v)
+        lower: np.ndarray = z < 0
+        u[lower], v[lower] = (
+            (1 - np.abs(v[lower])) * sign(u[lower]),
+            (1 - np.abs(u[lower])) * sign(v[lower]),
+        )
+        norm: np.ndarray = np.sqrt(u ** 2 + v ** 2 + z ** 2)
+        x, y, z = u / norm, v / norm, z / norm
+
+    return HeisenbergState(
+        x=np.ascontiguousarray(x), y=np.ascontiguousarray(y), z=np.ascontiguousarray(z)
+    )
+
+
+def encode_ising_state(state: np.ndarray) -> np.ndarray:
+    """Pack the spins of an Ising state into bits, losslessly.
+
+    :param state: One-dimensional array of ``+1`` and ``-1`` spins.
+    :return: Array of ``ceil(number_sites / 8)`` bytes, one bit per site.
+    :raises ValueError: An error will be raised if a spin is not ``+1`` or ``-1``.
+    """
+    if not np.all(np.abs(state) == 1):
+        raise ValueError("Only +1 and -1 spins can be bit-packed.")
+
+    return np.packbits(state > 0)
+
+
+def decode_ising_state(encoded: np.ndarray, number_sites: int) -> np.ndarray:
+    """Unpack the spins of an Ising state.
+
+    :param encoded: Packed spins from ``encode_ising_state``.
+    :param number_sites: Number of sites in the lattice.
+    :return: One-dimensional array of ``+1`` and ``-1`` spins.
+    """
+    return np.where(np.unpackbits(encoded)[:number_sites], 1, -1)
+
+
+def add_snapshot(data: SimulationData, sweep_index: int) -> None:
+    """Encode the current state and write the buffered chunk once it is full.
+
+    :param data: Data container for the simulation.
+    :param sweep_index: Sweep index for the simulation.
+    """
+    snapshots: SnapshotBuffer = data.snapshots
+
+    if snapshots.encoding in ISING_ENCODINGS:
+        snapshots.encoded_states.append(encode_ising_state(state=data.state))
+
+    else:
+        snapshots.encoded_states.append(
+            encode_heisenberg_state(state=data.state, encoding=snapshots.encoding)
+        )
+
+    snapshots.sweeps.append(sweep_index)
+
+    if len(snapshots.sweeps) >= snapshots.chunk_size:
+        flush_snapshots(data=data)
+
+
+def flush_snapshots(data: SimulationData) -> None:
+    """Write the buffered snapshots to disk as one chunk.
+
+    The file starts with a JSON header describing the encoding and is followed by
+    chunks of snapshots. Each chunk is a ``(number_snapshots, payload_bytes)`` header
+    and a payload holding the ``int64`` sweep indices and then the encoded states. The
+    payload is ``zlib`` compressed if a compression level is set. The first flush of
+    a run truncates the file.
+
+    :param data: Data container for the simulation.
+    """
+    snapshots: SnapshotBuffer = data.snapshots
+
+    if snapshots is None or not snapshots.sweeps:
+        return
+
+    payload: bytes = np.asarray(snapshots.sweeps, dtype="<i8").tobytes() + b"".join(
+        encoded_state.tobytes() for encoded_state in snapshots.encoded_states
+    )
+
+    if snapshots.compression_level is not None:
+        payload = zlib.compress(payload, snapshots.compression_level)
+
+    with open(
+        data.parameters.snapshot_filepath, "ab" if snapshots.number_chunks else "wb"
+    ) as snapshot_file:
+        if not snapshots.number_chunks:
+            header: bytes = json.dumps(
+                dict(
+                    encoding=snapshots.encoding,
+                    compressed=snapshots.compression_level is not None,
+                    number_sites=int(data.lookup_tables.number_sites),
+                    encoded_shape=list(snapshots.encoded_states[0].shape),
+                )
+            ).encode()
+            snapshot_file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+        snapshot_file.write(CHUNK_HEADER.pack(len(snapshots.sweeps), len(payload)))
+        snapshot_file.write(payload)
+
+    snapshots.number_chunks += 1
+    snapshots.sweeps.clear()
+    snapshots.encoded_states.clear()
+
+
+def read_snapshots(filepath: str) -> Tuple[np.ndarray, List[State]]:
+    """Load and decode the snapshots of a run.
+
+    :param filepath: Path of the snapshot file.
+    :return: Sweep index of each snapshot and the decoded states, either
+        ``HeisenbergState`` containers or one-dimensional arrays of Ising spins.
+    :raises ValueError: An error will be raised if the file is not a snapshot file.
+    """
+    sweeps: List[np.ndarray] = []
+    states: List[State] = []
+
+    with open(filepath, "rb") as snapshot_file:
+        if snapshot_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filepath} is not a sPyns snapshot file.")
+
+        (header_length,) = struct.unpack("<I", snapshot_file.read(4))
+        header: Dict[str, Any] = json.loads(snapshot_file.read(header_length))
+        encoding: str = header["encoding"]
+        dtype: str = {**HEISENBERG_ENCODINGS, **ISING_ENCODINGS}[encoding]
+        encoded_shape: Tuple[int, ...] = tuple(header["encoded_shape"])
+        chunk_header: bytes = snapshot_file.read(CHUNK_HEADER.size)
+
+        while chunk_header:
+            number_snapshots, payload_length = CHUNK_HEADER.unpack(chunk_header)
+            payload: bytes = snapshot_file.read(payload_length)
+
+            if header["compressed"]:
+                payload = zlib.decompress(payload)
+
+            sweeps.append(np.frombuffer(payload, dtype="<i8", count=number_snapshots))
+            encoded_states: np.ndarray = np.frombuffer(
+                payload, dtype=dtype, offset=8 * number_snapshots
+            ).reshape((number_snapshots,) + encoded_shape)
+
+            for encoded in encoded_states:
+                if encoding in ISING_ENCODINGS:
+                    states.append(
+                        decode_ising_state(
+                            encoded=encoded, number_sites=header["number_sites"]
+                        )
+                    )
+
+                else:
+                    states.append(
+                        decode_heisenberg_state(encoded=encoded, encoding=encoding)
+                    )
+
+            chunk_header = snapshot_file.read(CHUNK_HEADER.size)
+
+    return np.concatenate(sweeps) if sweeps else np.zeros(0, dtype=np.int64), states
+
+
+def check_encoding(encoding: str, encodings: Dict[str, str]) -> None:
+    """Check that an encoding is supported.
+
+    :param encoding: Name of the encoding.
+    :param encodings: Supported encodings.
+    :raises ValueError: An error will be raised if the encoding is not supported.
+    """
+    if encoding not in encodings:
+        raise ValueError(
+            f"Unknown snapshot encoding {encoding!r}, expected one of "
+            f"{sorted(encodings)}."
+        )
+
+
+def sign(values: np.ndarray) -> np.ndarray:
+    """Sign of each value, counting zero as positive.
+
+    :param values: Array of values.
+    :return: Array of ``+1.0`` and ``-1.0``.
+    """
+    return np.where(values >= 0, 1.0, -1.0)
@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 import numpy as np
-import pandas as pd
 
-from spyns.data import SimulationData
+from spyns.data import ShellCorrelations, SimulationData
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def compute_running_average(trace_df: pd.DataFrame, estimator_name: str) -> None:
+
+def compute_running_average(trace_df: "pd.DataFrame", estimator_name: str) -> None:
     """Compute running average for a series of estimator samples.
 
     :param trace_df: Trace history data frame of estimator samples.
@@ -18,14 +20,14 @@ def compute_running_average(trace_df: pd.DataFrame, estimator_name: str) -> None
 
 
 def compute_estimator_moments(
-    trace_df: pd.DataFrame, estimator_name: str, max_power: int = 4
+    trace_df: "pd.DataFrame", estimator_name: str, max_power: int = 4
 ) -> None:
     for power in range(1, max_power + 1):
         trace_df[f"{estimator_name}**{power}"] = trace_df[estimator_name] ** power
 
 
 def compute_estimator_fluctuations(
-    trace_df: pd.DataFrame,
+    trace_df: "pd.DataFrame",
     fluctuation_name: str,
     estimator_name: str,
     number_sites: int,
@@ -38,69 +40,233 @@ def compute_estimator_fluctuations(
     )
 
 
-def compute_binder_parameter(trace_df: pd.DataFrame, estimator_name: str) -> None:
+def compute_binder_parameter(trace_df: "pd.DataFrame", estimator_name: str) -> None:
     trace_df[f"Binder_{estimator_name}"] = 1 - (1 / 3) * (
         trace_df[f"<{estimator_name}**4>"] / trace_df[f"<{estimator_name}**2>"] ** 2
     )
 
 
 def compute_ising_afm_order_parameter(
-    trace_df: pd.DataFrame,
+    trace_df: "pd.DataFrame",
     order_parameter_name: str,
     sublattices1: List[str],
     sublattices2: List[str],
     number_sites: int,
 ) -> None:
-    spin_vector_df = trace_df.copy()
-    spin_vector_df["spin1"] = 0.0
-    spin_vector_df["spin2"] = 0.0
-
-    for sublattice in sublattices1:
-        spin_vector_df["spin1"] += spin_vector_df[f"S{sublattice}"]
+    columns: List[str] = [
+        f"S{sublattice}" for sublattice in list(sublattices1) + list(sublattices2)
+    ]
 
-    for sublattice in sublattices2:
-        spin_vector_df["spin2"] += spin_vector_df[f"S{sublattice}"]
-
-    trace_df[order_parameter_name] = (
-        np.abs(spin_vector_df["spin2"] - spin_vector_df["spin1"]) / number_sites
-    )
+    trace_df[order_parameter_name] = compute_order_parameters(
+        spin_vector=trace_df[columns].values[:, :, np.newaxis],
+        weights=make_staggered_weights(
+            number_sublattices1=len(sublattices1), number_sublattices2=len(sublattices2)
+        ),
+        number_sites=number_sites,
+    )[:, 0]
 
 
 def compute_heisenberg_afm_order_parameter(
-    trace_df: pd.DataFrame,
+    trace_df: "pd.DataFrame",
     order_parameter_name: str,
     sublattices1: List[str],
     sublattices2: List[str],
     number_sites: int,
 ) -> None:
-    spin_vector_df = trace_df.copy()
-    spin_vector_df["spin1x"] = 0.0
-    spin_vector_df["spin1y"] = 0.0
-    spin_vector_df["spin1z"] = 0.0
-    spin_vector_df["spin2x"] = 0.0
-    spin_vector_df["spin2y"] = 0.0
-    spin_vector_df["spin2z"] = 0.0
-
-    for sublattice in sublattices1:
-        spin_vector_df["spin1x"] += spin_vector_df[f"S{sublattice}x"]
-        spin_vector_df["spin1y"] += spin_vector_df[f"S{sublattice}y"]
-        spin_vector_df["spin1z"] += spin_vector_df[f"S{sublattice}z"]
-
-    for sublattice in sublattices2:
-        spin_vector_df["spin2x"] += spin_vector_df[f"S{sublattice}x"]
-        spin_vector_df["spin2y"] += spin_vector_df[f"S{sublattice}y"]
-        spin_vector_df["spin2z"] += spin_vector_df[f"S{sublattice}z"]
-
-    trace_df[order_parameter_name] = (
-        np.linalg.norm(
-            spin_vector_df[["spin1x", "spin1y", "spin1z"]].values
-            - spin_vector_df[["spin2x", "spin2y", "spin2z"]].values,
-            axis=1,
-        )
+    columns: List[str] = [
+        f"S{sublattice}{axis}"
+        for sublattice in list(sublattices1) + list(sublattices2)
+        for axis in "xyz"
+    ]
+
+    trace_df[order_parameter_name] = compute_order_parameters(
+        spin_vector=trace_df[columns].values.reshape(len(trace_df), -1, 3),
+        weights=make_staggered_weights(
+            number_sublattices1=len(sublattices1), number_sublattices2=len(sublattices2)
+        ),
+        number_sites=number_sites,
+    )[:, 0]
+
+
+def make_staggered_weights(
+    number_sublattices1: int, number_sublattices2: int
+) -> np.ndarray:
+    """Make the weights of a two-sublattice staggered pattern.
+
+    :param number_sublattices1: Number of sublattices with weight ``-1``, listed first.
+    :param number_sublattices2: Number of sublattices with weight ``+1``, listed last.
+    :return: Weight matrix with a single pattern, see ``compute_order_parameters``.
+    """
+    return np.concatenate(
+        [-np.ones(shape=number_sublattices1), np.ones(shape=number_sublattices2)]
+    )[np.newaxis, :]
+
+
+def make_pattern_weights(
+    sublattice_labels: np.ndarray, patterns: Dict[str, Dict[str, float]]
+) -> Tuple[List[str], np.ndarray]:
+    """Build the weight matrix of several sublattice ordering patterns.
+
+    :param sublattice_labels: Labels of the sublattices, in sublattice index order.
+    :param patterns: Map of pattern name to the weight of each sublattice label in
+        the pattern. Sublattices left out of a pattern have zero weight.
+    :return: Tuple of the pattern names and the ``(patterns, sublattices)`` weight
+        matrix.
+    :raises ValueError: An error will be raised if a pattern names an unknown
+        sublattice.
+    """
+    sublattice_indices: Dict[str, int] = {
+        str(label): index for index, label in enumerate(sublattice_labels)
+    }
+    weights: np.ndarray = np.zeros(shape=(len(patterns), len(sublattice_labels)))
+
+    for pattern_index, pattern_weights in enumerate(patterns.values()):
+        for label, weight in pattern_weights.items():
+            if label not in sublattice_indices:
+                raise ValueError(
+                    f"Unknown sublattice {label}, expected one of "
+                    f"{sorted(sublattice_indices)}."
+                )
+
+            weights[pattern_index, sublattice_indices[label]] = weight
+
+    return list(patterns), weights
+
+
+def compute_order_parameters(
+    spin_vector: np.ndarray, weights: np.ndarray, number_sites: int
+) -> np.ndarray:
+    """Compute the magnitude of sublattice-pattern order parameters.
+
+    Each pattern ``p`` weights the summed spin vector of each sublattice ``s`` and
+    takes the norm, ``|sum_s weights[p, s] * spin_vector[..., s, :]| / number_sites``.
+    A pattern of all ones gives the magnetization, and a pattern of ``+1`` and ``-1``
+    gives a staggered magnetization.
+
+    :param spin_vector: Summed spin vectors of shape ``(samples, sublattices,
+        components)``, such as ``SimulationTrace.spin_vector``.
+    :param weights: Weight matrix of shape ``(patterns, sublattices)``.
+    :param number_sites: Number of sites in the lattice.
+    :return: Array of shape ``(samples, patterns)``.
+    """
+    return (
+        np.linalg.norm(np.einsum("ps,nsx->npx", weights, spin_vector), axis=-1)
         / number_sites
     )
 
 
+def compute_block_means(samples: np.ndarray, number_blocks: int) -> np.ndarray:
+    """Split a series of samples into equal-sized blocks and average each block.
+
+    Leading samples that do not fill a complete block are discarded so that the most
+    recent samples are always kept.
+
+    :param samples: One-dimensional array of estimator samples.
+    :param number_blocks: Number of blocks to split the samples into.
+    :return: Array of block averages.
+    """
+    block_size: int = len(samples) // number_blocks
+    first_sample: int = len(samples) - block_size * number_blocks
+    blocks: np.ndarray = samples[first_sample:]
+
+    return blocks.reshape(number_blocks, block_size).mean(axis=1)
+
+
+def detect_equilibration(
+    samples: np.ndarray, number_blocks: int, tolerance: float
+) -> bool:
+    """Check if a series of samples has stopped drifting by comparing block means.
+
+    The samples are split into ``number_blocks`` blocks. The series is considered
+    equilibrated when the mean of the first half of the blocks agrees with the mean of
+    the second half to within ``tolerance`` standard errors, where the standard error
+    is estimated from the scatter of the block means within each half.
+
+    :param samples: One-dimensional array of estimator samples, such as the energy
+        trace recorded during the equilibration sweeps.
+    :param number_blocks: Number of blocks to split the samples into. Must be an even
+        number no smaller than four.
+    :param tolerance: Number of standard errors the two halves are allowed to differ
+        by.
+    :return: Boolean specifying if the samples appear to be equilibrated.
+    """
+    if len(samples) < 2 * number_blocks:
+        return False
+
+    block_means: np.ndarray = compute_block_means(
+        samples=samples, number_blocks=number_blocks
+    )
+    half: int = number_blocks // 2
+    first_half: np.ndarray = block_means[:half]
+    second_half: np.ndarray = block_means[half:]
+
+    drift: float = np.abs(first_half.mean() - second_half.mean())
+    standard_error: float = np.sqrt(
+        first_half.var(ddof=1) / len(first_half)
+        + second_half.var(ddof=1) / len(second_half)
+    )
+
+    return bool(drift <= tolerance * standard_error)
+
+
+def compute_relative_error(samples: np.ndarray, number_blocks: int) -> float:
+    """Estimate the relative statistical error of a sample mean using block means.
+
+    :param samples: One-dimensional array of estimator samples.
+    :param number_blocks: Number of blocks to use for the batch means estimate.
+    :return: Standard error of the mean divided by the magnitude of the mean.
+        Returns infinity if there are too few samples or the mean is zero.
+    """
+    if len(samples) < 2 * number_blocks:
+        return np.inf
+
+    block_means: np.ndarray = compute_block_means(
+        samples=samples, number_blocks=number_blocks
+    )
+    mean: float = np.abs(block_means.mean())
+
+    if mean == 0:
+        return np.inf
+
+    return float(block_means.std(ddof=1) / np.sqrt(number_blocks) / mean)
+
+
+def compute_shell_correlations(data: SimulationData) -> "pd.DataFrame":
+    """Average the shell correlations and split the exchange energy by bond type.
+
+    Rows are indexed by interaction class, which matches the rows of
+    ``Lattice.sublattice_pairs_data_frame``. Every bond appears twice in the neighbor
+    table, once from each end, so the exchange energy of a class is half its
+    interaction parameter times the correlation sum. The ``<E_ij>`` column adds up
+    to the average isotropic exchange energy.
+
+    :param data: Data container of a simulation run with shell correlations.
+    :return: Data frame with the interaction parameter ``J_ij``, the number of
+        neighbor table entries ``n``, the mean correlation ``<Si.Sj>``, and the mean
+        exchange energy ``<E_ij>`` of each interaction class.
+    """
+    import pandas as pd
+
+    shell_correlations: ShellCorrelations = data.shell_correlations
+    correlation_sums: np.ndarray = shell_correlations.correlation_sums / max(
+        shell_correlations.number_samples[0], 1
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_correlations: np.ndarray = correlation_sums / shell_correlations.bond_counts
+
+    return pd.DataFrame(
+        data={
+            "J_ij": shell_correlations.interaction_class_parameters,
+            "n": shell_correlations.bond_counts,
+            "<Si.Sj>": mean_correlations,
+            "<E_ij>": 0.5
+            * shell_correlations.interaction_class_parameters
+            * correlation_sums,
+        }
+    ).rename_axis(index="interaction_class")
+
+
 def update_trace(data: SimulationData, sweep_index: int) -> None:
     """Save estimators samples in the simulation trace.
 
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from typing import Tuple
+
+import numpy as np
+
+from spyns.data import SimulationData, StructureFactor
+
+
+def update_structure_factor(data: SimulationData) -> None:
+    """Add the spin structure factor of the current state to the running sum.
+
+    The spin vectors of each unit cell site are laid out on the grid of supercell
+    translations and Fourier transformed with a 3D FFT, so a measurement costs
+    ``O(N log N)``. For unit cell sites ``a`` and ``b`` the sample is
+    ``S_ab(q) = F_a(q) . conj(F_b(q)) / number_cells``, where
+    ``F_a(q) = sum_t S_a(t) exp(-2 pi i q . t)`` runs over the translations ``t``.
+
+    :param data: Data container for the simulation.
+    """
+    structure_factor: StructureFactor = data.structure_factor
+    grid_shape: Tuple[int, ...] = (
+        3,
+        structure_factor.correlations.shape[0],
+    ) + structure_factor.scaling_factors
+
+    spin_vector_transforms: np.ndarray = np.fft.fftn(
+        np.stack([data.state.x, data.state.y, data.state.z]).reshape(grid_shape),
+        axes=(2, 3, 4),
+    )
+
+    structure_factor.correlations += np.einsum(
+        "xaijk,xbijk->abijk", spin_vector_transforms, spin_vector_transforms.conj()
+    ) / np.prod(structure_factor.scaling_factors)
+    structure_factor.number_samples[0] += 1
+
+
+def compute_average_structure_factor(structure_factor: StructureFactor) -> np.ndarray:
+    """Average the accumulated spin structure factor over the samples.
+
+    :param structure_factor: Structure factor container of a finished simulation.
+    :return: Complex array of shape ``(number_unit_sites, number_unit_sites, *scaling)``
+        whose ``[a, b]`` element is ``S_ab(q)`` on the grid from ``get_wave_vectors``.
+    """
+    return structure_factor.correlations / max(structure_factor.number_samples[0], 1)
+
+
+def get_wave_vectors(scaling_factors: Tuple[int, int, int]) -> np.ndarray:
+    """List the wave vectors of the structure factor grid.
+
+    :param scaling_factors: Number of unit cells along each lattice vector.
+    :return: Array of shape ``(*scaling_factors, 3)`` of wave vectors in units of the
+        reciprocal lattice vectors of the unit cell, within ``[-1/2, 1/2)``.
+    """
+    return np.stack(
+        np.meshgrid(
+            *[np.fft.fftfreq(scaling_factor) for scaling_factor in scaling_factors],
+            indexing="ij",
+        ),
+        axis=-1,
+    )
+
+
+def find_ordering_vector(structure_factor: StructureFactor) -> np.ndarray:
+    """Find the wave vector where the averaged structure factor peaks.
+
+    The peak is taken over the sum of the diagonal ``S_aa(q)`` terms, which does not
+    depend on where the sites sit within the unit cell.
+
+    :param structure_factor: Structure factor container of a finished simulation.
+    :return: Ordering wave vector in units of the reciprocal lattice vectors of the
+        unit cell.
+    """
+    average: np.ndarray = compute_average_structure_factor(
+        structure_factor=structure_factor
+    )
+    diagonal_sum: np.ndarray = np.einsum("aa...->...", average).real
+    peak: Tuple[int, ...] = np.unravel_index(
+        np.argmax(diagonal_sum), diagonal_sum.shape
+    )
+
+    return get_wave_vectors(scaling_factors=structure_factor.scaling_factors)[peak]
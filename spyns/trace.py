@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+import os
+import warnings
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import numpy as np
+
+from spyns.data import SimulationData
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+
+except ImportError:
+    pyarrow = None
+
+MAX_POWER: int = 4
+TRACE_FORMATS: Dict[str, str] = {
+    ".csv": "csv",
+    ".feather": "feather",
+    ".npz": "npz",
+    ".parquet": "parquet",
+}
+ARROW_TRACE_FORMATS: List[str] = ["feather", "parquet"]
+
+
+class TraceView(object):
+    """Lazy, column-addressable view of a simulation trace.
+
+    Raw columns wrap the ``SimulationTrace`` arrays without copying them. Derived
+    columns use the names of the old trace data frame and are computed on first
+    access and then cached:
+
+    * ``E**k`` and ``M**k`` for powers ``k`` up to 4.
+    * ``<name>``, the running average of any other column.
+    * ``C``, ``X``, and ``Binder_M``, the heat capacity, susceptibility, and Binder
+      parameter, for ``heisenberg_cython`` runs.
+    * ``theta{s}`` and ``phi{s}``, the angles of sublattice ``s``, for
+      ``heisenberg`` runs.
+
+    Cached columns can be dropped with ``evict``, and ``to_data_frame`` builds a
+    pandas ``DataFrame`` when one is needed.
+    """
+
+    __slots__ = ["_raw_columns", "_cache", "_derived_columns", "_number_sites", "_data"]
+
+    def __init__(self, data: SimulationData):
+        """Wrap the trace arrays of a simulation.
+
+        :param data: Data container for the simulation.
+        """
+        mode: str = data.parameters.mode.strip().lower()
+        number_sublattices: int = data.lookup_tables.number_sublattices
+
+        self._data: SimulationData = data
+        self._number_sites: int = data.lookup_tables.number_sites
+        self._cache: Dict[str, np.ndarray] = {}
+        self._raw_columns: Dict[str, np.ndarray] = {
+            "sweep": data.trace.sweep,
+            "E": data.trace.energy,
+            "M": data.trace.magnetization,
+        }
+        self._derived_columns: List[str] = []
+
+        if mode in ["ising", "voter"]:
+            for sublattice in range(number_sublattices):
+                self._raw_columns[f"S{sublattice}"] = data.trace.spin_vector[
+                    :, sublattice, 0
+                ]
+
+        elif mode == "heisenberg":
+            for sublattice in range(number_sublattices):
+                for component, axis in enumerate("xyz"):
+                    self._raw_columns[f"S{sublattice}{axis}"] = data.trace.spin_vector[
+                        :, sublattice, component
+                    ]
+
+                self._derived_columns.extend([f"theta{sublattice}", f"phi{sublattice}"])
+
+        if data.order_parameters is not None:
+            for name, values in zip(
+                data.order_parameters.names, data.order_parameters.values.T
+            ):
+                self._raw_columns[name] = values
+
+        for estimator in ["E", "M"]:
+            self._derived_columns.extend(
+                [f"{estimator}**{power}" for power in range(1, MAX_POWER + 1)]
+                + [f"<{estimator}**{power}>" for power in range(1, MAX_POWER + 1)]
+            )
+
+        if mode == "heisenberg_cython":
+            self._derived_columns.extend(["C", "X", "Binder_M"])
+
+    def __len__(self) -> int:
+        return len(self._raw_columns["sweep"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._raw_columns or name in self._derived_columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Read a raw or derived column, computing and caching it if needed.
+
+        :param name: Column name.
+        :return: Column values, one per production sweep. Treat as read-only.
+        :raises KeyError: An error will be raised if the column name is unknown.
+        """
+        if name in self._raw_columns:
+            return self._raw_columns[name]
+
+        if name not in self._cache:
+            self._cache[name] = self._compute_column(name=name)
+
+        return self._cache[name]
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the raw columns followed by the listed derived columns."""
+        return list(self._raw_columns) + self._derived_columns
+
+    @property
+    def raw_columns(self) -> Dict[str, np.ndarray]:
+        """Raw columns of the trace, keyed by name, without derived columns."""
+        return dict(self._raw_columns)
+
+    @property
+    def cached_columns(self) -> List[str]:
+        """Names of the derived columns that are currently cached."""
+        return list(self._cache)
+
+    def evict(self, names: Optional[List[str]] = None) -> None:
+        """Drop cached derived columns to free their memory.
+
+        :param names: Columns to drop. Drops every cached column if not provided.
+        """
+        if names is None:
+            self._cache.clear()
+            return
+
+        for name in names:
+            self._cache.pop(name, None)
+
+    def to_data_frame(self, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+        """Build a pandas ``DataFrame`` of the trace.
+
+        :param columns: Columns to include. Defaults to ``columns``.
+        :return: Trace history data frame.
+        """
+        import pandas as pd
+
+        if columns is None:
+            columns = self.columns
+
+        return pd.DataFrame({name: self[name] for name in columns}, columns=columns)
+
+    def _compute_column(self, name: str) -> np.ndarray:
+        """Compute a derived column.
+
+        :param name: Column name.
+        :return: Column values.
+        :raises KeyError: An error will be raised if the column name is unknown.
+        """
+        if name.startswith("<") and name.endswith(">") and name[1:-1] in self:
+            return compute_running_average(samples=self[name[1:-1]])
+
+        if name not in self._derived_columns:
+            raise KeyError(name)
+
+        derived_columns: Dict[str, Callable[[], np.ndarray]] = {
+            "C": lambda: self._compute_fluctuation(estimator_name="E", power=2),
+            "X": lambda: self._compute_fluctuation(estimator_name="M", power=1),
+            "Binder_M": lambda: 1 - (1 / 3) * (self["<M**4>"] / self["<M**2>"] ** 2),
+        }
+
+        if name in derived_columns:
+            return derived_columns[name]()
+
+        if name.startswith("theta"):
+            sublattice: str = name[len("theta"):]
+
+            return np.arctan(
+                (self[f"S{sublattice}x"] ** 2 + self[f"S{sublattice}y"] ** 2)
+                / self[f"S{sublattice}z"]
+            )
+
+        if name.startswith("phi"):
+            sublattice = name[len("phi"):]
+
+            return np.arctan(self[f"S{sublattice}y"] / self[f"S{sublattice}x"])
+
+        estimator_name, power = name.split("**")
+
+        return self[estimator_name] ** int(power)
+
+    def _compute_fluctuation(self, estimator_name: str, power: int) -> np.ndarray:
+        """Compute the running heat capacity or susceptibility.
+
+        :param estimator_name: Either ``E`` or ``M``.
+        :param power: Power of the temperature in the denominator.
+        :return: Fluctuation per site after each production sweep.
+        """
+        return (
+            (self[f"<{estimator_name}**2>"] - self[f"<{estimator_name}**1>"] ** 2)
+            / self._data.parameters.temperature ** power
+            / self._number_sites
+        )
+
+
+def compute_running_average(samples: np.ndarray) -> np.ndarray:
+    """Compute the running average of a series of samples.
+
+    :param samples: One-dimensional array of samples.
+    :return: Array whose element ``i`` is the mean of the first ``i + 1`` samples.
+    """
+    return np.cumsum(samples) / np.arange(1, len(samples) + 1)
+
+
+def get_trace_format(filepath: str, trace_format: Optional[str] = None) -> str:
+    """Work out the file format of a trace history file.
+
+    :param filepath: Path of the trace history file.
+    :param trace_format: One of ``csv``, ``feather``, ``npz``, or ``parquet``. If not
+        provided, the format is taken from the file extension, falling back to
+        ``csv`` for unknown extensions.
+    :return: Trace history file format.
+    :raises ValueError: An error will be raised if the format is unknown.
+    """
+    if trace_format is None:
+        return TRACE_FORMATS.get(os.path.splitext(filepath)[1].lower(), "csv")
+
+    if trace_format.strip().lower() not in TRACE_FORMATS.values():
+        raise ValueError(
+            f"Unknown trace format {trace_format!r}, expected one of "
+            f"{sorted(TRACE_FORMATS.values())}."
+        )
+
+    return trace_format.strip().lower()
+
+
+def write_trace(
+    trace_view: TraceView, filepath: str, trace_format: Optional[str] = None
+) -> str:
+    """Save the trace history to disk.
+
+    The ``csv`` format keeps every column of the trace view and goes through a pandas
+    ``DataFrame``. The columnar ``feather``, ``npz``, and ``parquet`` formats are
+    written straight from the raw trace arrays and skip the derived columns, which
+    ``TraceView`` recomputes on demand. ``feather`` and ``parquet`` need the optional
+    ``pyarrow`` dependency. Without it the trace is written as compressed ``npz``
+    next to the requested path instead.
+
+    :param trace_view: Trace view of the simulation.
+    :param filepath: Path of the trace history file.
+    :param trace_format: File format, see ``get_trace_format``.
+    :return: Path of the file that was written.
+    """
+    trace_format = get_trace_format(filepath=filepath, trace_format=trace_format)
+
+    if trace_format == "csv":
+        trace_view.to_data_frame().to_csv(path_or_buf=filepath, index=False)
+
+        return filepath
+
+    raw_columns: Dict[str, np.ndarray] = {
+        name: np.ascontiguousarray(values)
+        for name, values in trace_view.raw_columns.items()
+    }
+
+    if trace_format in ARROW_TRACE_FORMATS and pyarrow is None:
+        filepath = os.path.splitext(filepath)[0] + ".npz"
+        warnings.warn(
+            f"pyarrow is not installed, writing the trace to {filepath} instead."
+        )
+        trace_format = "npz"
+
+    if trace_format == "npz":
+        with open(filepath, "wb") as trace_file:
+            np.savez_compressed(trace_file, **raw_columns)
+
+        return filepath
+
+    table: "pyarrow.Table" = pyarrow.Table.from_arrays(
+        [pyarrow.array(values) for values in raw_columns.values()],
+        names=list(raw_columns),
+    )
+
+    if trace_format == "parquet":
+        pyarrow.parquet.write_table(table, filepath, compression="zstd")
+
+    else:
+        pyarrow.feather.write_feather(table, filepath, compression="zstd")
+
+    return filepath
+
+
+def read_trace(
+    filepath: str,
+    columns: Optional[List[str]] = None,
+    trace_format: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """Load columns of a saved trace history.
+
+    Only the requested columns are read from the ``feather``, ``npz``, and
+    ``parquet`` formats.
+
+    :param filepath: Path of the trace history file.
+    :param columns: Columns to load. Loads every column if not provided.
+    :param trace_format: File format, see ``get_trace_format``.
+    :return: Trace columns keyed by name.
+    :raises ImportError: An error will be raised if ``pyarrow`` is needed but not
+        installed.
+    """
+    trace_format = get_trace_format(filepath=filepath, trace_format=trace_format)
+
+    if trace_format == "csv":
+        import pandas as pd
+
+        trace_df: "pd.DataFrame" = pd.read_csv(filepath, usecols=columns)
+
+        return {name: trace_df[name].values for name in columns or trace_df.columns}
+
+    if trace_format == "npz":
+        with np.load(filepath) as trace_file:
+            return {name: trace_file[name] for name in columns or trace_file.files}
+
+    if pyarrow is None:
+        raise ImportError(f"Reading {trace_format} traces requires pyarrow.")
+
+    if trace_format == "parquet":
+        table: "pyarrow.Table" = pyarrow.parquet.read_table(filepath, columns=columns)
+
+    else:
+        table = pyarrow.feather.read_table(filepath, columns=columns)
+
+    return {name: table.column(name).to_numpy() for name in table.column_names}
@@ -0,0 +1,630 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, List, Tuple, Union
+
+import numpy as np
+
+from spyns.data import (
+    HeisenbergState,
+    LookupTables,
+    SharedLookupTables,
+    SimulationData,
+    SimulationParameters,
+    WangLandauParameters,
+    WangLandauResult,
+)
+from spyns.reweighting import ReweightedEstimators
+import spyns
+import spyns.algorithms.wang_landau.heisenberg_cython
+import spyns.model.heisenberg
+import spyns.model.heisenberg_cython
+import spyns.shared
+from spyns.data_cython import SimulationHeisenbergData_t
+from spyns.random_numbers.distribution import RandomNumberGenerator
+
+if TYPE_CHECKING:
+    from spyns.lattice import Lattice
+
+EnergyWindow = Tuple[int, int]
+
+
+@dataclass
+class WangLandauWalker(object):
+    data: SimulationHeisenbergData_t
+    window: EnergyWindow
+    energy_min: float
+    bin_width: float
+    log_density_of_states: np.ndarray
+    histogram: np.ndarray
+    visited: np.ndarray
+    log_modification_factor: float
+    sweeps: int
+    __slots__ = [
+        "data",
+        "window",
+        "energy_min",
+        "bin_width",
+        "log_density_of_states",
+        "histogram",
+        "visited",
+        "log_modification_factor",
+        "sweeps",
+    ]
+
+
+def simulation(
+    lattice: Union["Lattice", LookupTables], parameters: WangLandauParameters
+) -> WangLandauResult:
+    """Estimate the density of states of the Heisenberg model with Wang–Landau sampling.
+
+    With more than one energy window, each window is sampled by its own process and
+    configurations are swapped between neighboring windows (replica-exchange
+    Wang–Landau). The window estimates are then joined into one density of states.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :return: Log density of states over the energy bins, along with the bins that
+        were visited and whether every window converged.
+    """
+    bin_width: float = lattice.number_sites * (
+        (parameters.energy_max - parameters.energy_min) / parameters.energy_bins
+    )
+    energy_edges: np.ndarray = lattice.number_sites * np.linspace(
+        start=parameters.energy_min,
+        stop=parameters.energy_max,
+        num=parameters.energy_bins + 1,
+    )
+    windows: List[EnergyWindow] = define_energy_windows(
+        number_bins=parameters.energy_bins,
+        number_windows=parameters.number_windows,
+        window_overlap=parameters.window_overlap,
+    )
+
+    if len(windows) == 1:
+        walker: WangLandauWalker = setup_walker(
+            lattice=lattice,
+            parameters=parameters,
+            window=windows[0],
+            energy_min=energy_edges[0],
+            bin_width=bin_width,
+            seed=parameters.seed,
+        )
+        run_walker(walker=walker, parameters=parameters, sweeps=parameters.max_sweeps)
+        walkers: List[WangLandauWalker] = [walker]
+
+    else:
+        walkers = run_replica_exchange(
+            lattice=lattice,
+            parameters=parameters,
+            windows=windows,
+            energy_min=energy_edges[0],
+            bin_width=bin_width,
+        )
+
+    log_density_of_states, visited = stitch_windows(
+        walkers=walkers, number_bins=parameters.energy_bins
+    )
+
+    return WangLandauResult(
+        energy_edges=energy_edges,
+        log_density_of_states=log_density_of_states,
+        visited=visited,
+        sweeps=max(walker.sweeps for walker in walkers),
+        converged=all(is_walker_converged(walker, parameters) for walker in walkers),
+        number_sites=lattice.number_sites,
+    )
+
+
+def compute_thermodynamics(
+    result: WangLandauResult, temperatures: np.ndarray
+) -> ReweightedEstimators:
+    """Compute canonical averages at any temperature from a Wang–Landau result.
+
+    :param result: Density of states from a Wang–Landau simulation.
+    :param temperatures: Temperatures at which to compute the averages.
+    :return: Energy per site and heat capacity at each temperature. The magnetization
+        and susceptibility are not resolved by the density of states and are ``nan``.
+    """
+    return spyns.reweighting.compute_reweighted_estimators(
+        log_density_of_states=np.where(
+            result.visited, result.log_density_of_states, -np.inf
+        ),
+        energies=spyns.reweighting.compute_bin_centers(edges=result.energy_edges),
+        magnetizations=None,
+        temperatures=temperatures,
+        number_sites=result.number_sites,
+    )
+
+
+def define_energy_windows(
+    number_bins: int, number_windows: int, window_overlap: float
+) -> List[EnergyWindow]:
+    """Split the energy bins into overlapping windows of equal width.
+
+    :param number_bins: Total number of energy bins.
+    :param number_windows: Number of windows to split the bins into.
+    :param window_overlap: Fraction of each window shared with its neighbor.
+    :return: List of half-open ``(first_bin, last_bin)`` intervals.
+    :raises ValueError: An error will be raised if the windows are too narrow to
+        overlap.
+    """
+    if number_windows == 1:
+        return [(0, number_bins)]
+
+    window_width: float = number_bins / (
+        number_windows - (number_windows - 1) * window_overlap
+    )
+    window_starts: np.ndarray = np.round(
+        np.arange(number_windows) * window_width * (1 - window_overlap)
+    ).astype(np.int)
+    window_stops: np.ndarray = np.append(
+        np.round(window_starts[:-1] + window_width).astype(np.int), number_bins
+    )
+
+    if np.any(window_stops[:-1] <= window_starts[1:]):
+        raise ValueError(
+            "Energy windows do not overlap. Increase energy_bins or window_overlap."
+        )
+
+    return list(zip(window_starts.tolist(), window_stops.tolist()))
+
+
+def setup_walker(
+    lattice: Union["Lattice", LookupTables],
+    parameters: WangLandauParameters,
+    window: EnergyWindow,
+    energy_min: float,
+    bin_width: float,
+    seed: int,
+) -> WangLandauWalker:
+    """Initialize a random state and move it inside of an energy window.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :param window: Half-open interval of energy bins sampled by the walker.
+    :param energy_min: Lower edge of the first energy bin.
+    :param bin_width: Width of the energy bins.
+    :param seed: Random number generator seed for the walker.
+    :return: Walker whose state lies inside of its energy window.
+    :raises RuntimeError: An error will be raised if the walker cannot reach its
+        energy window.
+    """
+    np.random.seed(seed)
+
+    heisenberg_state: HeisenbergState = spyns.model.heisenberg.sample_random_state(
+        lattice.number_sites
+    )
+    data_object: SimulationData = spyns.data.setup_containers(
+        parameters=SimulationParameters(
+            seed=seed,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=0,
+            equilibration_sweeps=0,
+            sample_interval=1,
+            temperature=np.inf,
+        ),
+        state=heisenberg_state,
+        lattice=lattice,
+    )
+    data: SimulationHeisenbergData_t = SimulationHeisenbergData_t(
+        data=data_object,
+        random_number_generator=RandomNumberGenerator(
+            seed=seed, number_sites=lattice.number_sites
+        ),
+    )
+    window_energy_min: float = energy_min + window[0] * bin_width
+    window_energy_max: float = energy_min + window[1] * bin_width
+
+    spyns.model.heisenberg_cython.save_full_state(data)
+
+    if not spyns.algorithms.wang_landau.heisenberg_cython.enter_energy_window(
+        data=data,
+        energy_min=window_energy_min,
+        energy_max=window_energy_max,
+        max_sweeps=parameters.max_sweeps,
+    ):
+        raise RuntimeError(
+            f"Could not reach energy window [{window_energy_min}, "
+            f"{window_energy_max}). Check energy_min and energy_max."
+        )
+
+    number_window_bins: int = window[1] - window[0]
+
+    return WangLandauWalker(
+        data=data,
+        window=window,
+        energy_min=window_energy_min,
+        bin_width=bin_width,
+        log_density_of_states=np.zeros(shape=number_window_bins, dtype=np.float),
+        histogram=np.zeros(shape=number_window_bins, dtype=np.int),
+        visited=np.zeros(shape=number_window_bins, dtype=np.bool),
+        log_modification_factor=parameters.log_modification_factor_initial,
+        sweeps=0,
+    )
+
+
+def run_walker(
+    walker: WangLandauWalker, parameters: WangLandauParameters, sweeps: int
+) -> None:
+    """Run Wang–Landau sweeps, refining the modification factor when flat.
+
+    The histogram is checked for flatness every ``check_interval`` sweeps. Each time it
+    is flat, the log modification factor is halved and the histogram is reset. The
+    walker stops early once the log modification factor drops below its final value.
+
+    :param walker: Walker to run.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :param sweeps: Maximum number of sweeps to run.
+    """
+    stop: int = min(walker.sweeps + sweeps, parameters.max_sweeps)
+
+    while walker.sweeps < stop and not is_walker_converged(walker, parameters):
+        block_sweeps: int = min(parameters.check_interval, stop - walker.sweeps)
+
+        spyns.algorithms.wang_landau.heisenberg_cython.run_sweeps(
+            data=walker.data,
+            log_density_of_states=walker.log_density_of_states,
+            histogram=walker.histogram,
+            energy_min=walker.energy_min,
+            bin_width=walker.bin_width,
+            log_modification_factor=walker.log_modification_factor,
+            sweeps=block_sweeps,
+        )
+        walker.sweeps += block_sweeps
+        walker.visited |= walker.histogram > 0
+
+        if is_histogram_flat(
+            histogram=walker.histogram,
+            visited=walker.visited,
+            flatness=parameters.flatness,
+        ):
+            walker.log_modification_factor /= 2
+            walker.histogram[:] = 0
+
+
+def is_histogram_flat(
+    histogram: np.ndarray, visited: np.ndarray, flatness: float
+) -> bool:
+    """Check if every visited energy bin has been sampled roughly equally often.
+
+    Bins that have never been visited are treated as inaccessible, which is needed
+    because the energy window of a continuous spin model is not known in advance.
+
+    :param histogram: Visit counts for each energy bin.
+    :param visited: Mask of energy bins that have been visited at least once.
+    :param flatness: Minimum allowed ratio of the smallest count to the mean count.
+    :return: Boolean specifying if the histogram is flat.
+    """
+    visited_counts: np.ndarray = histogram[visited]
+
+    if len(visited_counts) == 0:
+        return False
+
+    return bool(visited_counts.min() >= flatness * visited_counts.mean())
+
+
+def is_walker_converged(
+    walker: WangLandauWalker, parameters: WangLandauParameters
+) -> bool:
+    """Check if a walker's log modification factor has reached its final value.
+
+    :param walker: Walker to check.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :return: Boolean specifying if the walker is converged.
+    """
+    return walker.log_modification_factor < parameters.log_modification_factor_final
+
+
+def stitch_windows(
+    walkers: List[WangLandauWalker], number_bins: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Join the log densities of states of overlapping windows.
+
+    Each window is shifted to match the previous one over the bins both have
+    visited. The lower half of the overlap is taken from the previous window and the
+    upper half from the next.
+
+    :param walkers: Walkers sorted by energy window.
+    :param number_bins: Total number of energy bins.
+    :return: Tuple of the joined log density of states, normalized so the lowest
+        visited bin is zero, and the mask of visited bins.
+    :raises RuntimeError: An error will be raised if two neighboring windows share
+        no visited bins.
+    """
+    log_density_of_states: np.ndarray = np.zeros(shape=number_bins, dtype=np.float)
+    visited: np.ndarray = np.zeros(shape=number_bins, dtype=np.bool)
+    previous_stop: int = 0
+
+    for walker in walkers:
+        start, stop = walker.window
+        shift: float = 0.0
+        junction: int = start
+        overlap_width: int = previous_stop - start
+
+        if overlap_width > 0:
+            overlap: np.ndarray = (
+                visited[start:previous_stop] & walker.visited[:overlap_width]
+            )
+
+            if not np.any(overlap):
+                raise RuntimeError(
+                    f"Energy windows ending at bin {previous_stop} and starting at "
+                    f"bin {start} share no visited bins."
+                )
+
+            shift = np.mean(
+                log_density_of_states[start:previous_stop][overlap]
+                - walker.log_density_of_states[:overlap_width][overlap]
+            )
+            junction = (start + previous_stop) // 2
+
+        junction_offset: int = junction - start
+        log_density_of_states[junction:stop] = (
+            walker.log_density_of_states[junction_offset:] + shift
+        )
+        visited[junction:stop] = walker.visited[junction_offset:]
+        previous_stop = stop
+
+    log_density_of_states -= log_density_of_states[np.argmax(visited)]
+
+    return log_density_of_states, visited
+
+
+def run_replica_exchange(
+    lattice: Union["Lattice", LookupTables],
+    parameters: WangLandauParameters,
+    windows: List[EnergyWindow],
+    energy_min: float,
+    bin_width: float,
+) -> List[WangLandauWalker]:
+    """Run one Wang–Landau walker per energy window in parallel processes.
+
+    Every ``exchange_interval`` sweeps, configurations of neighboring windows are
+    swapped with the replica-exchange acceptance probability, alternating between
+    even and odd window pairs. The lookup tables are published once with
+    ``spyns.shared`` and mapped by every worker instead of being copied to each.
+
+    :param lattice: Neighbor and interaction tables that define the system under
+        simulation.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :param windows: Energy windows, sorted by energy.
+    :param energy_min: Lower edge of the first energy bin.
+    :param bin_width: Width of the energy bins.
+    :return: Walkers with their final log densities of states. The ``data`` field of
+        the returned walkers is ``None`` because the states stay in the workers.
+    """
+    random_state: np.random.RandomState = np.random.RandomState(parameters.seed)
+    shared_lookup_tables: SharedLookupTables = spyns.shared.publish_lookup_tables(
+        lattice=lattice
+    )
+    connections: List[Connection] = []
+    processes: List[multiprocessing.Process] = []
+
+    for window_index, window in enumerate(windows):
+        parent_connection, child_connection = multiprocessing.Pipe()
+        process: multiprocessing.Process = multiprocessing.Process(
+            target=run_replica_exchange_worker,
+            kwargs=dict(
+                connection=child_connection,
+                shared_lookup_tables=shared_lookup_tables,
+                parameters=parameters,
+                window=window,
+                energy_min=energy_min,
+                bin_width=bin_width,
+                seed=parameters.seed + window_index,
+            ),
+        )
+        process.start()
+        connections.append(parent_connection)
+        processes.append(process)
+
+    try:
+        for connection in connections:
+            check_worker_reply(connection.recv())
+
+        number_rounds: int = int(
+            np.ceil(parameters.max_sweeps / parameters.exchange_interval)
+        )
+
+        for exchange_round in range(number_rounds):
+            for connection in connections:
+                connection.send(("run", parameters.exchange_interval))
+
+            replies: List[Tuple[float, bool]] = [
+                check_worker_reply(connection.recv()) for connection in connections
+            ]
+
+            if all(converged for _, converged in replies):
+                break
+
+            for window_index in range(exchange_round % 2, len(windows) - 1, 2):
+                next_window_index: int = window_index + 1
+                attempt_replica_exchange(
+                    connections=[
+                        connections[window_index],
+                        connections[next_window_index],
+                    ],
+                    energies=[replies[window_index][0], replies[next_window_index][0]],
+                    random_state=random_state,
+                )
+
+        walkers: List[WangLandauWalker] = []
+
+        for connection in connections:
+            connection.send(("finish",))
+            walkers.append(check_worker_reply(connection.recv()))
+
+    finally:
+        for process in processes:
+            process.join(timeout=10)
+
+            if process.is_alive():
+                process.terminate()
+
+        spyns.shared.release_lookup_tables(shared_lookup_tables=shared_lookup_tables)
+
+    return walkers
+
+
+def attempt_replica_exchange(
+    connections: List[Connection],
+    energies: List[float],
+    random_state: np.random.RandomState,
+) -> bool:
+    """Attempt to swap the configurations of two neighboring windows.
+
+    :param connections: Pipes to the workers of the two windows.
+    :param energies: Current energy of each window's configuration.
+    :param random_state: Random number generator for the acceptance test.
+    :return: Boolean specifying if the configurations were swapped.
+    """
+    log_densities: List[np.ndarray] = []
+
+    for connection in connections:
+        connection.send(("log_density_of_states", energies))
+        log_densities.append(check_worker_reply(connection.recv()))
+
+    if not np.all(np.isfinite(log_densities)):
+        return False
+
+    log_acceptance: float = (
+        log_densities[0][0]
+        - log_densities[0][1]
+        + log_densities[1][1]
+        - log_densities[1][0]
+    )
+
+    if np.log(random_state.uniform()) > log_acceptance:
+        return False
+
+    states: List[HeisenbergState] = []
+
+    for connection in connections:
+        connection.send(("get_state",))
+        states.append(check_worker_reply(connection.recv()))
+
+    for connection, state in zip(connections, reversed(states)):
+        connection.send(("set_state", state))
+        check_worker_reply(connection.recv())
+
+    return True
+
+
+def run_replica_exchange_worker(
+    connection: Connection,
+    shared_lookup_tables: SharedLookupTables,
+    parameters: WangLandauParameters,
+    window: EnergyWindow,
+    energy_min: float,
+    bin_width: float,
+    seed: int,
+) -> None:
+    """Serve the commands sent to one window of a replica-exchange simulation.
+
+    :param connection: Pipe to the parent process.
+    :param shared_lookup_tables: Handle to the published neighbor and interaction
+        tables that define the system under simulation.
+    :param parameters: Parameters to use for the Wang–Landau simulation.
+    :param window: Half-open interval of energy bins sampled by the worker.
+    :param energy_min: Lower edge of the first energy bin.
+    :param bin_width: Width of the energy bins.
+    :param seed: Random number generator seed for the worker.
+    """
+    try:
+        walker: WangLandauWalker = setup_walker(
+            lattice=spyns.shared.attach_lookup_tables(
+                shared_lookup_tables=shared_lookup_tables
+            ),
+            parameters=parameters,
+            window=window,
+            energy_min=energy_min,
+            bin_width=bin_width,
+            seed=seed,
+        )
+        connection.send(None)
+
+        while True:
+            command: Tuple = connection.recv()
+
+            if command[0] == "run":
+                run_walker(walker=walker, parameters=parameters, sweeps=command[1])
+                connection.send(
+                    (
+                        walker.data.container.estimators.energy[0],
+                        is_walker_converged(walker, parameters),
+                    )
+                )
+
+            elif command[0] == "log_density_of_states":
+                connection.send(
+                    lookup_walker_log_density_of_states(
+                        walker=walker, energies=np.array(command[1])
+                    )
+                )
+
+            elif command[0] == "get_state":
+                state: HeisenbergState = walker.data.container.state
+                connection.send(
+                    HeisenbergState(
+                        x=state.x.copy(), y=state.y.copy(), z=state.z.copy()
+                    )
+                )
+
+            elif command[0] == "set_state":
+                state = walker.data.container.state
+                state.x[:] = command[1].x
+                state.y[:] = command[1].y
+                state.z[:] = command[1].z
+                spyns.model.heisenberg_cython.save_full_state(walker.data)
+                connection.send(None)
+
+            elif command[0] == "finish":
+                walker.data = None
+                connection.send(walker)
+                break
+
+    except Exception as error:
+        connection.send(error)
+
+    finally:
+        connection.close()
+
+
+def lookup_walker_log_density_of_states(
+    walker: WangLandauWalker, energies: np.ndarray
+) -> np.ndarray:
+    """Look up a walker's log density of states at a set of energies.
+
+    :param walker: Walker to query.
+    :param energies: Total energies to look up.
+    :return: Log density of states at each energy, or negative infinity for energies
+        outside of the walker's window.
+    """
+    bins: np.ndarray = np.floor((energies - walker.energy_min) / walker.bin_width)
+    bins = bins.astype(np.int)
+    inside: np.ndarray = (bins >= 0) & (bins < len(walker.log_density_of_states))
+
+    return np.where(
+        inside,
+        walker.log_density_of_states[np.clip(bins, 0, len(walker.histogram) - 1)],
+        -np.inf,
+    )
+
+
+def check_worker_reply(reply: Any) -> Any:
+    """Re-raise an exception sent back by a replica-exchange worker.
+
+    :param reply: Message received from the worker.
+    :return: The message, if it is not an exception.
+    """
+    if isinstance(reply, Exception):
+        raise reply
+
+    return reply
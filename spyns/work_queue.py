@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from spyns.data import (
+    BatchParameters,
+    LookupTables,
+    ProgressParameters,
+    ProgressReport,
+    SharedLookupTables,
+)
+import spyns.batch
+import spyns.shared
+from spyns.batch import RESULT_COLUMNS, BatchPoint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STATUSES: List[str] = ["pending", "claimed", "done", "failed"]
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS job (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    spec TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS points (
+    temperature REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    heartbeat REAL,
+    error TEXT,
+    energy REAL,
+    magnetization REAL,
+    heat_capacity REAL,
+    susceptibility REAL,
+    binder_parameter REAL,
+    PRIMARY KEY (temperature, seed)
+);
+"""
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``spyns-queue`` command-line interface.
+
+    :param argv: Command-line arguments. Defaults to ``sys.argv[1:]``.
+    :return: Exit status, nonzero if ``collect`` finds failed grid points.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="spyns-queue",
+        description=(
+            "Spread a grid of Heisenberg model simulations over temperatures and "
+            "seeds across the nodes of a shared filesystem using a SQLite work queue."
+        ),
+    )
+    parser.add_argument("database", help="Path to the SQLite work queue.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    submit_parser = subparsers.add_parser(
+        "submit", help="Add the grid points of a JSON job spec to the queue."
+    )
+    submit_parser.add_argument("job_spec", help="Path to the JSON job spec file.")
+    work_parser = subparsers.add_parser(
+        "work", help="Claim and run grid points until the queue is drained."
+    )
+    work_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes on this node (default: number of CPUs).",
+    )
+    work_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds without a heartbeat before a claim is re-issued (default: 600).",
+    )
+    work_parser.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between heartbeats of a running point (default: 30).",
+    )
+    work_parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Number of times to try each grid point (default: 3).",
+    )
+    collect_parser = subparsers.add_parser(
+        "collect", help="Write the results of the finished grid points to a CSV file."
+    )
+    collect_parser.add_argument(
+        "-o", "--output", default="results.csv", help="Consolidated results file."
+    )
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    if args.command == "submit":
+        number_points: int = submit_job(
+            database_filepath=args.database, job_spec_filepath=args.job_spec
+        )
+        print(f"Added {number_points} grid points.", file=sys.stderr)
+
+        return 0
+
+    if args.command == "work":
+        run_workers(
+            database_filepath=args.database,
+            workers=args.workers,
+            timeout=args.timeout,
+            heartbeat_interval=args.heartbeat_interval,
+            max_attempts=args.max_attempts,
+        )
+
+        return 0
+
+    collect_results(database_filepath=args.database).to_csv(args.output, index=False)
+
+    for (temperature, seed), error in read_failures(database_filepath=args.database):
+        print(
+            f"Failed at temperature={temperature}, seed={seed}: {error}",
+            file=sys.stderr,
+        )
+
+    status: Dict[str, int] = queue_status(database_filepath=args.database)
+    print(
+        ", ".join(f"{count} {name}" for name, count in status.items()), file=sys.stderr
+    )
+
+    return 1 if status["failed"] else 0
+
+
+def connect(database_filepath: str) -> sqlite3.Connection:
+    """Open the work queue, creating its tables if needed.
+
+    Transactions are managed explicitly, and writers wait for the database lock
+    instead of failing immediately. The default rollback journal is kept because
+    write-ahead logging needs shared memory and does not work across nodes.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :return: Connection to the work queue.
+    """
+    connection: sqlite3.Connection = sqlite3.connect(
+        database_filepath, timeout=60.0, isolation_level=None
+    )
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+def submit_job(database_filepath: str, job_spec_filepath: str) -> int:
+    """Add the grid points of a batch job spec to the work queue.
+
+    The spec format is the one of ``spyns-batch``, see
+    ``spyns.batch.read_job_spec``. A queue holds a single job, but the same job can
+    be submitted again with more temperatures or seeds to extend its grid. Points
+    that are already queued keep their status and results.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :param job_spec_filepath: Path to the JSON job spec file.
+    :return: Number of grid points added.
+    :raises ValueError: An error will be raised if the spec is malformed or differs
+        from the queued job in anything but its temperatures and seeds.
+    """
+    with open(job_spec_filepath, "r") as spec_file:
+        spec: Dict[str, Any] = json.load(spec_file)
+
+    parameters: BatchParameters = spyns.batch.parse_job_spec(spec=spec)
+
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            row: Optional[Tuple[str]] = connection.execute(
+                "SELECT spec FROM job WHERE id = 0"
+            ).fetchone()
+
+            if row is None:
+                connection.execute(
+                    "INSERT INTO job (id, spec) VALUES (0, ?)", (json.dumps(spec),)
+                )
+
+            elif strip_grid(spec=json.loads(row[0])) != strip_grid(spec=spec):
+                raise ValueError(
+                    "The job spec differs from the queued job in more than its "
+                    "temperatures and seeds."
+                )
+
+            else:
+                queued_spec: Dict[str, Any] = json.loads(row[0])
+                queued_spec["temperatures"] = sorted(
+                    set(spyns.batch.parse_job_spec(spec=queued_spec).temperatures)
+                    | set(parameters.temperatures)
+                )
+                queued_spec["seeds"] = sorted(
+                    set(queued_spec["seeds"]) | set(parameters.seeds)
+                )
+                connection.execute(
+                    "UPDATE job SET spec = ? WHERE id = 0", (json.dumps(queued_spec),)
+                )
+
+            number_points: int = connection.executemany(
+                "INSERT OR IGNORE INTO points (temperature, seed) VALUES (?, ?)",
+                [
+                    (temperature, seed)
+                    for temperature in parameters.temperatures
+                    for seed in parameters.seeds
+                ],
+            ).rowcount
+            connection.execute("COMMIT")
+
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    return number_points
+
+
+def read_job(database_filepath: str) -> BatchParameters:
+    """Read the batch job of a work queue.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :return: Parameters of the queued batch job.
+    :raises ValueError: An error will be raised if no job has been submitted.
+    """
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        row: Optional[Tuple[str]] = connection.execute(
+            "SELECT spec FROM job WHERE id = 0"
+        ).fetchone()
+
+    if row is None:
+        raise ValueError(f"No job has been submitted to {database_filepath}.")
+
+    return spyns.batch.parse_job_spec(spec=json.loads(row[0]))
+
+
+def run_workers(
+    database_filepath: str,
+    workers: int,
+    timeout: float,
+    heartbeat_interval: float,
+    max_attempts: int,
+) -> int:
+    """Run worker processes on this node until the work queue is drained.
+
+    The lattice is built once and its lookup tables are shared with the workers
+    through ``spyns.shared``. Nothing is built if no point can be claimed.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :param workers: Number of worker processes.
+    :param timeout: Seconds without a heartbeat before a claim is re-issued.
+    :param heartbeat_interval: Seconds between heartbeats of a running point.
+    :param max_attempts: Number of times to try each point.
+    :return: Number of points run on this node.
+    """
+    status: Dict[str, int] = queue_status(database_filepath=database_filepath)
+
+    if not status["pending"] + status["claimed"]:
+        return 0
+
+    with spyns.shared.shared_lookup_tables(
+        lattice=spyns.batch.build_batch_lookup_tables(
+            parameters=read_job(database_filepath=database_filepath)
+        )
+    ) as shared_lookup_tables, multiprocessing.Pool(processes=workers) as pool:
+        return sum(
+            pool.starmap(
+                run_worker,
+                [
+                    (
+                        database_filepath,
+                        shared_lookup_tables,
+                        timeout,
+                        heartbeat_interval,
+                        max_attempts,
+                    )
+                    for _ in range(workers)
+                ],
+            )
+        )
+
+
+def run_worker(
+    database_filepath: str,
+    shared_lookup_tables: Optional[SharedLookupTables] = None,
+    timeout: float = 600.0,
+    heartbeat_interval: float = 30.0,
+    max_attempts: int = 3,
+    worker: Optional[str] = None,
+) -> int:
+    """Claim and run grid points until none are left to claim.
+
+    While a point runs, the worker updates its heartbeat every
+    ``heartbeat_interval`` seconds from a progress callback. A claim whose heartbeat
+    is older than ``timeout`` is re-issued to the next worker that asks for work, so
+    ``timeout`` must be well above ``heartbeat_interval`` and the clock skew between
+    nodes. A worker whose claim was re-issued or finished elsewhere stops its run
+    early. Failed points are retried until they have been tried ``max_attempts``
+    times.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :param shared_lookup_tables: Handle to published lookup tables for the job's
+        lattice. The lattice is built on the first claim if not provided.
+    :param timeout: Seconds without a heartbeat before a claim is re-issued.
+    :param heartbeat_interval: Seconds between heartbeats of a running point.
+    :param max_attempts: Number of times to try each point.
+    :param worker: Name of the worker. Defaults to the host name and process ID.
+    :return: Number of points this worker ran to completion.
+    """
+    worker = worker_name() if worker is None else worker
+    parameters: BatchParameters = read_job(database_filepath=database_filepath)
+    lattice: Optional[LookupTables] = (
+        None
+        if shared_lookup_tables is None
+        else spyns.shared.attach_lookup_tables(
+            shared_lookup_tables=shared_lookup_tables
+        )
+    )
+    number_completed: int = 0
+
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        while True:
+            point: Optional[BatchPoint] = claim_point(
+                connection=connection,
+                worker=worker,
+                timeout=timeout,
+                max_attempts=max_attempts,
+            )
+
+            if point is None:
+                return number_completed
+
+            if lattice is None:
+                lattice = spyns.batch.build_batch_lookup_tables(parameters=parameters)
+
+            try:
+                result: Dict[str, float] = spyns.batch.simulate_point(
+                    lattice=lattice,
+                    point=point,
+                    simulation=parameters.simulation,
+                    progress_parameters=ProgressParameters(
+                        callback=functools.partial(
+                            send_heartbeat,
+                            connection=connection,
+                            worker=worker,
+                            point=point,
+                        ),
+                        sweep_interval=None,
+                        time_interval=heartbeat_interval,
+                    ),
+                )
+
+            except Exception as error:
+                fail_point(
+                    connection=connection,
+                    worker=worker,
+                    point=point,
+                    error=f"{type(error).__name__}: {error}",
+                    max_attempts=max_attempts,
+                )
+                continue
+
+            if complete_point(connection=connection, worker=worker, result=result):
+                number_completed += 1
+
+
+def claim_point(
+    connection: sqlite3.Connection, worker: str, timeout: float, max_attempts: int
+) -> Optional[BatchPoint]:
+    """Atomically claim the next pending or timed-out grid point.
+
+    Points with the fewest attempts are claimed first. Timed-out claims that have
+    used up their attempts are marked as failed.
+
+    :param connection: Connection to the work queue.
+    :param worker: Name of the claiming worker.
+    :param timeout: Seconds without a heartbeat before a claim is re-issued.
+    :param max_attempts: Number of times to try each point.
+    :return: Temperature and seed of the claimed point, or ``None`` if no point can
+        be claimed.
+    """
+    now: float = time.time()
+    connection.execute("BEGIN IMMEDIATE")
+
+    try:
+        connection.execute(
+            "UPDATE points SET status = 'failed', error = 'Claim timed out.' "
+            "WHERE status = 'claimed' AND heartbeat < ? AND attempts >= ?",
+            (now - timeout, max_attempts),
+        )
+        row: Optional[BatchPoint] = connection.execute(
+            "SELECT temperature, seed FROM points "
+            "WHERE status = 'pending' OR (status = 'claimed' AND heartbeat < ?) "
+            "ORDER BY attempts, temperature, seed LIMIT 1",
+            (now - timeout,),
+        ).fetchone()
+
+        if row is not None:
+            connection.execute(
+                "UPDATE points SET status = 'claimed', worker = ?, heartbeat = ?, "
+                "attempts = attempts + 1 WHERE temperature = ? AND seed = ?",
+                (worker, now) + tuple(row),
+            )
+
+        connection.execute("COMMIT")
+
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+
+    return None if row is None else (float(row[0]), int(row[1]))
+
+
+def heartbeat(connection: sqlite3.Connection, worker: str, point: BatchPoint) -> bool:
+    """Refresh the heartbeat of a claimed grid point.
+
+    :param connection: Connection to the work queue.
+    :param worker: Name of the worker holding the claim.
+    :param point: Temperature and seed of the claimed point.
+    :return: Whether the worker still holds the claim.
+    """
+    return (
+        connection.execute(
+            "UPDATE points SET heartbeat = ? WHERE temperature = ? AND seed = ? "
+            "AND status = 'claimed' AND worker = ?",
+            (time.time(),) + tuple(point) + (worker,),
+        ).rowcount
+        == 1
+    )
+
+
+def send_heartbeat(
+    report: ProgressReport,
+    connection: sqlite3.Connection,
+    worker: str,
+    point: BatchPoint,
+) -> Optional[bool]:
+    """Progress callback that refreshes the heartbeat of a running grid point.
+
+    :param report: Progress report for the run.
+    :param connection: Connection to the work queue.
+    :param worker: Name of the worker holding the claim.
+    :param point: Temperature and seed of the claimed point.
+    :return: ``True`` to stop the run if the worker no longer holds the claim.
+    """
+    return not heartbeat(connection=connection, worker=worker, point=point)
+
+
+def complete_point(
+    connection: sqlite3.Connection, worker: str, result: Dict[str, float]
+) -> bool:
+    """Write the estimators of a finished grid point back to the work queue.
+
+    :param connection: Connection to the work queue.
+    :param worker: Name of the worker holding the claim.
+    :param result: Estimators of the grid point, see ``spyns.batch.simulate_point``.
+    :return: Whether the worker still held the claim, otherwise the result is
+        dropped.
+    """
+    estimators: List[str] = RESULT_COLUMNS[2:]
+
+    return (
+        connection.execute(
+            f"UPDATE points SET status = 'done', error = NULL, "
+            f"{', '.join(f'{name} = ?' for name in estimators)} "
+            f"WHERE temperature = ? AND seed = ? AND status = 'claimed' "
+            f"AND worker = ?",
+            tuple(float(result[name]) for name in estimators)
+            + (result["temperature"], result["seed"], worker),
+        ).rowcount
+        == 1
+    )
+
+
+def fail_point(
+    connection: sqlite3.Connection,
+    worker: str,
+    point: BatchPoint,
+    error: str,
+    max_attempts: int,
+) -> None:
+    """Release a grid point whose run raised an error.
+
+    :param connection: Connection to the work queue.
+    :param worker: Name of the worker holding the claim.
+    :param point: Temperature and seed of the claimed point.
+    :param error: Error message of the run.
+    :param max_attempts: Number of times to try each point. The point is marked as
+        failed once it has been tried this many times and is pending otherwise.
+    """
+    connection.execute(
+        "UPDATE points SET error = ?, "
+        "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END "
+        "WHERE temperature = ? AND seed = ? AND status = 'claimed' AND worker = ?",
+        (error, max_attempts) + tuple(point) + (worker,),
+    )
+
+
+def queue_status(database_filepath: str) -> Dict[str, int]:
+    """Count the grid points of a work queue by status.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :return: Number of ``pending``, ``claimed``, ``done``, and ``failed`` points.
+    """
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        counts: Dict[str, int] = dict(
+            connection.execute(
+                "SELECT status, COUNT(*) FROM points GROUP BY status"
+            ).fetchall()
+        )
+
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+def collect_results(database_filepath: str) -> "pd.DataFrame":
+    """Collect the estimators of the finished grid points.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :return: Data frame with the ``spyns.batch.RESULT_COLUMNS`` of every finished
+        point, sorted by temperature and seed.
+    """
+    import pandas as pd
+
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(RESULT_COLUMNS)} FROM points WHERE status = 'done' "
+            f"ORDER BY temperature, seed",
+            connection,
+        )
+
+
+def read_failures(database_filepath: str) -> List[Tuple[BatchPoint, str]]:
+    """Read the grid points that failed on every attempt.
+
+    :param database_filepath: Path to the SQLite work queue.
+    :return: Failed points, along with their last error, sorted by temperature and
+        seed.
+    """
+    with closing(connect(database_filepath=database_filepath)) as connection:
+        return [
+            ((temperature, seed), error)
+            for temperature, seed, error in connection.execute(
+                "SELECT temperature, seed, error FROM points WHERE status = 'failed' "
+                "ORDER BY temperature, seed"
+            )
+        ]
+
+
+def strip_grid(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the temperatures and seeds of a job spec.
+
+    :param spec: Decoded JSON job spec.
+    :return: Copy of the spec without its grid.
+    """
+    return {
+        key: value
+        for key, value in spec.items()
+        if key not in ["temperatures", "seeds"]
+    }
+
+
+def worker_name() -> str:
+    """Name the calling process after its host and process ID.
+
+    :return: Worker name.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pymatgen as pmg
+import pytest
+
+from spyns.data import AnnealingParameters, AnnealingResult, StructureParameters
+from spyns.lattice import Lattice
+import spyns
+
+
+@pytest.fixture()
+def simple_cubic_lattice() -> Lattice:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(1.0, 1.0, 1.0),
+        ang=3 * (90,),
+        spacegroup=1,
+        species=["Fe"],
+        coordinates=[[0.00, 0.00, 0.00]],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+    structure = spyns.lattice.generate.make_supercell(
+        cell_structure=structure, scaling_factors=(4, 4, 4)
+    )
+    lattice: Lattice = Lattice(structure=structure, r=1.2)
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=-1.0)
+    )
+
+    return lattice
+
+
+def test_sc_heisenberg_annealing_finds_ferromagnetic_ground_state(
+    simple_cubic_lattice: Lattice
+) -> None:
+    parameters: AnnealingParameters = AnnealingParameters(
+        seed=93451,
+        schedule="geometric",
+        temperature_initial=2.0,
+        temperature_final=0.05,
+        number_stages=20,
+        temperatures=None,
+        sweeps_per_stage=50,
+        quench_sweeps=200,
+    )
+    result: AnnealingResult = spyns.annealing.simulation(
+        lattice=simple_cubic_lattice, parameters=parameters
+    )
+    number_sites: int = simple_cubic_lattice.number_sites
+    spins: np.ndarray = np.column_stack(
+        (result.best_state.x, result.best_state.y, result.best_state.z)
+    )
+
+    assert len(result.temperatures) == parameters.number_stages + 1
+    assert len(result.stage_energies) == parameters.number_stages + 1
+    assert result.temperatures[-1] == 0
+    assert result.best_energy <= np.min(result.stage_energies) + 1e-8
+    assert result.best_energy / number_sites < -2.9
+    assert np.linalg.norm(spins.sum(axis=0)) / number_sites > 0.95
+
+
+def test_custom_annealing_schedule_rejects_zero_temperature() -> None:
+    parameters: AnnealingParameters = AnnealingParameters(
+        seed=93451,
+        schedule="custom",
+        temperature_initial=0.0,
+        temperature_final=0.0,
+        number_stages=0,
+        temperatures=[1.0, 0.0],
+        sweeps_per_stage=10,
+        quench_sweeps=0,
+    )
+
+    with pytest.raises(ValueError):
+        spyns.annealing.make_temperature_schedule(parameters=parameters)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from spyns.data import BatchParameters, StructureParameters
+import spyns
+
+
+@pytest.fixture()
+def job_spec(tmp_path: Path) -> Path:
+    spec: Dict[str, Any] = {
+        "structure": {
+            "from_parameters": {
+                "abc": [2.0, 2.0, 20.0],
+                "ang": [90, 90, 90],
+                "spacegroup": 1,
+                "species": 4 * ["Fe"],
+                "coordinates": [
+                    [0.00, 0.00, 0.00],
+                    [0.50, 0.00, 0.00],
+                    [0.00, 0.50, 0.00],
+                    [0.50, 0.50, 0.00],
+                ],
+            }
+        },
+        "subspecies_labels": {"0": "1", "1": "2", "2": "2", "3": "1"},
+        "scaling_factors": [3, 3, 1],
+        "r": 1.2,
+        "interactions": [
+            {
+                "subspecies_i": "Fe1",
+                "subspecies_j": "Fe2",
+                "subspecies_ij_distance_rank": 0,
+                "J_ij": -1.0,
+            },
+            {
+                "subspecies_i": "Fe2",
+                "subspecies_j": "Fe1",
+                "subspecies_ij_distance_rank": 0,
+                "J_ij": -1.0,
+            },
+        ],
+        "simulation": {"sweeps": 50, "equilibration_sweeps": 20},
+        "temperatures": {"start": 0.5, "stop": 2.0, "num": 2},
+        "seeds": [1, 2],
+    }
+    filepath: Path = tmp_path / "job.json"
+    filepath.write_text(json.dumps(spec))
+
+    return filepath
+
+
+def read_results(filepath: Path) -> List[Dict[str, str]]:
+    with open(str(filepath), "r", newline="") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def test_read_job_spec(job_spec: Path) -> None:
+    parameters: BatchParameters = spyns.batch.read_job_spec(filepath=str(job_spec))
+
+    assert isinstance(parameters.structure, StructureParameters)
+    assert parameters.subspecies_labels == {0: "1", 1: "2", 2: "2", 3: "1"}
+    assert parameters.scaling_factors == (3, 3, 1)
+    assert parameters.simulation == {
+        "sweeps": 50,
+        "equilibration_sweeps": 20,
+        "sample_interval": 1,
+    }
+    assert parameters.temperatures == [0.5, 2.0]
+    assert parameters.cache_directory is None
+
+
+def test_batch_runs_grid_and_retries_failed_points(
+    job_spec: Path, tmp_path: Path, monkeypatch
+) -> None:
+    results_filepath: Path = tmp_path / "results.csv"
+    arguments: List[str] = [str(job_spec), "-o", str(results_filepath), "-w", "2"]
+
+    assert spyns.batch.main(arguments) == 0
+
+    results: List[Dict[str, str]] = read_results(results_filepath)
+
+    assert [(row["temperature"], row["seed"]) for row in results] == [
+        ("0.5", "1"),
+        ("0.5", "2"),
+        ("2.0", "1"),
+        ("2.0", "2"),
+    ]
+    assert float(results[0]["energy"]) < float(results[-1]["energy"]) < 0
+
+    def fail_simulation(*args, **kwargs):
+        raise RuntimeError("simulation failed")
+
+    with open(str(results_filepath), "w", newline="") as csvfile:
+        dictwriter = csv.DictWriter(csvfile, fieldnames=spyns.batch.RESULT_COLUMNS)
+        dictwriter.writeheader()
+        dictwriter.writerows(results[1:])
+
+    monkeypatch.setattr(spyns.run, "simulation", fail_simulation)
+
+    assert spyns.batch.main(arguments + ["--max-attempts", "2"]) == 1
+    assert read_results(results_filepath) == results[1:]
+
+    monkeypatch.undo()
+
+    assert spyns.batch.main(arguments) == 0
+    assert read_results(results_filepath)[1:] == results[1:]
+    assert read_results(results_filepath)[0]["energy"] == results[0]["energy"]
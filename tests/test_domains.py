@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from spyns.data import (
+    DomainDecompositionParameters,
+    LookupTables,
+    SimulationData,
+    SimulationParameters,
+)
+import spyns
+
+
+@pytest.fixture()
+def lookup_tables() -> LookupTables:
+    number_sites: int = 60
+    sites: np.ndarray = np.arange(number_sites)
+
+    return spyns.runtime.make_lookup_tables(
+        neighbors_table=np.column_stack(
+            [(sites - 1) % number_sites, (sites + 1) % number_sites]
+        ).flatten(),
+        neighbors_count=np.full(shape=number_sites, fill_value=2),
+        interaction_parameters_table=np.full(shape=2 * number_sites, fill_value=-1.0),
+        sublattice_table=sites % 2,
+    )
+
+
+def test_neighbors_never_share_a_color(lookup_tables: LookupTables) -> None:
+    colors: np.ndarray = spyns.domains.color_sites(lookup_tables=lookup_tables, seed=1)
+    rows, neighbors, _ = spyns.domains.gather_neighbors(
+        lookup_tables=lookup_tables, sites=np.arange(lookup_tables.number_sites)
+    )
+
+    assert np.all(colors[rows] != colors[neighbors])
+    assert colors.max() == 1
+
+
+def test_odd_rings_fall_back_to_jones_plassmann() -> None:
+    number_sites: int = 61
+    sites: np.ndarray = np.arange(number_sites)
+    lookup_tables: LookupTables = spyns.runtime.make_lookup_tables(
+        neighbors_table=np.column_stack(
+            [(sites - 1) % number_sites, (sites + 1) % number_sites]
+        ).flatten(),
+        neighbors_count=np.full(shape=number_sites, fill_value=2),
+        interaction_parameters_table=np.full(shape=2 * number_sites, fill_value=-1.0),
+    )
+    colors: np.ndarray = spyns.domains.color_sites(lookup_tables=lookup_tables, seed=1)
+    rows, neighbors, _ = spyns.domains.gather_neighbors(
+        lookup_tables=lookup_tables, sites=sites
+    )
+
+    assert np.all(colors[rows] != colors[neighbors])
+    assert colors.max() >= 2
+
+
+@pytest.mark.parametrize("partition", ["blocks", "graph"])
+def test_partitions_are_balanced(lookup_tables: LookupTables, partition: str) -> None:
+    domains: np.ndarray = spyns.domains.partition_sites(
+        lookup_tables=lookup_tables, number_domains=4, partition=partition
+    )
+
+    assert np.array_equal(np.bincount(domains), [15, 15, 15, 15])
+
+
+def test_blocks_keep_unit_cells_together(lookup_tables: LookupTables) -> None:
+    domains: np.ndarray = spyns.domains.partition_sites(
+        lookup_tables=lookup_tables,
+        number_domains=3,
+        partition="blocks",
+        number_cells=30,
+    )
+
+    assert np.array_equal(domains[:30], domains[30:])
+    assert np.array_equal(np.bincount(domains), [20, 20, 20])
+
+
+@pytest.mark.parametrize("partition", ["blocks", "graph"])
+def test_domain_decomposed_simulation_reduces_estimators(
+    lookup_tables: LookupTables, partition: str
+) -> None:
+    data: SimulationData = spyns.domains.simulation(
+        lattice=lookup_tables,
+        parameters=SimulationParameters(
+            seed=1234,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=50,
+            equilibration_sweeps=200,
+            sample_interval=1,
+            temperature=0.05,
+        ),
+        decomposition_parameters=DomainDecompositionParameters(
+            number_domains=3, partition=partition, directory=None
+        ),
+    )
+
+    assert np.isclose(data.trace.energy[-1], data.estimators.energy[0])
+    assert np.allclose(data.trace.spin_vector[-1], data.estimators.spin_vector)
+    assert data.trace_view["<E**1>"][-1] / lookup_tables.number_sites < -0.85
+    assert data.estimators.number_samples[0] == 50
+
+
+def test_domain_decomposition_needs_heisenberg_cython_mode(
+    lookup_tables: LookupTables,
+) -> None:
+    with pytest.raises(ValueError):
+        spyns.domains.simulation(
+            lattice=lookup_tables,
+            parameters=SimulationParameters(
+                seed=1234,
+                mode="heisenberg",
+                trace_filepath=None,
+                snapshot_filepath=None,
+                sweeps=1,
+                equilibration_sweeps=0,
+                sample_interval=1,
+                temperature=1.0,
+            ),
+            decomposition_parameters=DomainDecompositionParameters(
+                number_domains=2, partition="blocks", directory=None
+            ),
+        )
+
+
+def test_domain_decomposition_needs_a_temperature(lookup_tables: LookupTables) -> None:
+    with pytest.raises(ValueError):
+        spyns.domains.simulation(
+            lattice=lookup_tables,
+            parameters=SimulationParameters(
+                seed=1234,
+                mode="heisenberg_cython",
+                trace_filepath=None,
+                snapshot_filepath=None,
+                sweeps=1,
+                equilibration_sweeps=0,
+                sample_interval=1,
+                temperature=None,
+            ),
+            decomposition_parameters=DomainDecompositionParameters(
+                number_domains=2, partition="blocks", directory=None
+            ),
+        )
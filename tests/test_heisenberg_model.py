@@ -5,6 +5,7 @@ import pymatgen as pmg
 import pytest
 
 from spyns.data import (
+    HamiltonianParameters,
     HeisenbergState,
     StructureParameters,
     SimulationParameters,
@@ -16,6 +17,7 @@ import spyns.model.heisenberg
 from spyns.data_cython import SimulationHeisenbergData_t
 from spyns.random_numbers.distribution import RandomNumberGenerator
 import spyns.model.heisenberg_cython
+import spyns.algorithms.metropolis.heisenberg_cython
 
 
 @pytest.fixture()
@@ -206,3 +208,122 @@ def test_sc_heisenberg_cython_fm_energy_and_magnetization_computation(
 
         assert np.abs(total_energy_aligned) <= 3.0
         assert np.abs(magnetization_aligned) <= 1.0
+
+
+def test_sc_heisenberg_vectorized_energy_matches_site_sums(
+    sc_heisenberg_model: SimulationData
+) -> None:
+    random_number_generator = RandomNumberGenerator(
+        seed=sc_heisenberg_model.parameters.seed,
+        number_sites=sc_heisenberg_model.lookup_tables.number_sites,
+    )
+
+    data = SimulationHeisenbergData_t(
+        data=sc_heisenberg_model, random_number_generator=random_number_generator
+    )
+
+    total_energy_vectorized: float = spyns.model.heisenberg.compute_total_energy(
+        data=sc_heisenberg_model
+    )
+    total_energy_site_sums: float = 0.5 * sum(
+        spyns.model.heisenberg.compute_site_energy(
+            site_index=site_index, data=sc_heisenberg_model
+        )
+        for site_index in range(sc_heisenberg_model.lookup_tables.number_sites)
+    )
+    total_energy_cython: float = spyns.model.heisenberg_cython.compute_total_energy(
+        data
+    )
+
+    spin_vector_vectorized: np.ndarray = spyns.model.heisenberg.sum_spin_vectors_within_sublattices(
+        data=sc_heisenberg_model
+    )
+    spin_vector_cython: np.ndarray = np.array(
+        spyns.model.heisenberg_cython.sum_spin_vectors_within_sublattices(data)
+    )
+
+    assert np.isclose(total_energy_vectorized, total_energy_site_sums)
+    assert np.isclose(total_energy_vectorized, total_energy_cython)
+    assert np.allclose(spin_vector_vectorized, spin_vector_cython)
+
+
+def test_sc_heisenberg_hamiltonian_terms_keep_energy_estimator_consistent(
+    simple_cubic_lattice: pmg.Structure, simulation_parameters: SimulationParameters
+) -> None:
+    lattice: Lattice = Lattice(structure=simple_cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=2 * (-1.0,))
+    )
+
+    dm_vector: np.ndarray = np.array([0.1, -0.2, 0.3])
+    hamiltonian_parameters: HamiltonianParameters = HamiltonianParameters(
+        magnetic_field=np.array([[0.0, 0.0, 0.5], [0.2, 0.0, 0.5]]),
+        anisotropy=np.stack(
+            [-0.3 * np.diag([0.0, 0.0, 1.0]), -0.1 * np.diag([1.0, 0.0, 0.0])]
+        ),
+        exchange_tensors=np.stack(
+            [
+                spyns.model.heisenberg.make_dm_exchange_tensor(dm_vector=dm_vector),
+                spyns.model.heisenberg.make_dm_exchange_tensor(dm_vector=-dm_vector),
+            ]
+        ),
+    )
+    sc_heisenberg_model: SimulationData = spyns.data.setup_containers(
+        parameters=simulation_parameters,
+        state=spyns.model.heisenberg.sample_random_state(lattice.number_sites),
+        lattice=lattice,
+        hamiltonian_parameters=hamiltonian_parameters,
+    )
+    data = SimulationHeisenbergData_t(
+        data=sc_heisenberg_model,
+        random_number_generator=RandomNumberGenerator(
+            seed=simulation_parameters.seed, number_sites=lattice.number_sites
+        ),
+    )
+
+    assert np.isclose(
+        spyns.model.heisenberg.compute_total_energy(data=sc_heisenberg_model),
+        spyns.model.heisenberg_cython.compute_total_energy(data),
+    )
+
+    site_index: int = 7
+    total_energy_before: float = spyns.model.heisenberg.compute_total_energy(
+        data=sc_heisenberg_model
+    )
+    site_energy_before: float = spyns.model.heisenberg.compute_site_energy(
+        site_index=site_index, data=sc_heisenberg_model
+    )
+    sc_heisenberg_model.state.x[site_index] = 0.0
+    sc_heisenberg_model.state.y[site_index] = 0.0
+    sc_heisenberg_model.state.z[site_index] = 1.0
+
+    assert np.isclose(
+        spyns.model.heisenberg.compute_total_energy(data=sc_heisenberg_model)
+        - total_energy_before,
+        spyns.model.heisenberg.compute_site_energy(
+            site_index=site_index, data=sc_heisenberg_model
+        )
+        - site_energy_before,
+    )
+
+    spyns.model.heisenberg_cython.save_full_state(data)
+    spyns.algorithms.metropolis.heisenberg_cython.run_sweeps(
+        data=data, equilibration_run=True
+    )
+
+    assert np.isclose(
+        sc_heisenberg_model.estimators.energy[0],
+        spyns.model.heisenberg.compute_total_energy(data=sc_heisenberg_model),
+    )
+    assert sc_heisenberg_model.estimators.spin_vector[:, 2].sum() > 0
+
+    with pytest.raises(ValueError):
+        spyns.data.setup_containers(
+            parameters=simulation_parameters,
+            state=sc_heisenberg_model.state,
+            lattice=lattice,
+            hamiltonian_parameters=HamiltonianParameters(
+                magnetic_field=np.zeros(shape=3), anisotropy=None, exchange_tensors=None
+            ),
+        )
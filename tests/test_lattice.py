@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pymatgen as pmg
+import pytest
+
+from spyns.data import (
+    LookupTables,
+    SimulationData,
+    SimulationParameters,
+    StructureParameters,
+)
+from spyns.lattice import Lattice
+from spyns.lattice.neighborhood import NeighborPairs, find_neighbor_pairs_with_cell_list
+import spyns
+
+
+@pytest.fixture()
+def two_dimensional_square_unit_cell() -> pmg.Structure:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(2.0, 2.0, 20.0),
+        ang=3 * (90,),
+        spacegroup=1,
+        species=4 * ["Fe"],
+        coordinates=[
+            [0.00, 0.00, 0.00],
+            [0.50, 0.00, 0.00],
+            [0.00, 0.50, 0.00],
+            [0.50, 0.50, 0.00],
+        ],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+    structure = spyns.lattice.generate.label_subspecies(
+        structure=structure, subspecies_labels={0: "1", 1: "2", 2: "2", 3: "1"}
+    )
+
+    return structure
+
+
+@pytest.fixture()
+def two_dimensional_square_lattice(
+    two_dimensional_square_unit_cell: pmg.Structure
+) -> pmg.Structure:
+    return spyns.lattice.generate.make_supercell(
+        cell_structure=two_dimensional_square_unit_cell, scaling_factors=(5, 5, 1)
+    )
+
+
+@pytest.fixture()
+def cubic_unit_cell() -> pmg.Structure:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(2.0, 2.0, 2.0),
+        ang=3 * (90,),
+        spacegroup=1,
+        species=8 * ["Fe"],
+        coordinates=[
+            [0.00, 0.00, 0.00],
+            [0.50, 0.00, 0.00],
+            [0.00, 0.50, 0.00],
+            [0.50, 0.50, 0.00],
+            [0.00, 0.00, 0.50],
+            [0.50, 0.00, 0.50],
+            [0.00, 0.50, 0.50],
+            [0.50, 0.50, 0.50],
+        ],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+    structure = spyns.lattice.generate.label_subspecies(
+        structure=structure,
+        subspecies_labels={
+            0: "1",
+            1: "2",
+            2: "2",
+            3: "1",
+            4: "2",
+            5: "1",
+            6: "1",
+            7: "2",
+        },
+    )
+
+    return structure
+
+
+@pytest.fixture()
+def cubic_lattice(cubic_unit_cell: pmg.Structure) -> pmg.Structure:
+    return spyns.lattice.generate.make_supercell(
+        cell_structure=cubic_unit_cell, scaling_factors=(5, 5, 5)
+    )
+
+
+@pytest.fixture()
+def bcc_unit_cell() -> pmg.Structure:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(2.0, 2.0, 1.0),
+        ang=3 * (90,),
+        spacegroup=1,
+        species=8 * ["Fe"],
+        coordinates=[
+            [0.00, 0.00, 0.00],
+            [0.50, 0.00, 0.00],
+            [0.00, 0.50, 0.00],
+            [0.50, 0.50, 0.00],
+            [0.25, 0.25, 0.50],
+            [0.75, 0.25, 0.50],
+            [0.25, 0.75, 0.50],
+            [0.75, 0.75, 0.50],
+        ],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+    structure = spyns.lattice.generate.label_subspecies(
+        structure=structure,
+        subspecies_labels={
+            0: "1",
+            1: "2",
+            2: "2",
+            3: "1",
+            4: "3",
+            5: "4",
+            6: "4",
+            7: "3",
+        },
+    )
+
+    return structure
+
+
+@pytest.fixture()
+def bcc_lattice(bcc_unit_cell: pmg.Structure) -> pmg.Structure:
+    return spyns.lattice.generate.make_supercell(
+        cell_structure=bcc_unit_cell, scaling_factors=(5, 5, 10)
+    )
+
+
+@pytest.fixture()
+def hexagonal_unit_cell() -> pmg.Structure:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(1.0, 1.0, 1.6),
+        ang=(90, 90, 120),
+        spacegroup=1,
+        species=2 * ["Fe"],
+        coordinates=[[1 / 3, 2 / 3, 0.25], [2 / 3, 1 / 3, 0.75]],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+
+    return structure
+
+
+@pytest.fixture()
+def hexagonal_lattice(hexagonal_unit_cell: pmg.Structure) -> pmg.Structure:
+    return spyns.lattice.generate.make_supercell(
+        cell_structure=hexagonal_unit_cell, scaling_factors=(4, 4, 2)
+    )
+
+
+@pytest.mark.parametrize(
+    "structure_name",
+    [
+        "two_dimensional_square_lattice",
+        "cubic_lattice",
+        "bcc_lattice",
+        "hexagonal_lattice",
+    ],
+)
+@pytest.mark.parametrize("r", [1.0, 1.2, 1.9])
+def test_cell_list_neighbors_match_pymatgen_neighbors(
+    structure_name: str, r: float, request
+) -> None:
+    structure: pmg.Structure = request.getfixturevalue(structure_name)
+    neighbor_pairs: NeighborPairs = find_neighbor_pairs_with_cell_list(
+        cell_structure=structure, r=r
+    )
+    cell_list_df: pd.DataFrame = pd.DataFrame(
+        data={
+            "i": neighbor_pairs.i,
+            "j": neighbor_pairs.j,
+            "a": neighbor_pairs.translation_ij[:, 0],
+            "b": neighbor_pairs.translation_ij[:, 1],
+            "c": neighbor_pairs.translation_ij[:, 2],
+            "distance_ij": neighbor_pairs.distance_ij,
+        }
+    )
+    pymatgen_df: pd.DataFrame = pd.DataFrame(
+        data=[
+            (i, neighbor[2], *np.round(neighbor[3]).astype(np.int64), neighbor[1])
+            for i, site_neighbors in enumerate(
+                structure.get_all_neighbors(
+                    r=r + 1e-6, include_index=True, include_image=True
+                )
+            )
+            for neighbor in site_neighbors
+        ],
+        columns=["i", "j", "a", "b", "c", "distance_ij"],
+    )
+    pair_columns = ["i", "j", "a", "b", "c"]
+    cell_list_df = cell_list_df.sort_values(pair_columns).reset_index(drop=True)
+    pymatgen_df = pymatgen_df.sort_values(pair_columns).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(
+        cell_list_df.loc[:, pair_columns],
+        pymatgen_df.loc[:, pair_columns],
+        check_dtype=False,
+    )
+    np.testing.assert_allclose(
+        cell_list_df["distance_ij"], pymatgen_df["distance_ij"], atol=1e-10
+    )
+
+
+def test_square_lattice_sites_have_four_neighbors_at_the_lattice_spacing(
+    two_dimensional_square_lattice: pmg.Structure,
+) -> None:
+    neighbor_pairs: NeighborPairs = find_neighbor_pairs_with_cell_list(
+        cell_structure=two_dimensional_square_lattice, r=1.0
+    )
+
+    assert np.all(
+        np.bincount(
+            neighbor_pairs.i, minlength=two_dimensional_square_lattice.num_sites
+        )
+        == 4
+    )
+    np.testing.assert_allclose(neighbor_pairs.distance_ij, 1.0)
+
+
+@pytest.mark.parametrize(
+    "unit_cell_name, scaling_factors, r",
+    [
+        ("two_dimensional_square_unit_cell", (5, 5, 1), 1.2),
+        ("cubic_unit_cell", (3, 4, 5), 1.9),
+        ("bcc_unit_cell", (5, 5, 10), 1.9),
+        ("hexagonal_unit_cell", (4, 4, 2), 1.2),
+    ],
+)
+def test_lattice_from_unit_cell_matches_supercell_lattice(
+    unit_cell_name: str, scaling_factors: Tuple[int, int, int], r: float, request
+) -> None:
+    unit_cell: pmg.Structure = request.getfixturevalue(unit_cell_name)
+    tiled_lattice: Lattice = Lattice.from_unit_cell(
+        structure=unit_cell, r=r, scaling_factors=scaling_factors
+    )
+    supercell_lattice: Lattice = Lattice(
+        structure=spyns.lattice.generate.make_supercell(
+            cell_structure=unit_cell, scaling_factors=scaling_factors
+        ),
+        r=r,
+    )
+
+    for lattice in (tiled_lattice, supercell_lattice):
+        lattice.set_sublattice_pair_interactions(
+            interaction_df=lattice.sublattice_pairs_data_frame.assign(
+                J_ij=lambda x: -1.0
+                - x["subspecies_ij_distance_rank"]
+                - 0.1 * x["subspecies_i"].str.len()
+            )
+        )
+
+    assert tiled_lattice.number_sites == supercell_lattice.number_sites
+    np.testing.assert_array_equal(
+        tiled_lattice.neighbors_table, supercell_lattice.neighbors_table
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.neighbors_count, supercell_lattice.neighbors_count
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.neighbors_lookup_index, supercell_lattice.neighbors_lookup_index
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.sublattice_table, supercell_lattice.sublattice_table
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.interaction_parameters_table,
+        supercell_lattice.interaction_parameters_table,
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.interaction_class_parameters[
+            tiled_lattice.interaction_class_table
+        ],
+        tiled_lattice.interaction_parameters_table,
+    )
+    np.testing.assert_array_equal(
+        tiled_lattice.neighbors_data_frame.loc[:, ["i", "j", "n"]].values,
+        supercell_lattice.neighbors_data_frame.loc[:, ["i", "j", "n"]].values,
+    )
+
+
+def test_lookup_table_cache_hits_and_rejects_corrupt_entries(
+    bcc_unit_cell: pmg.Structure, tmp_path, monkeypatch
+) -> None:
+    interactions: pd.DataFrame = Lattice.from_unit_cell(
+        structure=bcc_unit_cell, r=1.2, scaling_factors=(3, 3, 6)
+    ).sublattice_pairs_data_frame.assign(
+        J_ij=lambda x: -1.0 / (1 + x["subspecies_ij_distance_rank"])
+    )
+    expected: LookupTables = spyns.lattice.cache.build_lookup_tables(
+        structure=bcc_unit_cell,
+        r=1.2,
+        interactions=interactions,
+        scaling_factors=(3, 3, 6),
+    )
+    built: LookupTables = spyns.lattice.cache.load_lookup_tables(
+        structure=bcc_unit_cell,
+        r=1.2,
+        interactions=interactions,
+        cache_directory=str(tmp_path),
+        scaling_factors=(3, 3, 6),
+    )
+    (binary_path,) = tmp_path.glob("*.bin")
+
+    def fail_to_build(**kwargs) -> None:
+        raise AssertionError("Lookup tables rebuilt on a cache hit.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(spyns.lattice.cache, "build_lookup_tables", fail_to_build)
+        cached: LookupTables = spyns.lattice.cache.load_lookup_tables(
+            structure=bcc_unit_cell,
+            r=1.2,
+            interactions=interactions,
+            cache_directory=str(tmp_path),
+            scaling_factors=(3, 3, 6),
+        )
+
+    for lookup_tables in (built, cached):
+        assert isinstance(lookup_tables.neighbors_table, np.memmap)
+        assert lookup_tables.number_sites == expected.number_sites
+        np.testing.assert_array_equal(
+            lookup_tables.sublattice_labels, expected.sublattice_labels
+        )
+
+        for name in spyns.shared.LOOKUP_ARRAYS:
+            np.testing.assert_array_equal(
+                getattr(lookup_tables, name), getattr(expected, name)
+            )
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=cached,
+        parameters=SimulationParameters(
+            seed=np.random.randint(100000),
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=20,
+            equilibration_sweeps=10,
+            sample_interval=1,
+            temperature=1,
+        ),
+    )
+
+    assert np.all(np.isfinite(data.container.trace.energy))
+
+    corrupted_bytes: bytearray = bytearray(binary_path.read_bytes())
+    corrupted_bytes[-1] ^= 0xFF
+    binary_path.unlink()
+    binary_path.write_bytes(bytes(corrupted_bytes))
+    rebuilt: LookupTables = spyns.lattice.cache.load_lookup_tables(
+        structure=bcc_unit_cell,
+        r=1.2,
+        interactions=interactions,
+        cache_directory=str(tmp_path),
+        scaling_factors=(3, 3, 6),
+    )
+
+    np.testing.assert_array_equal(
+        rebuilt.interaction_parameters_table, expected.interaction_parameters_table
+    )
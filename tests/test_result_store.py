@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from spyns.data import (
+    LookupTables,
+    ResultStoreParameters,
+    SimulationParameters,
+    StoredResult,
+)
+import spyns
+
+
+@pytest.fixture()
+def lookup_tables() -> LookupTables:
+    number_sites: int = 32
+    sites: np.ndarray = np.arange(number_sites)
+
+    return spyns.runtime.make_lookup_tables(
+        neighbors_table=np.column_stack(
+            [(sites - 1) % number_sites, (sites + 1) % number_sites]
+        ).flatten(),
+        neighbors_count=np.full(shape=number_sites, fill_value=2),
+        interaction_parameters_table=np.full(shape=2 * number_sites, fill_value=-1.0),
+    )
+
+
+def make_parameters(seed: int) -> SimulationParameters:
+    return SimulationParameters(
+        seed=seed,
+        mode="heisenberg_cython",
+        trace_filepath=None,
+        snapshot_filepath=None,
+        sweeps=20,
+        equilibration_sweeps=10,
+        sample_interval=1,
+        temperature=1.0,
+    )
+
+
+def test_identical_runs_are_loaded_from_store(
+    lookup_tables: LookupTables, tmp_path: Path, monkeypatch
+) -> None:
+    store_parameters: ResultStoreParameters = ResultStoreParameters(
+        directory=str(tmp_path / "store"), max_bytes=None
+    )
+    first: StoredResult = spyns.result_store.cached_simulation(
+        lattice=lookup_tables,
+        parameters=make_parameters(seed=1),
+        store_parameters=store_parameters,
+    )
+
+    def fail_simulation(*args, **kwargs):
+        raise RuntimeError("simulation was rerun")
+
+    monkeypatch.setattr(spyns.run, "simulation", fail_simulation)
+    second: StoredResult = spyns.result_store.cached_simulation(
+        lattice=lookup_tables,
+        parameters=make_parameters(seed=1),
+        store_parameters=store_parameters,
+    )
+
+    assert not first.hit and second.hit
+    assert second.key == first.key
+    assert second.observables == first.observables
+    assert set(second.trace) == set(first.trace)
+    assert all(
+        np.array_equal(second.trace[name], first.trace[name]) for name in first.trace
+    )
+
+    with pytest.raises(RuntimeError):
+        spyns.result_store.cached_simulation(
+            lattice=lookup_tables,
+            parameters=make_parameters(seed=2),
+            store_parameters=store_parameters,
+        )
+
+    monkeypatch.setattr(spyns, "__version__", "0.0.0")
+
+    assert spyns.result_store.compute_result_key(
+        lattice=lookup_tables, parameters=make_parameters(seed=1)
+    ) != first.key
+    assert spyns.result_store.invalidate_results(
+        directory=store_parameters.directory, version=spyns.__version__
+    ) == [first.key]
+
+
+def test_least_recently_used_results_are_evicted(
+    lookup_tables: LookupTables, tmp_path: Path
+) -> None:
+    store_path: Path = tmp_path / "store"
+    keys: List[str] = [
+        spyns.result_store.cached_simulation(
+            lattice=lookup_tables,
+            parameters=make_parameters(seed=seed),
+            store_parameters=ResultStoreParameters(
+                directory=str(store_path), max_bytes=None
+            ),
+        ).key
+        for seed in [1, 2, 3]
+    ]
+    entry_bytes: int = max(
+        size for _, _, size in spyns.result_store.list_results(store_path=store_path)
+    )
+
+    assert spyns.result_store.read_result(store_path=store_path, key=keys[0]).hit
+    assert spyns.result_store.evict_results(
+        store_path=store_path, max_bytes=2 * entry_bytes
+    ) == [keys[1]]
+    assert spyns.result_store.read_result(store_path=store_path, key=keys[1]) is None
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import spyns
+from spyns.reweighting import (
+    ReweightedEstimators,
+    compute_multiple_histogram_log_density_of_states,
+    compute_single_histogram_log_density_of_states,
+)
+
+
+@pytest.fixture()
+def model_log_density_of_states() -> np.ndarray:
+    energies: np.ndarray = np.linspace(start=-100.0, stop=0.0, num=51)
+    log_density_of_states: np.ndarray = 0.5 * (energies + 100.0) - 0.002 * (
+        energies + 50.0
+    ) ** 2
+
+    return np.stack([energies, log_density_of_states])
+
+
+def make_canonical_histogram(
+    energies: np.ndarray,
+    log_density_of_states: np.ndarray,
+    temperature: float,
+    number_samples: int,
+) -> np.ndarray:
+    log_weights: np.ndarray = log_density_of_states - energies / temperature
+    probabilities: np.ndarray = np.exp(log_weights - log_weights.max())
+
+    return number_samples * probabilities / probabilities.sum()
+
+
+def test_single_histogram_reweighting_to_sampled_temperature(
+    model_log_density_of_states: np.ndarray
+) -> None:
+    energies, log_density_of_states = model_log_density_of_states
+    counts: np.ndarray = make_canonical_histogram(
+        energies=energies,
+        log_density_of_states=log_density_of_states,
+        temperature=2.0,
+        number_samples=100000,
+    )
+
+    estimated_log_density_of_states = compute_single_histogram_log_density_of_states(
+        counts=counts, energies=energies, temperature=2.0
+    )
+    reweighted: ReweightedEstimators = spyns.reweighting.compute_reweighted_estimators(
+        log_density_of_states=estimated_log_density_of_states,
+        energies=energies,
+        magnetizations=None,
+        temperatures=np.array([2.0]),
+        number_sites=1,
+    )
+
+    assert np.isclose(reweighted.energy[0], np.sum(counts * energies) / counts.sum())
+    assert np.all(np.isnan(reweighted.magnetization))
+
+
+def test_multiple_histogram_reweighting_recovers_density_of_states(
+    model_log_density_of_states: np.ndarray
+) -> None:
+    energies, log_density_of_states = model_log_density_of_states
+    temperatures: np.ndarray = np.array([1.5, 2.0, 4.0, 20.0])
+    counts: np.ndarray = np.stack(
+        [
+            make_canonical_histogram(
+                energies=energies,
+                log_density_of_states=log_density_of_states,
+                temperature=temperature,
+                number_samples=100000,
+            )
+            for temperature in temperatures
+        ]
+    )
+
+    estimated_log_density_of_states = compute_multiple_histogram_log_density_of_states(
+        counts=counts,
+        energies=energies,
+        temperatures=temperatures,
+        tolerance=1e-12,
+        max_iterations=100000,
+    )
+
+    expected: np.ndarray = log_density_of_states - log_density_of_states[-1]
+    estimated: np.ndarray = (
+        estimated_log_density_of_states - estimated_log_density_of_states[-1]
+    )
+
+    assert np.allclose(estimated, expected, atol=1e-6)
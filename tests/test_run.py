@@ -1,13 +1,30 @@
 # -*- coding: utf-8 -*-
 
-from typing import Tuple, Union
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
 
 import numpy as np
+import pandas as pd
 import pymatgen as pmg
 import pytest
 
-from spyns.data import StructureParameters, SimulationParameters, SimulationData
+from spyns.data import (
+    AdaptiveParameters,
+    AdaptiveRunReport,
+    HistogramParameters,
+    MetricsParameters,
+    OrderPatternParameters,
+    ProgressParameters,
+    ProgressReport,
+    RunMetrics,
+    ShellCorrelationParameters,
+    StructureParameters,
+    SimulationParameters,
+    SimulationData,
+)
 from spyns.lattice import Lattice
+from spyns.reweighting import ReweightedEstimators
 import spyns
 
 
@@ -354,15 +371,15 @@ def test_sc_heisenberg_cython_ferromagnet_simulation(
         lattice=lattice, parameters=simulation_parameters_heisenberg_cython
     )
 
-    energy: float = data.container.data_frame["<E**1>"].values[
+    energy: float = data.container.trace_view["<E**1>"][
         -1
     ] / data.container.lookup_tables.number_sites
-    magnetization: float = data.container.data_frame["<M**1>"].values[
+    magnetization: float = data.container.trace_view["<M**1>"][
         -1
     ] / data.container.lookup_tables.number_sites
-    susceptibility: float = data.container.data_frame["X"].values[-1]
-    heat_capacity: float = data.container.data_frame["C"].values[-1]
-    binder_m: float = data.container.data_frame["Binder_M"].values[-1]
+    susceptibility: float = data.container.trace_view["X"][-1]
+    heat_capacity: float = data.container.trace_view["C"][-1]
+    binder_m: float = data.container.trace_view["Binder_M"][-1]
 
     print(f"Average susceptibility = {susceptibility}")
     print(f"Average heat capacity = {heat_capacity}")
@@ -370,3 +387,266 @@ def test_sc_heisenberg_cython_ferromagnet_simulation(
 
     assert energy >= -max_abs_energy and energy <= max_abs_energy
     assert magnetization >= -1.0 and magnetization <= 1.0
+
+
+def test_sc_heisenberg_cython_adaptive_simulation(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=(-1.0, -1.0))
+    )
+
+    adaptive_parameters: AdaptiveParameters = AdaptiveParameters(
+        observables=["E", "M"],
+        target_relative_error=0.01,
+        check_interval=20,
+        number_blocks=4,
+        equilibration_tolerance=2.0,
+    )
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        adaptive_parameters=adaptive_parameters,
+    )
+
+    report: AdaptiveRunReport = data.container.adaptive_report
+
+    print(f"Adaptive run report = {report}")
+
+    assert report.stop_reason in ["target_error_reached", "max_sweeps_reached"]
+    assert 0 < report.equilibration_sweeps <= 100
+    assert 0 < report.production_sweeps <= 200
+    assert len(data.container.trace.energy) == report.production_sweeps
+    assert set(report.relative_errors.keys()) == {"E", "M"}
+
+    if report.stop_reason == "target_error_reached":
+        assert max(report.relative_errors.values()) <= 0.01
+
+
+def test_sc_heisenberg_cython_histogram_reweighting(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=(-1.0, -1.0))
+    )
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        histogram_parameters=HistogramParameters(
+            energy_min=-3.0, energy_max=3.0, energy_bins=600, magnetization_bins=50
+        ),
+    )
+
+    histograms = data.container.histograms
+    number_samples: int = data.container.estimators.number_samples[0]
+
+    assert histograms.energy_counts.sum() + histograms.out_of_range[0] == (
+        number_samples
+    )
+    assert histograms.energy_magnetization_counts.sum() == (
+        histograms.energy_counts.sum()
+    )
+
+    reweighted: ReweightedEstimators = spyns.reweighting.reweight_simulations(
+        data=[data.container],
+        temperatures=np.array(
+            [simulation_parameters_heisenberg_cython.temperature, 1.1]
+        ),
+    )
+    energy: float = data.container.trace.energy.mean() / lattice.number_sites
+    magnetization: float = (
+        data.container.trace.magnetization.mean() / lattice.number_sites
+    )
+
+    print(f"Reweighted energy = {reweighted.energy}")
+    print(f"Reweighted magnetization = {reweighted.magnetization}")
+
+    assert np.isclose(reweighted.energy[0], energy, atol=0.01)
+    assert np.isclose(reweighted.magnetization[0], magnetization, atol=0.02)
+    assert reweighted.energy[1] > reweighted.energy[0]
+
+
+def test_sc_heisenberg_cython_run_metrics(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+    tmp_path: Path,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=(-1.0, -1.0))
+    )
+
+    log_filepath: Path = tmp_path / "metrics.jsonl"
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        metrics_parameters=MetricsParameters(log_filepath=str(log_filepath)),
+    )
+
+    metrics: RunMetrics = data.container.metrics
+    total_sweeps: int = (
+        simulation_parameters_heisenberg_cython.sweeps
+        + simulation_parameters_heisenberg_cython.equilibration_sweeps
+    )
+
+    assert set(metrics.phase_times) == {
+        "lattice_build",
+        "pre_simulation",
+        "main_simulation",
+        "post_simulation",
+        "io",
+    }
+    assert metrics.attempted_flips.sum() == total_sweeps * lattice.number_sites
+    assert 0 < metrics.accepted_flips.sum() <= metrics.attempted_flips.sum()
+    assert np.all(metrics.attempted_flips > 0)
+    assert metrics.number_samples == simulation_parameters_heisenberg_cython.sweeps
+    assert metrics.flips_per_second > 0
+    assert metrics.peak_memory > 0
+
+    record: Dict[str, Any] = json.loads(log_filepath.read_text().splitlines()[-1])
+
+    assert record["seed"] == simulation_parameters_heisenberg_cython.seed
+    assert len(record["sublattices"]) == lattice.number_sublattices
+    assert sum(
+        sublattice["attempted_flips"] for sublattice in record["sublattices"]
+    ) == (total_sweeps * lattice.number_sites)
+
+
+def test_sc_heisenberg_cython_progress_hook_stops_run(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=(-1.0, -1.0))
+    )
+
+    reports: List[ProgressReport] = []
+
+    def stop_after_production_sweep_50(report: ProgressReport) -> bool:
+        reports.append(report)
+
+        with pytest.raises(ValueError):
+            report.estimators.energy[0] = 0.0
+
+        return report.phase == "production" and report.sweep >= 50
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        progress_parameters=ProgressParameters(
+            callback=stop_after_production_sweep_50,
+            sweep_interval=25,
+            time_interval=None,
+        ),
+    ).container
+
+    assert [(report.phase, report.sweep) for report in reports] == [
+        ("equilibration", 25),
+        ("equilibration", 50),
+        ("equilibration", 75),
+        ("equilibration", 100),
+        ("production", 25),
+        ("production", 50),
+    ]
+    assert data.estimators.number_samples[0] == 50
+    assert len(data.trace_view) == 50
+    assert data.trace_view["E"][-1] == reports[-1].estimators.energy[0]
+
+
+def test_sc_heisenberg_cython_shell_correlations(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.5)
+    sublattice_pairs_df = lattice.sublattice_pairs_data_frame
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=sublattice_pairs_df.assign(
+            J_ij=np.where(
+                sublattice_pairs_df["subspecies_i"]
+                != sublattice_pairs_df["subspecies_j"],
+                -1.0,
+                0.2,
+            )
+        )
+    )
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        shell_correlation_parameters=ShellCorrelationParameters(sample_interval=1),
+    ).container
+    shell_correlations_df = spyns.statistics.compute_shell_correlations(data=data)
+
+    assert len(shell_correlations_df) == len(sublattice_pairs_df)
+    assert shell_correlations_df["n"].sum() == len(lattice.neighbors_table)
+    assert (
+        data.shell_correlations.number_samples[0] == data.estimators.number_samples[0]
+    )
+    assert np.all(np.abs(shell_correlations_df["<Si.Sj>"]) <= 1.0)
+    assert np.isclose(
+        shell_correlations_df["<E_ij>"].sum(), data.trace_view["E"].mean()
+    )
+
+
+def test_sc_heisenberg_cython_order_parameters(
+    cubic_lattice: pmg.Structure,
+    simulation_parameters_heisenberg_cython: SimulationParameters,
+) -> None:
+    lattice: Lattice = Lattice(structure=cubic_lattice, r=1.2)
+
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=(1.0, 1.0))
+    )
+
+    names, weights = spyns.statistics.make_pattern_weights(
+        sublattice_labels=lattice.sublattice_labels,
+        patterns={
+            "M_uniform": {"Fe1": 1.0, "Fe2": 1.0},
+            "M_staggered": {"Fe1": -1.0, "Fe2": 1.0},
+        },
+    )
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=simulation_parameters_heisenberg_cython,
+        order_pattern_parameters=OrderPatternParameters(names=names, weights=weights),
+    ).container
+    order_parameters: np.ndarray = spyns.statistics.compute_order_parameters(
+        spin_vector=data.trace.spin_vector,
+        weights=weights,
+        number_sites=lattice.number_sites,
+    )
+
+    assert np.allclose(data.order_parameters.values, order_parameters)
+    assert np.allclose(
+        data.trace_view["M_uniform"], data.trace.magnetization / lattice.number_sites
+    )
+    assert data.trace_view["M_staggered"].mean() > data.trace_view["M_uniform"].mean()
+
+    trace_df = pd.DataFrame(
+        {
+            f"S{sublattice}{axis}": data.trace.spin_vector[:, sublattice, component]
+            for sublattice in range(lattice.number_sublattices)
+            for component, axis in enumerate("xyz")
+        }
+    )
+    spyns.statistics.compute_heisenberg_afm_order_parameter(
+        trace_df=trace_df,
+        order_parameter_name="M_afm",
+        sublattices1=["0"],
+        sublattices2=["1"],
+        number_sites=lattice.number_sites,
+    )
+
+    assert np.allclose(trace_df["M_afm"], data.trace_view["M_staggered"])
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from spyns.data import LookupTables, SimulationData, SimulationParameters
+import spyns
+
+
+def make_square_lattice_tables(length: int) -> LookupTables:
+    sites: np.ndarray = np.arange(length * length).reshape(length, length)
+    neighbors_table: np.ndarray = np.stack(
+        [
+            np.roll(sites, shift=1, axis=0),
+            np.roll(sites, shift=-1, axis=0),
+            np.roll(sites, shift=1, axis=1),
+            np.roll(sites, shift=-1, axis=1),
+        ],
+        axis=-1,
+    ).ravel()
+
+    return spyns.runtime.make_lookup_tables(
+        neighbors_table=neighbors_table,
+        neighbors_count=np.full(shape=length * length, fill_value=4),
+        interaction_parameters_table=np.full(
+            shape=len(neighbors_table), fill_value=-1.0
+        ),
+        sublattice_table=(sites % 2).ravel(),
+    )
+
+
+@pytest.fixture()
+def simulation_parameters() -> SimulationParameters:
+    return SimulationParameters(
+        seed=1234,
+        mode="heisenberg_cython",
+        trace_filepath=None,
+        snapshot_filepath=None,
+        sweeps=100,
+        equilibration_sweeps=50,
+        sample_interval=1,
+        temperature=0.5,
+    )
+
+
+def test_make_lookup_tables_index() -> None:
+    lookup_tables: LookupTables = spyns.runtime.make_lookup_tables(
+        neighbors_table=[1, 0, 2, 1],
+        neighbors_count=[1, 2, 1],
+        interaction_parameters_table=[-1.0, -1.0, -1.0, -1.0],
+    )
+
+    assert np.array_equal(lookup_tables.neighbors_lookup_index, [0, 1, 3])
+    assert lookup_tables.number_sites == 3
+    assert lookup_tables.number_sublattices == 1
+
+    with pytest.raises(ValueError):
+        spyns.runtime.make_lookup_tables(
+            neighbors_table=[1, 0, 2],
+            neighbors_count=[1, 2, 1],
+            interaction_parameters_table=[-1.0, -1.0, -1.0],
+        )
+
+
+def test_runtime_simulation_matches_run_simulation(
+    simulation_parameters: SimulationParameters
+) -> None:
+    lookup_tables: LookupTables = make_square_lattice_tables(length=8)
+
+    runtime_data: SimulationData = spyns.runtime.simulation(
+        lookup_tables=lookup_tables, parameters=simulation_parameters
+    )
+    run_data: SimulationData = spyns.run.simulation(
+        lattice=lookup_tables, parameters=simulation_parameters
+    ).container
+
+    assert runtime_data.data_frame is None
+    assert np.allclose(runtime_data.trace.energy, run_data.trace.energy)
+    assert np.allclose(runtime_data.trace.spin_vector, run_data.trace.spin_vector)
+    assert np.mean(runtime_data.trace.energy) / lookup_tables.number_sites < -1.0
+
+
+def test_runtime_skips_lattice_dependencies() -> None:
+    script: str = "\n".join(
+        [
+            "import sys",
+            "import numpy as np",
+            "import spyns.runtime",
+            "from spyns.data import SimulationParameters",
+            "sites = np.arange(16)",
+            "tables = spyns.runtime.make_lookup_tables(",
+            "    neighbors_table=np.stack([sites - 1, sites + 1], axis=-1).ravel() % 16,",
+            "    neighbors_count=np.full(16, 2),",
+            "    interaction_parameters_table=np.full(32, -1.0),",
+            ")",
+            "spyns.runtime.simulation(",
+            "    lookup_tables=tables,",
+            "    parameters=SimulationParameters(",
+            "        1, 'heisenberg_cython', None, None, 10, 10, 1, 1.0",
+            "    ),",
+            ")",
+            "print(' '.join(sorted(sys.modules)))",
+        ]
+    )
+    modules: str = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.split()
+
+    assert "spyns.algorithms.metropolis.heisenberg_cython" in modules
+    assert "pandas" not in modules
+    assert "pymatgen" not in modules
+    assert "scipy" not in modules
+
+
+def test_package_attributes_resolve_lazily() -> None:
+    script: str = "\n".join(
+        [
+            "import spyns",
+            "spyns.model.heisenberg.sample_random_state",
+            "spyns.algorithms.metropolis.heisenberg_cython.run_sweeps",
+            "spyns.algorithms.wang_landau.heisenberg_cython.run_sweeps",
+            "spyns.lattice.generate.make_supercell",
+        ]
+    )
+
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import pickle
+from typing import List
+
+import numpy as np
+
+from spyns.data import (
+    LookupTables,
+    SharedLookupTables,
+    SimulationData,
+    SimulationParameters,
+)
+import spyns
+
+
+def make_chain_lookup_tables(number_sites: int) -> LookupTables:
+    sites: np.ndarray = np.arange(number_sites)
+    neighbors: np.ndarray = np.stack([sites - 1, sites + 1], axis=-1) % number_sites
+
+    return spyns.runtime.make_lookup_tables(
+        neighbors_table=neighbors.ravel(),
+        neighbors_count=np.full(shape=number_sites, fill_value=2),
+        interaction_parameters_table=np.full(shape=2 * number_sites, fill_value=-1.0),
+        sublattice_table=sites % 2,
+    )
+
+
+def run_chain_simulation(
+    shared_lookup_tables: SharedLookupTables, seed: int
+) -> np.ndarray:
+    lookup_tables: LookupTables = spyns.shared.attach_lookup_tables(
+        shared_lookup_tables=shared_lookup_tables
+    )
+    data: SimulationData = spyns.runtime.simulation(
+        lookup_tables=lookup_tables,
+        parameters=SimulationParameters(
+            seed=seed,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=20,
+            equilibration_sweeps=10,
+            sample_interval=1,
+            temperature=1.0,
+        ),
+    )
+
+    return data.trace.energy
+
+
+def test_shared_lookup_tables_round_trip() -> None:
+    lookup_tables: LookupTables = make_chain_lookup_tables(number_sites=1000)
+
+    with spyns.shared.shared_lookup_tables(lattice=lookup_tables) as handle:
+        assert len(pickle.dumps(handle)) < 2048
+
+        attached: LookupTables = spyns.shared.attach_lookup_tables(
+            shared_lookup_tables=handle
+        )
+
+        for name in ["sublattice_table", "neighbors_table", "neighbors_lookup_index"]:
+            assert np.array_equal(getattr(attached, name), getattr(lookup_tables, name))
+            assert getattr(attached, name).dtype == getattr(lookup_tables, name).dtype
+            assert not getattr(attached, name).flags.writeable
+
+        assert attached.interaction_class_table is None
+        assert attached.number_sites == lookup_tables.number_sites
+
+    assert not os.path.exists(handle.filepath)
+
+
+def test_shared_lookup_tables_in_spawned_workers() -> None:
+    lookup_tables: LookupTables = make_chain_lookup_tables(number_sites=64)
+    seeds: List[int] = [1, 2, 3]
+
+    with spyns.shared.shared_lookup_tables(lattice=lookup_tables) as handle:
+        with multiprocessing.get_context("spawn").Pool(processes=2) as pool:
+            energies: List[np.ndarray] = pool.starmap(
+                run_chain_simulation, [(handle, seed) for seed in seeds]
+            )
+
+        for seed, energy in zip(seeds, energies):
+            assert np.allclose(
+                energy, run_chain_simulation(shared_lookup_tables=handle, seed=seed)
+            )
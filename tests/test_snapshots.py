@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from spyns.data import (
+    HeisenbergState,
+    SimulationData,
+    SimulationParameters,
+    SnapshotParameters,
+)
+import spyns
+
+
+@pytest.mark.parametrize(
+    "encoding,max_error",
+    [
+        ("float64", 1e-15),
+        ("float32", 6e-8),
+        ("angles16", 5.5e-5),
+        ("octahedral16", 7e-5),
+    ],
+)
+def test_heisenberg_encodings_are_within_error_bounds(
+    encoding: str, max_error: float
+) -> None:
+    np.random.seed(1234)
+    state: HeisenbergState = spyns.model.heisenberg.sample_random_state(100000)
+    decoded: HeisenbergState = spyns.snapshots.decode_heisenberg_state(
+        encoded=spyns.snapshots.encode_heisenberg_state(state=state, encoding=encoding),
+        encoding=encoding,
+    )
+    spin_vectors: np.ndarray = np.column_stack([state.x, state.y, state.z])
+    decoded_spin_vectors: np.ndarray = np.column_stack(
+        [decoded.x, decoded.y, decoded.z]
+    )
+    angles: np.ndarray = np.arctan2(
+        np.linalg.norm(np.cross(spin_vectors, decoded_spin_vectors), axis=1),
+        np.sum(spin_vectors * decoded_spin_vectors, axis=1),
+    )
+
+    assert decoded.x.flags.c_contiguous and decoded.x.dtype == np.float64
+    assert np.max(angles) < max_error
+
+
+def test_ising_encoding_is_lossless() -> None:
+    state: np.ndarray = np.random.RandomState(1234).choice([-1, 1], size=37)
+    encoded: np.ndarray = spyns.snapshots.encode_ising_state(state=state)
+
+    assert encoded.nbytes == 5
+    assert np.array_equal(
+        spyns.snapshots.decode_ising_state(encoded=encoded, number_sites=37), state
+    )
+
+
+@pytest.mark.parametrize("compression_level", [None, 6])
+def test_encoded_snapshots_round_trip_through_disk(tmp_path, compression_level) -> None:
+    number_sites: int = 64
+    sites: np.ndarray = np.arange(number_sites)
+    snapshot_filepath: str = str(tmp_path / "snapshots.bin")
+
+    data: SimulationData = spyns.runtime.simulation(
+        lookup_tables=spyns.runtime.make_lookup_tables(
+            neighbors_table=np.column_stack(
+                [(sites - 1) % number_sites, (sites + 1) % number_sites]
+            ).flatten(),
+            neighbors_count=np.full(shape=number_sites, fill_value=2),
+            interaction_parameters_table=np.full(
+                shape=2 * number_sites, fill_value=-1.0
+            ),
+        ),
+        parameters=SimulationParameters(
+            seed=1234,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=snapshot_filepath,
+            sweeps=10,
+            equilibration_sweeps=5,
+            sample_interval=1,
+            temperature=1.0,
+        ),
+        snapshot_parameters=SnapshotParameters(
+            encoding="octahedral16", compression_level=compression_level, chunk_size=4
+        ),
+    )
+    sweeps, states = spyns.snapshots.read_snapshots(filepath=snapshot_filepath)
+    last_state: List[np.ndarray] = [states[-1].x, states[-1].y, states[-1].z]
+
+    assert np.array_equal(sweeps, np.arange(1, 11))
+    assert len(states) == 10
+    assert data.snapshots.number_chunks == 3
+    assert np.allclose(
+        last_state, [data.state.x, data.state.y, data.state.z], atol=1e-4
+    )
+
+
+def test_snapshot_encoding_must_match_mode() -> None:
+    with pytest.raises(ValueError):
+        spyns.data.setup_snapshots(
+            snapshot_parameters=SnapshotParameters(
+                encoding="bits", compression_level=None, chunk_size=1
+            ),
+            mode="heisenberg_cython",
+        )
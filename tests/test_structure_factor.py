@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pymatgen as pmg
+
+from spyns.data import (
+    SimulationData,
+    SimulationParameters,
+    StructureFactorParameters,
+    StructureParameters,
+)
+from spyns.lattice import Lattice
+import spyns
+
+
+def make_simulation_parameters(sweeps: int, temperature: float) -> SimulationParameters:
+    return SimulationParameters(
+        seed=1234,
+        mode="heisenberg_cython",
+        trace_filepath=None,
+        snapshot_filepath=None,
+        sweeps=sweeps,
+        equilibration_sweeps=sweeps,
+        sample_interval=1,
+        temperature=temperature,
+    )
+
+
+def test_structure_factor_matches_direct_pair_sum() -> None:
+    scaling_factors = (3, 4, 2)
+    number_unit_sites: int = 2
+    number_cells: int = int(np.prod(scaling_factors))
+    number_sites: int = number_unit_sites * number_cells
+    sites: np.ndarray = np.arange(number_sites)
+
+    data: SimulationData = spyns.data.setup_containers(
+        parameters=make_simulation_parameters(sweeps=1, temperature=1.0),
+        state=spyns.model.heisenberg.sample_random_state(number_sites),
+        lattice=spyns.runtime.make_lookup_tables(
+            neighbors_table=sites,
+            neighbors_count=np.ones(shape=number_sites),
+            interaction_parameters_table=np.zeros(shape=number_sites),
+        ),
+        structure_factor_parameters=StructureFactorParameters(
+            scaling_factors=scaling_factors
+        ),
+    )
+    spyns.structure_factor.update_structure_factor(data=data)
+
+    spin_vectors: np.ndarray = spyns.model.heisenberg.get_spin_vectors(
+        data=data
+    ).reshape(number_unit_sites, number_cells, 3)
+    translations: np.ndarray = np.column_stack(
+        np.unravel_index(np.arange(number_cells), scaling_factors)
+    )
+    wave_vectors: np.ndarray = spyns.structure_factor.get_wave_vectors(
+        scaling_factors=scaling_factors
+    ).reshape(number_cells, 3)
+    phases: np.ndarray = np.exp(-2j * np.pi * wave_vectors @ translations.T)
+    direct_sum: np.ndarray = np.einsum(
+        "qt,qu,atx,bux->abq", phases, phases.conj(), spin_vectors, spin_vectors
+    ).reshape((number_unit_sites, number_unit_sites) + scaling_factors)
+
+    assert np.allclose(
+        spyns.structure_factor.compute_average_structure_factor(
+            structure_factor=data.structure_factor
+        ),
+        direct_sum / number_cells,
+    )
+
+
+def test_square_antiferromagnet_orders_at_zone_corner() -> None:
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=StructureParameters(
+            abc=(1.0, 1.0, 10.0),
+            ang=(90, 90, 90),
+            spacegroup=1,
+            species=["Fe"],
+            coordinates=[[0.0, 0.0, 0.0]],
+        )
+    )
+    lattice: Lattice = Lattice.from_unit_cell(
+        structure=structure, r=1.1, scaling_factors=(8, 8, 1)
+    )
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=1.0)
+    )
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=make_simulation_parameters(sweeps=200, temperature=0.1),
+        structure_factor_parameters=StructureFactorParameters(
+            scaling_factors=(8, 8, 1)
+        ),
+    ).container
+
+    assert data.structure_factor.number_samples[0] == 200
+    assert np.allclose(
+        np.abs(spyns.structure_factor.find_ordering_vector(data.structure_factor)),
+        [0.5, 0.5, 0.0],
+    )
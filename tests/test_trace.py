@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pymatgen as pmg
+import pytest
+
+from spyns.data import SimulationData, SimulationParameters, StructureParameters
+from spyns.lattice import Lattice
+from spyns.trace import TraceView
+import spyns
+
+
+def test_trace_view_matches_data_frame_statistics() -> None:
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=StructureParameters(
+            abc=(1.0, 1.0, 1.0),
+            ang=(90, 90, 90),
+            spacegroup=1,
+            species=["Fe"],
+            coordinates=[[0.0, 0.0, 0.0]],
+        )
+    )
+    lattice: Lattice = Lattice.from_unit_cell(
+        structure=structure, r=1.1, scaling_factors=(4, 4, 4)
+    )
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=-1.0)
+    )
+    temperature: float = 2.0
+
+    data: SimulationData = spyns.run.simulation(
+        lattice=lattice,
+        parameters=SimulationParameters(
+            seed=1234,
+            mode="heisenberg_cython",
+            trace_filepath=None,
+            snapshot_filepath=None,
+            sweeps=100,
+            equilibration_sweeps=10,
+            sample_interval=1,
+            temperature=temperature,
+        ),
+    ).container
+    trace_view: TraceView = data.trace_view
+
+    assert data.data_frame is None
+    assert len(trace_view) == 100
+    assert trace_view.cached_columns == ["E**1", "<E**1>", "M**1", "<M**1>"]
+
+    trace_df: pd.DataFrame = pd.DataFrame(
+        {"E": data.trace.energy, "M": data.trace.magnetization}
+    )
+
+    for estimator in ["E", "M"]:
+        spyns.statistics.compute_estimator_moments(
+            trace_df=trace_df, estimator_name=estimator
+        )
+
+        for power in range(1, 5):
+            spyns.statistics.compute_running_average(
+                trace_df=trace_df, estimator_name=f"{estimator}**{power}"
+            )
+
+    spyns.statistics.compute_estimator_fluctuations(
+        trace_df=trace_df,
+        fluctuation_name="C",
+        estimator_name="E",
+        number_sites=lattice.number_sites,
+        coefficient=1 / temperature ** 2,
+    )
+    spyns.statistics.compute_binder_parameter(trace_df=trace_df, estimator_name="M")
+
+    for name in ["<E**3>", "<M**2>", "C", "Binder_M"]:
+        assert np.allclose(trace_view[name], trace_df[name])
+
+    assert "<M**4>" in trace_view.cached_columns
+
+    trace_view.evict(names=["C"])
+
+    assert "C" not in trace_view.cached_columns
+
+    trace_view.evict()
+
+    assert trace_view.cached_columns == []
+    assert np.allclose(
+        trace_view.to_data_frame(columns=["E", "<E**4>"]).values,
+        trace_df[["E", "<E**4>"]].values,
+    )
+
+    spyns.data.make_trace_data_frame(data=data)
+
+    assert list(data.data_frame.columns) == trace_view.columns
+
+
+@pytest.mark.parametrize(
+    "extension,use_pyarrow",
+    [
+        (".csv", True),
+        (".npz", True),
+        (".parquet", True),
+        (".feather", True),
+        (".parquet", False),
+    ],
+)
+def test_trace_round_trips_through_disk(
+    tmp_path, monkeypatch, extension: str, use_pyarrow: bool
+) -> None:
+    if not use_pyarrow:
+        monkeypatch.setattr(spyns.trace, "pyarrow", None)
+
+    elif extension in [".parquet", ".feather"]:
+        pytest.importorskip("pyarrow")
+
+    number_sites: int = 8
+    sites: np.ndarray = np.arange(number_sites)
+    data: SimulationData = spyns.data.setup_containers(
+        parameters=SimulationParameters(
+            seed=1234,
+            mode="heisenberg",
+            trace_filepath=str(tmp_path / f"trace{extension}"),
+            snapshot_filepath=None,
+            sweeps=20,
+            equilibration_sweeps=0,
+            sample_interval=1,
+            temperature=1.0,
+        ),
+        state=spyns.model.heisenberg.sample_random_state(number_sites),
+        lattice=spyns.runtime.make_lookup_tables(
+            neighbors_table=sites,
+            neighbors_count=np.ones(shape=number_sites),
+            interaction_parameters_table=np.zeros(shape=number_sites),
+        ),
+    )
+    random_state: np.random.RandomState = np.random.RandomState(1234)
+    data.trace.energy[:] = random_state.normal(size=20)
+    data.trace.spin_vector[:] = random_state.normal(size=data.trace.spin_vector.shape)
+
+    spyns.data.write_trace_history_to_disk(data=data)
+    trace: Dict[str, np.ndarray] = spyns.trace.read_trace(
+        filepath=data.written_trace_filepath, columns=["E", "S0y"]
+    )
+
+    assert data.written_trace_filepath == str(
+        tmp_path / f"trace{extension if use_pyarrow else '.npz'}"
+    )
+    assert list(trace) == ["E", "S0y"]
+    assert np.allclose(trace["E"], data.trace.energy)
+    assert np.allclose(trace["S0y"], data.trace.spin_vector[:, 0, 1])
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pymatgen as pmg
+import pytest
+
+from spyns.data import StructureParameters, WangLandauParameters, WangLandauResult
+from spyns.lattice import Lattice
+from spyns.reweighting import ReweightedEstimators
+import spyns
+
+
+@pytest.fixture()
+def simple_cubic_lattice() -> Lattice:
+    structure_parameters: StructureParameters = StructureParameters(
+        abc=(1.0, 1.0, 1.0),
+        ang=3 * (90,),
+        spacegroup=1,
+        species=["Fe"],
+        coordinates=[[0.00, 0.00, 0.00]],
+    )
+    structure: pmg.Structure = spyns.lattice.generate.from_parameters(
+        structure_parameters=structure_parameters
+    )
+    structure = spyns.lattice.generate.make_supercell(
+        cell_structure=structure, scaling_factors=(3, 3, 3)
+    )
+    lattice: Lattice = Lattice(structure=structure, r=1.2)
+    lattice.set_sublattice_pair_interactions(
+        interaction_df=lattice.sublattice_pairs_data_frame.assign(J_ij=-1.0)
+    )
+
+    return lattice
+
+
+@pytest.mark.parametrize("number_windows", [1, 2])
+def test_sc_heisenberg_wang_landau_simulation(
+    number_windows: int, simple_cubic_lattice: Lattice
+) -> None:
+    parameters: WangLandauParameters = WangLandauParameters(
+        seed=1234,
+        energy_min=-2.5,
+        energy_max=0.0,
+        energy_bins=50,
+        flatness=0.6,
+        log_modification_factor_initial=1.0,
+        log_modification_factor_final=0.01,
+        check_interval=50,
+        max_sweeps=20000,
+        number_windows=number_windows,
+        window_overlap=0.5,
+        exchange_interval=100,
+    )
+
+    result: WangLandauResult = spyns.wang_landau.simulation(
+        lattice=simple_cubic_lattice, parameters=parameters
+    )
+    thermodynamics: ReweightedEstimators = spyns.wang_landau.compute_thermodynamics(
+        result=result, temperatures=np.array([0.5, 1.0, 2.0, 4.0])
+    )
+
+    assert result.converged
+    log_density_of_states: np.ndarray = result.log_density_of_states[result.visited]
+
+    assert np.all(np.isfinite(log_density_of_states))
+    assert log_density_of_states[-1] > log_density_of_states[0]
+    assert np.all(np.diff(thermodynamics.energy) > 0)
+    assert np.all(thermodynamics.heat_capacity > 0)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import pytest
+
+from spyns.batch import BatchPoint
+import spyns
+
+
+@pytest.fixture()
+def job_spec() -> Dict[str, Any]:
+    return {
+        "structure": {
+            "from_parameters": {
+                "abc": [2.0, 2.0, 20.0],
+                "ang": [90, 90, 90],
+                "spacegroup": 1,
+                "species": 4 * ["Fe"],
+                "coordinates": [
+                    [0.00, 0.00, 0.00],
+                    [0.50, 0.00, 0.00],
+                    [0.00, 0.50, 0.00],
+                    [0.50, 0.50, 0.00],
+                ],
+            }
+        },
+        "subspecies_labels": {"0": "1", "1": "2", "2": "2", "3": "1"},
+        "scaling_factors": [3, 3, 1],
+        "r": 1.2,
+        "interactions": [
+            {
+                "subspecies_i": "Fe1",
+                "subspecies_j": "Fe2",
+                "subspecies_ij_distance_rank": 0,
+                "J_ij": -1.0,
+            },
+            {
+                "subspecies_i": "Fe2",
+                "subspecies_j": "Fe1",
+                "subspecies_ij_distance_rank": 0,
+                "J_ij": -1.0,
+            },
+        ],
+        "simulation": {"sweeps": 50, "equilibration_sweeps": 20},
+        "temperatures": [0.5, 2.0],
+        "seeds": [1, 2],
+    }
+
+
+def submit(tmp_path: Path, spec: Dict[str, Any]) -> int:
+    filepath: Path = tmp_path / "job.json"
+    filepath.write_text(json.dumps(spec))
+
+    return spyns.work_queue.submit_job(
+        database_filepath=str(tmp_path / "queue.db"), job_spec_filepath=str(filepath)
+    )
+
+
+def test_workers_drain_queue_and_results_are_collected(
+    job_spec: Dict[str, Any], tmp_path: Path
+) -> None:
+    database_filepath: str = str(tmp_path / "queue.db")
+
+    assert submit(tmp_path=tmp_path, spec=job_spec) == 4
+    assert submit(tmp_path=tmp_path, spec=job_spec) == 0
+    assert spyns.work_queue.run_worker(database_filepath=database_filepath) == 4
+    assert spyns.work_queue.queue_status(database_filepath=database_filepath) == {
+        "pending": 0,
+        "claimed": 0,
+        "done": 4,
+        "failed": 0,
+    }
+
+    results: pd.DataFrame = spyns.work_queue.collect_results(
+        database_filepath=database_filepath
+    )
+
+    assert list(results.columns) == spyns.batch.RESULT_COLUMNS
+    assert list(zip(results["temperature"], results["seed"])) == [
+        (0.5, 1),
+        (0.5, 2),
+        (2.0, 1),
+        (2.0, 2),
+    ]
+    assert results["energy"].iloc[0] < results["energy"].iloc[-1] < 0
+
+    assert submit(tmp_path=tmp_path, spec=dict(job_spec, seeds=[3])) == 2
+    assert spyns.work_queue.read_job(
+        database_filepath=database_filepath
+    ).seeds == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        submit(tmp_path=tmp_path, spec=dict(job_spec, r=1.5))
+
+
+def test_timed_out_claims_are_reissued(
+    job_spec: Dict[str, Any], tmp_path: Path
+) -> None:
+    database_filepath: str = str(tmp_path / "queue.db")
+    submit(tmp_path=tmp_path, spec=dict(job_spec, temperatures=[1.0], seeds=[1]))
+
+    with closing(
+        spyns.work_queue.connect(database_filepath=database_filepath)
+    ) as connection:
+        point: Optional[BatchPoint] = spyns.work_queue.claim_point(
+            connection=connection, worker="a", timeout=600.0, max_attempts=2
+        )
+
+        assert point == (1.0, 1)
+        assert (
+            spyns.work_queue.claim_point(
+                connection=connection, worker="b", timeout=600.0, max_attempts=2
+            )
+            is None
+        )
+        assert spyns.work_queue.heartbeat(
+            connection=connection, worker="a", point=point
+        )
+        assert (
+            spyns.work_queue.claim_point(
+                connection=connection, worker="b", timeout=-1.0, max_attempts=2
+            )
+            == point
+        )
+        assert not spyns.work_queue.heartbeat(
+            connection=connection, worker="a", point=point
+        )
+        assert (
+            spyns.work_queue.claim_point(
+                connection=connection, worker="c", timeout=-1.0, max_attempts=2
+            )
+            is None
+        )
+
+    assert spyns.work_queue.read_failures(database_filepath=database_filepath) == [
+        ((1.0, 1), "Claim timed out.")
+    ]
+
+
+def test_failed_points_are_retried_then_marked_failed(
+    job_spec: Dict[str, Any], tmp_path: Path, monkeypatch
+) -> None:
+    database_filepath: str = str(tmp_path / "queue.db")
+    submit(tmp_path=tmp_path, spec=job_spec)
+
+    def fail_simulation(*args, **kwargs):
+        raise RuntimeError("simulation failed")
+
+    monkeypatch.setattr(spyns.run, "simulation", fail_simulation)
+
+    assert (
+        spyns.work_queue.run_worker(database_filepath=database_filepath, max_attempts=2)
+        == 0
+    )
+    assert spyns.work_queue.queue_status(database_filepath=database_filepath)[
+        "failed"
+    ] == 4
+
+    with closing(sqlite3.connect(database_filepath)) as connection:
+        assert connection.execute(
+            "SELECT DISTINCT attempts FROM points"
+        ).fetchall() == [(2,)]
+
+    assert (
+        spyns.work_queue.main(
+            [database_filepath, "collect", "-o", str(tmp_path / "results.csv")]
+        )
+        == 1
+    )